@@ -0,0 +1,140 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Latency of the threaded gRPC server under overload, with and without a concurrent RPCs limit.
+
+`--clients` threads call GetGenomeByUUID in a loop for `--duration` seconds against an in-process server
+configured with `--workers` gRPC workers and a `--pool-size` database connection pool. `--sql-delay` adds a
+delay to each SQL statement, while holding the connection, to stand for a busy database. The server is run once
+without a limit on the concurrent RPCs and once with `--max-concurrent-rpcs`, the excess RPCs being rejected
+with RESOURCE_EXHAUSTED. By default it runs against a copy of the test databases:
+
+    python benchmarks/load_test.py [--metadata-uri URI --taxonomy-uri URI] [--clients N] [--duration S]
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent import futures
+from pathlib import Path
+
+import grpc
+
+TEST_DATABASES = Path(__file__).parents[1] / "src/tests/databases"
+
+
+def test_databases_copy():
+    tmp_dir = Path(tempfile.mkdtemp())
+    for name in ("ensembl_genome_metadata", "ncbi_taxonomy"):
+        shutil.copy(TEST_DATABASES / f"{name}.db", tmp_dir / f"{name}.db")
+    return f"sqlite:///{tmp_dir}/ensembl_genome_metadata.db", f"sqlite:///{tmp_dir}/ncbi_taxonomy.db"
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def run(servicer, cfg, clients, duration, genome_uuids):
+    from ensembl.production.metadata.grpc import ensembl_metadata_pb2, ensembl_metadata_pb2_grpc
+    from ensembl.production.metadata.grpc.service import server_options
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=cfg.grpc_max_workers), **server_options(cfg))
+    ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    latencies, codes = [], {}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(index):
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            stub = ensembl_metadata_pb2_grpc.EnsemblMetadataStub(channel)
+            request = ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=genome_uuids[index % len(genome_uuids)])
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    stub.GetGenomeByUUID(request)
+                    code = grpc.StatusCode.OK
+                except grpc.RpcError as e:
+                    code = e.code()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    codes[code.name] = codes.get(code.name, 0) + 1
+                    if code == grpc.StatusCode.OK:
+                        latencies.append(elapsed)
+                if code == grpc.StatusCode.RESOURCE_EXHAUSTED:
+                    # back off before retrying, as a client would
+                    time.sleep(0.05)
+
+    with futures.ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(client, range(clients)))
+    server.stop(grace=None)
+    latencies.sort()
+    return latencies, codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metadata-uri", help="Metadata database URI, a copy of the test database by default")
+    parser.add_argument("--taxonomy-uri", help="Taxonomy database URI, a copy of the test database by default")
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per run")
+    parser.add_argument("--workers", type=int, default=10, help="gRPC worker threads")
+    parser.add_argument("--pool-size", type=int, default=4, help="Database connection pool size")
+    parser.add_argument("--pool-timeout", type=float, default=30, help="Database connection wait timeout")
+    parser.add_argument("--max-concurrent-rpcs", type=int, default=20, help="Concurrent RPCs limit")
+    parser.add_argument("--sql-delay", type=float, default=0.005, help="Seconds added to each SQL statement")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    metadata_uri, taxonomy_uri = args.metadata_uri, args.taxonomy_uri
+    if metadata_uri is None:
+        metadata_uri, taxonomy_uri = test_databases_copy()
+    # The configuration is read when the modules are first imported
+    os.environ.update({
+        "METADATA_URI": metadata_uri,
+        "TAXONOMY_URI": taxonomy_uri,
+        "POOL_SIZE": str(args.pool_size),
+        "MAX_OVERFLOW": "0",
+        "POOL_TIMEOUT": str(args.pool_timeout),
+        "GRPC_MAX_WORKERS": str(args.workers),
+    })
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from ensembl.production.metadata.grpc.config import MetadataConfig
+    from ensembl.production.metadata.grpc.servicer import EnsemblMetadataServicer
+
+    if args.sql_delay:
+        event.listen(Engine, "before_cursor_execute", lambda *_: time.sleep(args.sql_delay))
+    servicer = EnsemblMetadataServicer()
+    genome_uuids = [row.Genome.genome_uuid for row in servicer.genome_adaptor.fetch_genomes(status="Released")]
+
+    print(f"{args.clients} clients, {args.workers} workers, {args.pool_size} connections, "
+          f"{args.sql_delay * 1000:g}ms per statement")
+    print(f"{'max concurrent RPCs':>20} {'OK/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+          f"{'max (ms)':>9}  codes")
+    for limit in (0, args.max_concurrent_rpcs):
+        os.environ["GRPC_MAX_CONCURRENT_RPCS"] = str(limit)
+        cfg = MetadataConfig().validate()
+        latencies, codes = run(servicer, cfg, args.clients, args.duration, genome_uuids)
+        print(f"{limit or 'none':>20} {len(latencies) / args.duration:8.1f} "
+              f"{percentile(latencies, 0.5) * 1000:9.1f} {percentile(latencies, 0.95) * 1000:9.1f} "
+              f"{percentile(latencies, 0.99) * 1000:9.1f} {latencies[-1] * 1000 if latencies else 0:9.1f}  "
+              f"{codes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Throughput of the gRPC service by number of worker processes (GRPC_PROCESSES).
+
+For each `--processes` value, the service is started with that many workers and `--client-processes`
+client processes, each with its own channels (so its own connections, spread among the workers by
+SO_REUSEPORT), call GetGenomeByUUID in a loop for `--duration` seconds. The response cache and the request
+coalescing are disabled, each RPC going through the servicer. By default it runs against a copy of the test
+databases:
+
+    python benchmarks/prefork_scaling.py [--metadata-uri URI --taxonomy-uri URI] [--processes 1 2 4]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import grpc
+
+ROOT = Path(__file__).parents[1]
+TEST_DATABASES = ROOT / "src/tests/databases"
+
+
+def test_databases_copy():
+    tmp_dir = Path(tempfile.mkdtemp())
+    for name in ("ensembl_genome_metadata", "ncbi_taxonomy"):
+        shutil.copy(TEST_DATABASES / f"{name}.db", tmp_dir / f"{name}.db")
+    return f"sqlite:///{tmp_dir}/ensembl_genome_metadata.db", f"sqlite:///{tmp_dir}/ncbi_taxonomy.db"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def client(port, threads, duration, genome_uuids, results):
+    from ensembl.production.metadata.grpc import ensembl_metadata_pb2, ensembl_metadata_pb2_grpc
+
+    counts = []
+    deadline = time.monotonic() + duration
+
+    def loop(index):
+        count = 0
+        # a channel per thread, for its own connection
+        options = [("grpc.use_local_subchannel_pool", 1)]
+        with grpc.insecure_channel(f"localhost:{port}", options=options) as channel:
+            stub = ensembl_metadata_pb2_grpc.EnsemblMetadataStub(channel)
+            genome_uuid = genome_uuids[index % len(genome_uuids)]
+            request = ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=genome_uuid)
+            while time.monotonic() < deadline:
+                stub.GetGenomeByUUID(request)
+                count += 1
+        counts.append(count)
+
+    workers = [threading.Thread(target=loop, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put(sum(counts))
+
+
+def run(processes, args, env, genome_uuids):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(ROOT / "src/ensembl/production/metadata/grpc/service.py")],
+        env={**env, "SERVICE_PORT": str(port), "GRPC_PROCESSES": str(processes)},
+    )
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            grpc.channel_ready_future(channel).result(timeout=120)
+        # let all the workers open the port
+        time.sleep(2)
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(
+                target=client, args=(port, args.threads, args.duration, genome_uuids, results)
+            )
+            for _ in range(args.client_processes)
+        ]
+        for process in clients:
+            process.start()
+        total = sum(results.get() for _ in clients)
+        for process in clients:
+            process.join()
+        return total / args.duration
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metadata-uri", help="Metadata database URI, the test database by default")
+    parser.add_argument("--taxonomy-uri", help="Taxonomy database URI, the test database by default")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4],
+                        help="Worker processes to compare")
+    parser.add_argument("--client-processes", type=int, default=os.cpu_count(), help="Client processes")
+    parser.add_argument("--threads", type=int, default=8, help="Client threads per client process")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per run")
+    args = parser.parse_args()
+
+    metadata_uri, taxonomy_uri = args.metadata_uri, args.taxonomy_uri
+    if metadata_uri is None:
+        metadata_uri, taxonomy_uri = test_databases_copy()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT / "src"),
+        "METADATA_URI": metadata_uri,
+        "TAXONOMY_URI": taxonomy_uri,
+        "RESPONSE_CACHE_SIZE": "0",
+        "COALESCE_RPCS": "none",
+    }
+    os.environ.update(env)
+    from ensembl.production.metadata.api.adaptors import GenomeAdaptor
+
+    adaptor = GenomeAdaptor(metadata_uri=metadata_uri, taxonomy_uri=taxonomy_uri)
+    genome_uuids = [row.Genome.genome_uuid for row in adaptor.fetch_genomes(status="Released")]
+
+    print(f"{os.cpu_count()} CPUs, {args.client_processes} client processes x {args.threads} threads")
+    print(f"{'processes':>10} {'RPC/s':>9} {'speedup':>8}")
+    baseline = None
+    for processes in args.processes:
+        throughput = run(processes, args, env, genome_uuids)
+        baseline = baseline or throughput
+        print(f"{processes:>10} {throughput:9.1f} {throughput / baseline:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Per call Python overhead of the hot adaptor queries, with and without the statement cache.
+
+Each query is timed with its statement cache emptied before every call ("uncached", i.e. the statement
+is rebuilt on every call, as it used to be) and with the cache kept ("cached"). By default it runs against
+a copy of the test databases:
+
+    python benchmarks/statement_cache.py [--metadata-uri URI --taxonomy-uri URI] [--number N]
+"""
+import argparse
+import shutil
+import tempfile
+import timeit
+from pathlib import Path
+
+from ensembl.production.metadata.api.adaptors import GenomeAdaptor, ReleaseAdaptor
+from ensembl.production.metadata.api.adaptors.genome import fetch_genomes_select, fetch_sequences_select, \
+    genome_uuid_by_assembly_accession_select
+from ensembl.production.metadata.api.adaptors.release import fetch_releases_select
+
+TEST_DATABASES = Path(__file__).parents[1] / "src/tests/databases"
+
+
+def test_databases_copy():
+    tmp_dir = Path(tempfile.mkdtemp())
+    for name in ("ensembl_genome_metadata", "ncbi_taxonomy"):
+        shutil.copy(TEST_DATABASES / f"{name}.db", tmp_dir / f"{name}.db")
+    return f"sqlite:///{tmp_dir}/ensembl_genome_metadata.db", f"sqlite:///{tmp_dir}/ncbi_taxonomy.db"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metadata-uri", help="Metadata database URI, a copy of the test database by default")
+    parser.add_argument("--taxonomy-uri", help="Taxonomy database URI, a copy of the test database by default")
+    parser.add_argument("--number", type=int, default=200, help="Calls per measurement")
+    args = parser.parse_args()
+
+    metadata_uri, taxonomy_uri = args.metadata_uri, args.taxonomy_uri
+    if metadata_uri is None:
+        metadata_uri, taxonomy_uri = test_databases_copy()
+    genome_adaptor = GenomeAdaptor(metadata_uri, taxonomy_uri)
+    release_adaptor = ReleaseAdaptor(metadata_uri)
+
+    genome = genome_adaptor.fetch_genomes(status="Released")[0]
+    genome_uuid, assembly_accession = genome.Genome.genome_uuid, genome.Assembly.accession
+    queries = {
+        "fetch_genomes(genome_uuid, Current)": (
+            fetch_genomes_select, lambda: genome_adaptor.fetch_genomes(genome_uuid=genome_uuid, status="Current")),
+        "fetch_genomes(genome_tag, release_version)": (
+            fetch_genomes_select,
+            lambda: genome_adaptor.fetch_genomes(genome_tag="grch38", release_version=110.1, status="Released")),
+        "fetch_sequences(genome_uuid)": (
+            fetch_sequences_select, lambda: genome_adaptor.fetch_sequences(genome_uuid=genome_uuid)),
+        "get_genome_uuid_by_assembly_accession": (
+            genome_uuid_by_assembly_accession_select,
+            lambda: genome_adaptor.get_genome_uuid_by_assembly_accession(assembly_accession)),
+        "fetch_releases(current_only)": (
+            fetch_releases_select, lambda: release_adaptor.fetch_releases(current_only=True)),
+    }
+
+    print(f"{'query':45} {'uncached (ms)':>14} {'cached (ms)':>12} {'speedup':>8}")
+    for name, (statement_cache, call) in queries.items():
+        call()
+
+        def uncached():
+            statement_cache.cache_clear()
+            call()
+
+        before = timeit.timeit(uncached, number=args.number) / args.number * 1000
+        call()
+        after = timeit.timeit(call, number=args.number) / args.number * 1000
+        print(f"{name:45} {before:14.3f} {after:12.3f} {before / after:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
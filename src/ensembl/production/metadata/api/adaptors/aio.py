@@ -0,0 +1,228 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Asyncio counterparts of the metadata adaptors, backed by SQLAlchemy ``AsyncSession``.
+
+The query logic stays in the synchronous adaptors. Each async adaptor opens an ``AsyncSession``
+and runs the synchronous code through ``AsyncSession.run_sync()``, so the SQL is executed by an
+asyncio driver (aiomysql, aiosqlite) on the event loop instead of blocking a worker thread.
+"""
+from __future__ import annotations
+
+import functools
+import itertools
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, Tuple, TypeVar
+
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from ensembl.production.metadata.api.adaptors.base import BaseAdaptor, cfg, pool_options
+from ensembl.production.metadata.api.adaptors.genome import AssembliesCounts, GenomeAdaptor
+from ensembl.production.metadata.api.adaptors.release import ReleaseAdaptor
+from ensembl.production.metadata.api.adaptors.vep import VepAdaptor
+
+__all__ = ["AsyncBaseAdaptor", "AsyncGenomeAdaptor", "AsyncReleaseAdaptor", "AsyncVepAdaptor", "to_async_url"]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# asyncio driver used for each supported backend when the configured URI uses a blocking driver
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str | URL) -> URL:
+    """
+    Return the asyncio flavour of a database URL.
+
+    ``mysql://``, ``mysql+pymysql://`` and ``sqlite://`` URLs are switched to their asyncio drivers,
+    URLs already using an asyncio driver are returned unchanged.
+
+    Raises:
+        ValueError: If no asyncio driver is known for the URL backend.
+    """
+    url = make_url(url)
+    if url.get_dialect().is_async:
+        return url
+    try:
+        return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+    except KeyError:
+        raise ValueError(f"No asyncio driver available for '{url.get_backend_name()}' databases") from None
+
+
+def _create_engine(uri: str | URL | AsyncEngine) -> AsyncEngine:
+    if isinstance(uri, AsyncEngine):
+        return uri
+    url = to_async_url(uri)
+    return create_async_engine(url, **pool_options(url))
+
+
+class _SessionScope:
+    """Stand-in for ``DBConnection`` handing an already opened session to the synchronous adaptor code."""
+
+    def __init__(self, session):
+        self._session = session
+
+    @property
+    def url(self) -> str:
+        return self._session.bind.url.render_as_string(hide_password=False)
+
+    @contextmanager
+    def session_scope(self):
+        yield self._session
+
+
+def _awaitable(method: Callable[..., T]) -> Callable[..., Any]:
+    """Expose a synchronous adaptor method as a coroutine running it through ``run_sync()``."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs) -> T:
+        return await self.run_sync(method, *args, **kwargs)
+
+    return wrapper
+
+
+class AsyncBaseAdaptor:
+    sync_adaptor_class = BaseAdaptor
+
+    def __init__(self, metadata_uri: str | URL | AsyncEngine):
+        self.metadata_engine = _create_engine(metadata_uri)
+        self.metadata_session = async_sessionmaker(self.metadata_engine, expire_on_commit=False, autoflush=False)
+
+    def _sync_adaptor(self, metadata_session: AsyncSession, **sessions: AsyncSession) -> BaseAdaptor:
+        """Build a synchronous adaptor bound to the given open sessions, without opening new connections."""
+        adaptor = self.sync_adaptor_class.__new__(self.sync_adaptor_class)
+        adaptor.metadata_db = _SessionScope(metadata_session.sync_session)
+        return adaptor
+
+    @asynccontextmanager
+    async def _adaptor_scope(self) -> AsyncIterator[Tuple[AsyncSession, BaseAdaptor]]:
+        """A synchronous adaptor bound to fresh sessions, and the metadata session running its code"""
+        async with self.metadata_session() as session:
+            yield session, self._sync_adaptor(session)
+
+    async def run_sync(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call ``fn(adaptor, *args, **kwargs)`` with a synchronous adaptor bound to a fresh ``AsyncSession``.
+
+        Every query issued by ``fn`` (including lazy loads) goes through the asyncio driver, and all of them
+        share the same session. ``fn`` can be an adaptor method or any function taking the adaptor as its
+        first argument, e.g. the gRPC ``utils`` helpers.
+        """
+        async with self._adaptor_scope() as (session, adaptor):
+            return await session.run_sync(lambda _: fn(adaptor, *args, **kwargs))
+
+    async def stream_sync(self, fn: Callable[..., Iterator[T]], *args, page_size: int = None) -> AsyncIterator[T]:
+        """
+        Iterate ``fn(adaptor, *args)`` like ``run_sync``, `page_size` items at a time.
+
+        Each page is built in its own ``run_sync`` call and yielded before the next one is built, so at most a
+        page of items is held and the first one is sent as soon as its page is ready. The session (and its
+        database connection) stays open until the iteration ends. Helpers loading all their rows with a single
+        query still do so before their first item.
+        """
+        page_size = page_size or cfg.grpc_stream_page_size
+        async with self._adaptor_scope() as (session, adaptor):
+            items = fn(adaptor, *args)
+            try:
+                while True:
+                    page = await session.run_sync(lambda _: list(itertools.islice(items, page_size)))
+                    for item in page:
+                        yield item
+                    if len(page) < page_size:
+                        return
+            finally:
+                # the helper may still need the session to exit its context managers
+                await session.run_sync(lambda _: items.close())
+
+    async def dispose(self) -> None:
+        await self.metadata_engine.dispose()
+
+
+class AsyncGenomeAdaptor(AsyncBaseAdaptor):
+    sync_adaptor_class = GenomeAdaptor
+
+    def __init__(self, metadata_uri: str | URL | AsyncEngine, taxonomy_uri: str | URL | AsyncEngine):
+        super().__init__(metadata_uri)
+        self.taxonomy_engine = _create_engine(taxonomy_uri)
+        self.taxonomy_session = async_sessionmaker(self.taxonomy_engine, expire_on_commit=False, autoflush=False)
+        # shared by the per request synchronous adaptors
+        self.assemblies_counts = AssembliesCounts()
+
+    def _sync_adaptor(self, metadata_session: AsyncSession, **sessions: AsyncSession) -> GenomeAdaptor:
+        adaptor = super()._sync_adaptor(metadata_session)
+        adaptor.taxonomy_db = _SessionScope(sessions["taxonomy_session"].sync_session)
+        adaptor.assemblies_counts = self.assemblies_counts
+        return adaptor
+
+    @asynccontextmanager
+    async def _adaptor_scope(self) -> AsyncIterator[Tuple[AsyncSession, GenomeAdaptor]]:
+        # The taxonomy session only connects if fn actually queries the taxonomy database
+        async with self.metadata_session() as session, self.taxonomy_session() as taxonomy_session:
+            yield session, self._sync_adaptor(session, taxonomy_session=taxonomy_session)
+
+    async def dispose(self) -> None:
+        await super().dispose()
+        await self.taxonomy_engine.dispose()
+
+    fetch_taxonomy_names = _awaitable(GenomeAdaptor.fetch_taxonomy_names)
+    fetch_taxonomy_ids = _awaitable(GenomeAdaptor.fetch_taxonomy_ids)
+    fetch_genomes = _awaitable(GenomeAdaptor.fetch_genomes)
+    fetch_genomes_by_genome_uuid = _awaitable(GenomeAdaptor.fetch_genomes_by_genome_uuid)
+    fetch_genomes_by_assembly_accession = _awaitable(GenomeAdaptor.fetch_genomes_by_assembly_accession)
+    fetch_genomes_by_ensembl_name = _awaitable(GenomeAdaptor.fetch_genomes_by_ensembl_name)
+    fetch_genomes_by_taxonomy_id = _awaitable(GenomeAdaptor.fetch_genomes_by_taxonomy_id)
+    fetch_genomes_by_assembly_name_genebuild = _awaitable(GenomeAdaptor.fetch_genomes_by_assembly_name_genebuild)
+    get_genome_uuid_by_assembly_accession = _awaitable(GenomeAdaptor.get_genome_uuid_by_assembly_accession)
+    fetch_genome_by_specific_keyword = _awaitable(GenomeAdaptor.fetch_genome_by_specific_keyword)
+    fetch_genome_by_release_version = _awaitable(GenomeAdaptor.fetch_genome_by_release_version)
+    fetch_sequences = _awaitable(GenomeAdaptor.fetch_sequences)
+    fetch_sequences_by_genome_uuid = _awaitable(GenomeAdaptor.fetch_sequences_by_genome_uuid)
+    fetch_sequences_by_assembly_accession = _awaitable(GenomeAdaptor.fetch_sequences_by_assembly_accession)
+    fetch_top_regions_by_genome_uuid = _awaitable(GenomeAdaptor.fetch_top_regions_by_genome_uuid)
+    fetch_genome_datasets = _awaitable(GenomeAdaptor.fetch_genome_datasets)
+    fetch_genomes_info = _awaitable(GenomeAdaptor.fetch_genomes_info)
+    fetch_organisms_group_counts = _awaitable(GenomeAdaptor.fetch_organisms_group_counts)
+    fetch_assemblies_count = _awaitable(GenomeAdaptor.fetch_assemblies_count)
+    fetch_assemblies_counts = _awaitable(GenomeAdaptor.fetch_assemblies_counts)
+    fetch_genome_groups = _awaitable(GenomeAdaptor.fetch_genome_groups)
+    fetch_genome_group_members_detailed = _awaitable(GenomeAdaptor.fetch_genome_group_members_detailed)
+    get_public_path = _awaitable(GenomeAdaptor.get_public_path)
+    get_public_paths = _awaitable(GenomeAdaptor.get_public_paths)
+
+
+class AsyncReleaseAdaptor(AsyncBaseAdaptor):
+    sync_adaptor_class = ReleaseAdaptor
+
+    fetch_releases = _awaitable(ReleaseAdaptor.fetch_releases)
+    fetch_releases_for_genome = _awaitable(ReleaseAdaptor.fetch_releases_for_genome)
+    fetch_releases_for_dataset = _awaitable(ReleaseAdaptor.fetch_releases_for_dataset)
+
+
+class AsyncVepAdaptor(AsyncBaseAdaptor):
+    sync_adaptor_class = VepAdaptor
+
+    def __init__(self, metadata_uri: str | URL | AsyncEngine, file="all"):
+        super().__init__(metadata_uri)
+        self.file = file
+
+    def _sync_adaptor(self, metadata_session: AsyncSession, **sessions: AsyncSession) -> VepAdaptor:
+        adaptor = super()._sync_adaptor(metadata_session)
+        adaptor.file = self.file
+        return adaptor
+
+    fetch_vep_locations = _awaitable(VepAdaptor.fetch_vep_locations)
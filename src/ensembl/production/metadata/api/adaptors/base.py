@@ -9,17 +9,74 @@
 #   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
+from contextlib import contextmanager
+
+import sqlalchemy as db
 from ensembl.utils.database import DBConnection
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
 
 from ensembl.production.metadata.grpc.config import cfg
 
 
+def pool_options(url) -> dict:
+    """
+    Connection pool options of the adaptors engines, none for the (single connection) in memory databases.
+
+    DuckDB files are opened read-only: the adaptors never write, and several server processes can then open
+    the same file.
+    """
+    url = make_url(url)
+    if url.get_backend_name() in ("sqlite", "duckdb") and url.database in (None, "", ":memory:"):
+        return {}
+    options = {
+        "pool_size": cfg.pool_size,
+        "max_overflow": cfg.max_overflow,
+        "pool_timeout": cfg.pool_timeout,
+        "pool_recycle": cfg.pool_recycle,
+    }
+    if url.get_backend_name() == "duckdb":
+        options["connect_args"] = {"read_only": True}
+    return options
+
+
+class PooledDBConnection(DBConnection):
+    """
+    DBConnection whose sessions share the connection pool of its engine.
+
+    DBConnection.session_scope() binds each session to a new engine, i.e. a new database connection: the pool
+    options never apply and each request pays for a connection set up. The schema is not reflected.
+    """
+
+    def __init__(self, url, **kwargs):
+        super().__init__(url, reflect=False, **kwargs)
+        if self.dialect == "sqlite":
+            self._enable_sqlite_savepoints(self._engine)
+        self._session_factory = sessionmaker(bind=self._engine, future=True, autoflush=False)
+
+    @classmethod
+    def from_config(cls, url) -> "PooledDBConnection":
+        return cls(url, **pool_options(url))
+
+    @contextmanager
+    def session_scope(self):
+        session = self._session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
 class BaseAdaptor:
     def __init__(self, metadata_uri: str | DBConnection):
         if isinstance(metadata_uri, DBConnection):
             self.metadata_db = metadata_uri
         else:
-            self.metadata_db = DBConnection(metadata_uri, pool_size=cfg.pool_size, pool_recycle=cfg.pool_recycle)
+            self.metadata_db = PooledDBConnection.from_config(metadata_uri)
 
 def check_parameter(param):
     if isinstance(param, tuple):
@@ -27,3 +84,8 @@ def check_parameter(param):
     if param is not None and not isinstance(param, list):
         param = [param]
     return param
+
+
+def expanding_param(name):
+    """ Bound list parameter of an IN clause, its value is given at execution time """
+    return db.bindparam(name, expanding=True)
@@ -11,19 +11,25 @@
 #   limitations under the License.
 from __future__ import annotations
 
+import copy
 import enum
+import functools
 import logging
 import re
+import threading
+import time
 from operator import and_
-from typing import List, Tuple, NamedTuple
+from typing import FrozenSet, List, Tuple, NamedTuple
 
 import sqlalchemy as db
 from ensembl.utils.database import DBConnection
-from sqlalchemy import select, func, desc, or_, distinct, case
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import aliased
+from sqlalchemy import select, func, desc, or_, distinct, case, make_url
+from sqlalchemy.exc import NoResultFound, MultipleResultsFound
+from sqlalchemy.orm import aliased, selectinload
 
-from ensembl.production.metadata.api.adaptors.base import BaseAdaptor, check_parameter, cfg
+from ensembl.production.metadata.api.adaptors.base import BaseAdaptor, PooledDBConnection, check_parameter, cfg, \
+    expanding_param
+from ensembl.production.metadata.api.adaptors.cache import TTLCache
 from ensembl.production.metadata.api.exceptions import TypeNotFoundException
 from ensembl.production.metadata.api.factories.utils import format_accession_path
 from ensembl.production.metadata.api.models import *
@@ -57,7 +63,400 @@ class GenomeDatasetsListItem(NamedTuple):
     datasets: [GenomeDatasetItem]
 
 
+# Dataset graph walked by fetch_genome_datasets: one "SELECT ... WHERE ... IN" per relationship,
+# whatever the number of genomes. selectinload keeps the genome_datasets in the same order as a lazy load would.
+GENOME_DATASETS_LOADER = selectinload(Genome.genome_datasets).options(
+    selectinload(GenomeDataset.ensembl_release),
+    selectinload(GenomeDataset.dataset).options(
+        selectinload(Dataset.dataset_type),
+        selectinload(Dataset.dataset_source),
+        selectinload(Dataset.dataset_attributes).selectinload(DatasetAttribute.attribute),
+    ),
+)
+
+
+# The current release of a genome is its newest released integrated release or, failing that,
+# its current (genome_release.is_current) released partial release.
+# Same rule for the queries (fetch_genomes "Current" status) and the loaded genomes (search ReleaseSelector).
+def is_current_release_candidate(genome_release: GenomeRelease) -> bool:
+    release = genome_release.ensembl_release
+    return release.status == ReleaseStatus.RELEASED and (
+            release.release_type == "integrated" or genome_release.is_current == 1
+    )
+
+
+def current_release_sort_key(release: EnsemblRelease) -> Tuple[bool, str]:
+    """ Best current release candidate last """
+    return release.release_type == "integrated", release.label
+
+
+def current_genome_release_select():
+    """
+    genome_release_id of the current release of each genome, ranked in a single pass over genome_release
+    """
+    rank = func.row_number().over(
+        partition_by=GenomeRelease.genome_id,
+        order_by=(
+            case((EnsemblRelease.release_type == "integrated", 1), else_=0).desc(),
+            EnsemblRelease.label.desc(),
+        )
+    )
+    ranked = (
+        select(GenomeRelease.genome_release_id, rank.label("current_rank"))
+        .join(EnsemblRelease, EnsemblRelease.release_id == GenomeRelease.release_id)
+        .where(
+            EnsemblRelease.status == ReleaseStatus.RELEASED,
+            or_(EnsemblRelease.release_type == "integrated", GenomeRelease.is_current == 1),
+        )
+        .subquery()
+    )
+    return select(ranked.c.genome_release_id).where(ranked.c.current_rank == 1)
+
+
+@functools.lru_cache(maxsize=cfg.statement_cache_size)
+def fetch_genomes_select(filters: FrozenSet[str], status: GenomeStatus):
+    """
+    GenomeAdaptor.fetch_genomes statement for a given set of filters, built once per filter set.
+
+    Filter values are bound at execution time, under the name of the fetch_genomes argument they come from.
+    """
+    genome_select = db.select(
+        Genome, Organism, Assembly
+    ).select_from(Genome) \
+        .join(Organism, Organism.organism_id == Genome.organism_id) \
+        .join(Assembly, Assembly.assembly_id == Genome.assembly_id)
+
+    # Apply group filtering if group parameter is provided
+    if "group" in filters:
+        genome_select = db.select(
+            Genome, Organism, Assembly, OrganismGroup, OrganismGroupMember
+        ).join(Genome.assembly).join(Genome.organism) \
+            .join(Organism.organism_group_members) \
+            .join(OrganismGroupMember.organism_group) \
+            .filter(OrganismGroup.name.in_(expanding_param("group")) |
+                    OrganismGroup.code.in_(expanding_param("group")))
+
+    # genome group logic
+    if filters & {"genome_group_id", "genome_group_name", "genome_group_type", "genome_group_reference_only"}:
+        genome_select = genome_select.join(
+            GenomeGroupMember, Genome.genome_id == GenomeGroupMember.genome_id
+        ).join(
+            GenomeGroup, GenomeGroup.genome_group_id == GenomeGroupMember.genome_group_id
+        )
+
+        if "genome_group_id" in filters:
+            genome_select = genome_select.where(
+                GenomeGroup.genome_group_id.in_(expanding_param("genome_group_id")))
+
+        if "genome_group_name" in filters:
+            genome_select = genome_select.where(GenomeGroup.name.in_(expanding_param("genome_group_name")))
+
+        if "genome_group_type" in filters:
+            genome_select = genome_select.where(GenomeGroup.type.in_(expanding_param("genome_group_type")))
+
+        if "genome_group_reference_only" in filters:
+            genome_select = genome_select.where(GenomeGroupMember.is_reference == 1)
+
+        if status == GenomeStatus.CURRENT:
+            genome_select = genome_select.where(GenomeGroupMember.is_current == 1)
+    if "genebuild_date" in filters:
+        genome_select = genome_select.filter(Genome.genebuild_date == db.bindparam("genebuild_date"))
+    # Apply additional filters based on the provided parameters
+    if "genome_id" in filters:
+        genome_select = genome_select.filter(Genome.genome_id.in_(expanding_param("genome_id")))
+
+    if "genome_uuid" in filters:
+        genome_select = genome_select.filter(Genome.genome_uuid.in_(expanding_param("genome_uuid")))
+
+    if "genome_tag" in filters:
+        genome_select = genome_select.filter(
+            db.or_(Genome.url_name.in_(expanding_param("genome_tag")),
+                   Organism.tol_id.in_(expanding_param("genome_tag")))
+        )
+
+    if "organism_uuid" in filters:
+        genome_select = genome_select.filter(Organism.organism_uuid.in_(expanding_param("organism_uuid")))
+
+    if "assembly_uuid" in filters:
+        genome_select = genome_select.filter(Assembly.assembly_uuid.in_(expanding_param("assembly_uuid")))
+
+    if "assembly_accession" in filters:
+        genome_select = genome_select.filter(Assembly.accession.in_(expanding_param("assembly_accession")))
+
+    if "assembly_name" in filters:
+        # case() function is used to conditionally select between columns, sql equivalent is:
+        # CASE
+        #     WHEN :use_default_assembly = 1 THEN assembly.assembly_default
+        #     ELSE assembly.name
+        # END
+        conditional_column = db.case(
+            (db.bindparam("use_default_assembly", type_=db.Boolean) == 1, Assembly.assembly_default),
+            else_=Assembly.name
+        )
+        genome_select = genome_select.filter(
+            db.func.lower(conditional_column).in_(expanding_param("assembly_name")))
+
+    if "biosample_id" in filters:
+        genome_select = genome_select.filter(Organism.biosample_id.in_(expanding_param("biosample_id")))
+
+    if "production_name" in filters:
+        genome_select = genome_select.filter(Genome.production_name.in_(expanding_param("production_name")))
+
+    if "taxonomy_id" in filters:
+        genome_select = genome_select.filter(Organism.taxonomy_id.in_(expanding_param("taxonomy_id")))
+    genome_select = genome_select.add_columns(GenomeRelease, EnsemblRelease, EnsemblSite) \
+        .join(GenomeRelease) \
+        .join(EnsemblRelease) \
+        .join(EnsemblSite)
+    if status == GenomeStatus.CURRENT:
+        # This filter will allow us to fetch genomes present in the integrated release
+        # and having genome_release.is_current = 0 (see ENSPLAT-169 for more details)
+
+        if "release_type" in filters:
+            genome_select = genome_select.where(
+                and_(
+                    func.lower(EnsemblRelease.release_type) == db.bindparam("release_type"),
+                    EnsemblRelease.is_current == 1
+                )
+            )
+        else:
+            genome_select = genome_select.where(
+                GenomeRelease.genome_release_id.in_(current_genome_release_select())
+            )
+
+    if status == GenomeStatus.UNRELEASED_ONLY:
+        # fetch only unreleased ones
+        genome_select = genome_select.filter(EnsemblRelease.status != ReleaseStatus.RELEASED)
+    if status == GenomeStatus.RELEASED:
+        genome_select = genome_select.filter(EnsemblRelease.status == ReleaseStatus.RELEASED)
+    if "release_version" in filters:
+        # if release is specified
+        genome_select = genome_select.filter(EnsemblRelease.version <= db.bindparam("release_version"))
+    if "release_type" in filters:
+        genome_select = genome_select.filter(EnsemblRelease.release_type == db.bindparam("release_type"))
+    if "site_name" in filters:
+        genome_select = genome_select.add_columns(EnsemblSite).filter(
+            EnsemblSite.name == db.bindparam("site_name"))
+    return genome_select.order_by("production_name", EnsemblRelease.release_date.desc())
+
+
+@functools.lru_cache(maxsize=cfg.statement_cache_size)
+def fetch_sequences_select(filters: FrozenSet[str], chromosomal_only: bool):
+    """
+    GenomeAdaptor.fetch_sequences statement for a given set of filters, built once per filter set.
+    """
+    seq_select = db.select(
+        Genome, Assembly, AssemblySequence
+    ).select_from(Genome) \
+        .join(Assembly, Assembly.assembly_id == Genome.assembly_id) \
+        .join(AssemblySequence, AssemblySequence.assembly_id == Assembly.assembly_id)
+
+    if chromosomal_only:
+        seq_select = seq_select.filter(AssemblySequence.chromosomal == 1)
+
+    # These options are in order of decreasing specificity,
+    # and thus the ones later in the list can be redundant.
+    if "genome_id" in filters:
+        seq_select = seq_select.filter(Genome.genome_id.in_(expanding_param("genome_id")))
+
+    if "genome_uuid" in filters:
+        seq_select = seq_select.filter(Genome.genome_uuid == db.bindparam("genome_uuid"))
+
+    if "assembly_accession" in filters:
+        seq_select = seq_select.filter(Assembly.accession == db.bindparam("assembly_accession"))
+
+    if "assembly_uuid" in filters:
+        seq_select = seq_select.filter(Assembly.assembly_uuid.in_(expanding_param("assembly_uuid")))
+
+    if "assembly_sequence_accession" in filters:
+        seq_select = seq_select.filter(
+            AssemblySequence.accession.in_(expanding_param("assembly_sequence_accession")))
+
+    if "assembly_sequence_name" in filters:
+        seq_select = seq_select.filter(AssemblySequence.name.in_(expanding_param("assembly_sequence_name")))
+    return seq_select.order_by(AssemblySequence.accession)
+
+
+@functools.lru_cache(maxsize=cfg.statement_cache_size)
+def genome_uuid_by_assembly_accession_select(with_release: bool):
+    """
+    GenomeAdaptor.get_genome_uuid_by_assembly_accession statement, with or without the release version filter.
+    """
+    integrated_release = case((EnsemblRelease.release_type == "integrated", 1), else_=0)
+    ensembl_provider = case((func.lower(Genome.provider_name) == "ensembl", 1), else_=0)
+
+    query = (
+        select(Genome.genome_uuid)
+        .select_from(Assembly)
+        .join(Genome, Genome.assembly_id == Assembly.assembly_id)
+        .join(GenomeRelease, GenomeRelease.genome_id == Genome.genome_id)
+        .join(EnsemblRelease, EnsemblRelease.release_id == GenomeRelease.release_id)
+        .where(
+            Assembly.accession == db.bindparam("assembly_accession"),
+            EnsemblRelease.status == ReleaseStatus.RELEASED,
+        )
+    )
+
+    if with_release:
+        query = query.where(EnsemblRelease.version == db.bindparam("release"))
+
+    return query.order_by(
+        GenomeRelease.default.desc(),
+        integrated_release.desc(),
+        ensembl_provider.desc(),
+        # sorting by date is needed to guarantee that the latest integrated is the one on the top
+        EnsemblRelease.release_date.desc(),
+        EnsemblRelease.release_id.desc(),
+    ).limit(1)
+
+
+def fetch_release_generation(session) -> Tuple:
+    """
+    Cheap fingerprint of the release state of the metadata DB.
+
+    It changes whenever a release is created or its status changes, and whenever genomes or datasets are
+    attached to a release or released.
+    """
+    releases = session.execute(
+        db.select(
+            EnsemblRelease.release_id,
+            EnsemblRelease.version,
+            EnsemblRelease.status,
+            EnsemblRelease.is_current,
+            EnsemblRelease.release_date,
+        ).order_by(EnsemblRelease.release_id)
+    ).all()
+    counts = session.execute(
+        db.select(
+            db.select(db.func.count()).select_from(GenomeRelease).scalar_subquery(),
+            db.select(db.func.count()).select_from(GenomeRelease).where(
+                GenomeRelease.is_current == 1).scalar_subquery(),
+            db.select(db.func.count()).select_from(GenomeDataset).scalar_subquery(),
+            db.select(db.func.count()).select_from(Dataset).where(
+                Dataset.status == DatasetStatus.RELEASED).scalar_subquery(),
+        )
+    ).one()
+    return tuple(tuple(release) for release in releases) + tuple(counts)
+
+
+def public_path_genebuild_select(genome_uuids: List[str]):
+    """
+    Organism name, assembly accession and genebuild source / date of each genome, the base of its public paths
+    """
+    return select(
+        Genome.genome_uuid,
+        Organism.scientific_name,
+        Assembly.accession,
+        func.max(case(
+            (Attribute.name == 'genebuild.annotation_source', DatasetAttribute.value),
+            else_=None
+        )).label('genebuild_source_name'),
+        func.max(case(
+            (Attribute.name == 'genebuild.last_geneset_update', DatasetAttribute.value),
+            else_=None
+        )).label('last_geneset_update')
+    ).select_from(
+        Genome
+    ).join(Organism).join(Assembly).join(GenomeDataset).join(Dataset).join(DatasetType).join(
+        DatasetAttribute).join(Attribute).where(
+        Genome.genome_uuid.in_(genome_uuids),
+        DatasetType.name == 'genebuild',
+        Attribute.name.in_(['genebuild.annotation_source', 'genebuild.last_geneset_update'])
+    ).group_by(
+        Genome.genome_uuid,
+        Organism.scientific_name,
+        Assembly.accession
+    )
+
+
+def public_path_partial_releases_select(genome_uuids: List[str], release: str = None):
+    """
+    Partial release labels of the released homologies / variation datasets of each genome, newest first.
+
+    The first row of a (genome_uuid, dataset type) is the current partial release, or the latest one up to
+    `release` when given. It is the date component of the homology/ and variation/ public paths.
+    """
+    query = select(
+        Genome.genome_uuid, DatasetType.name.label('dataset_type_name'), EnsemblRelease.label
+    ).select_from(EnsemblRelease).join(GenomeDataset).join(Dataset).join(DatasetType).join(
+        Genome).where(
+        Genome.genome_uuid.in_(genome_uuids),
+        DatasetType.name.in_(['homologies', 'short_variants']),
+        Dataset.status == DatasetStatus.RELEASED,
+        EnsemblRelease.release_type == 'partial',
+    ).order_by(EnsemblRelease.release_id.desc())
+    if release is None:
+        return query.where(GenomeDataset.is_current == True)
+    return query.where(
+        EnsemblRelease.release_id <= (
+            select(EnsemblRelease.release_id).where(EnsemblRelease.label == release).scalar_subquery()
+        )
+    )
+
+
+class AssembliesCounts:
+    """
+    Materialised species_taxonomy_id -> related assemblies count maps, one per release version and status.
+
+    The maps are built with a single query over all the species and dropped when the release state of the
+    database changes (see fetch_release_generation), e.g. once a release is published. The state is checked
+    at most every `refresh_interval` seconds, 0 disables the checks. The release versions come from the
+    requests, so only the `max_maps` most recently used maps are kept.
+
+    The queries run outside the lock, concurrent requests for a map being built may build it too.
+    """
+
+    def __init__(self, refresh_interval: float = None, max_maps: int = 32):
+        self.refresh_interval = cfg.assemblies_counts_refresh_interval if refresh_interval is None \
+            else refresh_interval
+        self.max_maps = max_maps
+        self._counts = TTLCache(maxsize=max_maps)
+        self._generation = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _due(self) -> bool:
+        return self._generation is None or (
+                bool(self.refresh_interval) and time.monotonic() - self._checked > self.refresh_interval)
+
+    def get(self, metadata_db, release_version, status, build) -> dict:
+        key = (float(release_version) if release_version else None, GenomeStatus[status.upper()])
+        if self._due():
+            self.refresh(metadata_db)
+        with self._lock:
+            counts, generation = self._counts.get(key), self._generation
+        if counts is None:
+            counts = build()
+            with self._lock:
+                # not stored if the maps were dropped while building it
+                if generation == self._generation:
+                    self._counts.set(key, counts)
+        return counts
+
+    def refresh(self, metadata_db) -> bool:
+        """
+        Drop the maps if the release state of the database changed.
+
+        Returns:
+            True if the maps were dropped.
+        """
+        with self._lock:
+            # the other threads don't check again while this one queries the database
+            self._checked = time.monotonic()
+        with metadata_db.session_scope() as session:
+            generation = fetch_release_generation(session)
+        with self._lock:
+            if generation == self._generation:
+                return False
+            self._counts = TTLCache(maxsize=self.max_maps)
+            self._generation = generation
+            return True
+
+
 class GenomeAdaptor(BaseAdaptor):
+    # Process wide, the NCBI taxonomy names hardly ever change
+    taxonomy_names_cache = TTLCache(maxsize=cfg.taxonomy_cache_size, ttl=cfg.taxonomy_cache_ttl)
+
     def __init__(self, metadata_uri: str | DBConnection, taxonomy_uri: str | DBConnection):
 
         super().__init__(metadata_uri)
@@ -65,7 +464,8 @@ class GenomeAdaptor(BaseAdaptor):
         if isinstance(taxonomy_uri, DBConnection):
             self.taxonomy_db = taxonomy_uri
         else:
-            self.taxonomy_db = DBConnection(taxonomy_uri, pool_size=cfg.pool_size, pool_recycle=cfg.pool_recycle)
+            self.taxonomy_db = PooledDBConnection.from_config(taxonomy_uri)
+        self.assemblies_counts = AssembliesCounts()
 
     def fetch_taxonomy_names(self, taxonomy_ids, synonyms=None):
 
@@ -79,40 +479,66 @@ class GenomeAdaptor(BaseAdaptor):
             "synonym",
         ] if len(check_parameter(synonyms)) == 0 else synonyms
         required_class_name = ["genbank common name", "scientific name"]
+        database = make_url(self.taxonomy_db.url)
+        database = (database.get_backend_name(), database.host, database.port, database.database)
         taxons = {}
-        with self.taxonomy_db.session_scope() as session:
-            for tid in taxonomy_ids:
+        # taxon ids may be given as strings, map the database values back to the requested keys
+        missing = {}
+        for tid in taxonomy_ids:
+            cached = self.taxonomy_names_cache.get((database, str(tid), tuple(sorted(synonyms))))
+            if cached is None:
                 taxons[tid] = {"scientific_name": None, "genbank_common_name": None, "synonym": []}
-
-                taxonomyname_query = db.select(
-                    NCBITaxaName.name,
-                    NCBITaxaName.name_class,
-                ).filter(
-                    NCBITaxaName.taxon_id == tid,
-                    NCBITaxaName.name_class.in_(required_class_name + synonyms),
-                )
-
-                for taxon_name in session.execute(taxonomyname_query).all():
-                    if taxon_name[1] in synonyms:
-                        taxons[tid]['synonym'].append(taxon_name[0])
-                    if taxon_name[1] in required_class_name:
-                        taxon_format_name = "_".join(taxon_name[1].split(' '))
-                        taxons[tid][taxon_format_name] = taxon_name[0]
+                missing[str(tid)] = tid
+            else:
+                # callers are free to update the returned lists
+                taxons[tid] = copy.deepcopy(cached)
+        if not missing:
             return taxons
+        # All the missing taxons names in a single query
+        taxonomyname_query = db.select(
+            NCBITaxaName.taxon_id,
+            NCBITaxaName.name,
+            NCBITaxaName.name_class,
+        ).filter(
+            NCBITaxaName.taxon_id.in_(list(missing.values())),
+            NCBITaxaName.name_class.in_(required_class_name + synonyms),
+        )
+        with self.taxonomy_db.session_scope() as session:
+            for taxon_id, name, name_class in session.execute(taxonomyname_query).all():
+                tid = missing[str(taxon_id)]
+                if name_class in synonyms:
+                    taxons[tid]['synonym'].append(name)
+                if name_class in required_class_name:
+                    taxon_format_name = "_".join(name_class.split(' '))
+                    taxons[tid][taxon_format_name] = name
+        for key, tid in missing.items():
+            self.taxonomy_names_cache.set((database, key, tuple(sorted(synonyms))), copy.deepcopy(taxons[tid]))
+        return taxons
 
     def fetch_taxonomy_ids(self, taxonomy_names):
-        taxids = []
         taxonomy_names = check_parameter(taxonomy_names)
+        if not taxonomy_names:
+            return []
+        taxa_name_select = db.select(
+            NCBITaxaName.name,
+            NCBITaxaName.taxon_id
+        ).filter(
+            NCBITaxaName.name.in_(taxonomy_names)
+        )
+        logger.debug(taxa_name_select)
+        taxon_ids = {}
+        with self.taxonomy_db.session_scope() as session:
+            for name, taxon_id in session.execute(taxa_name_select).all():
+                # names comparison is case-insensitive with MySQL
+                taxon_ids.setdefault(name.lower(), []).append(taxon_id)
+        taxids = []
         for taxon in taxonomy_names:
-            taxa_name_select = db.select(
-                NCBITaxaName.taxon_id
-            ).filter(
-                NCBITaxaName.name == taxon
-            )
-            with self.taxonomy_db.session_scope() as session:
-                logger.debug(taxa_name_select)
-                taxid = session.execute(taxa_name_select).one()
-                taxids.append(taxid[0])
+            matches = taxon_ids.get(taxon.lower(), [])
+            if not matches:
+                raise NoResultFound(f"No taxon found for name {taxon}")
+            if len(matches) > 1:
+                raise MultipleResultsFound(f"Multiple taxons found for name {taxon}: {matches}")
+            taxids.append(matches[0])
         return taxids
 
     def fetch_genomes_by_assembly_name_genebuild(self,
@@ -150,35 +576,13 @@ class GenomeAdaptor(BaseAdaptor):
             logger.warning("Missing or Empty assembly_accession field.")
             return None
 
+        params = {"assembly_accession": assembly_accession}
+        if release is not None:
+            params["release"] = release
         with self.metadata_db.session_scope() as session:
-            integrated_release = case((EnsemblRelease.release_type == "integrated", 1), else_=0)
-            ensembl_provider = case((func.lower(Genome.provider_name) == "ensembl", 1), else_=0)
-
-            query = (
-                select(Genome.genome_uuid)
-                .select_from(Assembly)
-                .join(Genome, Genome.assembly_id == Assembly.assembly_id)
-                .join(GenomeRelease, GenomeRelease.genome_id == Genome.genome_id)
-                .join(EnsemblRelease, EnsemblRelease.release_id == GenomeRelease.release_id)
-                .where(
-                    Assembly.accession == assembly_accession,
-                    EnsemblRelease.status == ReleaseStatus.RELEASED,
-                )
-            )
-
-            if release is not None:
-                query = query.where(EnsemblRelease.version == release)
-
-            query = query.order_by(
-                GenomeRelease.default.desc(),
-                integrated_release.desc(),
-                ensembl_provider.desc(),
-                # sorting by date is needed to guarantee that the latest integrated is the one on the top
-                EnsemblRelease.release_date.desc(),
-                EnsemblRelease.release_id.desc(),
-            ).limit(1)
-
-            genome_uuid = session.execute(query).scalar_one_or_none()
+            genome_uuid = session.execute(
+                genome_uuid_by_assembly_accession_select(release is not None), params
+            ).scalar_one_or_none()
 
         if genome_uuid is None:
             logger.error(
@@ -216,7 +620,7 @@ class GenomeAdaptor(BaseAdaptor):
 
         Args:
             genome_id (Union[int, List[int]]): The ID(s) of the genome(s) to fetch.
-            genome_uuid str|None: The UUID of the genome to fetch.
+            genome_uuid (Union[str, List[str]]): The UUID(s) of the genome(s) to fetch.
             genome_tag (Union[str, List[str]]): Genome URL name or organism Tree of Life ID.
             organism_uuid (Union[str, List[str]]): The UUID(s) of the organism(s) to fetch.
             assembly_uuid (Union[str, List[str]]): The UUID(s) of the assembly(s) to fetch.
@@ -261,163 +665,38 @@ class GenomeAdaptor(BaseAdaptor):
         group = check_parameter(group)
 
         status = GenomeStatus[status.upper()]
-        # Construct the initial database query
-        genome_select = db.select(
-            Genome, Organism, Assembly
-        ).select_from(Genome) \
-            .join(Organism, Organism.organism_id == Genome.organism_id) \
-            .join(Assembly, Assembly.assembly_id == Genome.assembly_id)
-
-        # Apply group filtering if group parameter is provided
-        if group:
-            genome_select = db.select(
-                Genome, Organism, Assembly, OrganismGroup, OrganismGroupMember
-            ).join(Genome.assembly).join(Genome.organism) \
-                .join(Organism.organism_group_members) \
-                .join(OrganismGroupMember.organism_group) \
-                .filter(OrganismGroup.name.in_(group) | OrganismGroup.code.in_(group))
-
-        # genome group logic
-        if genome_group_id or genome_group_name or genome_group_type or genome_group_reference_only:
-            genome_select = genome_select.join(
-                GenomeGroupMember, Genome.genome_id == GenomeGroupMember.genome_id
-            ).join(
-                GenomeGroup, GenomeGroup.genome_group_id == GenomeGroupMember.genome_group_id
-            )
-
-            if genome_group_id:
-                genome_group_id = check_parameter(genome_group_id)
-                genome_select = genome_select.where(GenomeGroup.genome_group_id.in_(genome_group_id))
-
-            if genome_group_name:
-                genome_group_name = check_parameter(genome_group_name)
-                genome_select = genome_select.where(GenomeGroup.name.in_(genome_group_name))
-
-            if genome_group_type:
-                genome_group_type = check_parameter(genome_group_type)
-                genome_select = genome_select.where(GenomeGroup.type.in_(genome_group_type))
-
-            if genome_group_reference_only:
-                genome_select = genome_select.where(GenomeGroupMember.is_reference == 1)
-
-            if status == GenomeStatus.CURRENT:
-                genome_select = genome_select.where(GenomeGroupMember.is_current == 1)
-        if (genebuild_date):
-            genome_select = genome_select.filter(Genome.genebuild_date == genebuild_date)
-        # Apply additional filters based on the provided parameters
-        if genome_id is not None:
-            genome_select = genome_select.filter(Genome.genome_id.in_(genome_id))
-
-        if genome_uuid is not None:
-            genome_select = genome_select.filter(Genome.genome_uuid == genome_uuid)
-
-        if genome_tag is not None:
-            genome_select = genome_select.filter(
-                db.or_(Genome.url_name.in_(genome_tag), Organism.tol_id.in_(genome_tag))
-            )
-
-        if organism_uuid is not None:
-            genome_select = genome_select.filter(Organism.organism_uuid.in_(organism_uuid))
-
-        if assembly_uuid is not None:
-            genome_select = genome_select.filter(Assembly.assembly_uuid.in_(assembly_uuid))
-
-        if assembly_accession is not None:
-            genome_select = genome_select.filter(Assembly.accession.in_(assembly_accession))
-
-        if assembly_name is not None:
-            # case() function is used to conditionally select between columns, sql equivalent is:
-            # CASE
-            #     WHEN :use_default_assembly = 1 THEN assembly.assembly_default
-            #     ELSE assembly.name
-            # END
-            conditional_column = db.case(
-                # literal is used to prevent evaluating use_default_assembly to a boolean (True or False)
-                # TODO: check the conditional (use_default_assembly is already a boolean)
-                (db.literal(use_default_assembly) == 1, Assembly.assembly_default),
-                else_=Assembly.name
-            )
-            lowered_assemblies = [name.lower() for name in assembly_name]
-            genome_select = genome_select.filter(db.func.lower(conditional_column).in_(lowered_assemblies))
-
-        if biosample_id is not None:
-            genome_select = genome_select.filter(Organism.biosample_id.in_(biosample_id))
-
-        if production_name is not None:
-            genome_select = genome_select.filter(Genome.production_name.in_(production_name))
-
-        if taxonomy_id is not None:
-            genome_select = genome_select.filter(Organism.taxonomy_id.in_(taxonomy_id))
-        genome_select = genome_select.add_columns(GenomeRelease, EnsemblRelease, EnsemblSite) \
-            .join(GenomeRelease) \
-            .join(EnsemblRelease) \
-            .join(EnsemblSite)
-        if status == GenomeStatus.CURRENT:
-            # This filter will allow us to fetch genomes present in the integrated release
-            # and having genome_release.is_current = 0 (see ENSPLAT-169 for more details)
-
-            if release_type is not None:
-                genome_select = genome_select.where(
-                        and_(
-                                func.lower(EnsemblRelease.release_type) == release_type,
-                                EnsemblRelease.is_current == 1
-                            )
-                        )    
-            else: 
-                # We join two pairs of genome_release-ensembl_release they should be with
-                # - Both pairs should have either genome is current or ensembl is currrent and be different releases
-                # - We select those pairs where EnsemblRelease (that gives selected fileds) is earlier or no other current release
-                # - If dates are equal we select integrated
-                Er_2 = aliased(EnsemblRelease)
-                Gr_2 = aliased(GenomeRelease)
-                genome_select = genome_select\
-                .join(Gr_2, GenomeRelease.genome_id == Gr_2.genome_id) \
-                .join(Er_2, Gr_2.release_id == Er_2.release_id)
-                genome_select = genome_select.where(
-                        and_(
-                            and_(
-                                    GenomeRelease.release_id != Gr_2.release_id,
-                                    and_(
-                                        or_(
-                                            Er_2.is_current == 1,
-                                            Gr_2.is_current == 1,
-                                        ),
-                                        or_(
-                                            EnsemblRelease.is_current == 1,
-                                            GenomeRelease.is_current == 1,
-                                        )
-                                    )
-                            ),
-                            or_(
-                                or_(
-                                    EnsemblRelease.release_date > Er_2.release_date,
-                                    Er_2.release_date.is_(None)
-                                ),
-                                and_(
-                                    EnsemblRelease.release_date == Er_2.release_date,
-                                    func.lower(EnsemblRelease.release_type) == "integrated"
-                                )
-                            )
-                        )
-                    )
+        if release_version is not None and not release_version > 0:
+            release_version = None
+        params = {
+            "group": group or None,
+            "genome_group_id": check_parameter(genome_group_id) if genome_group_id else None,
+            "genome_group_name": check_parameter(genome_group_name) if genome_group_name else None,
+            "genome_group_type": check_parameter(genome_group_type) if genome_group_type else None,
+            "genome_group_reference_only": genome_group_reference_only or None,
+            "genebuild_date": genebuild_date or None,
+            "genome_id": genome_id,
+            "genome_uuid": check_parameter(genome_uuid),
+            "genome_tag": genome_tag,
+            "organism_uuid": organism_uuid,
+            "assembly_uuid": assembly_uuid,
+            "assembly_accession": assembly_accession,
+            "assembly_name": [name.lower() for name in assembly_name] if assembly_name is not None else None,
+            "biosample_id": biosample_id,
+            "production_name": production_name,
+            "taxonomy_id": taxonomy_id,
+            "release_version": release_version,
+            "release_type": release_type,
+            "site_name": site_name,
+        }
+        params = {name: value for name, value in params.items() if value is not None and value is not False}
+        if "assembly_name" in params:
+            params["use_default_assembly"] = use_default_assembly
+        genome_select = fetch_genomes_select(frozenset(params), status)
 
-        if status == GenomeStatus.UNRELEASED_ONLY:
-            # fetch only unreleased ones
-            genome_select = genome_select.filter(EnsemblRelease.status != ReleaseStatus.RELEASED)
-        if status == GenomeStatus.RELEASED:
-            genome_select = genome_select.filter(EnsemblRelease.status == ReleaseStatus.RELEASED)
-        if release_version is not None and release_version > 0:
-            # if release is specified
-            genome_select = genome_select.filter(EnsemblRelease.version <= release_version)
-        if release_type is not None:
-            genome_select = genome_select.filter(EnsemblRelease.release_type == release_type)
-        if site_name is not None:
-            genome_select = genome_select.add_columns(EnsemblSite).filter(EnsemblSite.name == site_name)
-
-        logger.debug(f"fetch_genome: {genome_select} / {release_version}")
+        logger.debug("fetch_genome: %s / %s", genome_select, release_version)
         with self.metadata_db.session_scope() as session:
             session.expire_on_commit = False
-            return session.execute(genome_select.order_by("production_name", EnsemblRelease.release_date.desc())).all()
+            return session.execute(genome_select, params).all()
 
     def fetch_genomes_by_genome_uuid(self, genome_uuid, site_name=None, release_type=None, release_version=None,
                                      status="Current"):
@@ -488,8 +767,8 @@ class GenomeAdaptor(BaseAdaptor):
         genome_query = genome_query.add_columns(EnsemblSite) \
             .join(GenomeRelease, GenomeRelease.genome_id == Genome.genome_id) \
             .join(EnsemblRelease, EnsemblRelease.release_id == GenomeRelease.release_id) \
-            .join(EnsemblSite,
-                  EnsemblRelease.site_id == EnsemblSite.site_id & EnsemblSite.site_id == cfg.ensembl_site_id)
+            .join(EnsemblSite, db.and_(EnsemblRelease.site_id == EnsemblSite.site_id,
+                                       EnsemblSite.site_id == cfg.ensembl_site_id))
         if status == GenomeStatus.RELEASED:
             genome_query = genome_query.filter(EnsemblRelease.status == ReleaseStatus.RELEASED)
         if release_version is not None and release_version > 0:
@@ -593,8 +872,8 @@ class GenomeAdaptor(BaseAdaptor):
         genome_query = genome_query.add_columns(EnsemblSite) \
             .join(GenomeRelease, GenomeRelease.genome_id == Genome.genome_id) \
             .join(EnsemblRelease, EnsemblRelease.release_id == GenomeRelease.release_id) \
-            .join(EnsemblSite,
-                  EnsemblRelease.site_id == EnsemblSite.site_id & EnsemblSite.site_id == cfg.ensembl_site_id)
+            .join(EnsemblSite, db.and_(EnsemblRelease.site_id == EnsemblSite.site_id,
+                                       EnsemblSite.site_id == cfg.ensembl_site_id))
         if status in (GenomeStatus.RELEASED, GenomeStatus.CURRENT):
             genome_query = genome_query.filter(EnsemblRelease.status == ReleaseStatus.RELEASED)
         if release_version is not None and release_version > 0:
@@ -622,45 +901,20 @@ class GenomeAdaptor(BaseAdaptor):
         Returns:
             list: A list of fetched sequences.
         """
-        genome_id = check_parameter(genome_id)
-        # genome_uuid = check_parameter(genome_uuid)
-        assembly_uuid = check_parameter(assembly_uuid)
-        # assembly_accession = check_parameter(assembly_accession)
-        assembly_sequence_accession = check_parameter(assembly_sequence_accession)
-        assembly_sequence_name = check_parameter(assembly_sequence_name)
-
-        seq_select = db.select(
-            Genome, Assembly, AssemblySequence
-        ).select_from(Genome) \
-            .join(Assembly, Assembly.assembly_id == Genome.assembly_id) \
-            .join(AssemblySequence, AssemblySequence.assembly_id == Assembly.assembly_id)
-
-        if chromosomal_only:
-            seq_select = seq_select.filter(AssemblySequence.chromosomal == 1)
-
-        # These options are in order of decreasing specificity,
-        # and thus the ones later in the list can be redundant.
-        if genome_id is not None:
-            seq_select = seq_select.filter(Genome.genome_id.in_(genome_id))
-
-        if genome_uuid is not None:
-            seq_select = seq_select.filter(Genome.genome_uuid == genome_uuid)
-
-        if assembly_accession is not None:
-            seq_select = seq_select.filter(Assembly.accession == assembly_accession)
-
-        if assembly_uuid is not None:
-            seq_select = seq_select.filter(Assembly.assembly_uuid.in_(assembly_uuid))
-
-        if assembly_sequence_accession is not None:
-            seq_select = seq_select.filter(AssemblySequence.accession.in_(assembly_sequence_accession))
-
-        if assembly_sequence_name is not None:
-            seq_select = seq_select.filter(AssemblySequence.name.in_(assembly_sequence_name))
-        logger.debug(f'Query {seq_select}')
+        params = {
+            "genome_id": check_parameter(genome_id),
+            "genome_uuid": genome_uuid,
+            "assembly_accession": assembly_accession,
+            "assembly_uuid": check_parameter(assembly_uuid),
+            "assembly_sequence_accession": check_parameter(assembly_sequence_accession),
+            "assembly_sequence_name": check_parameter(assembly_sequence_name),
+        }
+        params = {name: value for name, value in params.items() if value is not None}
+        seq_select = fetch_sequences_select(frozenset(params), bool(chromosomal_only))
+        logger.debug("Query %s", seq_select)
         with self.metadata_db.session_scope() as session:
             session.expire_on_commit = False
-            return session.execute(seq_select.order_by(AssemblySequence.accession)).all()
+            return session.execute(seq_select, params).all()
 
     def fetch_sequences_by_genome_uuid(self, genome_uuid, chromosomal_only=False):
         return self.fetch_sequences(
@@ -792,7 +1046,7 @@ class GenomeAdaptor(BaseAdaptor):
             session.expire_on_commit = False
             # fetch from genome table
             genome_select = db.select(GenomeRelease, Genome, EnsemblRelease).join(EnsemblRelease).join(Genome).join(
-                GenomeDataset).join(Dataset).join(Organism)
+                GenomeDataset).join(Dataset).join(Organism).options(GENOME_DATASETS_LOADER)
             if genome_uuid is not None:
                 genome_uuid = check_parameter(genome_uuid)
                 genome_select = genome_select.where(Genome.genome_uuid.in_(genome_uuid))
@@ -827,104 +1081,118 @@ class GenomeAdaptor(BaseAdaptor):
                     continue
                 seen_genome_uuids.add(genome.genome_uuid)
 
+                genomes_dataset_info.extend(self._genome_datasets_items(
+                    genome, genome_release.EnsemblRelease, status, dataset_type_name, release_version
+                ))
+
+            return genomes_dataset_info
+
+    @staticmethod
+    def _genome_datasets_items(genome: Genome, default_release: EnsemblRelease, status: GenomeStatus,
+                               dataset_type_name: str | None,
+                               release_version: float | None) -> List[GenomeDatasetsListItem]:
+        """
+        Group the datasets of an already loaded genome by release, applying the fetch_genome_datasets filters.
+
+        `default_release` is reported for the datasets not attached to any release.
+        """
+        genomes_dataset_info = []
+        genome_datasets = [
+            gd for gd in genome.genome_datasets
+        ]
+        if dataset_type_name is None:
+            genome_datasets = [gd for gd in genome_datasets if gd.dataset.parent_id is None]
+        elif dataset_type_name != "all":
+            genome_datasets = [
+                gd for gd in genome_datasets if gd.dataset.dataset_type.name == dataset_type_name
+            ]
+        # filter release / unreleased
+        if status == GenomeStatus.RELEASED:
+            # TODO see to add is_current as well
+            genome_datasets = [
+                gd for gd in genome_datasets
+                if gd.dataset.status == DatasetStatus.RELEASED
+                and gd.ensembl_release is not None
+                and gd.ensembl_release.status == ReleaseStatus.RELEASED
+            ]
+            # TODO Get only the first one when allow_unreleased
+        if status == GenomeStatus.UNRELEASED_ONLY:
+            genome_datasets = [
+                gd for gd in genome_datasets
+                if (gd.ensembl_release is None or gd.ensembl_release.status != ReleaseStatus.RELEASED)
+                and gd.dataset.status != DatasetStatus.RELEASED
+            ]
+        if release_version:
+            genome_datasets = [
+                gd for gd in genome_datasets
+                if gd.ensembl_release is not None
+                and float(gd.ensembl_release.version) <= release_version
+            ]
+        if len(genome_datasets) > 1:
+            logger.debug(f"{len(genome_datasets)} genome_datasets found")
+            logger.debug(f"Retrieved genome_datasets {genome}")
+            # this means that we have datasets that are released in both integrated and partial,
+            # if it's the case we pick the partial dataset because "if a dataset is provided in a partial release
+            # for an existing genome we would prefer that dataset"
+            # https://genomes-ebi.slack.com/archives/C010QF119N1/p1746101265211759?thread_ts=1746094298.003789&cid=C010QF119N1
+            # TODO: assure that above described logic still valid
+            if status == GenomeStatus.CURRENT:
                 genome_datasets = [
-                    gd for gd in genome.genome_datasets
+                    gd for gd in genome_datasets
+                    if gd.ensembl_release is not None
+                    and gd.ensembl_release.release_type == "partial"
                 ]
-                if dataset_type_name is None:
-                    genome_datasets = [gd for gd in genome_datasets if gd.dataset.parent_id is None]
-                elif dataset_type_name != "all":
-                    genome_datasets = [
-                        gd for gd in genome_datasets if gd.dataset.dataset_type.name == dataset_type_name
-                    ]
-                # filter release / unreleased
-                if status == GenomeStatus.RELEASED:
-                    # TODO see to add is_current as well
-                    genome_datasets = [
-                        gd for gd in genome_datasets
-                        if gd.dataset.status == DatasetStatus.RELEASED
-                        and gd.ensembl_release is not None
-                        and gd.ensembl_release.status == ReleaseStatus.RELEASED
-                    ]
-                    # TODO Get only the first one when allow_unreleased
-                if status == GenomeStatus.UNRELEASED_ONLY:
-                    genome_datasets = [
-                        gd for gd in genome_datasets
-                        if (gd.ensembl_release is None or gd.ensembl_release.status != ReleaseStatus.RELEASED)
-                        and gd.dataset.status != DatasetStatus.RELEASED
-                    ]
-                if release_version:
-                    genome_datasets = [
-                        gd for gd in genome_datasets
-                        if gd.ensembl_release is not None
-                        and float(gd.ensembl_release.version) <= release_version
-                    ]
-                if len(genome_datasets) > 1:
-                    logger.debug(f"{len(genome_datasets)} genome_datasets found")
-                    logger.debug(f"Retrieved genome_datasets {genome}")
-                    # this means that we have datasets that are released in both integrated and partial,
-                    # if it's the case we pick the partial dataset because "if a dataset is provided in a partial release
-                    # for an existing genome we would prefer that dataset"
-                    # https://genomes-ebi.slack.com/archives/C010QF119N1/p1746101265211759?thread_ts=1746094298.003789&cid=C010QF119N1
-                    # TODO: assure that above described logic still valid
-                    if status == GenomeStatus.CURRENT:
-                        genome_datasets = [
-                            gd for gd in genome_datasets
-                            if gd.ensembl_release is not None
-                            and gd.ensembl_release.release_type == "partial"
-                        ]
-                if len(genome_datasets) > 0:
-                    indexed_datasets = {}
-                    for gd in genome_datasets:
-                        indexed_datasets[gd.genome_dataset_id] = gd
-
-                    datasets_by_release = {}
-                    for gd in indexed_datasets.values():
-                        datasets_by_release.setdefault(gd.release_id, []).append(gd)
-
-                    def release_sort_key(release_id):
-                        release = datasets_by_release[release_id][0].ensembl_release
-                        if release is None:
-                            return (3, "", 0)
-                        release_status_rank = 0 if release.status == ReleaseStatus.RELEASED else 2
-                        release_type_rank = 0 if release.release_type == "partial" else 1
-                        return (release_status_rank, release_type_rank, -(release.version or 0))
-
-                    for release_id in sorted(datasets_by_release.keys(), key=release_sort_key):
-                        datasets_list = []
-                        for gd in datasets_by_release[release_id]:
-                            # Build attributes first
-                            attributes = [
-                                DatasetAttributeItem(
-                                    name=ds.attribute.name,
-                                    value=ds.value,
-                                    type=ds.attribute.type,
-                                    label=ds.attribute.label
-                                )
-                                for ds in gd.dataset.dataset_attributes
-                            ]
-
-                            # Build dataset item
-                            dataset_item = GenomeDatasetItem(
-                                dataset=gd.dataset,
-                                dataset_type=gd.dataset.dataset_type,
-                                dataset_source=gd.dataset.dataset_source,
-                                release=gd,
-                                attributes=attributes
-                            )
-                            datasets_list.append(dataset_item)
-
-                        # Finally, build the main GenomeDatasetsListItem
-                        genome_item = GenomeDatasetsListItem(
-                            genome=genome,
-                            release=datasets_by_release[release_id][0].ensembl_release or genome_release.EnsemblRelease,
-                            datasets=datasets_list
+        if len(genome_datasets) > 0:
+            indexed_datasets = {}
+            for gd in genome_datasets:
+                indexed_datasets[gd.genome_dataset_id] = gd
+
+            datasets_by_release = {}
+            for gd in indexed_datasets.values():
+                datasets_by_release.setdefault(gd.release_id, []).append(gd)
+
+            def release_sort_key(release_id):
+                release = datasets_by_release[release_id][0].ensembl_release
+                if release is None:
+                    return (3, "", 0)
+                release_status_rank = 0 if release.status == ReleaseStatus.RELEASED else 2
+                release_type_rank = 0 if release.release_type == "partial" else 1
+                return (release_status_rank, release_type_rank, -(release.version or 0))
+
+            for release_id in sorted(datasets_by_release.keys(), key=release_sort_key):
+                datasets_list = []
+                for gd in datasets_by_release[release_id]:
+                    # Build attributes first
+                    attributes = [
+                        DatasetAttributeItem(
+                            name=ds.attribute.name,
+                            value=ds.value,
+                            type=ds.attribute.type,
+                            label=ds.attribute.label
                         )
-                        genomes_dataset_info.append(genome_item)
+                        for ds in gd.dataset.dataset_attributes
+                    ]
 
-                else:
-                    logger.warning(f"No dataset retrieved for genome and parameters")
+                    # Build dataset item
+                    dataset_item = GenomeDatasetItem(
+                        dataset=gd.dataset,
+                        dataset_type=gd.dataset.dataset_type,
+                        dataset_source=gd.dataset.dataset_source,
+                        release=gd,
+                        attributes=attributes
+                    )
+                    datasets_list.append(dataset_item)
 
-            return genomes_dataset_info
+                # Finally, build the main GenomeDatasetsListItem
+                genome_item = GenomeDatasetsListItem(
+                    genome=genome,
+                    release=datasets_by_release[release_id][0].ensembl_release or default_release,
+                    datasets=datasets_list
+                )
+                genomes_dataset_info.append(genome_item)
+        else:
+            logger.warning(f"No dataset retrieved for genome and parameters")
+        return genomes_dataset_info
 
     def fetch_genomes_info(self, genome_id=None, genome_uuid=None, biosample_id=None, group=None,
                            dataset_type_name=None, release_version=None, status="All"):
@@ -1055,26 +1323,16 @@ class GenomeAdaptor(BaseAdaptor):
 
             return session.execute(query).all()
 
-    def fetch_assemblies_count(self, species_taxonomy_id: int, release_version: float = None, status = "Released"):
-        """
-        Fetch all genomes for the same species_taxonomy_id
-        release_version is to return only the ones which were available until this release_version
-        Args:
-            species_taxonomy_id: int The species taxon_id as per ncbi taxonomy
-            release_version: float The EnsemblRelease to filter on
-        """
+    @staticmethod
+    def _assemblies_count_query(query, release_version: float = None, status="Released"):
         status = GenomeStatus[status.upper()]
         query = (
-            # count(DISTINCT genome.genome_uuid) because some genome can be linked to both
-            # partial and integrated released which result in duplication when counting
-            select(func.count(distinct(Genome.genome_uuid)))
+            query
             .select_from(Genome)
             # join out to Organism -> GenomeRelease -> EnsemblRelease
             .join(Organism, Genome.organism_id == Organism.organism_id)
             .join(GenomeRelease, GenomeRelease.genome_id == Genome.genome_id)
             .join(EnsemblRelease, EnsemblRelease.release_id == GenomeRelease.release_id)
-            # filter on the species_taxonomy_id
-            .where(Organism.species_taxonomy_id == species_taxonomy_id)
         )
         # Fetch latest partial genomes using GenomeRelease.is_current (/!\ not EnsemblRelease.is_current)
         latest_partial_genomes = and_(
@@ -1095,10 +1353,51 @@ class GenomeAdaptor(BaseAdaptor):
             query = query.where(EnsemblRelease.status == ReleaseStatus.RELEASED)
         if release_version:
             query = query.filter(EnsemblRelease.version <= release_version)
+        return query
+
+    def fetch_assemblies_count(self, species_taxonomy_id: int, release_version: float = None, status = "Released"):
+        """
+        Fetch all genomes for the same species_taxonomy_id
+        release_version is to return only the ones which were available until this release_version
+        Args:
+            species_taxonomy_id: int The species taxon_id as per ncbi taxonomy
+            release_version: float The EnsemblRelease to filter on
+        """
+        return self.fetch_assemblies_counts(species_taxonomy_id, release_version, status)[species_taxonomy_id]
+
+    def fetch_assemblies_counts(self, species_taxonomy_ids, release_version: float = None, status="Released"):
+        """
+        Same as fetch_assemblies_count for several species at once, read from the materialised counts
+        (see AssembliesCounts)
+        Args:
+            species_taxonomy_ids: int|List[int] The species taxon_ids as per ncbi taxonomy
+            release_version: float The EnsemblRelease to filter on
+        Returns:
+            dict species_taxonomy_id -> assemblies count, 0 for species without any genome
+        """
+        counts = self.assemblies_counts.get(
+            self.metadata_db, release_version, status,
+            lambda: self._fetch_all_assemblies_counts(release_version, status)
+        )
+        return {
+            species_taxonomy_id: counts.get(
+                int(species_taxonomy_id) if species_taxonomy_id is not None else None, 0
+            )
+            for species_taxonomy_id in check_parameter(species_taxonomy_ids)
+        }
+
+    def _fetch_all_assemblies_counts(self, release_version: float = None, status="Released"):
+        query = self._assemblies_count_query(
+            # count(DISTINCT genome.genome_uuid) because some genome can be linked to both
+            # partial and integrated released which result in duplication when counting
+            select(Organism.species_taxonomy_id, func.count(distinct(Genome.genome_uuid))),
+            release_version,
+            status,
+        ).group_by(Organism.species_taxonomy_id)
 
         logger.debug(query)
         with self.metadata_db.session_scope() as session:
-            return session.execute(query).scalar()
+            return dict(session.execute(query).all())
 
     def fetch_genome_groups(
             self, genome_id=None, genome_uuid=None, group_type=None, is_current=True, release_version=None
@@ -1209,155 +1508,107 @@ class GenomeAdaptor(BaseAdaptor):
             ValueError: If genome_uuid or release not found, or required metadata missing
             TypeNotFoundException: If requested dataset_type is not available
         """
-        paths = []
-        scientific_name = None
-        accession = None
-        genebuild_source_name = None
-        last_geneset_update = None
+        paths = self.get_public_paths([genome_uuid], dataset_type, release)[genome_uuid]
+        if isinstance(paths, Exception):
+            raise paths
+        return paths
+
+    def get_public_paths(self, genome_uuids, dataset_type='all', release=None):
+        """
+        Retrieve public file paths for the genomic datasets of several genomes, in a fixed number of queries.
+
+        Args:
+            genome_uuids (Union[str, List[str]]): Unique identifiers for the genomes
+            dataset_type (str): Type of dataset ('genebuild', 'assembly', 'homologies', 'short_variants', or 'all')
+            release (str, optional): Specific Ensembl release label. If None, uses current release.
+
+        Returns:
+            dict: genome_uuid -> list of dictionaries containing dataset_type and path information, as returned
+            by get_public_path, or the ValueError / TypeNotFoundException get_public_path would raise for this genome
+        """
+        genome_uuids = check_parameter(genome_uuids)
         if dataset_type == "variation":
             dataset_type = "short_variants"
+        supported_types = ["genebuild", "assembly", "homologies", "short_variants"]
 
         with self.metadata_db.session_scope() as session:
             # === VALIDATION SECTION ===
-            genome_exists = session.execute(
-                select(Genome.genome_uuid).where(Genome.genome_uuid == genome_uuid)
-            ).first()
-            if not genome_exists:
-                raise ValueError(f"Genome with UUID {genome_uuid} not found")
+            existing_genomes = set(session.execute(
+                select(Genome.genome_uuid).where(Genome.genome_uuid.in_(genome_uuids))
+            ).scalars().all())
 
+            release_exists = True
             if release is not None:
                 release_exists = session.execute(
                     select(EnsemblRelease.label).where(EnsemblRelease.label == release)
-                ).first()
-                if not release_exists:
-                    raise ValueError(f"Ensembl release with label '{release}' not found")
+                ).first() is not None
 
             # === METADATA RETRIEVAL ===
             # Get core genome metadata: organism name, assembly accession, and genebuild info
-            query = select(
-                Organism.scientific_name,
-                Assembly.accession,
-                func.max(case(
-                    (Attribute.name == 'genebuild.annotation_source', DatasetAttribute.value),
-                    else_=None
-                )).label('genebuild_source_name'),
-                func.max(case(
-                    (Attribute.name == 'genebuild.last_geneset_update', DatasetAttribute.value),
-                    else_=None
-                )).label('last_geneset_update')
-            ).select_from(
-                Genome
-            ).join(Organism).join(Assembly).join(GenomeDataset).join(Dataset).join(DatasetType).join(
-                DatasetAttribute).join(Attribute).where(
-                Genome.genome_uuid == genome_uuid,
-                DatasetType.name == 'genebuild',
-                Attribute.name.in_(['genebuild.annotation_source', 'genebuild.last_geneset_update'])
-            ).group_by(
-                Organism.scientific_name,
-                Assembly.accession
-            )
-
-            result = session.execute(query).first()
-            if result:
-                scientific_name, accession, genebuild_source_name, last_geneset_update = result
-            else:
-                scientific_name = accession = genebuild_source_name = last_geneset_update = None
+            query = public_path_genebuild_select(genome_uuids)
+            genebuild_metadata = {}
+            for row in session.execute(query).all():
+                genebuild_metadata.setdefault(row.genome_uuid, tuple(row[1:]))
 
             # === DATASET TYPE DISCOVERY ===
-            supported_types = ["genebuild", "assembly", "homologies", "short_variants"]
-            unique_dataset_types_query = select(DatasetType.name).distinct().join(
+            unique_dataset_types_query = select(Genome.genome_uuid, DatasetType.name).distinct().join(
                 Dataset
             ).join(GenomeDataset).join(Genome).where(
-                Genome.genome_uuid == genome_uuid,
+                Genome.genome_uuid.in_(genome_uuids),
                 DatasetType.name.in_(supported_types),
                 Dataset.status == DatasetStatus.RELEASED
             )
-            unique_dataset_types = session.execute(unique_dataset_types_query).scalars().all()
-
-            variation_release = None
-            homology_release = None
+            unique_dataset_types = {}
+            for uuid, dataset_type_name in session.execute(unique_dataset_types_query).all():
+                unique_dataset_types.setdefault(uuid, []).append(dataset_type_name)
 
             # === RELEASE HANDLING ===
-            if release is None:
-                if "short_variants" in unique_dataset_types and dataset_type in ("all", "short_variants"):
-                    variation_release = (
-                        session.execute(
-                            select(EnsemblRelease.label)
-                            .join(GenomeDataset)
-                            .join(Dataset)
-                            .join(DatasetType)
-                            .join(Genome)
-                            .where(
-                                Genome.genome_uuid == genome_uuid,
-                                DatasetType.name == "short_variants",
-                                Dataset.status == DatasetStatus.RELEASED,
-                                GenomeDataset.is_current == True,
-                                EnsemblRelease.release_type == "partial",
-                            )
-                            .order_by(EnsemblRelease.release_id.desc())
-                        )
-                        .scalars()
-                        .first()
-                    )
-
-                if 'homologies' in unique_dataset_types and dataset_type in ('all', 'homologies'):
-                    homology_release = session.execute(
-                        select(EnsemblRelease.label).join(GenomeDataset).join(Dataset).join(DatasetType).join(
-                            Genome).where(
-                            Genome.genome_uuid == genome_uuid,
-                            DatasetType.name == 'homologies',
-                            Dataset.status == DatasetStatus.RELEASED,
-                            GenomeDataset.is_current == True,
-                            EnsemblRelease.release_type == 'partial'
-                        ).order_by(EnsemblRelease.release_id.desc())
-                    ).scalars().first()
+            # Latest partial release of the homologies / variation datasets: the current one, or the latest one
+            # up to the requested release
+            partial_releases = {}
+            if dataset_type in ('all', 'homologies', 'short_variants') and release_exists:
+                partial_releases_query = public_path_partial_releases_select(genome_uuids, release)
+                for uuid, dataset_type_name, label in session.execute(partial_releases_query).all():
+                    partial_releases.setdefault((uuid, dataset_type_name), label)
+
+        paths = {}
+        for genome_uuid in genome_uuids:
+            if genome_uuid not in existing_genomes:
+                paths[genome_uuid] = ValueError(f"Genome with UUID {genome_uuid} not found")
+            elif not release_exists:
+                paths[genome_uuid] = ValueError(f"Ensembl release with label '{release}' not found")
             else:
-                if "short_variants" in unique_dataset_types and dataset_type in ("all", "short_variants"):
-                    variation_release = (
-                        session.execute(
-                            select(EnsemblRelease.label)
-                            .join(GenomeDataset)
-                            .join(Dataset)
-                            .join(DatasetType)
-                            .join(Genome)
-                            .where(
-                                Genome.genome_uuid == genome_uuid,
-                                DatasetType.name == "short_variants",
-                                Dataset.status == DatasetStatus.RELEASED,
-                                EnsemblRelease.release_type == "partial",
-                                EnsemblRelease.release_id
-                                <= (
-                                    select(EnsemblRelease.release_id)
-                                    .where(EnsemblRelease.label == release)
-                                    .scalar_subquery()
-                                ),
-                            )
-                            .order_by(EnsemblRelease.release_id.desc())
-                        )
-                        .scalars()
-                        .first()
+                try:
+                    paths[genome_uuid] = self._public_paths(
+                        genome_uuid, dataset_type, release,
+                        genebuild_metadata.get(genome_uuid, (None, None, None, None)),
+                        unique_dataset_types.get(genome_uuid, []),
+                        partial_releases.get((genome_uuid, 'short_variants')),
+                        partial_releases.get((genome_uuid, 'homologies')),
                     )
+                except (ValueError, TypeNotFoundException) as e:
+                    paths[genome_uuid] = e
+        return paths
+
+    @staticmethod
+    def _public_paths(genome_uuid, dataset_type, release, genebuild_metadata, unique_dataset_types,
+                      variation_release, homology_release):
+        """
+        Build the public paths of a genome out of the metadata fetched by get_public_paths.
+        """
+        paths = []
+        scientific_name, accession, genebuild_source_name, last_geneset_update = genebuild_metadata
 
-                    if variation_release is None:
-                        unique_dataset_types = [t for t in unique_dataset_types if t != "short_variants"]
-
-                if 'homologies' in unique_dataset_types and dataset_type in ('all', 'homologies'):
-                    homology_release = session.execute(
-                        select(EnsemblRelease.label).join(GenomeDataset).join(Dataset).join(DatasetType).join(
-                            Genome).where(
-                            Genome.genome_uuid == genome_uuid,
-                            DatasetType.name == 'homologies',
-                            Dataset.status == DatasetStatus.RELEASED,
-                            EnsemblRelease.release_type == 'partial',
-                            EnsemblRelease.release_id <= (
-                                select(EnsemblRelease.release_id).where(
-                                    EnsemblRelease.label == release).scalar_subquery()
-                            )
-                        ).order_by(EnsemblRelease.release_id.desc())
-                    ).scalars().first()
-
-                    if homology_release is None:
-                        unique_dataset_types = [t for t in unique_dataset_types if t != 'homologies']
+        if "short_variants" in unique_dataset_types and dataset_type in ("all", "short_variants"):
+            if release is not None and variation_release is None:
+                unique_dataset_types = [t for t in unique_dataset_types if t != "short_variants"]
+        else:
+            variation_release = None
+        if 'homologies' in unique_dataset_types and dataset_type in ('all', 'homologies'):
+            if release is not None and homology_release is None:
+                unique_dataset_types = [t for t in unique_dataset_types if t != 'homologies']
+        else:
+            homology_release = None
 
         # === DATA VALIDATION ===
         if 'genebuild' not in unique_dataset_types or 'assembly' not in unique_dataset_types:
@@ -11,13 +11,14 @@
 #   limitations under the License.
 from __future__ import annotations
 
+import functools
 import logging
-from typing import List
+from typing import FrozenSet, List
 
 import sqlalchemy as db
 from sqlalchemy import and_
 
-from ensembl.production.metadata.api.adaptors.base import check_parameter, BaseAdaptor, cfg
+from ensembl.production.metadata.api.adaptors.base import check_parameter, BaseAdaptor, cfg, expanding_param
 from ensembl.production.metadata.api.models import (
     EnsemblRelease,
     EnsemblSite,
@@ -66,6 +67,44 @@ def filter_release_status(query, release_status: str | ReleaseStatus = None):
     return query
 
 
+@functools.lru_cache(maxsize=cfg.statement_cache_size)
+def fetch_releases_select(filters: FrozenSet[str], current_only: bool, release_status: str | ReleaseStatus,
+                          allow_unreleased: bool, ensembl_site_id):
+    """
+    ReleaseAdaptor.fetch_releases statement for a given set of filters, built once per filter set.
+
+    allow_unreleased and ensembl_site_id are the configuration values the statement is built with.
+    """
+    release_select = db.select(EnsemblRelease).order_by(EnsemblRelease.version)
+
+    if "release_id" in filters:
+        release_select = release_select.filter(EnsemblRelease.release_id.in_(expanding_param("release_id")))
+
+    if "release_versions" in filters:
+        release_select = release_select.filter(
+            EnsemblRelease.version.in_(expanding_param("release_versions")))
+    elif "release_version" in filters:
+        release_select = release_select.filter(EnsemblRelease.version <= db.bindparam("release_version"))
+
+    if current_only:
+        release_select = release_select.filter(EnsemblRelease.is_current == 1)
+
+    if "release_type" in filters:
+        release_select = release_select.filter(
+            EnsemblRelease.release_type.in_(expanding_param("release_type")))
+
+    if "release_label" in filters:
+        release_select = release_select.filter(EnsemblRelease.label.in_(expanding_param("release_label")))
+
+    # Filter by site name (requires site join, so must come before filter_release_status)
+    if "site_name" in filters:
+        release_select = release_select.filter(EnsemblSite.name.in_(expanding_param("site_name")))
+
+    # Add site join and status filters
+    # NOTE: This already handles the site_id == cfg.ensembl_site_id filter
+    return filter_release_status(release_select, release_status)
+
+
 def _ensure_scalar(value):
     """
     Ensures a parameter is a scalar value, unwrapping single-element lists.
@@ -111,50 +150,32 @@ class ReleaseAdaptor(BaseAdaptor):
         Returns:
             list: A list of fetched releases.
         """
-        release_select = db.select(EnsemblRelease).order_by(EnsemblRelease.version)
-
-        releases_id = check_parameter(release_id)
-        if releases_id is not None:
-            release_select = release_select.filter(EnsemblRelease.release_id.in_(releases_id))
-
+        params = {
+            "release_id": check_parameter(release_id),
+            "release_type": check_parameter(release_type),
+            "release_label": check_parameter(release_label),
+            "site_name": check_parameter(site_name),
+        }
         # Handle release_version parameter
         # Ensure it's a scalar for <= comparison, or list for IN clause
         release_version = _ensure_scalar(check_parameter(release_version))
-        if release_version is not None:
-            if isinstance(release_version, (list, tuple)):
-                # Multiple versions: use IN clause
-                release_select = release_select.filter(EnsemblRelease.version.in_(release_version))
-            else:
-                # Single version: use <= comparison
-                # Convert to float to ensure type compatibility with SQLite
-                release_version = float(release_version)
-                release_select = release_select.filter(EnsemblRelease.version <= release_version)
-
-        if current_only:
-            release_select = release_select.filter(EnsemblRelease.is_current == 1)
-
-        if release_type is not None:
-            release_type = check_parameter(release_type)
-            release_select = release_select.filter(EnsemblRelease.release_type.in_(release_type))
-
-        if release_label is not None:
-            release_label = check_parameter(release_label)
-            release_select = release_select.filter(EnsemblRelease.label.in_(release_label))
-
-        # Filter by site name (requires site join, so must come before filter_release_status)
-        if site_name is not None:
-            site_name = check_parameter(site_name)
-            release_select = release_select.filter(EnsemblSite.name.in_(site_name))
-
-        # Add site join and status filters
-        # NOTE: This already handles the site_id == cfg.ensembl_site_id filter
-        release_select = filter_release_status(release_select, release_status)
+        if isinstance(release_version, (list, tuple)):
+            # Multiple versions: use IN clause
+            params["release_versions"] = list(release_version)
+        elif release_version is not None:
+            # Single version: use <= comparison
+            # Convert to float to ensure type compatibility with SQLite
+            params["release_version"] = float(release_version)
+        params = {name: value for name, value in params.items() if value is not None}
+        release_select = fetch_releases_select(
+            frozenset(params), bool(current_only), release_status, cfg.allow_unreleased, cfg.ensembl_site_id
+        )
 
         logger.debug("Query: %s ", release_select)
 
         with self.metadata_db.session_scope() as session:
             session.expire_on_commit = False
-            return session.execute(release_select).all()
+            return session.execute(release_select, params).all()
 
     def fetch_releases_for_genome(self, genome_uuid):
         """
@@ -172,7 +193,7 @@ class ReleaseAdaptor(BaseAdaptor):
             select_released = select_released.filter(EnsemblRelease.status == ReleaseStatus.RELEASED)
 
         select_released = select_released.join(Genome).where(Genome.genome_uuid == genome_uuid)
-        select_released = filter_release_status(select_released)
+        select_released = filter_release_status(select_released).order_by(EnsemblRelease.version)
 
         logger.debug("Query: %s ", select_released)
 
@@ -202,7 +223,7 @@ class ReleaseAdaptor(BaseAdaptor):
         if not cfg.allow_unreleased:
             select_released = select_released.filter(EnsemblRelease.status == ReleaseStatus.RELEASED)
 
-        select_released = filter_release_status(select_released)
+        select_released = filter_release_status(select_released).order_by(EnsemblRelease.version)
         logger.debug("Query: %s ", select_released)
 
         with self.metadata_db.session_scope() as session:
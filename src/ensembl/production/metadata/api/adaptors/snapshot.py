@@ -0,0 +1,284 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Release-scoped in-memory read model of the genomes served by the gRPC service.
+
+The metadata DB only changes when a release is prepared or released, so a `GenomeSnapshot` loads the genomes
+together with their organism, assembly, releases, datasets and attributes once, and indexes them.
+`SnapshotGenomeAdaptor` answers the most frequent `GenomeAdaptor` calls from the snapshot, with the same results
+as the SQL queries, and falls back to the database for any other combination of parameters. The snapshot is
+reloaded when the releases (or the genome/dataset links) change in the database.
+"""
+from __future__ import annotations
+
+import copy
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import sqlalchemy as db
+from ensembl.utils.database import DBConnection
+from sqlalchemy.engine import Row
+
+from ensembl.production.metadata.api.adaptors.base import check_parameter, cfg
+from ensembl.production.metadata.api.adaptors.genome import GenomeAdaptor, GenomeStatus, GenomeDatasetsListItem, \
+    GENOME_DATASETS_LOADER, fetch_release_generation
+from ensembl.production.metadata.api.models import *
+
+__all__ = ['GenomeSnapshot', 'SnapshotGenomeAdaptor']
+
+logger = logging.getLogger(__name__)
+
+
+def _key(value):
+    # String lookups follow the case-insensitive collation of the production MySQL database
+    return value.lower() if isinstance(value, str) else value
+
+
+class GenomeSnapshot:
+    """
+    Immutable in-memory copy of the genome rows returned by `GenomeAdaptor.fetch_genomes`.
+
+    Rows are kept in the `fetch_genomes` order (production name, then latest release first) and indexed by
+    position, so any filter combination returns them in the same order as the database would.
+    """
+
+    def __init__(self, rows: List[Row], generation: Tuple, taxonomy_names: Dict[int, dict] | None = None):
+        self.rows = rows
+        self.generation = generation
+        self.taxonomy_names = taxonomy_names or {}
+        self.loaded = time.time()
+        self.by_genome_uuid: Dict[str, List[int]] = {}
+        self.by_genome_tag: Dict[str, List[int]] = {}
+        self.by_assembly_name: Dict[str, List[int]] = {}
+        self.by_assembly_default: Dict[str, List[int]] = {}
+        self.by_biosample_id: Dict[str, List[int]] = {}
+        self.by_species_taxonomy_id: Dict[int, List[int]] = {}
+        for position, row in enumerate(rows):
+            self.by_genome_uuid.setdefault(_key(row.Genome.genome_uuid), []).append(position)
+            for tag in {_key(row.Genome.url_name), _key(row.Organism.tol_id)} - {None}:
+                self.by_genome_tag.setdefault(tag, []).append(position)
+            self.by_assembly_name.setdefault(_key(row.Assembly.name), []).append(position)
+            self.by_assembly_default.setdefault(_key(row.Assembly.assembly_default), []).append(position)
+            self.by_biosample_id.setdefault(_key(row.Organism.biosample_id), []).append(position)
+            self.by_species_taxonomy_id.setdefault(row.Organism.species_taxonomy_id, []).append(position)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @staticmethod
+    def fetch_generation(session) -> Tuple:
+        return fetch_release_generation(session)
+
+    @classmethod
+    def load(cls, session) -> GenomeSnapshot:
+        """Load every genome row, with all its datasets and their attributes, in a handful of queries."""
+        generation = cls.fetch_generation(session)
+        rows_select = db.select(
+            Genome, Organism, Assembly, GenomeRelease, EnsemblRelease, EnsemblSite
+        ).select_from(Genome) \
+            .join(Organism, Organism.organism_id == Genome.organism_id) \
+            .join(Assembly, Assembly.assembly_id == Genome.assembly_id) \
+            .join(GenomeRelease) \
+            .join(EnsemblRelease) \
+            .join(EnsemblSite) \
+            .options(GENOME_DATASETS_LOADER) \
+            .order_by(Genome.production_name, EnsemblRelease.release_date.desc(), GenomeRelease.genome_release_id)
+        rows = session.execute(rows_select).all()
+        logger.debug(f"Loaded {len(rows)} genome rows in snapshot")
+        return cls(rows, generation)
+
+    def taxonomy_ids(self) -> set:
+        return {
+            taxonomy_id
+            for row in self.rows
+            for taxonomy_id in (row.Organism.taxonomy_id, row.Organism.species_taxonomy_id)
+            if taxonomy_id is not None
+        }
+
+    def positions(self, index: Dict[Any, List[int]], values) -> set:
+        return {position for value in values for position in index.get(_key(value), [])}
+
+
+class SnapshotGenomeAdaptor(GenomeAdaptor):
+    """
+    `GenomeAdaptor` answering the gRPC hot paths from a `GenomeSnapshot`.
+
+    Served from memory:
+        - `fetch_genomes` filtered on genome uuid/tag, assembly name, biosample id, release version/type and status
+          (except the "Current" status),
+        - `fetch_genome_datasets` by genome uuid(s),
+        - `fetch_assemblies_count`,
+        - `fetch_taxonomy_names` for the organisms' taxonomy ids.
+    Any other call goes to the database, as for `GenomeAdaptor`.
+
+    Args:
+        refresh_interval: Minimum number of seconds between two checks of the database release state,
+            a changed state triggers a reload of the snapshot. 0 disables the checks.
+    """
+    snapshot_genome_filters = {
+        "genome_uuid", "genome_tag", "assembly_name", "use_default_assembly", "biosample_id",
+        "release_type", "release_version", "status",
+    }
+    _fetch_genomes_signature = inspect.signature(GenomeAdaptor.fetch_genomes)
+
+    def __init__(self, metadata_uri: str | DBConnection, taxonomy_uri: str | DBConnection,
+                 refresh_interval: float = None):
+        super().__init__(metadata_uri, taxonomy_uri)
+        self.refresh_interval = cfg.snapshot_refresh_interval if refresh_interval is None else refresh_interval
+        self._lock = threading.RLock()
+        self._snapshot: GenomeSnapshot | None = None
+        self._checked = 0.0
+        self.refresh(force=True)
+
+    @property
+    def snapshot(self) -> GenomeSnapshot:
+        if self.refresh_interval and time.monotonic() - self._checked > self.refresh_interval:
+            with self._lock:
+                # Another thread may have checked while we were waiting for the lock
+                if time.monotonic() - self._checked > self.refresh_interval:
+                    self.refresh()
+        return self._snapshot
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the snapshot if the release state of the database changed (or always when `force` is set).
+
+        Returns:
+            True if a new snapshot was loaded.
+        """
+        with self._lock:
+            self._checked = time.monotonic()
+            if not force and self._snapshot is not None:
+                with self.metadata_db.session_scope() as session:
+                    if GenomeSnapshot.fetch_generation(session) == self._snapshot.generation:
+                        return False
+            with self.metadata_db.session_scope() as session:
+                session.expire_on_commit = False
+                snapshot = GenomeSnapshot.load(session)
+            taxonomy_ids = sorted(snapshot.taxonomy_ids())
+            snapshot.taxonomy_names = super().fetch_taxonomy_names(taxonomy_ids) if taxonomy_ids else {}
+            # Swapping the reference is atomic, requests in flight keep the previous snapshot
+            self._snapshot = snapshot
+            logger.info(f"Genome snapshot loaded: {len(snapshot)} genome rows")
+            return True
+
+    def fetch_genomes(self, *args, **kwargs):
+        params = self._fetch_genomes_signature.bind(self, *args, **kwargs)
+        params.apply_defaults()
+        arguments = params.arguments
+        requested = {
+            name for name, param in self._fetch_genomes_signature.parameters.items()
+            if name != "self" and arguments[name] != param.default
+        }
+        status = GenomeStatus[arguments["status"].upper()]
+        if not requested <= self.snapshot_genome_filters or status == GenomeStatus.CURRENT:
+            return super().fetch_genomes(*args, **kwargs)
+
+        snapshot = self.snapshot
+        positions = set(range(len(snapshot)))
+        genome_uuid = check_parameter(arguments["genome_uuid"])
+        if genome_uuid is not None:
+            positions &= snapshot.positions(snapshot.by_genome_uuid, genome_uuid)
+        genome_tag = check_parameter(arguments["genome_tag"])
+        if genome_tag is not None:
+            positions &= snapshot.positions(snapshot.by_genome_tag, genome_tag)
+        assembly_name = check_parameter(arguments["assembly_name"])
+        if assembly_name is not None:
+            index = snapshot.by_assembly_default if arguments["use_default_assembly"] else snapshot.by_assembly_name
+            positions &= snapshot.positions(index, assembly_name)
+        biosample_id = check_parameter(arguments["biosample_id"])
+        if biosample_id is not None:
+            positions &= snapshot.positions(snapshot.by_biosample_id, biosample_id)
+
+        release_version = arguments["release_version"]
+        release_type = arguments["release_type"]
+        rows = []
+        for position in sorted(positions):
+            row = snapshot.rows[position]
+            release = row.EnsemblRelease
+            if status == GenomeStatus.UNRELEASED_ONLY and release.status == ReleaseStatus.RELEASED:
+                continue
+            if status == GenomeStatus.RELEASED and release.status != ReleaseStatus.RELEASED:
+                continue
+            if release_version is not None and release_version > 0 and float(release.version) > release_version:
+                continue
+            if release_type is not None and release.release_type != release_type:
+                continue
+            rows.append(row)
+        return rows
+
+    def fetch_genome_datasets(self,
+                              genome_uuid: (str | List[str]) = None,
+                              dataset_uuid: str = None,
+                              organism_uuid: str = None,
+                              status="All",
+                              dataset_type_name: str = 'assembly',
+                              release_version: float = None) -> List[GenomeDatasetsListItem]:
+        genome_status = GenomeStatus[status.upper()]
+        if genome_uuid is None or dataset_uuid is not None or organism_uuid is not None \
+                or genome_status == GenomeStatus.UNRELEASED_ONLY:
+            return super().fetch_genome_datasets(genome_uuid=genome_uuid, dataset_uuid=dataset_uuid,
+                                                 organism_uuid=organism_uuid, status=status,
+                                                 dataset_type_name=dataset_type_name,
+                                                 release_version=release_version)
+        dataset_type_name = 'assembly' if dataset_type_name == '' else dataset_type_name
+        snapshot = self.snapshot
+        # first genome row of each genome, as joined by the fetch_genome_datasets query
+        genome_rows = {}
+        for position in sorted(snapshot.positions(snapshot.by_genome_uuid, check_parameter(genome_uuid))):
+            row = snapshot.rows[position]
+            if genome_status == GenomeStatus.RELEASED and row.EnsemblRelease.status != ReleaseStatus.RELEASED:
+                continue
+            if row.Genome.genome_datasets:
+                genome_rows.setdefault(row.Genome.genome_uuid, row)
+        genomes_dataset_info = []
+        for row in sorted(genome_rows.values(), key=lambda r: r.Genome.created, reverse=True):
+            genomes_dataset_info.extend(self._genome_datasets_items(
+                row.Genome, row.EnsemblRelease, genome_status, dataset_type_name, release_version
+            ))
+        return genomes_dataset_info
+
+    def fetch_assemblies_count(self, species_taxonomy_id: int, release_version: float = None, status="Released"):
+        genome_status = GenomeStatus[status.upper()]
+        if genome_status not in (GenomeStatus.ALL, GenomeStatus.RELEASED):
+            return super().fetch_assemblies_count(species_taxonomy_id, release_version, status)
+        snapshot = self.snapshot
+        genome_uuids = set()
+        for position in snapshot.by_species_taxonomy_id.get(species_taxonomy_id, []):
+            row = snapshot.rows[position]
+            release = row.EnsemblRelease
+            if not (release.release_type == 'integrated'
+                    or (release.release_type == 'partial' and row.GenomeRelease.is_current)):
+                continue
+            if genome_status == GenomeStatus.RELEASED and release.status != ReleaseStatus.RELEASED:
+                continue
+            if release_version and float(release.version) > release_version:
+                continue
+            genome_uuids.add(row.Genome.genome_uuid)
+        return len(genome_uuids)
+
+    def fetch_assemblies_counts(self, species_taxonomy_ids, release_version: float = None, status="Released"):
+        return {
+            species_taxonomy_id: self.fetch_assemblies_count(species_taxonomy_id, release_version, status)
+            for species_taxonomy_id in check_parameter(species_taxonomy_ids)
+        }
+
+    def fetch_taxonomy_names(self, taxonomy_ids, synonyms=None):
+        taxonomy_names = self.snapshot.taxonomy_names
+        taxonomy_ids = check_parameter(taxonomy_ids)
+        if synonyms or taxonomy_ids is None or any(tid not in taxonomy_names for tid in taxonomy_ids):
+            return super().fetch_taxonomy_names(taxonomy_ids, synonyms)
+        # callers are free to update the returned lists
+        return {tid: copy.deepcopy(taxonomy_names[tid]) for tid in taxonomy_ids}
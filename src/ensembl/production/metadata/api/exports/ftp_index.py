@@ -17,15 +17,15 @@ from collections import defaultdict
 from datetime import datetime
 
 from ensembl.utils.database import DBConnection
-from sqlalchemy import select, func, case
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from ensembl.production.metadata.api.adaptors.genome import public_path_genebuild_select, \
+    public_path_partial_releases_select
 from ensembl.production.metadata.api.exceptions import TypeNotFoundException
-from ensembl.production.metadata.api.models.assembly import Assembly
 from ensembl.production.metadata.api.models.dataset import Dataset, DatasetType, DatasetAttribute, DatasetSource, \
     DatasetStatus, Attribute
 from ensembl.production.metadata.api.models.genome import Genome, GenomeDataset, GenomeRelease
-from ensembl.production.metadata.api.models.organism import Organism
 from ensembl.production.metadata.api.models.release import EnsemblRelease, ReleaseStatus
 
 
@@ -170,70 +170,15 @@ class FTPMetadataExporter:
         attribute_results = session.execute(attributes_query).all()
 
         # --- Genebuild metadata (annotation source + geneset date) ---
-        genebuild_query = select(
-            Genome.genome_uuid,
-            Organism.scientific_name,
-            Assembly.accession,
-            func.max(case(
-                (Attribute.name == 'genebuild.annotation_source', DatasetAttribute.value),
-                else_=None
-            )).label('genebuild_source_name'),
-            func.max(case(
-                (Attribute.name == 'genebuild.last_geneset_update', DatasetAttribute.value),
-                else_=None
-            )).label('last_geneset_update')
-        ).select_from(
-            Genome
-        ).join(
-            Organism, Genome.organism_id == Organism.organism_id
-        ).join(
-            Assembly, Genome.assembly_id == Assembly.assembly_id
-        ).join(
-            GenomeDataset, Genome.genome_id == GenomeDataset.genome_id
-        ).join(
-            Dataset, GenomeDataset.dataset_id == Dataset.dataset_id
-        ).join(
-            DatasetType, Dataset.dataset_type_id == DatasetType.dataset_type_id
-        ).join(
-            DatasetAttribute, Dataset.dataset_id == DatasetAttribute.dataset_id
-        ).join(
-            Attribute, DatasetAttribute.attribute_id == Attribute.attribute_id
-        ).where(
-            Genome.genome_uuid.in_(genome_uuids),
-            DatasetType.name == 'genebuild',
-            Attribute.name.in_(['genebuild.annotation_source', 'genebuild.last_geneset_update'])
-        ).group_by(
-            Genome.genome_uuid,
-            Organism.scientific_name,
-            Assembly.accession
-        )
+        # Same query as GenomeAdaptor.get_public_paths
+        genebuild_query = public_path_genebuild_select(genome_uuids)
 
         genebuild_results = session.execute(genebuild_query).all()
 
         # --- Partial release labels for homologies and variation ---
         # These provide the sub-directory date component under homology/ and variation/.
-        # Mirrors the logic in get_public_path: partial releases, is_current=True, released status.
-        partial_releases_query = select(
-            Genome.genome_uuid,
-            DatasetType.name.label('dataset_type_name'),
-            EnsemblRelease.label
-        ).select_from(
-            EnsemblRelease
-        ).join(
-            GenomeDataset
-        ).join(
-            Dataset, GenomeDataset.dataset_id == Dataset.dataset_id
-        ).join(
-            DatasetType, Dataset.dataset_type_id == DatasetType.dataset_type_id
-        ).join(
-            Genome, GenomeDataset.genome_id == Genome.genome_id
-        ).where(
-            Genome.genome_uuid.in_(genome_uuids),
-            DatasetType.name.in_(['homologies', 'short_variants']),
-            Dataset.status == DatasetStatus.RELEASED,
-            GenomeDataset.is_current == True,
-            EnsemblRelease.release_type == 'partial'
-        )
+        # Shared with GenomeAdaptor.get_public_paths: current released partial releases, newest first.
+        partial_releases_query = public_path_partial_releases_select(genome_uuids)
 
         partial_release_results = session.execute(partial_releases_query).all()
 
@@ -241,7 +186,7 @@ class FTPMetadataExporter:
         # genome_uuid -> { 'homologies': label, 'short_variants': label }
         partial_releases_by_genome = defaultdict(dict)
         for result in partial_release_results:
-            partial_releases_by_genome[result.genome_uuid][result.dataset_type_name] = result.label
+            partial_releases_by_genome[result.genome_uuid].setdefault(result.dataset_type_name, result.label)
 
         # --- Build genome_data dict ---
         genome_data = {}
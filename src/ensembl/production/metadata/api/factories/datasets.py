@@ -16,7 +16,8 @@ from collections import defaultdict
 
 import sqlalchemy.orm
 from ensembl.utils.database.dbconnection import DBConnection
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError, MultipleResultsFound, NoResultFound
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
@@ -28,6 +29,147 @@ from ensembl.production.metadata.updater.updater_utils import update_attributes
 logger = logging.getLogger(__name__)
 
 
+class _DatasetStatusGraph:
+    """
+    Datasets of a set of genomes, with their statuses, linked as `DatasetFactory` links them: the parent of a
+    dataset is the dataset of the genome whose type is the parent type of the dataset one, its children the
+    datasets of the genome of its type child types. Status transitions are computed in memory, with the rules
+    of `DatasetFactory.update_dataset_status`, then written with `DatasetFactory.update_datasets_status`.
+    """
+
+    def __init__(self, datasets, genome_datasets, dataset_types):
+        # dataset_id -> (dataset_uuid, dataset_type_id, genome_id of its first genome dataset)
+        self.datasets = {}
+        self.statuses = {}
+        for dataset_id, dataset_uuid, dataset_type_id, status in datasets:
+            self.datasets[dataset_id] = (dataset_uuid, dataset_type_id, None)
+            self.statuses[dataset_id] = status
+        self.by_genome_type = defaultdict(list)
+        for dataset_id, dataset_uuid, dataset_type_id, status, genome_id in genome_datasets:
+            if self.datasets.get(dataset_id, (None, None, None))[2] is None:
+                self.datasets[dataset_id] = (dataset_uuid, dataset_type_id, genome_id)
+                self.statuses[dataset_id] = status
+            self.by_genome_type[(genome_id, dataset_type_id)].append(dataset_id)
+        self.initial_statuses = dict(self.statuses)
+        self.parent_types = {}
+        self.child_types = defaultdict(list)
+        self.type_ids = {}
+        for dataset_type_id, name, parent in dataset_types:
+            self.parent_types[dataset_type_id] = parent
+            self.type_ids[name] = dataset_type_id
+            if parent is not None:
+                self.child_types[parent].append(dataset_type_id)
+        self.ids = {dataset_uuid: dataset_id for dataset_id, (dataset_uuid, _, _) in self.datasets.items()}
+
+    def _genome_id(self, dataset_id):
+        genome_id = self.datasets[dataset_id][2]
+        if genome_id is None:
+            raise ValueError("No associated Genome found for the given dataset UUID")
+        return genome_id
+
+    def _one(self, genome_id, dataset_type_id, dataset_id):
+        # as the Query.one() of the DatasetFactory queries
+        datasets = self.by_genome_type.get((genome_id, dataset_type_id), [])
+        if not datasets:
+            raise NoResultFound(f"No dataset of type {dataset_type_id} for the genome of dataset "
+                                f"{self.datasets[dataset_id][0]}")
+        if len(datasets) > 1:
+            raise MultipleResultsFound(f"Several datasets of type {dataset_type_id} for the genome of dataset "
+                                       f"{self.datasets[dataset_id][0]}")
+        return datasets[0]
+
+    def parent(self, dataset_id):
+        parent_type = self.parent_types.get(self.datasets[dataset_id][1])
+        if parent_type is None:
+            return None
+        return self._one(self._genome_id(dataset_id), parent_type, dataset_id)
+
+    def children(self, dataset_id):
+        child_types = self.child_types.get(self.datasets[dataset_id][1])
+        if not child_types:
+            return []
+        genome_id = self._genome_id(dataset_id)
+        return [
+            child
+            for child_type in child_types
+            for child in self.by_genome_type.get((genome_id, child_type), [])
+        ]
+
+    def descendants(self, dataset_id):
+        return [
+            descendant
+            for child in self.children(dataset_id)
+            for descendant in [child] + self.descendants(child)
+        ]
+
+    def related(self, dataset_id, dataset_type):
+        return self._one(self._genome_id(dataset_id), self.type_ids.get(dataset_type), dataset_id)
+
+    def transition(self, dataset_id, status):
+        """
+        Move the dataset to `status`, with its parents or children as `DatasetFactory.update_dataset_status`
+        would, and return the dataset resulting status. Nothing changes when the transition is refused with an
+        exception.
+        """
+        changes = {}
+
+        def status_of(other_id):
+            return changes.get(other_id, self.statuses[other_id])
+
+        def update_status(current_id, new_status):
+            if new_status == DatasetStatus.SUBMITTED:
+                changes[current_id] = DatasetStatus.SUBMITTED
+                parent_id = self.parent(current_id)
+                if parent_id is not None:
+                    update_status(parent_id, DatasetStatus.SUBMITTED)
+            elif new_status == DatasetStatus.PROCESSING:
+                if status_of(current_id) == DatasetStatus.RELEASED:
+                    return
+                changes[current_id] = DatasetStatus.PROCESSING
+                parent_id = self.parent(current_id)
+                if parent_id is not None:
+                    update_status(parent_id, DatasetStatus.PROCESSING)
+            elif new_status == DatasetStatus.PROCESSED:
+                if status_of(current_id) == DatasetStatus.RELEASED:
+                    return
+                if any(status_of(child) in (DatasetStatus.PROCESSING, DatasetStatus.SUBMITTED)
+                       for child in self.children(current_id)):
+                    return
+                changes[current_id] = DatasetStatus.PROCESSED
+                parent_id = self.parent(current_id)
+                if parent_id is not None:
+                    update_status(parent_id, DatasetStatus.PROCESSED)
+            elif new_status == DatasetStatus.RELEASED:
+                top_level_id = current_id
+                while (parent_id := self.parent(top_level_id)) is not None:
+                    top_level_id = parent_id
+                top_level_children = self.descendants(top_level_id)
+                chain = top_level_children + self.descendants(self.related(current_id, "genebuild")) + \
+                    self.descendants(self.related(current_id, "assembly"))
+                for child in chain:
+                    if status_of(child) not in (DatasetStatus.RELEASED, DatasetStatus.PROCESSED):
+                        raise DatasetFactoryException(
+                            f"Dataset {self.datasets[child][0]} is not released or processed. "
+                            f"It is {status_of(child)}")
+                for child in top_level_children:
+                    changes[child] = DatasetStatus.RELEASED
+                changes[current_id] = DatasetStatus.RELEASED
+            else:
+                raise DatasetFactoryException(f"Dataset status: {new_status} is not a valid status")
+
+        update_status(dataset_id, status)
+        self.statuses.update(changes)
+        return self.statuses[dataset_id]
+
+    def changed(self):
+        """ New status -> ids of the datasets moved to it """
+        changed = defaultdict(list)
+        for dataset_id, status in self.statuses.items():
+            if status != self.initial_statuses[dataset_id]:
+                changed[status].append(dataset_id)
+        return changed
+
+
 class DatasetFactory:
 
     def __init__(self, conn_uri=None):
@@ -173,6 +315,82 @@ class DatasetFactory:
             self.update_dataset_attributes(dataset_uuid, attribute_dict, session=session)
         return updated_datasets
 
+    def update_datasets_status(self, dataset_uuids, status, session=None, chunk_size=1000):
+        """
+        Update the status of several datasets with the same rules as `update_dataset_status`, each dataset
+        taking its parents or children with it, in a fixed number of queries: the datasets of the genomes
+        involved are loaded at once, the transitions computed in memory, in the `dataset_uuids` order, and
+        written with one UPDATE per resulting status (and `chunk_size` datasets).
+
+        Args:
+            dataset_uuids (List[str]): The UUIDs of the datasets to update.
+            status (Union[str, DatasetStatus]): The new status.
+            session (Session, optional): SQLAlchemy session object. If None, a new session is created.
+            chunk_size (int): Maximum number of ids per IN clause.
+
+        Returns:
+            dict: dataset_uuid -> resulting DatasetStatus, the status it had when the transition doesn't apply
+            (e.g. a released dataset), or the exception `update_dataset_status` would raise for this dataset
+            (DatasetFactoryException, ValueError, NoResultFound, MultipleResultsFound), in which case neither
+            it nor its parents or children are updated.
+        """
+        if isinstance(status, str):
+            status = DatasetStatus(status)
+        if session is None:
+            with self.__get_db_connexion().session_scope() as db_session:
+                return self.update_datasets_status(dataset_uuids, status, session=db_session,
+                                                   chunk_size=chunk_size)
+        dataset_uuids = list(dict.fromkeys(dataset_uuids))
+
+        def chunks(values):
+            values = list(values)
+            return (values[i:i + chunk_size] for i in range(0, len(values), chunk_size))
+
+        datasets = []
+        genome_ids = set()
+        for chunk in chunks(dataset_uuids):
+            datasets.extend(session.execute(
+                select(Dataset.dataset_id, Dataset.dataset_uuid, Dataset.dataset_type_id, Dataset.status)
+                .where(Dataset.dataset_uuid.in_(chunk))
+            ).all())
+            genome_ids.update(session.execute(
+                select(GenomeDataset.genome_id).join(Dataset).where(Dataset.dataset_uuid.in_(chunk))
+            ).scalars())
+        genome_datasets = []
+        for chunk in chunks(sorted(genome_ids)):
+            genome_datasets.extend(session.execute(
+                select(Dataset.dataset_id, Dataset.dataset_uuid, Dataset.dataset_type_id, Dataset.status,
+                       GenomeDataset.genome_id)
+                .join(GenomeDataset)
+                .where(GenomeDataset.genome_id.in_(chunk))
+                .order_by(GenomeDataset.genome_dataset_id)
+            ).all())
+        dataset_types = session.execute(
+            select(DatasetType.dataset_type_id, DatasetType.name, DatasetType.parent)
+            .order_by(DatasetType.dataset_type_id)
+        ).all()
+        graph = _DatasetStatusGraph(datasets, genome_datasets, dataset_types)
+
+        results = {}
+        for dataset_uuid in dataset_uuids:
+            dataset_id = graph.ids.get(dataset_uuid)
+            if dataset_id is None:
+                results[dataset_uuid] = NoResultFound(f"Dataset {dataset_uuid} not found")
+                continue
+            try:
+                results[dataset_uuid] = graph.transition(dataset_id, status)
+            except (DatasetFactoryException, ValueError, NoResultFound, MultipleResultsFound) as exc:
+                results[dataset_uuid] = exc
+
+        for new_status, dataset_ids in graph.changed().items():
+            for chunk in chunks(dataset_ids):
+                session.execute(
+                    update(Dataset).where(Dataset.dataset_id.in_(chunk)).values(status=new_status)
+                )
+        session.flush()
+        logger.debug(f"Updated Datasets {results}")
+        return results
+
     def update_parent_and_children_status(self, dataset_uuid: str, status: DatasetStatus = None,
                                           session: Session = None,
                                           force: bool = False):
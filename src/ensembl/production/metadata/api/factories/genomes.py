@@ -16,13 +16,15 @@ Fetch Genome Info From New Metadata Database
 """
 
 import csv
+import datetime
 import json
 import logging
 import re
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
 from pathlib import Path
-from typing import Iterator, List
+from typing import Iterator, List, Optional
 
 from ensembl.utils.argparse import ArgumentParser
 from ensembl.utils.database import DBConnection
@@ -40,6 +42,9 @@ from ensembl.production.metadata.api.models.assembly import Assembly
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Records per Parquet row group: the Parquet writer holds one batch at a time
+PARQUET_BATCH_SIZE = 10000
+
 
 class OutputFormat(str, Enum):
     JSON = "json"
@@ -57,7 +62,8 @@ class OutputFormat(str, Enum):
 
 class GenomeOutputWriter:
     @staticmethod
-    def write(records: Iterator[dict], output_file: str, output_format: OutputFormat, columns: List[str]) -> None:
+    def write(records: Iterator[dict], output_file: str, output_format: OutputFormat, columns: List[str],
+              column_types: Optional[dict] = None) -> None:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -67,7 +73,7 @@ class GenomeOutputWriter:
             delimiter = "\t" if output_format == OutputFormat.TSV else ","
             GenomeOutputWriter._write(records, output_path, columns, delimiter)
         elif output_format == OutputFormat.PARQUET:
-            GenomeOutputWriter._write_parquet(records, output_path, columns)
+            GenomeOutputWriter._write_parquet(records, output_path, columns, column_types)
         else:
             raise ValueError(f"Unsupported output format: {output_format}")
 
@@ -87,19 +93,55 @@ class GenomeOutputWriter:
                 writer.writerow({key: record.get(key, "") for key in columns})
 
     @staticmethod
-    def _write_parquet(records: Iterator[dict], output_path: Path, columns: List[str]) -> None:
+    def parquet_schema(columns: List[str], column_types: Optional[dict] = None):
+        """
+        Arrow schema of the Parquet output, from the Python types of the columns (see
+        `GenomeInputFilters.column_types`), the columns of other or unknown types being written as strings.
+        """
+        import pyarrow as pa
+
+        arrow_types = {
+            bool: pa.bool_(),
+            int: pa.int64(),
+            float: pa.float64(),
+            datetime.datetime: pa.timestamp("us"),
+            datetime.date: pa.date32(),
+        }
+        column_types = column_types or {}
+        return pa.schema([(name, arrow_types.get(column_types.get(name), pa.string())) for name in columns])
+
+    @staticmethod
+    def _write_parquet(records: Iterator[dict], output_path: Path, columns: List[str],
+                       column_types: Optional[dict] = None, batch_size: int = PARQUET_BATCH_SIZE) -> None:
+        """
+        Write the records as they come, a row group per `batch_size` records, so that only one batch is held
+        in memory whatever the number of records.
+        """
         try:
-            import pandas as pd
-        except Exception as exc:
-            raise RuntimeError("Parquet export requires pandas and pyarrow or fastparquet") from exc
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet export requires pyarrow") from exc
+
+        schema = GenomeOutputWriter.parquet_schema(columns, column_types)
+        strings = {column.name for column in schema if pa.types.is_string(column.type)}
 
-        rows = [record for record in records]
-        frame = pd.DataFrame.from_records(rows, columns=columns)
+        def value(name, record):
+            value = record.get(name)
+            if value is None or name not in strings:
+                return value
+            return value.value if isinstance(value, Enum) else str(value)
+
+        records = iter(records)
         try:
-            frame.to_parquet(output_path, index=False)
-        except Exception as exc:
+            with pq.ParquetWriter(output_path, schema) as writer:
+                while batch := list(islice(records, batch_size)):
+                    rows = [{name: value(name, record) for name in columns} for record in batch]
+                    writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+        except (pa.ArrowException, OSError) as exc:
             raise RuntimeError(
-                "Parquet export failed. Install pyarrow or fastparquet and ensure the output path is writable."
+                "Parquet export failed. Ensure the output path is writable and the values match the column "
+                "types."
             ) from exc
 
 
@@ -201,6 +243,17 @@ class GenomeInputFilters:
         element = getattr(column, "element", column)
         return getattr(element, "name", getattr(column, "name", ""))
 
+    def column_types(self) -> dict:
+        """ Python type of each selected column, by name, `str` when the column type doesn't tell """
+        types = {}
+        for column in self.columns:
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = str
+            types[getattr(column, "key", getattr(column, "name", None))] = python_type
+        return types
+
     def uses_organism_group_columns(self) -> bool:
         return any(
             self._column_table_name(column) in ["organism_group", "organism_group_member"]
@@ -396,56 +449,69 @@ class GenomeFactory:
             logger.info(f"Executing SQL query: {query}")
 
             result = session.execute(query)
-            row_count = 0
-            for row in result.mappings():
-                row_count += 1
-                genome_info = dict(row)
-                dataset_uuid = genome_info.get("dataset_uuid")
-
-                dataset_status = genome_info.get("dataset_status")
-                if dataset_status and isinstance(dataset_status, DatasetStatus):
-                    genome_info["dataset_status"] = dataset_status.value
-
-                if not dataset_uuid:
-                    logger.warning(
-                        f"No dataset uuid found for genome {genome_info.get('genome_uuid')} skipping this genome"
-                    )
-                    continue
-
-                if filters.update_dataset_status:
-                    update_status_enum = filters.update_dataset_status
-                    if isinstance(update_status_enum, str):
-                        try:
-                            update_status_enum = DatasetStatus(update_status_enum)
-                        except ValueError:
-                            logger.error(f"Invalid update_dataset_status: {filters.update_dataset_status}")
-                            genome_info["updated_dataset_status"] = None
-                            yield genome_info
-                            continue
-
-                    _, status = DatasetFactory(filters.metadata_db_uri).update_dataset_status(
-                        dataset_uuid, update_status_enum.value, session=session
-                    )
-
-                    if update_status_enum == status:
-                        logger.info(
-                            f"Updated Dataset status for dataset uuid: {dataset_uuid} from "
-                            f"{genome_info.get('dataset_status')} to {status.value} "
-                            f"for genome {genome_info['genome_uuid']}"
-                        )
-                        genome_info["updated_dataset_status"] = status.value
-                    else:
-                        logger.warning(
-                            f"Cannot update status for dataset uuid: {dataset_uuid} "
-                            f"from {genome_info.get('dataset_status')} to {status.value} "
-                            f"for genome {genome_info['genome_uuid']}"
-                        )
-                        genome_info["updated_dataset_status"] = None
-                    session.flush()
-
-                yield genome_info
-
-            logger.debug(f"Query returned {row_count} results")
+            genome_infos = self._genome_infos(result)
+            if filters.update_dataset_status:
+                # the rows are all fetched first, for their datasets to be updated together
+                genome_infos = self._update_datasets_status(session, filters, list(genome_infos))
+            yield from genome_infos
+
+    @staticmethod
+    def _genome_infos(result):
+        row_count = 0
+        for row in result.mappings():
+            row_count += 1
+            genome_info = dict(row)
+            dataset_uuid = genome_info.get("dataset_uuid")
+
+            dataset_status = genome_info.get("dataset_status")
+            if dataset_status and isinstance(dataset_status, DatasetStatus):
+                genome_info["dataset_status"] = dataset_status.value
+
+            if not dataset_uuid:
+                logger.warning(
+                    f"No dataset uuid found for genome {genome_info.get('genome_uuid')} skipping this genome"
+                )
+                continue
+
+            yield genome_info
+
+        logger.debug(f"Query returned {row_count} results")
+
+    @staticmethod
+    def _update_datasets_status(session, filters: GenomeInputFilters, genome_infos: List[dict]) -> List[dict]:
+        update_status_enum = filters.update_dataset_status
+        if isinstance(update_status_enum, str):
+            try:
+                update_status_enum = DatasetStatus(update_status_enum)
+            except ValueError:
+                logger.error(f"Invalid update_dataset_status: {filters.update_dataset_status}")
+                for genome_info in genome_infos:
+                    genome_info["updated_dataset_status"] = None
+                return genome_infos
+
+        statuses = DatasetFactory(filters.metadata_db_uri).update_datasets_status(
+            [genome_info["dataset_uuid"] for genome_info in genome_infos], update_status_enum, session=session
+        )
+        for genome_info in genome_infos:
+            dataset_uuid = genome_info["dataset_uuid"]
+            status = statuses[dataset_uuid]
+            if isinstance(status, Exception):
+                raise status
+            if update_status_enum == status:
+                logger.info(
+                    f"Updated Dataset status for dataset uuid: {dataset_uuid} from "
+                    f"{genome_info.get('dataset_status')} to {status.value} "
+                    f"for genome {genome_info['genome_uuid']}"
+                )
+                genome_info["updated_dataset_status"] = status.value
+            else:
+                logger.warning(
+                    f"Cannot update status for dataset uuid: {dataset_uuid} "
+                    f"from {genome_info.get('dataset_status')} to {status.value} "
+                    f"for genome {genome_info['genome_uuid']}"
+                )
+                genome_info["updated_dataset_status"] = None
+        return genome_infos
 
 
 def main():
@@ -654,7 +720,9 @@ def main():
         getattr(column, "key", getattr(column, "name", None)) for column in filters.columns
     ]
     logger.info(f"Writing results to {args.output} in {output_format.value} format")
-    GenomeOutputWriter.write(genome_records, args.output, output_format, output_columns)
+    GenomeOutputWriter.write(
+        genome_records, args.output, output_format, output_columns, filters.column_types()
+    )
     logger.info("Completed !")
 
 
@@ -10,23 +10,34 @@
 #   limitations under the License.
 
 import argparse
+import datetime
 import json
 import logging
+import multiprocessing
 import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple, Iterator, Union
+from typing import IO, ClassVar, Optional, List, NamedTuple, Tuple, Iterable, Iterator, Union
 
 from ensembl.utils.database import DBConnection
 from pydantic import BaseModel, Field
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session, aliased, joinedload
 
-from ensembl.production.metadata.api.adaptors.genome import GenomeAdaptor
+from ensembl.production.metadata.api.adaptors.genome import (
+    GenomeAdaptor,
+    current_release_sort_key,
+    is_current_release_candidate,
+)
 from ensembl.production.metadata.api.models import (
+    Attribute,
     Genome,
     Dataset,
     DatasetAttribute,
+    DatasetType,
     EnsemblRelease,
     GenomeRelease,
     GenomeGroupMember,
@@ -177,6 +188,26 @@ class GenomeSearchDocument(BaseModel):
     class Config:
         from_attributes = True
 
+    # Search entry field name -> document field, None for the fields derived from other fields
+    SEARCH_ENTRY_FIELDS: ClassVar[dict[str, Optional[str]]] = {
+        "id": None,
+        "assembly": "assembly_name",
+        "assembly_accession": "accession",
+        "unversioned_assembly_accession": None,
+        "type_value": "strain",
+        "parlance_name": "scientific_parlance_name",
+        "type_type": "strain_type",
+        "n50": "contig_n50",
+        "annotation_method": "genebuild_method_display",
+        "annotation_provider": "genebuild_provider",
+        "url_name": None,
+        "organism_id": "organism_uuid",
+        "rank": None,
+    }
+    REPEATED_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "lineage_taxon_id", "lineage_common_name", "lineage_scientific_name", "genome_group_ids"
+    )
+
     def to_search_entry(self) -> SearchEntry:
         """Convert to SearchEntry format with fields array"""
         unversioned_accession = self.accession.rsplit(".", 1)[0] if "." in self.accession else self.accession
@@ -234,6 +265,23 @@ class GenomeSearchDocument(BaseModel):
 
         return SearchEntry(fields=fields)
 
+    @classmethod
+    def from_search_entry(cls, entry: SearchEntry) -> "GenomeSearchDocument":
+        """
+        Rebuild a document from its entry in a previous search index.
+
+        The optional names emitted as "" stay "", which gives the same entry and sort order. rank and url_name
+        are left for the ranking to set again.
+        """
+        doc_data = {name: [] for name in cls.REPEATED_FIELDS}
+        for field in entry.fields:
+            name = cls.SEARCH_ENTRY_FIELDS.get(field.name, field.name)
+            if name in cls.REPEATED_FIELDS:
+                doc_data[name].append(field.value)
+            elif name is not None:
+                doc_data[name] = field.value
+        return cls(**doc_data)
+
 
 # ============================================================================
 # DATASET FIELD EXTRACTOR
@@ -390,6 +438,36 @@ class DatasetFieldExtractor:
         return value
 
 
+class PrefetchedDatasetFieldExtractor(DatasetFieldExtractor):
+    """
+    Extracts the dataset-related fields of a genome from its dataset types and attribute values fetched
+    with those of a batch of genomes (see GenomeSearchIndexer._get_dataset_values), without loading its
+    datasets.
+    """
+
+    # Attributes read by the DatasetFieldExtractor getters
+    ATTRIBUTE_NAMES = (
+        "assembly.stats.contig_n50",
+        "genebuild.stats.coding_genes",
+        "genebuild.provider_name_display",
+        "genebuild.method_display",
+    )
+
+    def __init__(
+            self, session: Session, genome: Genome, release: EnsemblRelease,
+            dataset_types: set, attribute_values: dict,
+    ):
+        super().__init__(session, genome, release)
+        self.dataset_types = dataset_types
+        self.attribute_values = attribute_values
+
+    def _get_dataset_attribute(self, dataset_type_name: str, attribute_name: str) -> Optional[str]:
+        return self.attribute_values.get((dataset_type_name, attribute_name))
+
+    def _has_dataset_type(self, dataset_type_name: str) -> bool:
+        return dataset_type_name in self.dataset_types
+
+
 # ============================================================================
 # RELEASE SELECTION HELPER
 # ============================================================================
@@ -403,41 +481,29 @@ class ReleaseSelector:
         """
         Select the single appropriate release for a genome.
 
-        Rules:
+        Rules (shared with the GenomeAdaptor.fetch_genomes "Current" status):
         1. If only partial release(s) exist: return it IF genome_release.is_current=1, else None
         2. If both partial and integrated exist: return the newest integrated (by label)
         """
-        released_genome_releases = [
+        candidate_grs = [
             gr
             for gr in genome.genome_releases
-            if gr.ensembl_release and gr.ensembl_release.status == ReleaseStatus.RELEASED
+            if gr.ensembl_release and is_current_release_candidate(gr)
         ]
 
-        if not released_genome_releases:
+        if not candidate_grs:
             return None
 
-        integrated_grs = [
-            gr for gr in released_genome_releases if gr.ensembl_release.release_type == "integrated"
-        ]
-        partial_grs = [gr for gr in released_genome_releases if gr.ensembl_release.release_type == "partial"]
-
-        if integrated_grs:
-            newest_integrated = max(integrated_grs, key=lambda gr: gr.ensembl_release.label)
-            return newest_integrated.ensembl_release
-
-        current_partial_grs = [gr for gr in partial_grs if gr.is_current == 1]
-
-        if current_partial_grs:
-            if len(current_partial_grs) > 1:
-                # Data integrity issue - should never have multiple is_current partials
-                partial_labels = [gr.ensembl_release.label for gr in current_partial_grs]
-                raise ValueError(
-                    f"Data integrity error: Genome {genome.genome_uuid} has multiple is_current=1 "
-                    f"partial releases: {', '.join(partial_labels)}. Only one is_current partial should exist."
-                )
-            return current_partial_grs[0].ensembl_release
+        current_partial_grs = [gr for gr in candidate_grs if gr.ensembl_release.release_type == "partial"]
+        if len(current_partial_grs) == len(candidate_grs) > 1:
+            # Data integrity issue - should never have multiple is_current partials
+            partial_labels = [gr.ensembl_release.label for gr in current_partial_grs]
+            raise ValueError(
+                f"Data integrity error: Genome {genome.genome_uuid} has multiple is_current=1 "
+                f"partial releases: {', '.join(partial_labels)}. Only one is_current partial should exist."
+            )
 
-        return None
+        return max(candidate_grs, key=lambda gr: current_release_sort_key(gr.ensembl_release)).ensembl_release
 
     @staticmethod
     def get_release_info(
@@ -511,6 +577,108 @@ class ReleaseSelector:
         else:
             return 1 if selected_release.release_id == latest_release.release_id else 0
 
+# ============================================================================
+# TAXONOMY LINEAGE CACHE
+# ============================================================================
+
+
+class TaxonomyLineageCache:
+    """
+    Memoises the ancestors of taxonomy nodes and the names of their lineage nodes for an indexing run.
+
+    Most genomes share their ancestors (every vertebrate walks the same chain up to root), so each node is
+    resolved from the taxonomy database once per run. The lineages of a whole batch of genomes can be
+    preloaded with one query for the ancestors and one for the names.
+    """
+
+    # Ranks of the lineage nodes whose names are indexed
+    SELECTED_RANKS = ("domain", "kingdom", "phylum", "class", "order", "family", "genus", "species")
+    NAME_CLASSES = ("scientific name", "genbank common name", "common name")
+
+    def __init__(self):
+        # taxon_id -> ancestor taxon_ids, in Taxonomy.fetch_ancestors order
+        self._ancestors: dict[int, Tuple[int, ...]] = {}
+        # taxon_id -> names by name class, None for the nodes without a name of the selected ranks
+        self._names: dict[int, Optional[dict[str, List[str]]]] = {}
+        self.stats = Counter()
+
+    def preload(self, session: Session, taxon_ids: Iterable[int]) -> None:
+        """
+        Resolve the ancestors of the taxon_ids not cached yet, and the names of all their lineage nodes.
+        """
+        from ensembl.ncbi_taxonomy.models import NCBITaxaNode
+
+        taxon_ids = set(taxon_ids) - self._ancestors.keys()
+        if not taxon_ids:
+            return
+        # Same nested set query as Taxonomy.fetch_ancestors, for all the nodes at once
+        ParentTaxaNode = aliased(NCBITaxaNode)
+        rows = (
+            session.query(NCBITaxaNode.taxon_id, ParentTaxaNode.taxon_id)
+            .join(
+                ParentTaxaNode,
+                and_(
+                    NCBITaxaNode.left_index.between(ParentTaxaNode.left_index, ParentTaxaNode.right_index),
+                    ParentTaxaNode.taxon_id != NCBITaxaNode.taxon_id,
+                ),
+            )
+            .filter(NCBITaxaNode.taxon_id.in_(taxon_ids))
+            .all()
+        )
+        self.stats["queries"] += 1
+        ancestors = {taxon_id: [] for taxon_id in taxon_ids}
+        for taxon_id, ancestor_id in rows:
+            ancestors[taxon_id].append(ancestor_id)
+        for taxon_id, ancestor_ids in ancestors.items():
+            self._ancestors[taxon_id] = tuple(sorted(ancestor_ids))
+        self.stats["resolved_taxa"] += len(taxon_ids)
+
+        lineage_nodes = set(taxon_ids)
+        for taxon_id in taxon_ids:
+            lineage_nodes.update(self._ancestors[taxon_id])
+        self._load_names(session, lineage_nodes)
+
+    def _load_names(self, session: Session, taxon_ids: Iterable[int]) -> None:
+        """Resolve the names of the nodes not cached yet."""
+        from ensembl.ncbi_taxonomy.models import NCBITaxonomy
+
+        taxon_ids = set(taxon_ids) - self._names.keys()
+        if not taxon_ids:
+            return
+        rows = (
+            session.query(NCBITaxonomy.taxon_id, NCBITaxonomy.name, NCBITaxonomy.name_class)
+            .filter(NCBITaxonomy.taxon_id.in_(taxon_ids))
+            .filter(NCBITaxonomy.name_class.in_(self.NAME_CLASSES))
+            .filter(NCBITaxonomy.rank.in_(self.SELECTED_RANKS))
+            .distinct()
+            .all()
+        )
+        self.stats["queries"] += 1
+        self._names.update(dict.fromkeys(taxon_ids))
+        for taxon_id, name, name_class in rows:
+            if self._names[taxon_id] is None:
+                self._names[taxon_id] = {name_class: [] for name_class in self.NAME_CLASSES}
+            self._names[taxon_id][name_class].append(name)
+        self.stats["resolved_nodes"] += len(taxon_ids)
+
+    def ancestors(self, session: Session, taxon_id: int) -> Tuple[int, ...]:
+        """Ancestor taxon_ids of a node, none if it does not exist."""
+        self.stats["lookups"] += 1
+        self.preload(session, [taxon_id])
+        return self._ancestors[taxon_id]
+
+    def names(self, session: Session, taxon_ids: List[int]) -> dict[int, Optional[dict[str, List[str]]]]:
+        """Names of the nodes by name class, None for the nodes without a name of the selected ranks."""
+        self._load_names(session, taxon_ids)
+        return {taxon_id: self._names[taxon_id] for taxon_id in taxon_ids}
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['lookups']} lineage lookups, {self.stats['resolved_taxa']} taxa and "
+            f"{self.stats['resolved_nodes']} lineage nodes resolved in {self.stats['queries']} queries"
+        )
+
+
 # ============================================================================
 # MAIN SERVICE CLASS WITH BATCHING
 # ============================================================================
@@ -521,17 +689,25 @@ class GenomeSearchIndexer:
 
     FTP_BASE_URL = "http://ftp.ebi.ac.uk/pub/ensemblorganisms"
 
-    def __init__(self, metadata_uri: str, taxonomy_uri: str, batch_size: int = 500):
+    def __init__(self, metadata_uri: str, taxonomy_uri: str, batch_size: int = 500, workers: int = 1):
+        self.metadata_uri = metadata_uri
+        self.taxonomy_uri = taxonomy_uri
         self.metadata_db = DBConnection(metadata_uri)
         self.taxonomy_db = DBConnection(taxonomy_uri)
         self.genome_adaptor = GenomeAdaptor(self.metadata_db, self.taxonomy_db)
         self.release_selector = ReleaseSelector()
+        self.lineage_cache = TaxonomyLineageCache()
         self.batch_size = batch_size
+        # Worker processes building the search documents, 1 to build them in this process
+        self.workers = workers
+        # (genome_uuid, release label) -> genebuild public paths of the batch being indexed
+        self._public_paths = {}
 
     def _get_genome_ids_to_process(self, session: Session) -> List[int]:
         """
         Get list of genome IDs that have released releases.
         This is a lightweight query to get just the IDs.
+        The documents are created in genome ID order, which the ranking keeps for equal sort keys.
         """
         genome_ids = (
             session.query(Genome.genome_id)
@@ -539,22 +715,26 @@ class GenomeSearchIndexer:
             .join(EnsemblRelease)
             .filter(EnsemblRelease.status == ReleaseStatus.RELEASED)
             .distinct()
+            .order_by(Genome.genome_id)
             .all()
         )
         return [gid[0] for gid in genome_ids]
 
-    def _get_genomes_batch(self, session: Session, genome_ids: List[int]) -> List[Genome]:
+    def _get_genomes_batch(self, session: Session, genome_ids: List[int], datasets: bool = True) -> List[Genome]:
         """
-        Get a batch of genomes with all necessary relationships eagerly loaded.
+        Get a batch of genomes with all necessary relationships eagerly loaded, but their datasets if
+        `datasets` is False.
         """
-        return (
-            session.query(Genome)
-            .filter(Genome.genome_id.in_(genome_ids))
-            .options(
-                joinedload(Genome.organism),
-                joinedload(Genome.assembly),
-                # Load all genome_releases with their releases for selection logic
-                joinedload(Genome.genome_releases).joinedload(GenomeRelease.ensembl_release),
+        options = [
+            joinedload(Genome.organism),
+            joinedload(Genome.assembly),
+            # Load all genome_releases with their releases for selection logic
+            joinedload(Genome.genome_releases).joinedload(GenomeRelease.ensembl_release),
+            # Load group ids with each batch so dump generation does not lazy-load per genome.
+            joinedload(Genome.genome_group_members).joinedload(GenomeGroupMember.genome_group),
+        ]
+        if datasets:
+            options += [
                 # Load all genome_datasets with their releases and dataset info
                 joinedload(Genome.genome_datasets)
                 .joinedload(GenomeDataset.dataset)
@@ -564,20 +744,24 @@ class GenomeSearchIndexer:
                 .joinedload(Dataset.dataset_attributes)
                 .joinedload(DatasetAttribute.attribute),
                 joinedload(Genome.genome_datasets).joinedload(GenomeDataset.ensembl_release),
-                # Load group ids with each batch so dump generation does not lazy-load per genome.
-                joinedload(Genome.genome_group_members).joinedload(GenomeGroupMember.genome_group),
-            )
+            ]
+        return (
+            session.query(Genome)
+            .filter(Genome.genome_id.in_(genome_ids))
+            .options(*options)
+            .order_by(Genome.genome_id)
             .all()
         )
 
     def get_genomes_with_releases_batched(
-            self, session: Session
+            self, session: Session, genome_ids: Optional[List[int]] = None
     ) -> Iterator[List[Tuple[Genome, EnsemblRelease]]]:
         """
         Get genomes with their selected releases in batches.
-        Yields batches of (genome, release) tuples.
+        Yields batches of (genome, release) tuples, of all the genomes to process by default.
         """
-        genome_ids = self._get_genome_ids_to_process(session)
+        if genome_ids is None:
+            genome_ids = self._get_genome_ids_to_process(session)
         total_genomes = len(genome_ids)
         logger.info(f"Found {total_genomes} genomes to process")
 
@@ -588,18 +772,75 @@ class GenomeSearchIndexer:
                 f"genomes {i + 1}-{min(i + self.batch_size, total_genomes)}"
             )
 
-            genomes_batch = self._get_genomes_batch(session, batch_ids)
-
-            genome_release_pairs = []
-            for genome in genomes_batch:
-                selected_release = self.release_selector.select_release_for_genome(genome)
-                if selected_release:
-                    genome_release_pairs.append((genome, selected_release))
+            genome_release_pairs = self._get_genome_release_pairs(session, batch_ids)
 
             yield genome_release_pairs
 
             session.expunge_all()
 
+    def _get_genome_release_pairs(
+            self, session: Session, genome_ids: List[int], datasets: bool = True
+    ) -> List[Tuple[Genome, EnsemblRelease]]:
+        """
+        Get the (genome, release) tuples of a batch of genomes, and the genebuild public paths of the batch.
+        Genomes without a release to index are left out.
+        """
+        genome_release_pairs = []
+        for genome in self._get_genomes_batch(session, genome_ids, datasets):
+            selected_release = self.release_selector.select_release_for_genome(genome)
+            if selected_release:
+                genome_release_pairs.append((genome, selected_release))
+
+        self._public_paths = self._fetch_public_paths(genome_release_pairs)
+        return genome_release_pairs
+
+    def _fetch_public_paths(self, genome_release_pairs: List[Tuple[Genome, EnsemblRelease]]) -> dict:
+        """
+        Genebuild public paths of a batch of genomes, with one GenomeAdaptor.get_public_paths call per release.
+        """
+        genome_uuids_by_release = {}
+        for genome, release in genome_release_pairs:
+            genome_uuids_by_release.setdefault(release.label if release else None, []).append(genome.genome_uuid)
+        public_paths = {}
+        for release_label, genome_uuids in genome_uuids_by_release.items():
+            paths = self.genome_adaptor.get_public_paths(genome_uuids, dataset_type="genebuild", release=release_label)
+            for genome_uuid in genome_uuids:
+                public_paths[(genome_uuid, release_label)] = paths[genome_uuid]
+        return public_paths
+
+    def _get_dataset_values(self, session: Session, genome_ids: List[int]) -> dict[int, Tuple[set, dict]]:
+        """
+        Dataset types and attribute values read by the dataset fields, of the current released datasets of a
+        batch of genomes, in two queries.
+
+        Returns:
+            genome_id -> (dataset type names, {(dataset type name, attribute name): value})
+        """
+        values = {genome_id: (set(), {}) for genome_id in genome_ids}
+        current_datasets = (
+            select(GenomeDataset.genome_id, DatasetType.name)
+            .select_from(GenomeDataset)
+            .join(Dataset)
+            .join(DatasetType)
+            .where(
+                GenomeDataset.genome_id.in_(genome_ids),
+                GenomeDataset.is_current == 1,
+                Dataset.status == DatasetStatus.RELEASED,
+            )
+        )
+        for genome_id, dataset_type_name in session.execute(current_datasets.distinct()):
+            values[genome_id][0].add(dataset_type_name)
+        attribute_values = (
+            current_datasets.add_columns(Attribute.name, DatasetAttribute.value)
+            .join(DatasetAttribute, DatasetAttribute.dataset_id == Dataset.dataset_id)
+            .join(Attribute)
+            .where(Attribute.name.in_(PrefetchedDatasetFieldExtractor.ATTRIBUTE_NAMES))
+            .order_by(GenomeDataset.genome_dataset_id, DatasetAttribute.dataset_attribute_id)
+        )
+        for genome_id, dataset_type_name, attribute_name, value in session.execute(attribute_values):
+            values[genome_id][1].setdefault((dataset_type_name, attribute_name), value)
+        return values
+
     def _get_newest_partial_release(self, session: Session) -> Optional[str]:
         """
         Get the newest partial release label from the database.
@@ -638,17 +879,23 @@ class GenomeSearchIndexer:
 
     def _get_ftp_path(self, genome: Genome, release: EnsemblRelease) -> str:
         """
-        Build the search FTP URL using GenomeAdaptor.get_public_path as the source of truth.
+        Build the search FTP URL using GenomeAdaptor.get_public_paths as the source of truth.
 
-        get_public_path returns dataset-specific relative paths. The search index stores
+        The paths of the genomes of the current batch are fetched along with the batch.
+        get_public_paths returns dataset-specific relative paths. The search index stores
         the genome-level FTP directory, so use the genebuild path and remove its final
         dataset directory.
         """
-        paths = self.genome_adaptor.get_public_path(
-            genome_uuid=genome.genome_uuid,
-            dataset_type="genebuild",
-            release=release.label if release else None,
-        )
+        release_label = release.label if release else None
+        paths = self._public_paths.get((genome.genome_uuid, release_label))
+        if paths is None:
+            paths = self.genome_adaptor.get_public_paths(
+                genome_uuids=[genome.genome_uuid],
+                dataset_type="genebuild",
+                release=release_label,
+            )[genome.genome_uuid]
+        if isinstance(paths, Exception):
+            raise paths
 
         genebuild_path = next(
             (path_info["path"] for path_info in paths if path_info["dataset_type"] == "genebuild"),
@@ -695,57 +942,19 @@ class GenomeSearchIndexer:
             taxonomy_id: The taxonomy ID to get lineage for
 
         """
-        from ensembl.ncbi_taxonomy.api.utils import Taxonomy
-        from ensembl.ncbi_taxonomy.models import NCBITaxonomy
+        # Current + all ancestors
+        lineage_taxon_ids = [taxonomy_id, *self.lineage_cache.ancestors(taxonomy_session, taxonomy_id)]
 
-        try:
-            ancestors = Taxonomy.fetch_ancestors(taxonomy_session, taxonomy_id)
-        except NoResultFound:
-            ancestors = []
-
-        # Build list of taxon_ids: current + all ancestors.
-        lineage_taxon_ids = [taxonomy_id]
-        for ancestor in ancestors:
-            lineage_taxon_ids.append(ancestor["taxon_id"])
-
-        selected_ranks = (
-            "domain",
-            "kingdom",
-            "phylum",
-            "class",
-            "order",
-            "family",
-            "genus",
-            "species",
-        )
-
-        # Query scientific names and candidate common names for selected ranks in the lineage.
-        taxonomy_name_rows = (
-            taxonomy_session.query(NCBITaxonomy.taxon_id, NCBITaxonomy.name, NCBITaxonomy.name_class)
-            .filter(NCBITaxonomy.taxon_id.in_(lineage_taxon_ids))
-            .filter(NCBITaxonomy.name_class.in_(("scientific name", "genbank common name", "common name")))
-            .filter(NCBITaxonomy.rank.in_(selected_ranks))
-            .distinct()
-            .all()
-        )
-
-        selected_taxon_ids = {taxon_id for taxon_id, name, name_class in taxonomy_name_rows}
-        if not selected_taxon_ids:
+        # Scientific names and candidate common names of the lineage nodes of the selected ranks
+        names_by_taxon_id = self.lineage_cache.names(taxonomy_session, lineage_taxon_ids)
+        lineage_taxon_ids = [taxon_id for taxon_id in lineage_taxon_ids if names_by_taxon_id[taxon_id]]
+        if not lineage_taxon_ids:
             return {
                 "lineage_taxon_id": [taxonomy_id],
                 "lineage_common_name": [],
                 "lineage_scientific_name": [],
             }
 
-        lineage_taxon_ids = [taxon_id for taxon_id in lineage_taxon_ids if taxon_id in selected_taxon_ids]
-        names_by_taxon_id = {
-            taxon_id: {"genbank common name": [], "common name": [], "scientific name": []}
-            for taxon_id in lineage_taxon_ids
-        }
-
-        for taxon_id, name, name_class in taxonomy_name_rows:
-            names_by_taxon_id[taxon_id][name_class].append(name)
-
         lineage_common_names = []
         lineage_scientific_names = []
         for taxon_id in lineage_taxon_ids:
@@ -764,6 +973,45 @@ class GenomeSearchIndexer:
         # logger.debug(lineage_data)
         return lineage_data
 
+    def _extract_release_fields(self, genome: Genome, release: EnsemblRelease) -> dict:
+        """Extract the first / latest / integrated releases fields of a genome"""
+        first_release, latest_release, all_integrated = self.release_selector.get_release_info(genome)
+
+        releases_str = ",".join([r.label for r in all_integrated]) if all_integrated else ""
+
+        is_current = self.release_selector.get_is_latest_release_current(genome, release, latest_release)
+
+        return {
+            "first_release_name": first_release.label if first_release else "",
+            "first_release_type": first_release.release_type if first_release else "",
+            "latest_release_name": latest_release.label if latest_release else "",
+            "latest_release_type": latest_release.release_type if latest_release else "",
+            "is_latest_release_current": is_current,
+            "releases": releases_str,
+        }
+
+    def _extract_dataset_fields(
+            self, metadata_session: Session, genome: Genome, release: EnsemblRelease,
+            dataset_extractor: Optional[DatasetFieldExtractor] = None,
+    ) -> dict:
+        """
+        Extract the fields derived from the dataset attributes, and the FTP URL.
+
+        Raises:
+            MissingDatasetFieldError: If any required dataset fields are missing
+        """
+        if dataset_extractor is None:
+            dataset_extractor = DatasetFieldExtractor(metadata_session, genome, release)
+        return {
+            "contig_n50": dataset_extractor.get_contig_n50(),
+            "coding_genes": dataset_extractor.get_coding_genes(),
+            "has_variation": dataset_extractor.has_variation(),
+            "has_regulation": dataset_extractor.has_regulation(),
+            "genebuild_provider": dataset_extractor.get_genebuild_provider(),
+            "genebuild_method_display": dataset_extractor.get_genebuild_method_display(),
+            "ftp_url": self._get_ftp_path(genome, release),
+        }
+
     def create_search_document(
             self, metadata_session: Session, taxonomy_session: Session, genome: Genome, release: EnsemblRelease
     ) -> GenomeSearchDocument:
@@ -784,42 +1032,96 @@ class GenomeSearchIndexer:
         """
 
         doc_data = self._extract_direct_fields(genome)
+        doc_data.update(self._extract_release_fields(genome, release))
+        # Dataset fields - will raise exceptions if required fields are missing
+        doc_data.update(self._extract_dataset_fields(metadata_session, genome, release))
+        doc_data.update(self._get_taxonomy_lineage(taxonomy_session, genome.organism.taxonomy_id))
 
-        first_release, latest_release, all_integrated = self.release_selector.get_release_info(genome)
-
-        releases_str = ",".join([r.label for r in all_integrated]) if all_integrated else ""
-
-        is_current = self.release_selector.get_is_latest_release_current(genome, release, latest_release) 
+        return GenomeSearchDocument(**doc_data)
 
-        doc_data.update(
-            {
-                "first_release_name": first_release.label if first_release else "",
-                "first_release_type": first_release.release_type if first_release else "",
-                "latest_release_name": latest_release.label if latest_release else "",
-                "latest_release_type": latest_release.release_type if latest_release else "",
-                "is_latest_release_current": is_current,
-                "releases": releases_str,
-                
-            }
+    def _create_search_documents(
+            self,
+            metadata_session: Session,
+            taxonomy_session: Session,
+            genome_release_pairs: List[Tuple[Genome, EnsemblRelease]],
+    ) -> Tuple[List[GenomeSearchDocument], IndexingErrorCollection]:
+        """
+        Create the search documents of a batch of genome/release pairs, collecting the errors of the
+        genomes that could not be indexed.
+        """
+        documents = []
+        error_collection = IndexingErrorCollection()
+        self.lineage_cache.preload(
+            taxonomy_session, {genome.organism.taxonomy_id for genome, release in genome_release_pairs}
         )
+        for genome, release in genome_release_pairs:
+            try:
+                documents.append(
+                    self.create_search_document(metadata_session, taxonomy_session, genome, release)
+                )
+            except MissingDatasetFieldError as e:
+                error_collection.add_error(
+                    genome_uuid=genome.genome_uuid,
+                    release_label=release.label,
+                    error_message=str(e),
+                    exception=e,
+                )
+            except Exception as e:
+                error_collection.add_error(
+                    genome_uuid=genome.genome_uuid,
+                    release_label=release.label,
+                    error_message=f"Unexpected error: {str(e)}",
+                    exception=e,
+                )
+        return documents, error_collection
 
-        # Extract dataset fields - will raise exceptions if required fields are missing
-        dataset_extractor = DatasetFieldExtractor(metadata_session, genome, release)
-        doc_data.update(
-            {
-                "contig_n50": dataset_extractor.get_contig_n50(),
-                "coding_genes": dataset_extractor.get_coding_genes(),
-                "has_variation": dataset_extractor.has_variation(),
-                "has_regulation": dataset_extractor.has_regulation(),
-                "genebuild_provider": dataset_extractor.get_genebuild_provider(),
-                "genebuild_method_display": dataset_extractor.get_genebuild_method_display(),
-            }
-        )
-        doc_data["ftp_url"] = self._get_ftp_path(genome, release)
+    def index_genome_batch(
+            self, genome_ids: List[int]
+    ) -> Tuple[List[GenomeSearchDocument], IndexingErrorCollection]:
+        """
+        Create the search documents of a batch of genomes, with sessions of their own.
+        This is what the worker processes run in parallel mode.
+        """
+        with self.metadata_db.session_scope() as metadata_session:
+            with self.taxonomy_db.session_scope() as taxonomy_session:
+                genome_release_pairs = self._get_genome_release_pairs(metadata_session, genome_ids)
+                return self._create_search_documents(metadata_session, taxonomy_session, genome_release_pairs)
 
-        doc_data.update(self._get_taxonomy_lineage(taxonomy_session, genome.organism.taxonomy_id))
+    def _search_document_batches(
+            self, metadata_session: Session, taxonomy_session: Session, genome_ids: Optional[List[int]] = None
+    ) -> Iterator[Tuple[List[GenomeSearchDocument], IndexingErrorCollection]]:
+        """
+        Yield the search documents and errors of each batch of genomes, in batch order. All the genomes to
+        process by default.
 
-        return GenomeSearchDocument(**doc_data)
+        With more than one worker, the batches are indexed by a pool of worker processes, each with its own
+        database sessions. The results are still yielded in batch order, so the documents come in the same
+        order as in a serial run and the sorted index is identical.
+        """
+        if self.workers <= 1:
+            for batch in self.get_genomes_with_releases_batched(metadata_session, genome_ids):
+                yield self._create_search_documents(metadata_session, taxonomy_session, batch)
+            return
+
+        if genome_ids is None:
+            genome_ids = self._get_genome_ids_to_process(metadata_session)
+        batches = [genome_ids[i: i + self.batch_size] for i in range(0, len(genome_ids), self.batch_size)]
+        logger.info(
+            f"Found {len(genome_ids)} genomes to process in {len(batches)} batches "
+            f"with {self.workers} worker processes"
+        )
+        with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.metadata_uri, self.taxonomy_uri, self.batch_size),
+        ) as executor:
+            # map returns the results in submission order, whichever batch completes first
+            results = executor.map(_index_genome_batch, batches)
+            for i, (documents, error_collection, lineage_stats) in enumerate(results, 1):
+                logger.info(f"Processed batch {i}/{len(batches)}")
+                self.lineage_cache.stats.update(lineage_stats)
+                yield documents, error_collection
 
     def export_to_json(
             self, output_path: str, raise_on_errors: bool = False, pretty_print: bool = True
@@ -861,12 +1163,12 @@ class GenomeSearchIndexer:
             self, output_path: str, pretty_print: bool = True
     ) -> Tuple[int, IndexingErrorCollection]:
         """
-        Generate search index and export to JSON file with url_name deduplication.
+        Generate search index and stream it to a JSON file, in two passes with bounded memory.
 
-        Note: This method collects all entries in memory to perform url_name deduplication
-        before writing. When duplicate url_names are found, the url_name field is cleared
-        on non-preferred entries (preferring integrated over partial releases). All entries
-        are kept in the index.
+        The first pass spills the documents to a temporary file as they are created, keeping only
+        their sort keys in memory. The second pass reads them back in rank order, sets their rank
+        and url_name and writes the entries to the output file one at a time. The file is the same
+        as export_to_json writes.
 
         Args:
             output_path: Path to output JSON file
@@ -875,78 +1177,45 @@ class GenomeSearchIndexer:
         Returns:
             Tuple of (number of documents exported, error collection)
         """
-        logger.info(f"Generating search index with deduplication and exporting to {output_path}")
+        logger.info(f"Generating search index and streaming it to {output_path}")
 
         error_collection = IndexingErrorCollection()
-        all_entries = []
-
-        with self.metadata_db.session_scope() as metadata_session:
-            with self.taxonomy_db.session_scope() as taxonomy_session:
-                newest_partial = self._get_newest_partial_release(metadata_session)
-                if not newest_partial:
-                    raise ValueError("No partial releases found in database")
-
-                for batch in self.get_genomes_with_releases_batched(metadata_session):
-                    for genome, release in batch:
-                        try:
-                            doc = self.create_search_document(
-                                metadata_session, taxonomy_session, genome, release
-                            )
-
-                            all_entries.append(doc)
-                            if len(all_entries) % 100 == 0:
-                                logger.info(f"Collected {len(all_entries)} entries...")
-
-                        except MissingDatasetFieldError as e:
-                            error_collection.add_error(
-                                genome_uuid=genome.genome_uuid,
-                                release_label=release.label,
-                                error_message=str(e),
-                                exception=e,
-                            )
-                        except Exception as e:
-                            error_collection.add_error(
-                                genome_uuid=genome.genome_uuid,
-                                release_label=release.label,
-                                error_message=f"Unexpected error: {str(e)}",
-                                exception=e,
-                            )
-
-                # sort GenomeSearchDocuments
-                all_entries = self.sort_results(all_entries)
-                all_entries = update_rank(all_entries)
-                
-                # set url_name
-                all_entries = set_url_name(all_entries)
-
-                # convert to SearchEntry
-                # TODO turn to_search_entry into a model_serializer  
-                all_entries_as_search_entry = list(map(lambda d: d.to_search_entry(), all_entries))
-
-                output_file = Path(output_path)
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-
-                with open(output_file, "w") as f:
-                    search_index = SearchIndex(
-                        name="ensemblNext",
-                        release=newest_partial,
-                        entry_count=len(all_entries_as_search_entry),
-                        entries=all_entries_as_search_entry,
-                    )
-                    if pretty_print:
-                        json.dump(search_index.model_dump(), f, indent=2)
-                    else:
-                        json.dump(search_index.model_dump(), f)
-
-                logger.info(
-                    f"Successfully exported {len(all_entries_as_search_entry)} documents to {output_path} "
+        sort_keys = []
+
+        with tempfile.TemporaryFile() as spill:
+            with self.metadata_db.session_scope() as metadata_session:
+                with self.taxonomy_db.session_scope() as taxonomy_session:
+                    newest_partial = self._get_newest_partial_release(metadata_session)
+                    if not newest_partial:
+                        raise ValueError("No partial releases found in database")
+
+                    batches = self._search_document_batches(metadata_session, taxonomy_session)
+                    for documents, batch_errors in batches:
+                        for doc in documents:
+                            sort_keys.append(SortKey.from_document(doc, spill.tell()))
+                            spill.write(doc.model_dump_json().encode() + b"\n")
+                        error_collection.errors.extend(batch_errors.errors)
+                        logger.info(f"Collected {len(sort_keys)} entries...")
+
+            # The sort keys have the attributes sort_results orders on, so they sort as the documents
+            sort_keys = self.sort_results(sort_keys)
+
+            output_file = Path(output_path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(output_file, "w") as f:
+                write_search_index(
+                    f, newest_partial, len(sort_keys), spilled_search_entries(spill, sort_keys), pretty_print
                 )
 
-                if error_collection.has_errors():
-                    logger.warning(f"Failed to index {len(error_collection.errors)} genome(s)")
-                    print(error_collection.get_summary())
+        logger.info(f"Successfully exported {len(sort_keys)} documents to {output_path} ")
+        logger.info(f"Taxonomy lineage cache: {self.lineage_cache.summary()}")
 
-                return len(all_entries_as_search_entry), error_collection
+        if error_collection.has_errors():
+            logger.warning(f"Failed to index {len(error_collection.errors)} genome(s)")
+            print(error_collection.get_summary())
+
+        return len(sort_keys), error_collection
 
     def export_to_json_auto(
             self,
@@ -958,10 +1227,9 @@ class GenomeSearchIndexer:
         """
         Automatically choose between regular export and streaming based on dataset size.
 
-        Note: Both methods now perform url_name deduplication, which requires all entries
-        in memory. When duplicate url_names are found, the url_name field is cleared on
-        non-preferred entries (preferring integrated over partial releases). The "streaming"
-        mode processes genomes in batches to avoid keeping all Genome objects loaded.
+        Note: Both methods write the same file. The regular mode builds the whole index in
+        memory, the streaming mode only keeps the sort keys of the documents in memory (see
+        stream_to_json).
 
         Args:
             output_path: Path to output JSON file
@@ -989,6 +1257,161 @@ class GenomeSearchIndexer:
             logger.info(f"Using regular mode (<={stream_threshold} genomes)")
             return self.export_to_json(output_path, raise_on_errors, pretty_print)
 
+    def export_to_json_incremental(
+            self,
+            previous_index_path: str,
+            output_path: str,
+            raise_on_errors: bool = False,
+            pretty_print: bool = True,
+    ) -> int:
+        """
+        Update a previous search index, only creating again the documents of the genomes that changed since
+        its release. The other documents are read from the previous index, and all of them are ranked again,
+        so the file is the same as a full rebuild writes.
+
+        A genome is considered changed when:
+        - it is not in the previous index
+        - it has genome_release, genome_dataset or genome_group_member rows of releases released since the
+          release of the previous index (other than it), or datasets created since its release date
+        - its organism, assembly, current genome groups, releases or dataset attribute fields differ from its
+          previous document
+
+        Args:
+            previous_index_path: Path to the previous search index JSON file
+            output_path: Path to output JSON file
+            raise_on_errors: If True, raise exception if any errors occurred
+            pretty_print: If True, format JSON with indentation
+
+        Returns:
+            Number of successfully indexed documents
+
+        Raises:
+            ValueError: If the release of the previous index is not in the database
+            MissingDatasetFieldError: If raise_on_errors=True and any errors occurred
+        """
+        logger.info(f"Updating search index {previous_index_path} and exporting to {output_path}")
+
+        with open(previous_index_path) as f:
+            previous_index = SearchIndex.model_validate(json.load(f))
+
+        error_collection = IndexingErrorCollection()
+        with self.metadata_db.session_scope() as metadata_session:
+            with self.taxonomy_db.session_scope() as taxonomy_session:
+                newest_partial = self._get_newest_partial_release(metadata_session)
+                if not newest_partial:
+                    raise ValueError("No partial releases found in database")
+
+                genome_ids = self._get_genome_ids_to_process(metadata_session)
+                reused = self._get_reusable_documents(metadata_session, genome_ids, previous_index)
+                changed_genome_ids = [genome_id for genome_id in genome_ids if genome_id not in reused]
+                logger.info(
+                    f"Reusing {len(reused)} documents of the previous index, "
+                    f"creating {len(changed_genome_ids)} documents"
+                )
+
+                documents = dict(reused)
+                genome_ids_by_uuid = dict(metadata_session.query(Genome.genome_uuid, Genome.genome_id))
+                batches = self._search_document_batches(
+                    metadata_session, taxonomy_session, changed_genome_ids
+                )
+                for batch_documents, batch_errors in batches:
+                    for doc in batch_documents:
+                        documents[genome_ids_by_uuid[doc.genome_uuid]] = doc
+                    error_collection.errors.extend(batch_errors.errors)
+
+        # In genome ID order, as a full rebuild creates them, for the same ranking
+        search_entries = [documents[genome_id] for genome_id in sorted(documents)]
+        search_entries = self.sort_results(search_entries)
+        search_entries = update_rank(search_entries)
+        search_entries = set_url_name(search_entries)
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_file, "w") as f:
+            entries = (doc.to_search_entry() for doc in search_entries)
+            write_search_index(f, newest_partial, len(search_entries), entries, pretty_print)
+
+        logger.info(f"Successfully exported {len(search_entries)} documents to {output_path}")
+        logger.info(f"Taxonomy lineage cache: {self.lineage_cache.summary()}")
+        if error_collection.has_errors():
+            logger.warning(f"Failed to index: {len(error_collection.errors)} genome(s)")
+            print(error_collection.get_summary())
+
+            if raise_on_errors:
+                error_collection.raise_if_errors()
+
+        return len(search_entries)
+
+    def _get_reusable_documents(
+            self, session: Session, genome_ids: List[int], previous_index: SearchIndex
+    ) -> dict[int, GenomeSearchDocument]:
+        """
+        Documents of the previous index of the genomes that did not change since its release, by genome ID,
+        with the current rank of their organism (see export_to_json_incremental).
+
+        The genomes without newer release, group or dataset rows are reused only if their direct, release and
+        dataset attribute fields, computed as for a new document, are the same as in the previous document:
+        the dataset attributes are updated in place, without a timestamp. The candidate genomes are loaded
+        without their datasets, the dataset fields being computed from the few attribute values they read
+        (see _get_dataset_values), and the FTP URLs from the genebuild public paths of the batch.
+        """
+        previous_release = (
+            session.query(EnsemblRelease).filter(EnsemblRelease.label == previous_index.release).one_or_none()
+        )
+        if previous_release is None:
+            raise ValueError(f"Release {previous_index.release} of the previous index not found in database")
+        previous_documents = {}
+        for entry in previous_index.entries:
+            doc = GenomeSearchDocument.from_search_entry(entry)
+            previous_documents[doc.genome_uuid] = doc
+
+        # Releases published on the same day as the previous index release may not be in the previous index
+        newer_release_ids = select(EnsemblRelease.release_id).where(
+            EnsemblRelease.status == ReleaseStatus.RELEASED,
+            EnsemblRelease.release_date >= previous_release.release_date,
+            EnsemblRelease.release_id != previous_release.release_id,
+        )
+        since = datetime.datetime.combine(previous_release.release_date, datetime.time.min)
+        changed_genome_ids = set()
+        for query in (
+            session.query(GenomeRelease.genome_id).filter(GenomeRelease.release_id.in_(newer_release_ids)),
+            session.query(GenomeDataset.genome_id).filter(GenomeDataset.release_id.in_(newer_release_ids)),
+            session.query(GenomeGroupMember.genome_id).filter(
+                GenomeGroupMember.release_id.in_(newer_release_ids)
+            ),
+            session.query(GenomeDataset.genome_id).join(Dataset).filter(Dataset.created >= since),
+        ):
+            changed_genome_ids.update(genome_id for genome_id, in query.distinct())
+
+        candidate_ids = [genome_id for genome_id in genome_ids if genome_id not in changed_genome_ids]
+        reusable = {}
+        for i in range(0, len(candidate_ids), self.batch_size):
+            batch_ids = candidate_ids[i: i + self.batch_size]
+            dataset_values = self._get_dataset_values(session, batch_ids)
+            for genome, release in self._get_genome_release_pairs(session, batch_ids, datasets=False):
+                doc = previous_documents.get(genome.genome_uuid)
+                if doc is None:
+                    continue
+                fields = self._extract_direct_fields(genome)
+                fields.update(self._extract_release_fields(genome, release))
+                dataset_extractor = PrefetchedDatasetFieldExtractor(
+                    session, genome, release, *dataset_values[genome.genome_id]
+                )
+                try:
+                    fields.update(self._extract_dataset_fields(session, genome, release, dataset_extractor))
+                except Exception:
+                    # Created again, to report the same error as a full rebuild
+                    continue
+                # The previous index has "" for the names that were None, url_name and rank are ranking output
+                if all(
+                        getattr(doc, name) == ("" if value is None else value)
+                        for name, value in fields.items() if name not in ("url_name", "rank")
+                ):
+                    doc.rank = fields["rank"]
+                    reusable[genome.genome_id] = doc
+            session.expunge_all()
+        return reusable
 
     def sort_results(self, docs: List[GenomeSearchDocument]) -> List[GenomeSearchDocument]:
         """Return a sorted list of genomes.
@@ -1047,7 +1470,6 @@ class GenomeSearchIndexer:
         """
         error_collection = IndexingErrorCollection()
         search_entries = []
-        total_processed = 0
 
         with self.metadata_db.session_scope() as metadata_session:
             with self.taxonomy_db.session_scope() as taxonomy_session:
@@ -1055,34 +1477,13 @@ class GenomeSearchIndexer:
                 if not newest_partial:
                     raise ValueError("No partial releases found in database")
 
-                for batch in self.get_genomes_with_releases_batched(metadata_session):
-                    for genome, release in batch:
-                        try:
-                            doc = self.create_search_document(
-                                metadata_session, taxonomy_session, genome, release
-                            )
-                            search_entries.append(doc)
-                            total_processed += 1
-
-                            if total_processed % 100 == 0:
-                                logger.info(f"Processed {total_processed} genomes...")
-
-                        except MissingDatasetFieldError as e:
-                            error_collection.add_error(
-                                genome_uuid=genome.genome_uuid,
-                                release_label=release.label,
-                                error_message=str(e),
-                                exception=e,
-                            )
-                        except Exception as e:
-                            error_collection.add_error(
-                                genome_uuid=genome.genome_uuid,
-                                release_label=release.label,
-                                error_message=f"Unexpected error: {str(e)}",
-                                exception=e,
-                            )
-
-                                # sort GenomeSearchDocuments
+                batches = self._search_document_batches(metadata_session, taxonomy_session)
+                for documents, batch_errors in batches:
+                    search_entries.extend(documents)
+                    error_collection.errors.extend(batch_errors.errors)
+                    logger.info(f"Processed {len(search_entries)} genomes...")
+
+                # sort GenomeSearchDocuments
                 search_entries = self.sort_results(search_entries)
                 search_entries = update_rank(search_entries)
                 
@@ -1097,6 +1498,7 @@ class GenomeSearchIndexer:
                 logger.info(
                     f"Successfully indexed: {len(search_entries)} genome(s) "
                 )
+                logger.info(f"Taxonomy lineage cache: {self.lineage_cache.summary()}")
                 if error_collection.has_errors():
                     logger.warning(f"Failed to index: {len(error_collection.errors)} genome(s)")
                     print(error_collection.get_summary())
@@ -1111,6 +1513,87 @@ class GenomeSearchIndexer:
                     entries=search_entries_as_search_entry,
                 )
 
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+
+class SortKey(NamedTuple):
+    """The fields sort_results orders documents on, and the offset of the document in a spill file"""
+
+    rank: int
+    is_reference: bool
+    first_release_type: str
+    common_name: Optional[str]
+    scientific_name: str
+    strain_type: Optional[str]
+    strain: Optional[str]
+    organism_uuid: str
+    offset: int
+
+    @classmethod
+    def from_document(cls, doc: GenomeSearchDocument, offset: int) -> "SortKey":
+        return cls(*(getattr(doc, field) for field in cls._fields[:-1]), offset)
+
+
+def spilled_search_entries(spill: IO[bytes], sort_keys: List[SortKey]) -> Iterator[SearchEntry]:
+    """
+    Read the documents spilled as JSON lines back in sort key order, ranked and with their url_name set.
+    """
+    for rank, sort_key in enumerate(sort_keys, 1):
+        spill.seek(sort_key.offset)
+        doc = GenomeSearchDocument.model_validate_json(spill.readline())
+        # as update_rank
+        doc.rank = rank
+        set_url_name([doc])
+        yield doc.to_search_entry()
+
+
+def write_search_index(
+        f: IO[str], release: str, entry_count: int, entries: Iterable[SearchEntry], pretty_print: bool = True
+) -> None:
+    """
+    Write a search index one entry at a time, as json.dump of the whole SearchIndex would.
+    """
+    header = SearchIndex(release=release, entry_count=entry_count, entries=[]).model_dump(exclude={"entries"})
+    if not pretty_print:
+        f.write(json.dumps(header)[:-1] + ', "entries": [')
+        for i, entry in enumerate(entries):
+            f.write((", " if i else "") + json.dumps(entry.model_dump()))
+        f.write("]}")
+        return
+
+    # The entries are nested two levels deep, so every line of an entry is indented by 4 more spaces
+    f.write(json.dumps(header, indent=2)[:-2] + ',\n  "entries": [')
+    written = 0
+    for entry in entries:
+        entry_json = json.dumps(entry.model_dump(), indent=2).replace("\n", "\n    ")
+        f.write(("," if written else "") + "\n    " + entry_json)
+        written += 1
+    f.write("\n  ]\n}" if written else "]\n}")
+
+# ============================================================================
+# PARALLEL INDEXING
+# ============================================================================
+
+# Indexer of a worker process, created once per process by _init_worker
+_worker_indexer: Optional[GenomeSearchIndexer] = None
+
+
+def _init_worker(metadata_uri: str, taxonomy_uri: str, batch_size: int) -> None:
+    global _worker_indexer
+    _worker_indexer = GenomeSearchIndexer(metadata_uri, taxonomy_uri, batch_size)
+
+
+def _index_genome_batch(
+        genome_ids: List[int]
+) -> Tuple[List[GenomeSearchDocument], IndexingErrorCollection, Counter]:
+    documents, error_collection = _worker_indexer.index_genome_batch(genome_ids)
+    # Lineage cache statistics of the batch, added up by the parent process
+    lineage_stats = _worker_indexer.lineage_cache.stats
+    _worker_indexer.lineage_cache.stats = Counter()
+    return documents, error_collection, lineage_stats
+
 # ============================================================================
 # Set URL name
 # ============================================================================
@@ -1158,6 +1641,19 @@ def main() -> None:
         help="Number of genomes to process per batch (default: 500). "
              "Smaller batches use less memory but more queries.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes creating the search documents, one batch at a time (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update the index given by --previous-index, only creating the documents of the genomes "
+             "that changed since its release",
+    )
+    parser.add_argument("--previous-index", help="Search index JSON file to update with --incremental")
     parser.add_argument(
         "--stream-threshold",
         type=int,
@@ -1180,6 +1676,8 @@ def main() -> None:
     )
 
     args = parser.parse_args()
+    if args.incremental and not args.previous_index:
+        parser.error("--incremental requires --previous-index")
 
     # Configure logging
     logging.basicConfig(
@@ -1188,15 +1686,26 @@ def main() -> None:
 
     try:
         indexer = GenomeSearchIndexer(
-            metadata_uri=args.metadata_uri, taxonomy_uri=args.taxonomy_uri, batch_size=args.batch_size
+            metadata_uri=args.metadata_uri,
+            taxonomy_uri=args.taxonomy_uri,
+            batch_size=args.batch_size,
+            workers=args.workers,
         )
 
-        count = indexer.export_to_json_auto(
-            output_path=args.output_path,
-            raise_on_errors=args.raise_on_errors,
-            pretty_print=not args.no_pretty_print,
-            stream_threshold=args.stream_threshold,
-        )
+        if args.incremental:
+            count = indexer.export_to_json_incremental(
+                previous_index_path=args.previous_index,
+                output_path=args.output_path,
+                raise_on_errors=args.raise_on_errors,
+                pretty_print=not args.no_pretty_print,
+            )
+        else:
+            count = indexer.export_to_json_auto(
+                output_path=args.output_path,
+                raise_on_errors=args.raise_on_errors,
+                pretty_print=not args.no_pretty_print,
+                stream_threshold=args.stream_threshold,
+            )
 
         logger.info(f"Genome search index generated successfully: {count} documents")
     except ValueError as e:
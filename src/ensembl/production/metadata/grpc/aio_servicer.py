@@ -0,0 +1,239 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+grpc.aio flavour of the EnsemblMetadata servicer.
+
+Each RPC runs the same ``utils`` helper as the threaded servicer, through the async adaptors:
+the whole helper (queries and protobuf building) is executed inside one ``AsyncSession``.
+Streaming RPCs build and send their responses one page (GRPC_STREAM_PAGE_SIZE) at a time in that session, see
+``AsyncBaseAdaptor.stream_sync``.
+"""
+import logging
+
+import ensembl.production.metadata.grpc.utils as utils
+from ensembl.production.metadata.api.adaptors.aio import AsyncGenomeAdaptor, AsyncReleaseAdaptor, AsyncVepAdaptor
+from ensembl.production.metadata.grpc import ensembl_metadata_pb2_grpc
+from ensembl.production.metadata.grpc.config import MetadataConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEnsemblMetadataServicer(ensembl_metadata_pb2_grpc.EnsemblMetadataServicer):
+    def __init__(self):
+        config = MetadataConfig()
+        self.genome_adaptor = AsyncGenomeAdaptor(
+            metadata_uri=config.metadata_uri,
+            taxonomy_uri=config.taxon_uri
+        )
+        self.release_adaptor = AsyncReleaseAdaptor(metadata_uri=self.genome_adaptor.metadata_engine)
+        self.vep_adaptor = AsyncVepAdaptor(metadata_uri=self.genome_adaptor.metadata_engine, file="all")
+        super().__init__()
+
+    async def close(self):
+        # release/vep adaptors share the genome adaptor metadata engine
+        await self.genome_adaptor.dispose()
+
+    async def GetSpeciesInformation(self, request, context):
+        logger.debug(f"Received RPC for GetSpeciesInformation with request: {request}")
+        return await self.genome_adaptor.run_sync(utils.get_species_information, request.genome_uuid)
+
+    async def GetAssemblyInformation(self, request, context):
+        logger.debug(f"Received RPC for GetAssemblyInformation with request: {request}")
+        return await self.genome_adaptor.run_sync(utils.get_assembly_information, request.assembly_uuid)
+
+    async def GetGenomesByAssemblyAccessionID(self, request, context):
+        logger.debug(f"Received RPC for GetGenomesByAssemblyAccessionID with request: {request}")
+        async for genome in self.genome_adaptor.stream_sync(
+                utils.get_genomes_from_assembly_accession_iterator, request.assembly_accession
+        ):
+            yield genome
+
+    async def GetSubSpeciesInformation(self, request, context):
+        logger.debug(f"Received RPC for GetSubSpeciesInformation with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_sub_species_info, request.organism_uuid, request.group
+        )
+
+    async def GetTopLevelStatistics(self, request, context):
+        logger.debug(f"Received RPC for GetTopLevelStatistics with request: {request}")
+        return await self.genome_adaptor.run_sync(utils.get_top_level_statistics, request.organism_uuid)
+
+    async def GetTopLevelStatisticsByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetTopLevelStatisticsByUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(utils.get_top_level_statistics_by_uuid, request.genome_uuid)
+
+    async def GetGenomeUUID(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(utils.get_genome_uuid,
+                                                  production_name=request.production_name,
+                                                  assembly_name=request.assembly_name,
+                                                  use_default=request.use_default,
+                                                  genebuild_date=request.genebuild_date,
+                                                  release_version=request.release_version)
+
+    async def GetGenomeByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeByUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_genome_by_uuid, request.genome_uuid, request.release_version
+        )
+
+    async def GetAttributesByGenomeUUID(self, request, context):
+        logger.debug(f"Received RPC for GetAttributesByGenomeUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_attributes_by_genome_uuid, request.genome_uuid, request.release_version
+        )
+
+    async def GetBriefGenomeDetailsByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetBriefGenomeDetailsByUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_brief_genome_details_by_uuid, request.genome_uuid, request.release_version
+        )
+
+    async def GetGenomesByUUIDs(self, request, context):
+        logger.debug(f"Received RPC for GetGenomesByUUIDs with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_genomes_by_uuids, list(request.genome_uuid), request.release_version
+        )
+
+    async def GetBriefGenomeDetailsByUUIDs(self, request, context):
+        logger.debug(f"Received RPC for GetBriefGenomeDetailsByUUIDs with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_brief_genome_details_by_uuids, list(request.genome_uuid), request.release_version
+        )
+
+    async def GetGenomesBySpecificKeyword(self, request, context):
+        logger.debug(f"Received RPC for GetGenomesBySpecificKeyword with request: {request}")
+        async for genome in self.genome_adaptor.stream_sync(
+                utils.get_genomes_by_specific_keyword_iterator,
+                request.tolid,
+                request.assembly_accession_id,
+                request.assembly_name,
+                request.ensembl_name,
+                request.common_name,
+                request.scientific_name,
+                request.scientific_parlance_name,
+                request.species_taxonomy_id,
+                request.release_version
+        ):
+            yield genome
+
+    async def GetGenomesByReleaseVersion(self, request, context):
+        logger.debug(f"Received RPC for GetGenomesByReleaseVersion with request: {request}")
+        async for genome in self.genome_adaptor.stream_sync(
+                utils.get_genomes_by_release_version_iterator, request.release_version
+        ):
+            yield genome
+
+    async def GetGenomeByName(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeByName with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_genome_by_name, request.ensembl_name, request.site_name, request.release_version
+        )
+
+    async def GetRelease(self, request, context):
+        logger.debug(f"Received RPC for GetRelease with request: {request}")
+        async for release in self.release_adaptor.stream_sync(
+                utils.release_iterator, request.site_name, request.release_label, request.current_only
+        ):
+            yield release
+
+    async def GetReleaseByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetReleaseByUUID with request: {request}")
+        async for release in self.release_adaptor.stream_sync(utils.release_by_uuid_iterator, request.genome_uuid):
+            yield release
+
+    async def GetGenomeSequence(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeSequence with request: {request}")
+        async for sequence in self.genome_adaptor.stream_sync(
+                utils.genome_sequence_iterator, request.genome_uuid, request.chromosomal_only
+        ):
+            yield sequence
+
+    async def GetAssemblyRegion(self, request, context):
+        logger.debug(f"Received RPC for GetAssemblyRegion with request: {request}")
+        async for region in self.genome_adaptor.stream_sync(
+                utils.assembly_region_iterator, request.genome_uuid, request.chromosomal_only
+        ):
+            yield region
+
+    async def GetGenomeAssemblySequenceRegion(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeAssemblySequenceRegion with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.genome_assembly_sequence_region, request.genome_uuid, request.sequence_region_name
+        )
+
+    async def GetDatasetsListByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetDatasetsListByUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_datasets_list_by_uuid, request.genome_uuid, request.release_version
+        )
+
+    async def GetDatasetInformation(self, request, context):
+        logger.debug(f"Received RPC for GetDatasetInformation with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_dataset_by_genome_and_dataset_type, request.genome_uuid, request.dataset_type
+        )
+
+    async def GetOrganismsGroupCount(self, request, context):
+        logger.debug(f"Received RPC for GetOrganismsGroupCount with request: {request}")
+        return await self.genome_adaptor.run_sync(utils.get_organisms_group_count, request.release_label)
+
+    async def GetGenomeUUIDByTag(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeUUIDByTag with request: {request}")
+        return await self.genome_adaptor.run_sync(utils.get_genome_uuid_by_tag, request.genome_tag)
+
+    async def GetFTPLinks(self, request, context):
+        return await self.genome_adaptor.run_sync(
+            utils.get_ftp_links, request.genome_uuid, request.dataset_type, request.release_version
+        )
+
+    async def GetReleaseVersionByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetReleaseVersionByUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_release_version_by_uuid, request.genome_uuid, request.dataset_type, request.release_version
+        )
+
+    async def GetReleaseLabelByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetReleaseLabelByUUID with request: {request}")
+        return await self.genome_adaptor.run_sync(
+            utils.get_release_label_by_uuid, request.genome_uuid, request.dataset_type, request.release_version
+        )
+
+    async def GetAttributesValuesByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetAttributesByUUID with request: {request}")
+        attribute_names = list(request.attribute_name) if request.attribute_name else None
+        return await self.genome_adaptor.run_sync(
+            utils.get_attributes_values_by_uuid, request.genome_uuid, request.dataset_type,
+            request.release_version, attribute_names, request.latest_only
+        )
+
+    async def GetVepFilePathsByUUID(self, request, context):
+        logger.debug(f"Received RPC for GetVepFilePathsByUUID with request: {request}")
+        return await self.vep_adaptor.run_sync(utils.get_vep_paths_by_uuid, request.genome_uuid)
+
+    async def GetGenomeGroupsWithReference(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeGroupsWithReference with request: {request}")
+        return utils.get_genome_groups_by_reference(
+            self.genome_adaptor, request.group_type, request.release_label
+        )
+
+    async def GetGenomesInGroup(self, request, context):
+        logger.debug(f"Received RPC for GetGenomesInGroup with request: {request}")
+        return utils.get_genomes_in_group(
+            self.genome_adaptor, request.group_id, request.release_label
+        )
+
+    async def GetGenomeCounts(self, request, context):
+        logger.debug(f"Received RPC for GetGenomeCounts with request: {request}")
+        return utils.get_genome_counts(
+            self.genome_adaptor, request.release_label
+        )
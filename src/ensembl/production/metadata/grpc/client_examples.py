@@ -37,6 +37,7 @@ from ensembl_metadata_pb2 import (
     GenomesInGroupRequest,
     GenomeCountsRequest,
     ReleaseInfoRequest,
+    GenomeUUIDsRequest,
 )
 
 
@@ -482,6 +483,19 @@ def get_brief_genome_details_by_uuid(stub):
     print(brief_genome_details3)
 
 
+def get_genomes_by_uuids(stub):
+    request = GenomeUUIDsRequest(
+        genome_uuid=["a7335667-93e7-11ec-a39d-005056b38ce3", "8bce37f6-5353-4fb4-962f-f7e9a6c4303d"]
+    )
+    genomes = stub.GetGenomesByUUIDs(request)
+    print("**** Genomes: By genome_uuids (human, mouse) ****")
+    print(genomes)
+
+    brief_genome_details = stub.GetBriefGenomeDetailsByUUIDs(request)
+    print("**** Brief Genome Details: By genome_uuids (human, mouse) ****")
+    print(brief_genome_details)
+
+
 def get_vep_file_paths_by_uuid(stub):
     request1 = GenomeUUIDRequest(
         genome_uuid="a7335667-93e7-11ec-a39d-005056b38ce3"
@@ -602,6 +616,8 @@ def run():
         get_attributes_by_genome_uuid(stub)
         print("-------------- Get Brief Genome Details By UUID --------------")
         get_brief_genome_details_by_uuid(stub)
+        print("-------------- Get Genomes By UUIDs --------------")
+        get_genomes_by_uuids(stub)
         print("-------------- Get VEP File Paths By UUID --------------")
         get_vep_file_paths_by_uuid(stub)
         print("-------------- Get Genome Groups with Reference --------------")
@@ -0,0 +1,224 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Request coalescing (single-flight) for the unary RPCs.
+
+Concurrent requests to the same RPC with the same request message share one computation: the first one runs
+the RPC, the others wait for it and get the same response (or error), or fail with DEADLINE_EXCEEDED when their
+own deadline expires first. Requests are compared on their deterministic serialisation, so two messages setting
+the same fields to the same values are identical.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Awaitable, Dict, Hashable, Optional, Set, Tuple
+
+import grpc
+
+from ensembl.production.metadata.grpc.metrics import Counter, Metrics
+
+__all__ = ["SingleFlight", "AsyncSingleFlight", "SingleFlightTimeout", "CoalescingInterceptor",
+           "AsyncCoalescingInterceptor", "parse_rpc_names"]
+
+logger = logging.getLogger(__name__)
+
+COALESCED_COUNTER = ("grpc_coalesced_requests_total", "Requests answered with the response of an identical "
+                                                      "in-flight request", ("method",))
+
+
+def parse_rpc_names(value: Optional[str]) -> Optional[Set[str]]:
+    """
+    RPC names from a setting such as COALESCE_RPCS: `*` for all the unary RPCs, a comma separated list of RPC
+    names, or an empty string / `none` for none of them (empty set).
+
+    Returns:
+        None for all the unary RPCs, or the set of the RPC names.
+    """
+    value = (value or "").strip()
+    if value == "*":
+        return None
+    if value.lower() in ("", "none"):
+        return set()
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class SingleFlightTimeout(Exception):
+    """ Raised to a caller whose timeout expired while waiting for the shared call """
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """ Runs one call per key at a time, concurrent callers with the same key share its outcome """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Return fn() and whether it was shared with (computed by) another caller.
+
+        The exception raised by fn is raised to all the callers sharing it.
+
+        Raises:
+            SingleFlightTimeout: If the call is shared and not done within `timeout` seconds.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            shared = call is not None
+            if not shared:
+                call = self._calls[key] = _Call()
+        if shared:
+            if not call.done.wait(None if timeout is None else min(timeout, threading.TIMEOUT_MAX)):
+                raise SingleFlightTimeout(key)
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result, shared
+
+
+class AsyncSingleFlight:
+    """
+    asyncio flavour of SingleFlight.
+
+    The call runs in its own task: a caller being cancelled does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            # mark the exception as retrieved, in case all the callers went away
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+                 timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        task = self._calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._done(key, done))
+            return await asyncio.shield(task), shared
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout), shared
+        except asyncio.TimeoutError:
+            raise SingleFlightTimeout(key) from None
+
+
+def _request_key(method: str, request) -> Tuple[str, bytes]:
+    return method, request.SerializeToString(deterministic=True)
+
+
+DEADLINE_DETAILS = "Deadline exceeded while waiting for an identical request in flight"
+
+
+class _CoalescingInterceptorBase:
+    def __init__(self, rpcs: Optional[Set[str]] = None, metrics: Metrics = None):
+        self.rpcs = rpcs
+        self.coalesced = metrics.counter(*COALESCED_COUNTER) if metrics else Counter(*COALESCED_COUNTER)
+
+    def _coalesced_handler(self, handler, handler_call_details) -> Optional[str]:
+        """ The RPC name when its requests are coalesced """
+        if handler is None or handler.unary_unary is None:
+            return None
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        if self.rpcs is not None and method not in self.rpcs:
+            return None
+        return method
+
+
+class CoalescingInterceptor(_CoalescingInterceptorBase, grpc.ServerInterceptor):
+    """
+    Coalesces the identical concurrent requests of a threaded gRPC server.
+
+    Args:
+        rpcs: Names of the RPCs to coalesce, None for all the unary RPCs.
+        metrics: Metrics registering the coalesced requests counter.
+    """
+
+    def __init__(self, rpcs: Optional[Set[str]] = None, metrics: Metrics = None):
+        super().__init__(rpcs, metrics)
+        self.single_flight = SingleFlight()
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        method = self._coalesced_handler(handler, handler_call_details)
+        if method is None:
+            return handler
+        behavior = handler.unary_unary
+
+        def coalesced(request, context):
+            try:
+                response, shared = self.single_flight.do(
+                    _request_key(method, request), lambda: behavior(request, context), context.time_remaining()
+                )
+            except SingleFlightTimeout:
+                context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, DEADLINE_DETAILS)
+            if shared:
+                self.coalesced.inc(method=method)
+            return response
+
+        return handler._replace(unary_unary=coalesced)
+
+
+class AsyncCoalescingInterceptor(_CoalescingInterceptorBase, grpc.aio.ServerInterceptor):
+    """ Coalesces the identical concurrent requests of a grpc.aio server, see CoalescingInterceptor """
+
+    def __init__(self, rpcs: Optional[Set[str]] = None, metrics: Metrics = None):
+        super().__init__(rpcs, metrics)
+        self.single_flight = AsyncSingleFlight()
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        method = self._coalesced_handler(handler, handler_call_details)
+        if method is None:
+            return handler
+        behavior = handler.unary_unary
+
+        async def coalesced(request, context):
+            try:
+                response, shared = await self.single_flight.do(
+                    _request_key(method, request), lambda: behavior(request, context), context.time_remaining()
+                )
+            except SingleFlightTimeout:
+                await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, DEADLINE_DETAILS)
+            if shared:
+                self.coalesced.inc(method=method)
+            return response
+
+        return handler._replace(unary_unary=coalesced)
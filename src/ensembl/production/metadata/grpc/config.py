@@ -57,12 +57,91 @@ class MetadataConfig:
         self.metadata_uri = os.environ.get("METADATA_URI",
                                            f"mysql://ensembl@localhost:3306/ensembl_genome_metadata")
         self.taxon_uri = os.environ.get("TAXONOMY_URI", f"mysql://ensembl@localhost:3306/marco_ncbi_taxonomy")
-        self.pool_size = os.environ.get("POOL_SIZE", 20)
-        self.max_overflow = os.environ.get("MAX_OVERFLOW", 0)
-        self.pool_recycle = os.environ.get("POOL_RECYCLE", 50)
+        self.pool_size = int(os.environ.get("POOL_SIZE", 20))
+        self.max_overflow = int(os.environ.get("MAX_OVERFLOW", 0))
+        self.pool_timeout = float(os.environ.get("POOL_TIMEOUT", 30))
+        self.pool_recycle = int(os.environ.get("POOL_RECYCLE", 50))
+        self.grpc_max_workers = int(os.environ.get("GRPC_MAX_WORKERS", 10))
+        # twice the workers by default, 0 for no limit
+        self.grpc_max_concurrent_rpcs = int(
+            os.environ.get("GRPC_MAX_CONCURRENT_RPCS", 2 * self.grpc_max_workers)
+        )
         self.allow_unreleased = parse_boolean_var(os.environ.get("ALLOW_UNRELEASED", False))
         self.ensembl_site_id = os.environ.get("ENSEMBL_SITE", 1)
         self.debug_mode = parse_boolean_var(os.environ.get("DEBUG", False))
         self.service_port = int(os.environ.get("SERVICE_PORT", 50051))
+        self.grpc_async = parse_boolean_var(os.environ.get("GRPC_ASYNC", False))
+        # responses of the asyncio server streaming RPCs built at once
+        self.grpc_stream_page_size = int(os.environ.get("GRPC_STREAM_PAGE_SIZE", 100))
+        # worker processes sharing SERVICE_PORT, 0 for one per CPU
+        self.grpc_processes = int(os.environ.get("GRPC_PROCESSES", 1))
+        self.grpc_shutdown_grace = float(os.environ.get("GRPC_SHUTDOWN_GRACE", 10))
+        self.grpc_worker_heartbeat_timeout = float(os.environ.get("GRPC_WORKER_HEARTBEAT_TIMEOUT", 30))
+        self.grpc_worker_restart_backoff = float(os.environ.get("GRPC_WORKER_RESTART_BACKOFF", 1))
+        self.grpc_worker_restart_window = float(os.environ.get("GRPC_WORKER_RESTART_WINDOW", 60))
+        # 0 for no limit
+        self.grpc_worker_max_restarts = int(os.environ.get("GRPC_WORKER_MAX_RESTARTS", 5))
+        self.snapshot_mode = parse_boolean_var(os.environ.get("SNAPSHOT_MODE", False))
+        self.snapshot_refresh_interval = float(os.environ.get("SNAPSHOT_REFRESH_INTERVAL", 60))
+        self.taxonomy_cache_size = int(os.environ.get("TAXONOMY_CACHE_SIZE", 10000))
+        self.taxonomy_cache_ttl = float(os.environ.get("TAXONOMY_CACHE_TTL", 86400))
+        self.statement_cache_size = int(os.environ.get("STATEMENT_CACHE_SIZE", 256))
+        self.assemblies_counts_refresh_interval = float(
+            os.environ.get("ASSEMBLIES_COUNTS_REFRESH_INTERVAL", 60)
+        )
+        self.warmup = parse_boolean_var(os.environ.get("WARMUP", False))
+        self.warmup_group = os.environ.get("WARMUP_GROUP", "popular")
+        self.warmup_max_genomes = int(os.environ.get("WARMUP_MAX_GENOMES", 50))
+        # opt-in
+        self.coalesce_rpcs = os.environ.get("COALESCE_RPCS", "none")
+        # opt-in, ignored with ALLOW_UNRELEASED
+        self.response_cache_size = int(os.environ.get("RESPONSE_CACHE_SIZE", 0))
+        self.response_cache_rpcs = os.environ.get("RESPONSE_CACHE_RPCS", "*")
+        self.response_cache_max_age = float(os.environ.get("RESPONSE_CACHE_MAX_AGE", 300))
+        self.response_cache_refresh_interval = float(os.environ.get("RESPONSE_CACHE_REFRESH_INTERVAL", 60))
+        self.metrics_port = int(os.environ.get("METRICS_PORT", 0))
+        self.metrics_host = os.environ.get("METRICS_HOST", "127.0.0.1")
+        self.metrics_file = os.environ.get("METRICS_FILE")
+        self.metrics_file_interval = float(os.environ.get("METRICS_FILE_INTERVAL", 60))
+
+    def validate(self) -> "MetadataConfig":
+        """
+        Check the gRPC server and database connection pool settings, together.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if self.grpc_max_workers < 1:
+            raise ValueError(f"GRPC_MAX_WORKERS must be at least 1, got {self.grpc_max_workers}")
+        if self.grpc_max_concurrent_rpcs < 0:
+            raise ValueError(f"GRPC_MAX_CONCURRENT_RPCS must be 0 (no limit) or positive, "
+                             f"got {self.grpc_max_concurrent_rpcs}")
+        if self.grpc_stream_page_size < 1:
+            raise ValueError(f"GRPC_STREAM_PAGE_SIZE must be at least 1, got {self.grpc_stream_page_size}")
+        if self.grpc_processes < 0:
+            raise ValueError(f"GRPC_PROCESSES must be 0 (one per CPU) or positive, got {self.grpc_processes}")
+        if self.grpc_worker_restart_backoff < 0:
+            raise ValueError(f"GRPC_WORKER_RESTART_BACKOFF must be 0 or positive, "
+                             f"got {self.grpc_worker_restart_backoff}")
+        if self.grpc_worker_max_restarts < 0:
+            raise ValueError(f"GRPC_WORKER_MAX_RESTARTS must be 0 (no limit) or positive, "
+                             f"got {self.grpc_worker_max_restarts}")
+        if self.response_cache_max_age <= 0:
+            raise ValueError(f"RESPONSE_CACHE_MAX_AGE must be positive, got {self.response_cache_max_age}")
+        if self.pool_size < 1:
+            raise ValueError(f"POOL_SIZE must be at least 1, got {self.pool_size}")
+        if self.max_overflow < 0:
+            raise ValueError(f"MAX_OVERFLOW must be 0 or positive, got {self.max_overflow}")
+        if self.pool_timeout <= 0:
+            raise ValueError(f"POOL_TIMEOUT must be positive, got {self.pool_timeout}")
+        if 0 < self.grpc_max_concurrent_rpcs < self.grpc_max_workers:
+            warnings.warn(f"GRPC_MAX_CONCURRENT_RPCS ({self.grpc_max_concurrent_rpcs}) is lower than "
+                          f"GRPC_MAX_WORKERS ({self.grpc_max_workers}), some workers will never be used")
+        connections = self.pool_size + self.max_overflow
+        if self.grpc_max_workers > connections:
+            warnings.warn(f"GRPC_MAX_WORKERS ({self.grpc_max_workers}) is higher than the database "
+                          f"connections (POOL_SIZE + MAX_OVERFLOW = {connections}), RPCs will wait up to "
+                          f"POOL_TIMEOUT ({self.pool_timeout}s) for a connection")
+        return self
 
 cfg = MetadataConfig()
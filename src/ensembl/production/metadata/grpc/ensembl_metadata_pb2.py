@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n7ensembl/production/metadata/grpc/ensembl_metadata.proto\x12\x10\x65nsembl_metadata\"\xe9\x02\n\x06Genome\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x10\n\x08url_name\x18\x02 \x01(\t\x12,\n\x08\x61ssembly\x18\x03 \x01(\x0b\x32\x1a.ensembl_metadata.Assembly\x12&\n\x05taxon\x18\x04 \x01(\x0b\x32\x17.ensembl_metadata.Taxon\x12\x0f\n\x07\x63reated\x18\x05 \x01(\t\x12,\n\x08organism\x18\x06 \x01(\x0b\x32\x1a.ensembl_metadata.Organism\x12\x39\n\x0f\x61ttributes_info\x18\x07 \x01(\x0b\x32 .ensembl_metadata.AttributesInfo\x12 \n\x18related_assemblies_count\x18\x08 \x01(\x05\x12*\n\x07release\x18\t \x01(\x0b\x32\x19.ensembl_metadata.Release\x12\x1a\n\x12\x61vailable_datasets\x18\n \x03(\t\"\xd0\x02\n\x12\x42riefGenomeDetails\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x10\n\x08url_name\x18\x02 \x01(\t\x12,\n\x08\x61ssembly\x18\x03 \x01(\x0b\x32\x1a.ensembl_metadata.Assembly\x12&\n\x05taxon\x18\x04 \x01(\x0b\x32\x17.ensembl_metadata.Taxon\x12\x0f\n\x07\x63reated\x18\x05 \x01(\t\x12,\n\x08organism\x18\x06 \x01(\x0b\x32\x1a.ensembl_metadata.Organism\x12*\n\x07release\x18\x07 \x01(\x0b\x32\x19.ensembl_metadata.Release\x12@\n\rlatest_genome\x18\x08 \x01(\x0b\x32$.ensembl_metadata.BriefGenomeDetailsH\x00\x88\x01\x01\x42\x10\n\x0e_latest_genome\"h\n\x16\x41ttributesInfoByGenome\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x39\n\x0f\x61ttributes_info\x18\x02 \x01(\x0b\x32 .ensembl_metadata.AttributesInfo\"\x99\x01\n\x07Species\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x10\n\x08taxon_id\x18\x02 \x01(\r\x12\x17\n\x0fscientific_name\x18\x03 \x01(\t\x12 \n\x18scientific_parlance_name\x18\x04 \x01(\t\x12\x1b\n\x13genbank_common_name\x18\x05 \x01(\t\x12\x0f\n\x07synonym\x18\x06 \x03(\t\"\xb6\x01\n\x0c\x41ssemblyInfo\x12\x15\n\rassembly_uuid\x18\x01 \x01(\t\x12\x11\n\taccession\x18\x02 \x01(\t\x12\r\n\x05level\x18\x03 \x01(\t\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x13\n\x0b\x63hromosomal\x18\x05 \x01(\r\x12\x0e\n\x06length\x18\x06 \x01(\x04\x12\x19\n\x11sequence_location\x18\x07 \x01(\t\x12\x0b\n\x03md5\x18\x08 \x01(\t\x12\x12\n\nsha512t24u\x18\t \x01(\t\"O\n\nSubSpecies\x12\x15\n\rorganism_uuid\x18\x01 \x01(\t\x12\x14\n\x0cspecies_type\x18\x02 \x03(\t\x12\x14\n\x0cspecies_name\x18\x03 \x03(\t\"c\n\x13\x41ttributeStatistics\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x16\n\x0estatistic_type\x18\x03 \x01(\t\x12\x17\n\x0fstatistic_value\x18\x04 \x01(\t\"j\n\x18TopLevelStatisticsByUUID\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x39\n\nstatistics\x18\x02 \x03(\x0b\x32%.ensembl_metadata.AttributeStatistics\"u\n\x12TopLevelStatistics\x12\x15\n\rorganism_uuid\x18\x01 \x01(\t\x12H\n\x14stats_by_genome_uuid\x18\x02 \x03(\x0b\x32*.ensembl_metadata.TopLevelStatisticsByUUID\"\x90\x01\n\x08\x41ssembly\x12\x11\n\taccession\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tucsc_name\x18\x03 \x01(\t\x12\r\n\x05level\x18\x04 \x01(\t\x12\x14\n\x0c\x65nsembl_name\x18\x05 \x01(\t\x12\x15\n\rassembly_uuid\x18\x06 \x01(\t\x12\x14\n\x0cis_reference\x18\x07 \x01(\x08\"`\n\x05Taxon\x12\x13\n\x0btaxonomy_id\x18\x01 \x01(\r\x12\x17\n\x0fscientific_name\x18\x02 \x01(\t\x12\x0e\n\x06strain\x18\x03 \x01(\t\x12\x19\n\x11\x61lternative_names\x18\x04 \x03(\t\"\xb2\x01\n\x07Release\x12\x17\n\x0frelease_version\x18\x01 \x01(\x01\x12\x14\n\x0crelease_date\x18\x02 \x01(\t\x12\x15\n\rrelease_label\x18\x03 \x01(\t\x12\x14\n\x0crelease_type\x18\x04 \x01(\t\x12\x12\n\nis_current\x18\x05 \x01(\x08\x12\x11\n\tsite_name\x18\x06 \x01(\t\x12\x12\n\nsite_label\x18\x07 \x01(\t\x12\x10\n\x08site_uri\x18\x08 \x01(\t\"\xee\x01\n\x08Organism\x12\x13\n\x0b\x63ommon_name\x18\x01 \x01(\t\x12\x0e\n\x06strain\x18\x02 \x01(\t\x12\x17\n\x0fscientific_name\x18\x03 \x01(\t\x12\x14\n\x0c\x65nsembl_name\x18\x04 \x01(\t\x12 \n\x18scientific_parlance_name\x18\x05 \x01(\t\x12\x15\n\rorganism_uuid\x18\x06 \x01(\t\x12\x13\n\x0bstrain_type\x18\x07 \x01(\t\x12\x13\n\x0btaxonomy_id\x18\x08 \x01(\x05\x12\x1b\n\x13species_taxonomy_id\x18\t \x01(\x05\x12\x0e\n\x06tol_id\x18\n \x01(\t\"K\n\tAttribute\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0c\n\x04type\x18\x04 \x01(\t\"\xaa\x03\n\x0e\x41ttributesInfo\x12\x18\n\x10genebuild_method\x18\x01 \x01(\t\x12 \n\x18genebuild_method_display\x18\x02 \x01(\t\x12%\n\x1dgenebuild_last_geneset_update\x18\x03 \x01(\t\x12\"\n\x1agenebuild_provider_version\x18\x04 \x01(\t\x12\x1f\n\x17genebuild_provider_name\x18\x05 \x01(\t\x12\x1e\n\x16genebuild_provider_url\x18\x06 \x01(\t\x12\x1d\n\x15genebuild_sample_gene\x18\x07 \x01(\t\x12!\n\x19genebuild_sample_location\x18\x08 \x01(\t\x12\x16\n\x0e\x61ssembly_level\x18\t \x01(\t\x12\x15\n\rassembly_date\x18\n \x01(\t\x12\x1e\n\x16\x61ssembly_provider_name\x18\x0b \x01(\t\x12\x1d\n\x15\x61ssembly_provider_url\x18\x0c \x01(\t\x12 \n\x18variation_sample_variant\x18\r \x01(\t\"q\n\x0eGenomeSequence\x12\x11\n\taccession\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x19\n\x11sequence_location\x18\x03 \x01(\t\x12\x0e\n\x06length\x18\x04 \x01(\x04\x12\x13\n\x0b\x63hromosomal\x18\x05 \x01(\x08\"r\n\x0e\x41ssemblyRegion\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04rank\x18\x02 \x01(\x05\x12\x0b\n\x03md5\x18\x03 \x01(\t\x12\x0e\n\x06length\x18\x04 \x01(\x04\x12\x12\n\nsha512t24u\x18\x05 \x01(\t\x12\x13\n\x0b\x63hromosomal\x18\x06 \x01(\x08\"r\n\x1cGenomeAssemblySequenceRegion\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0b\n\x03md5\x18\x02 \x01(\t\x12\x0e\n\x06length\x18\x03 \x01(\x04\x12\x12\n\nsha512t24u\x18\x04 \x01(\t\x12\x13\n\x0b\x63hromosomal\x18\x05 \x01(\x08\"\xcb\x02\n\x0b\x44\x61tasetInfo\x12\x14\n\x0c\x64\x61taset_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_name\x18\x02 \x01(\t\x12\x16\n\x0e\x61ttribute_name\x18\x03 \x01(\t\x12\x16\n\x0e\x61ttribute_type\x18\x04 \x01(\t\x12\x17\n\x0f\x64\x61taset_version\x18\x05 \x01(\t\x12\x15\n\rdataset_label\x18\x06 \x01(\t\x12\x17\n\x0frelease_version\x18\x07 \x01(\x01\x12\x17\n\x0f\x61ttribute_value\x18\x08 \x01(\t\x12\x1a\n\x12\x64\x61taset_type_topic\x18\t \x01(\t\x12\x1b\n\x13\x64\x61taset_source_type\x18\n \x01(\t\x12\x19\n\x11\x64\x61taset_type_name\x18\x0b \x01(\t\x12\x14\n\x0crelease_date\x18\x0c \x01(\t\x12\x14\n\x0crelease_type\x18\r \x01(\t\"P\n\x08\x44\x61tasets\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12/\n\x08\x64\x61tasets\x18\x02 \x03(\x0b\x32\x1d.ensembl_metadata.DatasetInfo\":\n\x0cVepFilePaths\x12\x14\n\x0c\x66\x61\x61_location\x18\x01 \x01(\t\x12\x14\n\x0cgff_location\x18\x02 \x01(\t\"!\n\nGenomeUUID\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\"y\n\x0eOrganismsGroup\x12\x1b\n\x13species_taxonomy_id\x18\x01 \x01(\r\x12\x13\n\x0b\x63ommon_name\x18\x02 \x01(\t\x12\x17\n\x0fscientific_name\x18\x03 \x01(\t\x12\r\n\x05order\x18\x04 \x01(\r\x12\r\n\x05\x63ount\x18\x05 \x01(\r\"m\n\x13OrganismsGroupCount\x12?\n\x15organisms_group_count\x18\x01 \x03(\x0b\x32 .ensembl_metadata.OrganismsGroup\x12\x15\n\rrelease_label\x18\x02 \x01(\t\"-\n\x07\x46TPLink\x12\x14\n\x0c\x64\x61taset_type\x18\x01 \x01(\t\x12\x0c\n\x04path\x18\x02 \x01(\t\"4\n\x08\x46TPLinks\x12(\n\x05Links\x18\x01 \x03(\x0b\x32\x19.ensembl_metadata.FTPLink\")\n\x0eReleaseVersion\x12\x17\n\x0frelease_version\x18\x01 \x01(\x01\"%\n\x0cReleaseLabel\x12\x15\n\rrelease_label\x18\x01 \x01(\t\"\x8d\x01\n\x15\x44\x61tasetAttributeValue\x12\x16\n\x0e\x61ttribute_name\x18\x01 \x01(\t\x12\x17\n\x0f\x61ttribute_value\x18\x02 \x01(\t\x12\x17\n\x0f\x64\x61taset_version\x18\x03 \x01(\t\x12\x14\n\x0c\x64\x61taset_uuid\x18\x04 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x05 \x01(\t\"o\n\x17\x44\x61tasetAttributesValues\x12;\n\nattributes\x18\x01 \x03(\x0b\x32\'.ensembl_metadata.DatasetAttributeValue\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"\x85\x01\n\tGroupInfo\x12\x10\n\x08group_id\x18\x01 \x01(\t\x12\x12\n\ngroup_type\x18\x02 \x01(\t\x12\x12\n\ngroup_name\x18\x03 \x01(\t\x12>\n\x10reference_genome\x18\x04 \x01(\x0b\x32$.ensembl_metadata.BriefGenomeDetails\"O\n\x19GenomeGroupsWithReference\x12\x32\n\rgenome_groups\x18\x01 \x03(\x0b\x32\x1b.ensembl_metadata.GroupInfo\"G\n\x0eGenomesInGroup\x12\x35\n\x07genomes\x18\x01 \x03(\x0b\x32$.ensembl_metadata.BriefGenomeDetails\"2\n\x12TaxonomyGroupCount\x12\r\n\x05label\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"S\n\x0cGenomeCounts\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x34\n\x06\x63ounts\x18\x02 \x03(\x0b\x32$.ensembl_metadata.TaxonomyGroupCount\"A\n\x11GenomeUUIDRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\",\n\x15GenomeUUIDOnlyRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\"\x81\x02\n\x1eGenomeBySpecificKeywordRequest\x12\r\n\x05tolid\x18\x01 \x01(\t\x12\x1d\n\x15\x61ssembly_accession_id\x18\x02 \x01(\t\x12\x15\n\rassembly_name\x18\x03 \x01(\t\x12\x14\n\x0c\x65nsembl_name\x18\x04 \x01(\t\x12\x13\n\x0b\x63ommon_name\x18\x05 \x01(\t\x12\x17\n\x0fscientific_name\x18\x06 \x01(\t\x12 \n\x18scientific_parlance_name\x18\x07 \x01(\t\x12\x1b\n\x13species_taxonomy_id\x18\x08 \x01(\t\x12\x17\n\x0frelease_version\x18\t \x01(\x01\"8\n\x1dGenomeByReleaseVersionRequest\x12\x17\n\x0frelease_version\x18\x01 \x01(\x01\"U\n\x11GenomeNameRequest\x12\x14\n\x0c\x65nsembl_name\x18\x01 \x01(\t\x12\x11\n\tsite_name\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\x01\"C\n\x11\x41ssemblyIDRequest\x12\x15\n\rassembly_uuid\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"Q\n\x1a\x41ssemblyAccessionIDRequest\x12\x1a\n\x12\x61ssembly_accession\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"9\n\x11OrganismIDRequest\x12\x15\n\rorganism_uuid\x18\x01 \x01(\t\x12\r\n\x05group\x18\x02 \x01(\t\"P\n\x0eReleaseRequest\x12\x11\n\tsite_name\x18\x01 \x03(\t\x12\x15\n\rrelease_label\x18\x02 \x03(\t\x12\x14\n\x0c\x63urrent_only\x18\x03 \x01(\x08\"F\n\x15GenomeSequenceRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x18\n\x10\x63hromosomal_only\x18\x02 \x01(\x08\"F\n\x15\x41ssemblyRegionRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x18\n\x10\x63hromosomal_only\x18\x02 \x01(\x08\"X\n#GenomeAssemblySequenceRegionRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x1c\n\x14sequence_region_name\x18\x02 \x01(\t\"?\n\x0f\x44\x61tasetsRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"B\n\x15GenomeDatatypeRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\"\x89\x01\n\x11GenomeInfoRequest\x12\x17\n\x0fproduction_name\x18\x01 \x01(\t\x12\x15\n\rassembly_name\x18\x02 \x01(\t\x12\x16\n\x0egenebuild_date\x18\x03 \x01(\t\x12\x17\n\x0frelease_version\x18\x04 \x01(\x01\x12\x13\n\x0buse_default\x18\x05 \x01(\x08\".\n\x15OrganismsGroupRequest\x12\x15\n\rrelease_label\x18\x01 \x01(\t\"&\n\x10GenomeTagRequest\x12\x12\n\ngenome_tag\x18\x01 \x01(\t\"U\n\x0f\x46TPLinksRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\t\"[\n\x15ReleaseVersionRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\x01\"X\n\x12ReleaseInfoRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\x01\"\x91\x01\n\x1e\x44\x61tasetAttributesValuesRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x16\n\x0e\x61ttribute_name\x18\x03 \x03(\t\x12\x17\n\x0frelease_version\x18\x04 \x01(\x01\x12\x13\n\x0blatest_only\x18\x05 \x01(\x08\"=\n\x10GroupTypeRequest\x12\x12\n\ngroup_type\x18\x01 \x01(\t\x12\x15\n\rrelease_label\x18\x02 \x01(\t\"@\n\x15GenomesInGroupRequest\x12\x10\n\x08group_id\x18\x01 \x01(\t\x12\x15\n\rrelease_label\x18\x02 \x01(\t\",\n\x13GenomeCountsRequest\x12\x15\n\rrelease_label\x18\x01 \x01(\t2\xdb\x17\n\x0f\x45nsemblMetadata\x12R\n\x0fGetGenomeByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x12l\n\x19GetAttributesByGenomeUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a(.ensembl_metadata.AttributesInfoByGenome\"\x00\x12j\n\x1bGetBriefGenomeDetailsByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a$.ensembl_metadata.BriefGenomeDetails\"\x00\x12T\n\rGetGenomeUUID\x12#.ensembl_metadata.GenomeInfoRequest\x1a\x1c.ensembl_metadata.GenomeUUID\"\x00\x12m\n\x1bGetGenomesBySpecificKeyword\x12\x30.ensembl_metadata.GenomeBySpecificKeywordRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x30\x01\x12w\n\x1aGetGenomesByReleaseVersion\x12/.ensembl_metadata.GenomeByReleaseVersionRequest\x1a$.ensembl_metadata.BriefGenomeDetails\"\x00\x30\x01\x12m\n\x1fGetGenomesByAssemblyAccessionID\x12,.ensembl_metadata.AssemblyAccessionIDRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x30\x01\x12Y\n\x15GetSpeciesInformation\x12#.ensembl_metadata.GenomeUUIDRequest\x1a\x19.ensembl_metadata.Species\"\x00\x12_\n\x16GetAssemblyInformation\x12#.ensembl_metadata.AssemblyIDRequest\x1a\x1e.ensembl_metadata.AssemblyInfo\"\x00\x12_\n\x18GetSubSpeciesInformation\x12#.ensembl_metadata.OrganismIDRequest\x1a\x1c.ensembl_metadata.SubSpecies\"\x00\x12\x64\n\x15GetTopLevelStatistics\x12#.ensembl_metadata.OrganismIDRequest\x1a$.ensembl_metadata.TopLevelStatistics\"\x00\x12p\n\x1bGetTopLevelStatisticsByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a*.ensembl_metadata.TopLevelStatisticsByUUID\"\x00\x12R\n\x0fGetGenomeByName\x12#.ensembl_metadata.GenomeNameRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x12M\n\nGetRelease\x12 .ensembl_metadata.ReleaseRequest\x1a\x19.ensembl_metadata.Release\"\x00\x30\x01\x12V\n\x10GetReleaseByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a\x19.ensembl_metadata.Release\"\x00\x30\x01\x12\x62\n\x11GetGenomeSequence\x12\'.ensembl_metadata.GenomeSequenceRequest\x1a .ensembl_metadata.GenomeSequence\"\x00\x30\x01\x12\x62\n\x11GetAssemblyRegion\x12\'.ensembl_metadata.AssemblyRegionRequest\x1a .ensembl_metadata.AssemblyRegion\"\x00\x30\x01\x12\x8a\x01\n\x1fGetGenomeAssemblySequenceRegion\x12\x35.ensembl_metadata.GenomeAssemblySequenceRegionRequest\x1a..ensembl_metadata.GenomeAssemblySequenceRegion\"\x00\x12X\n\x15GetDatasetsListByUUID\x12!.ensembl_metadata.DatasetsRequest\x1a\x1a.ensembl_metadata.Datasets\"\x00\x12^\n\x15GetDatasetInformation\x12\'.ensembl_metadata.GenomeDatatypeRequest\x1a\x1a.ensembl_metadata.Datasets\"\x00\x12j\n\x16GetOrganismsGroupCount\x12\'.ensembl_metadata.OrganismsGroupRequest\x1a%.ensembl_metadata.OrganismsGroupCount\"\x00\x12X\n\x12GetGenomeUUIDByTag\x12\".ensembl_metadata.GenomeTagRequest\x1a\x1c.ensembl_metadata.GenomeUUID\"\x00\x12N\n\x0bGetFTPLinks\x12!.ensembl_metadata.FTPLinksRequest\x1a\x1a.ensembl_metadata.FTPLinks\"\x00\x12\x66\n\x17GetReleaseVersionByUUID\x12\'.ensembl_metadata.ReleaseVersionRequest\x1a .ensembl_metadata.ReleaseVersion\"\x00\x12_\n\x15GetReleaseLabelByUUID\x12$.ensembl_metadata.ReleaseInfoRequest\x1a\x1e.ensembl_metadata.ReleaseLabel\"\x00\x12z\n\x19GetAttributesValuesByUUID\x12\x30.ensembl_metadata.DatasetAttributesValuesRequest\x1a).ensembl_metadata.DatasetAttributesValues\"\x00\x12\x62\n\x15GetVepFilePathsByUUID\x12\'.ensembl_metadata.GenomeUUIDOnlyRequest\x1a\x1e.ensembl_metadata.VepFilePaths\"\x00\x12q\n\x1cGetGenomeGroupsWithReference\x12\".ensembl_metadata.GroupTypeRequest\x1a+.ensembl_metadata.GenomeGroupsWithReference\"\x00\x12`\n\x11GetGenomesInGroup\x12\'.ensembl_metadata.GenomesInGroupRequest\x1a .ensembl_metadata.GenomesInGroup\"\x00\x12Z\n\x0fGetGenomeCounts\x12%.ensembl_metadata.GenomeCountsRequest\x1a\x1e.ensembl_metadata.GenomeCounts\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n7ensembl/production/metadata/grpc/ensembl_metadata.proto\x12\x10\x65nsembl_metadata\"\xe9\x02\n\x06Genome\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x10\n\x08url_name\x18\x02 \x01(\t\x12,\n\x08\x61ssembly\x18\x03 \x01(\x0b\x32\x1a.ensembl_metadata.Assembly\x12&\n\x05taxon\x18\x04 \x01(\x0b\x32\x17.ensembl_metadata.Taxon\x12\x0f\n\x07\x63reated\x18\x05 \x01(\t\x12,\n\x08organism\x18\x06 \x01(\x0b\x32\x1a.ensembl_metadata.Organism\x12\x39\n\x0f\x61ttributes_info\x18\x07 \x01(\x0b\x32 .ensembl_metadata.AttributesInfo\x12 \n\x18related_assemblies_count\x18\x08 \x01(\x05\x12*\n\x07release\x18\t \x01(\x0b\x32\x19.ensembl_metadata.Release\x12\x1a\n\x12\x61vailable_datasets\x18\n \x03(\t\"\xd0\x02\n\x12\x42riefGenomeDetails\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x10\n\x08url_name\x18\x02 \x01(\t\x12,\n\x08\x61ssembly\x18\x03 \x01(\x0b\x32\x1a.ensembl_metadata.Assembly\x12&\n\x05taxon\x18\x04 \x01(\x0b\x32\x17.ensembl_metadata.Taxon\x12\x0f\n\x07\x63reated\x18\x05 \x01(\t\x12,\n\x08organism\x18\x06 \x01(\x0b\x32\x1a.ensembl_metadata.Organism\x12*\n\x07release\x18\x07 \x01(\x0b\x32\x19.ensembl_metadata.Release\x12@\n\rlatest_genome\x18\x08 \x01(\x0b\x32$.ensembl_metadata.BriefGenomeDetailsH\x00\x88\x01\x01\x42\x10\n\x0e_latest_genome\"h\n\x16\x41ttributesInfoByGenome\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x39\n\x0f\x61ttributes_info\x18\x02 \x01(\x0b\x32 .ensembl_metadata.AttributesInfo\"\x99\x01\n\x07Species\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x10\n\x08taxon_id\x18\x02 \x01(\r\x12\x17\n\x0fscientific_name\x18\x03 \x01(\t\x12 \n\x18scientific_parlance_name\x18\x04 \x01(\t\x12\x1b\n\x13genbank_common_name\x18\x05 \x01(\t\x12\x0f\n\x07synonym\x18\x06 \x03(\t\"\xb6\x01\n\x0c\x41ssemblyInfo\x12\x15\n\rassembly_uuid\x18\x01 \x01(\t\x12\x11\n\taccession\x18\x02 \x01(\t\x12\r\n\x05level\x18\x03 \x01(\t\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x13\n\x0b\x63hromosomal\x18\x05 \x01(\r\x12\x0e\n\x06length\x18\x06 \x01(\x04\x12\x19\n\x11sequence_location\x18\x07 \x01(\t\x12\x0b\n\x03md5\x18\x08 \x01(\t\x12\x12\n\nsha512t24u\x18\t \x01(\t\"O\n\nSubSpecies\x12\x15\n\rorganism_uuid\x18\x01 \x01(\t\x12\x14\n\x0cspecies_type\x18\x02 \x03(\t\x12\x14\n\x0cspecies_name\x18\x03 \x03(\t\"c\n\x13\x41ttributeStatistics\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x16\n\x0estatistic_type\x18\x03 \x01(\t\x12\x17\n\x0fstatistic_value\x18\x04 \x01(\t\"j\n\x18TopLevelStatisticsByUUID\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x39\n\nstatistics\x18\x02 \x03(\x0b\x32%.ensembl_metadata.AttributeStatistics\"u\n\x12TopLevelStatistics\x12\x15\n\rorganism_uuid\x18\x01 \x01(\t\x12H\n\x14stats_by_genome_uuid\x18\x02 \x03(\x0b\x32*.ensembl_metadata.TopLevelStatisticsByUUID\"\x90\x01\n\x08\x41ssembly\x12\x11\n\taccession\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tucsc_name\x18\x03 \x01(\t\x12\r\n\x05level\x18\x04 \x01(\t\x12\x14\n\x0c\x65nsembl_name\x18\x05 \x01(\t\x12\x15\n\rassembly_uuid\x18\x06 \x01(\t\x12\x14\n\x0cis_reference\x18\x07 \x01(\x08\"`\n\x05Taxon\x12\x13\n\x0btaxonomy_id\x18\x01 \x01(\r\x12\x17\n\x0fscientific_name\x18\x02 \x01(\t\x12\x0e\n\x06strain\x18\x03 \x01(\t\x12\x19\n\x11\x61lternative_names\x18\x04 \x03(\t\"\xb2\x01\n\x07Release\x12\x17\n\x0frelease_version\x18\x01 \x01(\x01\x12\x14\n\x0crelease_date\x18\x02 \x01(\t\x12\x15\n\rrelease_label\x18\x03 \x01(\t\x12\x14\n\x0crelease_type\x18\x04 \x01(\t\x12\x12\n\nis_current\x18\x05 \x01(\x08\x12\x11\n\tsite_name\x18\x06 \x01(\t\x12\x12\n\nsite_label\x18\x07 \x01(\t\x12\x10\n\x08site_uri\x18\x08 \x01(\t\"\xee\x01\n\x08Organism\x12\x13\n\x0b\x63ommon_name\x18\x01 \x01(\t\x12\x0e\n\x06strain\x18\x02 \x01(\t\x12\x17\n\x0fscientific_name\x18\x03 \x01(\t\x12\x14\n\x0c\x65nsembl_name\x18\x04 \x01(\t\x12 \n\x18scientific_parlance_name\x18\x05 \x01(\t\x12\x15\n\rorganism_uuid\x18\x06 \x01(\t\x12\x13\n\x0bstrain_type\x18\x07 \x01(\t\x12\x13\n\x0btaxonomy_id\x18\x08 \x01(\x05\x12\x1b\n\x13species_taxonomy_id\x18\t \x01(\x05\x12\x0e\n\x06tol_id\x18\n \x01(\t\"K\n\tAttribute\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0c\n\x04type\x18\x04 \x01(\t\"\xaa\x03\n\x0e\x41ttributesInfo\x12\x18\n\x10genebuild_method\x18\x01 \x01(\t\x12 \n\x18genebuild_method_display\x18\x02 \x01(\t\x12%\n\x1dgenebuild_last_geneset_update\x18\x03 \x01(\t\x12\"\n\x1agenebuild_provider_version\x18\x04 \x01(\t\x12\x1f\n\x17genebuild_provider_name\x18\x05 \x01(\t\x12\x1e\n\x16genebuild_provider_url\x18\x06 \x01(\t\x12\x1d\n\x15genebuild_sample_gene\x18\x07 \x01(\t\x12!\n\x19genebuild_sample_location\x18\x08 \x01(\t\x12\x16\n\x0e\x61ssembly_level\x18\t \x01(\t\x12\x15\n\rassembly_date\x18\n \x01(\t\x12\x1e\n\x16\x61ssembly_provider_name\x18\x0b \x01(\t\x12\x1d\n\x15\x61ssembly_provider_url\x18\x0c \x01(\t\x12 \n\x18variation_sample_variant\x18\r \x01(\t\"q\n\x0eGenomeSequence\x12\x11\n\taccession\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x19\n\x11sequence_location\x18\x03 \x01(\t\x12\x0e\n\x06length\x18\x04 \x01(\x04\x12\x13\n\x0b\x63hromosomal\x18\x05 \x01(\x08\"r\n\x0e\x41ssemblyRegion\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04rank\x18\x02 \x01(\x05\x12\x0b\n\x03md5\x18\x03 \x01(\t\x12\x0e\n\x06length\x18\x04 \x01(\x04\x12\x12\n\nsha512t24u\x18\x05 \x01(\t\x12\x13\n\x0b\x63hromosomal\x18\x06 \x01(\x08\"r\n\x1cGenomeAssemblySequenceRegion\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0b\n\x03md5\x18\x02 \x01(\t\x12\x0e\n\x06length\x18\x03 \x01(\x04\x12\x12\n\nsha512t24u\x18\x04 \x01(\t\x12\x13\n\x0b\x63hromosomal\x18\x05 \x01(\x08\"\xcb\x02\n\x0b\x44\x61tasetInfo\x12\x14\n\x0c\x64\x61taset_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_name\x18\x02 \x01(\t\x12\x16\n\x0e\x61ttribute_name\x18\x03 \x01(\t\x12\x16\n\x0e\x61ttribute_type\x18\x04 \x01(\t\x12\x17\n\x0f\x64\x61taset_version\x18\x05 \x01(\t\x12\x15\n\rdataset_label\x18\x06 \x01(\t\x12\x17\n\x0frelease_version\x18\x07 \x01(\x01\x12\x17\n\x0f\x61ttribute_value\x18\x08 \x01(\t\x12\x1a\n\x12\x64\x61taset_type_topic\x18\t \x01(\t\x12\x1b\n\x13\x64\x61taset_source_type\x18\n \x01(\t\x12\x19\n\x11\x64\x61taset_type_name\x18\x0b \x01(\t\x12\x14\n\x0crelease_date\x18\x0c \x01(\t\x12\x14\n\x0crelease_type\x18\r \x01(\t\"P\n\x08\x44\x61tasets\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12/\n\x08\x64\x61tasets\x18\x02 \x03(\x0b\x32\x1d.ensembl_metadata.DatasetInfo\":\n\x0cVepFilePaths\x12\x14\n\x0c\x66\x61\x61_location\x18\x01 \x01(\t\x12\x14\n\x0cgff_location\x18\x02 \x01(\t\"!\n\nGenomeUUID\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\"y\n\x0eOrganismsGroup\x12\x1b\n\x13species_taxonomy_id\x18\x01 \x01(\r\x12\x13\n\x0b\x63ommon_name\x18\x02 \x01(\t\x12\x17\n\x0fscientific_name\x18\x03 \x01(\t\x12\r\n\x05order\x18\x04 \x01(\r\x12\r\n\x05\x63ount\x18\x05 \x01(\r\"m\n\x13OrganismsGroupCount\x12?\n\x15organisms_group_count\x18\x01 \x03(\x0b\x32 .ensembl_metadata.OrganismsGroup\x12\x15\n\rrelease_label\x18\x02 \x01(\t\"-\n\x07\x46TPLink\x12\x14\n\x0c\x64\x61taset_type\x18\x01 \x01(\t\x12\x0c\n\x04path\x18\x02 \x01(\t\"4\n\x08\x46TPLinks\x12(\n\x05Links\x18\x01 \x03(\x0b\x32\x19.ensembl_metadata.FTPLink\")\n\x0eReleaseVersion\x12\x17\n\x0frelease_version\x18\x01 \x01(\x01\"%\n\x0cReleaseLabel\x12\x15\n\rrelease_label\x18\x01 \x01(\t\"\x8d\x01\n\x15\x44\x61tasetAttributeValue\x12\x16\n\x0e\x61ttribute_name\x18\x01 \x01(\t\x12\x17\n\x0f\x61ttribute_value\x18\x02 \x01(\t\x12\x17\n\x0f\x64\x61taset_version\x18\x03 \x01(\t\x12\x14\n\x0c\x64\x61taset_uuid\x18\x04 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x05 \x01(\t\"o\n\x17\x44\x61tasetAttributesValues\x12;\n\nattributes\x18\x01 \x03(\x0b\x32\'.ensembl_metadata.DatasetAttributeValue\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"\x85\x01\n\tGroupInfo\x12\x10\n\x08group_id\x18\x01 \x01(\t\x12\x12\n\ngroup_type\x18\x02 \x01(\t\x12\x12\n\ngroup_name\x18\x03 \x01(\t\x12>\n\x10reference_genome\x18\x04 \x01(\x0b\x32$.ensembl_metadata.BriefGenomeDetails\"O\n\x19GenomeGroupsWithReference\x12\x32\n\rgenome_groups\x18\x01 \x03(\x0b\x32\x1b.ensembl_metadata.GroupInfo\"G\n\x0eGenomesInGroup\x12\x35\n\x07genomes\x18\x01 \x03(\x0b\x32$.ensembl_metadata.BriefGenomeDetails\"2\n\x12TaxonomyGroupCount\x12\r\n\x05label\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"S\n\x0cGenomeCounts\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x34\n\x06\x63ounts\x18\x02 \x03(\x0b\x32$.ensembl_metadata.TaxonomyGroupCount\"7\n\nGenomeList\x12)\n\x07genomes\x18\x01 \x03(\x0b\x32\x18.ensembl_metadata.Genome\"O\n\x16\x42riefGenomeDetailsList\x12\x35\n\x07genomes\x18\x01 \x03(\x0b\x32$.ensembl_metadata.BriefGenomeDetails\"A\n\x11GenomeUUIDRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\",\n\x15GenomeUUIDOnlyRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\"B\n\x12GenomeUUIDsRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x03(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"\x81\x02\n\x1eGenomeBySpecificKeywordRequest\x12\r\n\x05tolid\x18\x01 \x01(\t\x12\x1d\n\x15\x61ssembly_accession_id\x18\x02 \x01(\t\x12\x15\n\rassembly_name\x18\x03 \x01(\t\x12\x14\n\x0c\x65nsembl_name\x18\x04 \x01(\t\x12\x13\n\x0b\x63ommon_name\x18\x05 \x01(\t\x12\x17\n\x0fscientific_name\x18\x06 \x01(\t\x12 \n\x18scientific_parlance_name\x18\x07 \x01(\t\x12\x1b\n\x13species_taxonomy_id\x18\x08 \x01(\t\x12\x17\n\x0frelease_version\x18\t \x01(\x01\"8\n\x1dGenomeByReleaseVersionRequest\x12\x17\n\x0frelease_version\x18\x01 \x01(\x01\"U\n\x11GenomeNameRequest\x12\x14\n\x0c\x65nsembl_name\x18\x01 \x01(\t\x12\x11\n\tsite_name\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\x01\"C\n\x11\x41ssemblyIDRequest\x12\x15\n\rassembly_uuid\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"Q\n\x1a\x41ssemblyAccessionIDRequest\x12\x1a\n\x12\x61ssembly_accession\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"9\n\x11OrganismIDRequest\x12\x15\n\rorganism_uuid\x18\x01 \x01(\t\x12\r\n\x05group\x18\x02 \x01(\t\"P\n\x0eReleaseRequest\x12\x11\n\tsite_name\x18\x01 \x03(\t\x12\x15\n\rrelease_label\x18\x02 \x03(\t\x12\x14\n\x0c\x63urrent_only\x18\x03 \x01(\x08\"F\n\x15GenomeSequenceRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x18\n\x10\x63hromosomal_only\x18\x02 \x01(\x08\"F\n\x15\x41ssemblyRegionRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x18\n\x10\x63hromosomal_only\x18\x02 \x01(\x08\"X\n#GenomeAssemblySequenceRegionRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x1c\n\x14sequence_region_name\x18\x02 \x01(\t\"?\n\x0f\x44\x61tasetsRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x17\n\x0frelease_version\x18\x02 \x01(\x01\"B\n\x15GenomeDatatypeRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\"\x89\x01\n\x11GenomeInfoRequest\x12\x17\n\x0fproduction_name\x18\x01 \x01(\t\x12\x15\n\rassembly_name\x18\x02 \x01(\t\x12\x16\n\x0egenebuild_date\x18\x03 \x01(\t\x12\x17\n\x0frelease_version\x18\x04 \x01(\x01\x12\x13\n\x0buse_default\x18\x05 \x01(\x08\".\n\x15OrganismsGroupRequest\x12\x15\n\rrelease_label\x18\x01 \x01(\t\"&\n\x10GenomeTagRequest\x12\x12\n\ngenome_tag\x18\x01 \x01(\t\"U\n\x0f\x46TPLinksRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\t\"[\n\x15ReleaseVersionRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\x01\"X\n\x12ReleaseInfoRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x17\n\x0frelease_version\x18\x03 \x01(\x01\"\x91\x01\n\x1e\x44\x61tasetAttributesValuesRequest\x12\x13\n\x0bgenome_uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x64\x61taset_type\x18\x02 \x01(\t\x12\x16\n\x0e\x61ttribute_name\x18\x03 \x03(\t\x12\x17\n\x0frelease_version\x18\x04 \x01(\x01\x12\x13\n\x0blatest_only\x18\x05 \x01(\x08\"=\n\x10GroupTypeRequest\x12\x12\n\ngroup_type\x18\x01 \x01(\t\x12\x15\n\rrelease_label\x18\x02 \x01(\t\"@\n\x15GenomesInGroupRequest\x12\x10\n\x08group_id\x18\x01 \x01(\t\x12\x15\n\rrelease_label\x18\x02 \x01(\t\",\n\x13GenomeCountsRequest\x12\x15\n\rrelease_label\x18\x01 \x01(\t2\xa8\x19\n\x0f\x45nsemblMetadata\x12R\n\x0fGetGenomeByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x12l\n\x19GetAttributesByGenomeUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a(.ensembl_metadata.AttributesInfoByGenome\"\x00\x12j\n\x1bGetBriefGenomeDetailsByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a$.ensembl_metadata.BriefGenomeDetails\"\x00\x12Y\n\x11GetGenomesByUUIDs\x12$.ensembl_metadata.GenomeUUIDsRequest\x1a\x1c.ensembl_metadata.GenomeList\"\x00\x12p\n\x1cGetBriefGenomeDetailsByUUIDs\x12$.ensembl_metadata.GenomeUUIDsRequest\x1a(.ensembl_metadata.BriefGenomeDetailsList\"\x00\x12T\n\rGetGenomeUUID\x12#.ensembl_metadata.GenomeInfoRequest\x1a\x1c.ensembl_metadata.GenomeUUID\"\x00\x12m\n\x1bGetGenomesBySpecificKeyword\x12\x30.ensembl_metadata.GenomeBySpecificKeywordRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x30\x01\x12w\n\x1aGetGenomesByReleaseVersion\x12/.ensembl_metadata.GenomeByReleaseVersionRequest\x1a$.ensembl_metadata.BriefGenomeDetails\"\x00\x30\x01\x12m\n\x1fGetGenomesByAssemblyAccessionID\x12,.ensembl_metadata.AssemblyAccessionIDRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x30\x01\x12Y\n\x15GetSpeciesInformation\x12#.ensembl_metadata.GenomeUUIDRequest\x1a\x19.ensembl_metadata.Species\"\x00\x12_\n\x16GetAssemblyInformation\x12#.ensembl_metadata.AssemblyIDRequest\x1a\x1e.ensembl_metadata.AssemblyInfo\"\x00\x12_\n\x18GetSubSpeciesInformation\x12#.ensembl_metadata.OrganismIDRequest\x1a\x1c.ensembl_metadata.SubSpecies\"\x00\x12\x64\n\x15GetTopLevelStatistics\x12#.ensembl_metadata.OrganismIDRequest\x1a$.ensembl_metadata.TopLevelStatistics\"\x00\x12p\n\x1bGetTopLevelStatisticsByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a*.ensembl_metadata.TopLevelStatisticsByUUID\"\x00\x12R\n\x0fGetGenomeByName\x12#.ensembl_metadata.GenomeNameRequest\x1a\x18.ensembl_metadata.Genome\"\x00\x12M\n\nGetRelease\x12 .ensembl_metadata.ReleaseRequest\x1a\x19.ensembl_metadata.Release\"\x00\x30\x01\x12V\n\x10GetReleaseByUUID\x12#.ensembl_metadata.GenomeUUIDRequest\x1a\x19.ensembl_metadata.Release\"\x00\x30\x01\x12\x62\n\x11GetGenomeSequence\x12\'.ensembl_metadata.GenomeSequenceRequest\x1a .ensembl_metadata.GenomeSequence\"\x00\x30\x01\x12\x62\n\x11GetAssemblyRegion\x12\'.ensembl_metadata.AssemblyRegionRequest\x1a .ensembl_metadata.AssemblyRegion\"\x00\x30\x01\x12\x8a\x01\n\x1fGetGenomeAssemblySequenceRegion\x12\x35.ensembl_metadata.GenomeAssemblySequenceRegionRequest\x1a..ensembl_metadata.GenomeAssemblySequenceRegion\"\x00\x12X\n\x15GetDatasetsListByUUID\x12!.ensembl_metadata.DatasetsRequest\x1a\x1a.ensembl_metadata.Datasets\"\x00\x12^\n\x15GetDatasetInformation\x12\'.ensembl_metadata.GenomeDatatypeRequest\x1a\x1a.ensembl_metadata.Datasets\"\x00\x12j\n\x16GetOrganismsGroupCount\x12\'.ensembl_metadata.OrganismsGroupRequest\x1a%.ensembl_metadata.OrganismsGroupCount\"\x00\x12X\n\x12GetGenomeUUIDByTag\x12\".ensembl_metadata.GenomeTagRequest\x1a\x1c.ensembl_metadata.GenomeUUID\"\x00\x12N\n\x0bGetFTPLinks\x12!.ensembl_metadata.FTPLinksRequest\x1a\x1a.ensembl_metadata.FTPLinks\"\x00\x12\x66\n\x17GetReleaseVersionByUUID\x12\'.ensembl_metadata.ReleaseVersionRequest\x1a .ensembl_metadata.ReleaseVersion\"\x00\x12_\n\x15GetReleaseLabelByUUID\x12$.ensembl_metadata.ReleaseInfoRequest\x1a\x1e.ensembl_metadata.ReleaseLabel\"\x00\x12z\n\x19GetAttributesValuesByUUID\x12\x30.ensembl_metadata.DatasetAttributesValuesRequest\x1a).ensembl_metadata.DatasetAttributesValues\"\x00\x12\x62\n\x15GetVepFilePathsByUUID\x12\'.ensembl_metadata.GenomeUUIDOnlyRequest\x1a\x1e.ensembl_metadata.VepFilePaths\"\x00\x12q\n\x1cGetGenomeGroupsWithReference\x12\".ensembl_metadata.GroupTypeRequest\x1a+.ensembl_metadata.GenomeGroupsWithReference\"\x00\x12`\n\x11GetGenomesInGroup\x12\'.ensembl_metadata.GenomesInGroupRequest\x1a .ensembl_metadata.GenomesInGroup\"\x00\x12Z\n\x0fGetGenomeCounts\x12%.ensembl_metadata.GenomeCountsRequest\x1a\x1e.ensembl_metadata.GenomeCounts\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -101,54 +101,60 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_TAXONOMYGROUPCOUNT']._serialized_end=4681
   _globals['_GENOMECOUNTS']._serialized_start=4683
   _globals['_GENOMECOUNTS']._serialized_end=4766
-  _globals['_GENOMEUUIDREQUEST']._serialized_start=4768
-  _globals['_GENOMEUUIDREQUEST']._serialized_end=4833
-  _globals['_GENOMEUUIDONLYREQUEST']._serialized_start=4835
-  _globals['_GENOMEUUIDONLYREQUEST']._serialized_end=4879
-  _globals['_GENOMEBYSPECIFICKEYWORDREQUEST']._serialized_start=4882
-  _globals['_GENOMEBYSPECIFICKEYWORDREQUEST']._serialized_end=5139
-  _globals['_GENOMEBYRELEASEVERSIONREQUEST']._serialized_start=5141
-  _globals['_GENOMEBYRELEASEVERSIONREQUEST']._serialized_end=5197
-  _globals['_GENOMENAMEREQUEST']._serialized_start=5199
-  _globals['_GENOMENAMEREQUEST']._serialized_end=5284
-  _globals['_ASSEMBLYIDREQUEST']._serialized_start=5286
-  _globals['_ASSEMBLYIDREQUEST']._serialized_end=5353
-  _globals['_ASSEMBLYACCESSIONIDREQUEST']._serialized_start=5355
-  _globals['_ASSEMBLYACCESSIONIDREQUEST']._serialized_end=5436
-  _globals['_ORGANISMIDREQUEST']._serialized_start=5438
-  _globals['_ORGANISMIDREQUEST']._serialized_end=5495
-  _globals['_RELEASEREQUEST']._serialized_start=5497
-  _globals['_RELEASEREQUEST']._serialized_end=5577
-  _globals['_GENOMESEQUENCEREQUEST']._serialized_start=5579
-  _globals['_GENOMESEQUENCEREQUEST']._serialized_end=5649
-  _globals['_ASSEMBLYREGIONREQUEST']._serialized_start=5651
-  _globals['_ASSEMBLYREGIONREQUEST']._serialized_end=5721
-  _globals['_GENOMEASSEMBLYSEQUENCEREGIONREQUEST']._serialized_start=5723
-  _globals['_GENOMEASSEMBLYSEQUENCEREGIONREQUEST']._serialized_end=5811
-  _globals['_DATASETSREQUEST']._serialized_start=5813
-  _globals['_DATASETSREQUEST']._serialized_end=5876
-  _globals['_GENOMEDATATYPEREQUEST']._serialized_start=5878
-  _globals['_GENOMEDATATYPEREQUEST']._serialized_end=5944
-  _globals['_GENOMEINFOREQUEST']._serialized_start=5947
-  _globals['_GENOMEINFOREQUEST']._serialized_end=6084
-  _globals['_ORGANISMSGROUPREQUEST']._serialized_start=6086
-  _globals['_ORGANISMSGROUPREQUEST']._serialized_end=6132
-  _globals['_GENOMETAGREQUEST']._serialized_start=6134
-  _globals['_GENOMETAGREQUEST']._serialized_end=6172
-  _globals['_FTPLINKSREQUEST']._serialized_start=6174
-  _globals['_FTPLINKSREQUEST']._serialized_end=6259
-  _globals['_RELEASEVERSIONREQUEST']._serialized_start=6261
-  _globals['_RELEASEVERSIONREQUEST']._serialized_end=6352
-  _globals['_RELEASEINFOREQUEST']._serialized_start=6354
-  _globals['_RELEASEINFOREQUEST']._serialized_end=6442
-  _globals['_DATASETATTRIBUTESVALUESREQUEST']._serialized_start=6445
-  _globals['_DATASETATTRIBUTESVALUESREQUEST']._serialized_end=6590
-  _globals['_GROUPTYPEREQUEST']._serialized_start=6592
-  _globals['_GROUPTYPEREQUEST']._serialized_end=6653
-  _globals['_GENOMESINGROUPREQUEST']._serialized_start=6655
-  _globals['_GENOMESINGROUPREQUEST']._serialized_end=6719
-  _globals['_GENOMECOUNTSREQUEST']._serialized_start=6721
-  _globals['_GENOMECOUNTSREQUEST']._serialized_end=6765
-  _globals['_ENSEMBLMETADATA']._serialized_start=6768
-  _globals['_ENSEMBLMETADATA']._serialized_end=9803
+  _globals['_GENOMELIST']._serialized_start=4768
+  _globals['_GENOMELIST']._serialized_end=4823
+  _globals['_BRIEFGENOMEDETAILSLIST']._serialized_start=4825
+  _globals['_BRIEFGENOMEDETAILSLIST']._serialized_end=4904
+  _globals['_GENOMEUUIDREQUEST']._serialized_start=4906
+  _globals['_GENOMEUUIDREQUEST']._serialized_end=4971
+  _globals['_GENOMEUUIDONLYREQUEST']._serialized_start=4973
+  _globals['_GENOMEUUIDONLYREQUEST']._serialized_end=5017
+  _globals['_GENOMEUUIDSREQUEST']._serialized_start=5019
+  _globals['_GENOMEUUIDSREQUEST']._serialized_end=5085
+  _globals['_GENOMEBYSPECIFICKEYWORDREQUEST']._serialized_start=5088
+  _globals['_GENOMEBYSPECIFICKEYWORDREQUEST']._serialized_end=5345
+  _globals['_GENOMEBYRELEASEVERSIONREQUEST']._serialized_start=5347
+  _globals['_GENOMEBYRELEASEVERSIONREQUEST']._serialized_end=5403
+  _globals['_GENOMENAMEREQUEST']._serialized_start=5405
+  _globals['_GENOMENAMEREQUEST']._serialized_end=5490
+  _globals['_ASSEMBLYIDREQUEST']._serialized_start=5492
+  _globals['_ASSEMBLYIDREQUEST']._serialized_end=5559
+  _globals['_ASSEMBLYACCESSIONIDREQUEST']._serialized_start=5561
+  _globals['_ASSEMBLYACCESSIONIDREQUEST']._serialized_end=5642
+  _globals['_ORGANISMIDREQUEST']._serialized_start=5644
+  _globals['_ORGANISMIDREQUEST']._serialized_end=5701
+  _globals['_RELEASEREQUEST']._serialized_start=5703
+  _globals['_RELEASEREQUEST']._serialized_end=5783
+  _globals['_GENOMESEQUENCEREQUEST']._serialized_start=5785
+  _globals['_GENOMESEQUENCEREQUEST']._serialized_end=5855
+  _globals['_ASSEMBLYREGIONREQUEST']._serialized_start=5857
+  _globals['_ASSEMBLYREGIONREQUEST']._serialized_end=5927
+  _globals['_GENOMEASSEMBLYSEQUENCEREGIONREQUEST']._serialized_start=5929
+  _globals['_GENOMEASSEMBLYSEQUENCEREGIONREQUEST']._serialized_end=6017
+  _globals['_DATASETSREQUEST']._serialized_start=6019
+  _globals['_DATASETSREQUEST']._serialized_end=6082
+  _globals['_GENOMEDATATYPEREQUEST']._serialized_start=6084
+  _globals['_GENOMEDATATYPEREQUEST']._serialized_end=6150
+  _globals['_GENOMEINFOREQUEST']._serialized_start=6153
+  _globals['_GENOMEINFOREQUEST']._serialized_end=6290
+  _globals['_ORGANISMSGROUPREQUEST']._serialized_start=6292
+  _globals['_ORGANISMSGROUPREQUEST']._serialized_end=6338
+  _globals['_GENOMETAGREQUEST']._serialized_start=6340
+  _globals['_GENOMETAGREQUEST']._serialized_end=6378
+  _globals['_FTPLINKSREQUEST']._serialized_start=6380
+  _globals['_FTPLINKSREQUEST']._serialized_end=6465
+  _globals['_RELEASEVERSIONREQUEST']._serialized_start=6467
+  _globals['_RELEASEVERSIONREQUEST']._serialized_end=6558
+  _globals['_RELEASEINFOREQUEST']._serialized_start=6560
+  _globals['_RELEASEINFOREQUEST']._serialized_end=6648
+  _globals['_DATASETATTRIBUTESVALUESREQUEST']._serialized_start=6651
+  _globals['_DATASETATTRIBUTESVALUESREQUEST']._serialized_end=6796
+  _globals['_GROUPTYPEREQUEST']._serialized_start=6798
+  _globals['_GROUPTYPEREQUEST']._serialized_end=6859
+  _globals['_GENOMESINGROUPREQUEST']._serialized_start=6861
+  _globals['_GENOMESINGROUPREQUEST']._serialized_end=6925
+  _globals['_GENOMECOUNTSREQUEST']._serialized_start=6927
+  _globals['_GENOMECOUNTSREQUEST']._serialized_end=6971
+  _globals['_ENSEMBLMETADATA']._serialized_start=6974
+  _globals['_ENSEMBLMETADATA']._serialized_end=10214
 # @@protoc_insertion_point(module_scope)
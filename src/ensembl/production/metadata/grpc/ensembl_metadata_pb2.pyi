@@ -455,6 +455,18 @@ class GenomeCounts(_message.Message):
     counts: _containers.RepeatedCompositeFieldContainer[TaxonomyGroupCount]
     def __init__(self, total: _Optional[int] = ..., counts: _Optional[_Iterable[_Union[TaxonomyGroupCount, _Mapping]]] = ...) -> None: ...
 
+class GenomeList(_message.Message):
+    __slots__ = ("genomes",)
+    GENOMES_FIELD_NUMBER: _ClassVar[int]
+    genomes: _containers.RepeatedCompositeFieldContainer[Genome]
+    def __init__(self, genomes: _Optional[_Iterable[_Union[Genome, _Mapping]]] = ...) -> None: ...
+
+class BriefGenomeDetailsList(_message.Message):
+    __slots__ = ("genomes",)
+    GENOMES_FIELD_NUMBER: _ClassVar[int]
+    genomes: _containers.RepeatedCompositeFieldContainer[BriefGenomeDetails]
+    def __init__(self, genomes: _Optional[_Iterable[_Union[BriefGenomeDetails, _Mapping]]] = ...) -> None: ...
+
 class GenomeUUIDRequest(_message.Message):
     __slots__ = ("genome_uuid", "release_version")
     GENOME_UUID_FIELD_NUMBER: _ClassVar[int]
@@ -469,6 +481,14 @@ class GenomeUUIDOnlyRequest(_message.Message):
     genome_uuid: str
     def __init__(self, genome_uuid: _Optional[str] = ...) -> None: ...
 
+class GenomeUUIDsRequest(_message.Message):
+    __slots__ = ("genome_uuid", "release_version")
+    GENOME_UUID_FIELD_NUMBER: _ClassVar[int]
+    RELEASE_VERSION_FIELD_NUMBER: _ClassVar[int]
+    genome_uuid: _containers.RepeatedScalarFieldContainer[str]
+    release_version: float
+    def __init__(self, genome_uuid: _Optional[_Iterable[str]] = ..., release_version: _Optional[float] = ...) -> None: ...
+
 class GenomeBySpecificKeywordRequest(_message.Message):
     __slots__ = ("tolid", "assembly_accession_id", "assembly_name", "ensembl_name", "common_name", "scientific_name", "scientific_parlance_name", "species_taxonomy_id", "release_version")
     TOLID_FIELD_NUMBER: _ClassVar[int]
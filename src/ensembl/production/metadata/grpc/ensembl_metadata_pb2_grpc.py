@@ -53,6 +53,16 @@ class EnsemblMetadataStub(object):
                 request_serializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDRequest.SerializeToString,
                 response_deserializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.BriefGenomeDetails.FromString,
                 _registered_method=True)
+        self.GetGenomesByUUIDs = channel.unary_unary(
+                '/ensembl_metadata.EnsemblMetadata/GetGenomesByUUIDs',
+                request_serializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDsRequest.SerializeToString,
+                response_deserializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeList.FromString,
+                _registered_method=True)
+        self.GetBriefGenomeDetailsByUUIDs = channel.unary_unary(
+                '/ensembl_metadata.EnsemblMetadata/GetBriefGenomeDetailsByUUIDs',
+                request_serializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDsRequest.SerializeToString,
+                response_deserializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.BriefGenomeDetailsList.FromString,
+                _registered_method=True)
         self.GetGenomeUUID = channel.unary_unary(
                 '/ensembl_metadata.EnsemblMetadata/GetGenomeUUID',
                 request_serializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeInfoRequest.SerializeToString,
@@ -218,6 +228,20 @@ class EnsemblMetadataServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetGenomesByUUIDs(self, request, context):
+        """Retrieve several genomes by their UUIDs in a single call (same content as GetGenomeByUUID for each genome).
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBriefGenomeDetailsByUUIDs(self, request, context):
+        """Retrieve brief genome details of several genomes by their UUIDs in a single call.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetGenomeUUID(self, request, context):
         """Retrieve genome UUID by providing production name and assembly id.
         """
@@ -426,6 +450,16 @@ def add_EnsemblMetadataServicer_to_server(servicer, server):
                     request_deserializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDRequest.FromString,
                     response_serializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.BriefGenomeDetails.SerializeToString,
             ),
+            'GetGenomesByUUIDs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetGenomesByUUIDs,
+                    request_deserializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDsRequest.FromString,
+                    response_serializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeList.SerializeToString,
+            ),
+            'GetBriefGenomeDetailsByUUIDs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBriefGenomeDetailsByUUIDs,
+                    request_deserializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDsRequest.FromString,
+                    response_serializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.BriefGenomeDetailsList.SerializeToString,
+            ),
             'GetGenomeUUID': grpc.unary_unary_rpc_method_handler(
                     servicer.GetGenomeUUID,
                     request_deserializer=ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeInfoRequest.FromString,
@@ -657,6 +691,60 @@ class EnsemblMetadata(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetGenomesByUUIDs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ensembl_metadata.EnsemblMetadata/GetGenomesByUUIDs',
+            ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDsRequest.SerializeToString,
+            ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetBriefGenomeDetailsByUUIDs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ensembl_metadata.EnsemblMetadata/GetBriefGenomeDetailsByUUIDs',
+            ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.GenomeUUIDsRequest.SerializeToString,
+            ensembl_dot_production_dot_metadata_dot_grpc_dot_ensembl__metadata__pb2.BriefGenomeDetailsList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetGenomeUUID(request,
             target,
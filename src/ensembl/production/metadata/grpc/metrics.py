@@ -0,0 +1,514 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Service metrics in the Prometheus text exposition format.
+
+``Metrics`` holds the counters, gauges and histograms of the service. ``MetricsInterceptor`` (and
+``AsyncMetricsInterceptor`` for the grpc.aio server) records the per RPC latency, status codes, in flight
+requests, responses and serialisation time. ``Metrics.install()`` registers SQLAlchemy event hooks recording
+the SQL statements and their duration, attributed to the RPC they are run for, and the database connections
+checkout wait and usage.
+
+The metrics are exposed over HTTP on ``METRICS_PORT`` and/or written to ``METRICS_FILE``, see ``start_metrics``.
+No third party client library is needed.
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional, Tuple
+
+import grpc
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+__all__ = [
+    "Counter", "Gauge", "Histogram", "Metrics", "MetricsInterceptor", "AsyncMetricsInterceptor", "start_metrics",
+    "serialised_response"
+]
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    labels = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{labels}}}" if labels else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects the labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            for name, labels, value in self._samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        for key, value in self._values.items():
+            yield self.name, zip(self.labelnames, key), value
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels) -> int:
+        counts, _ = self._values.get(self._key(labels), ((), 0.0))
+        return sum(counts)
+
+    def sum(self, **labels) -> float:
+        return self._values.get(self._key(labels), ((), 0.0))[1]
+
+    def _samples(self):
+        for key, (counts, total) in self._values.items():
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + [("le", _format_value(bound))], cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+@dataclass
+class _RpcStats:
+    statements: int = 0
+    sql_seconds: float = 0.0
+
+
+# Statistics of the RPC being handled, set by the interceptors and updated by the SQLAlchemy hooks
+_current_rpc: contextvars.ContextVar[Optional[_RpcStats]] = contextvars.ContextVar("current_rpc", default=None)
+
+
+class Metrics:
+    """
+    Registry of the service metrics.
+
+    Args:
+        namespace: Prefix of the metrics names.
+    """
+
+    def __init__(self, namespace: str = "ensembl_metadata"):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._installed = []
+        self._http_server = None
+        self._dump_stop = None
+        self._dump_path = None
+        self.rpc_requests = self.counter("grpc_requests_total", "RPCs handled, by status code", ("method", "code"))
+        self.rpc_in_flight = self.gauge("grpc_requests_in_flight", "RPCs being handled", ("method",))
+        self.rpc_latency = self.histogram("grpc_request_duration_seconds", "RPC handling time", ("method",))
+        self.rpc_responses = self.counter("grpc_responses_total", "Response messages sent", ("method",))
+        self.rpc_response_bytes = self.counter("grpc_response_bytes_total", "Serialised responses size", ("method",))
+        self.rpc_serialisation = self.histogram(
+            "grpc_serialisation_duration_seconds", "Response messages serialisation time", ("method",))
+        self.rpc_sql_statements = self.histogram(
+            "grpc_sql_statements", "SQL statements run per RPC", ("method",), buckets=COUNT_BUCKETS)
+        self.rpc_sql_duration = self.histogram(
+            "grpc_sql_duration_seconds", "Time spent running SQL statements per RPC", ("method",))
+        self.sql_statements = self.counter("sql_statements_total", "SQL statements run")
+        self.sql_duration = self.histogram("sql_statement_duration_seconds", "SQL statements execution time")
+        self.db_checkout_wait = self.histogram(
+            "db_connection_wait_seconds", "Time for a session to get its database connection from the pool")
+        self.db_connections_in_use = self.gauge("db_connections_in_use", "Database connections checked out")
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """ All the metrics in the text exposition format """
+        return "".join(metric.render() for metric in self._metrics.values())
+
+    def write(self, path: str) -> None:
+        """ Atomically replace `path` with the current metrics """
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as out:
+            out.write(self.render())
+        os.replace(out.name, path)
+
+    # RPC recording, used by the interceptors
+
+    def rpc_started(self, method: str) -> Tuple[_RpcStats, contextvars.Token, float]:
+        self.rpc_in_flight.inc(method=method)
+        stats = _RpcStats()
+        return stats, _current_rpc.set(stats), time.perf_counter()
+
+    def rpc_finished(self, method: str, code: grpc.StatusCode, started) -> None:
+        stats, token, start = started
+        try:
+            _current_rpc.reset(token)
+        except ValueError:
+            # streaming response closed from another context, e.g. cancelled by the client
+            _current_rpc.set(None)
+        self.rpc_latency.observe(time.perf_counter() - start, method=method)
+        self.rpc_requests.inc(method=method, code=code.name)
+        self.rpc_in_flight.dec(method=method)
+        self.rpc_sql_statements.observe(stats.statements, method=method)
+        self.rpc_sql_duration.observe(stats.sql_seconds, method=method)
+
+    def timed_serializer(self, method: str, serializer):
+        if serializer is None:
+            return None
+        # the responses serialised by an inner interceptor are timed by it, see serialised_response
+        timed = serializer is not serialised_response
+
+        def serialize(message):
+            start = time.perf_counter()
+            data = serializer(message)
+            if timed:
+                self.rpc_serialisation.observe(time.perf_counter() - start, method=method)
+            self.rpc_responses.inc(method=method)
+            self.rpc_response_bytes.inc(len(data), method=method)
+            return data
+
+        return serialize
+
+    # SQLAlchemy hooks
+
+    def install(self) -> "Metrics":
+        """
+        Listen to the SQL statements, connections checkouts and sessions of all the engines.
+
+        The hooks are registered on the SQLAlchemy classes, so they apply to the engines created afterwards too.
+        """
+        hooks = [
+            (Engine, "before_cursor_execute", self._before_cursor_execute),
+            (Engine, "after_cursor_execute", self._after_cursor_execute),
+            (Engine, "handle_error", self._handle_error),
+            (Pool, "checkout", self._checkout),
+            (Pool, "checkin", self._checkin),
+            (Session, "after_transaction_create", self._after_transaction_create),
+            (Session, "after_begin", self._after_begin),
+        ]
+        for target, identifier, fn in hooks:
+            if (target, identifier, fn) not in self._installed:
+                event.listen(target, identifier, fn)
+                self._installed.append((target, identifier, fn))
+        return self
+
+    def uninstall(self) -> None:
+        while self._installed:
+            event.remove(*self._installed.pop())
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        self.sql_statements.inc()
+        self.sql_duration.observe(elapsed)
+        stats = _current_rpc.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.sql_seconds += elapsed
+
+    def _handle_error(self, exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("metrics_query_start"):
+            connection.info["metrics_query_start"].pop()
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.db_connections_in_use.inc()
+
+    def _checkin(self, dbapi_connection, connection_record):
+        self.db_connections_in_use.dec()
+
+    def _after_transaction_create(self, session, transaction):
+        if transaction.parent is None:
+            session.info["metrics_connection_requested"] = time.perf_counter()
+
+    def _after_begin(self, session, transaction, connection):
+        requested = session.info.pop("metrics_connection_requested", None)
+        if requested is not None:
+            self.db_checkout_wait.observe(time.perf_counter() - requested)
+
+    # Exposition
+
+    def serve_http(self, port: int, host: str = "127.0.0.1") -> int:
+        """ Serve the metrics on http://host:port/metrics from a daemon thread, returns the bound port """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("metrics: " + format, *args)
+
+        self._http_server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._http_server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._http_server.server_address[1]
+
+    def dump_periodically(self, path: str, interval: float) -> None:
+        """ Write the metrics to `path` every `interval` seconds from a daemon thread, and when closed """
+        self._dump_stop = threading.Event()
+        self._dump_path = path
+
+        def dump():
+            while not self._dump_stop.wait(interval):
+                try:
+                    self.write(path)
+                except OSError as e:
+                    logger.warning(f"Could not write the metrics to {path}: {e}")
+
+        threading.Thread(target=dump, name="metrics-dump", daemon=True).start()
+
+    def close(self) -> None:
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_stop = None
+            self.write(self._dump_path)
+        self.uninstall()
+
+
+def serialised_response(data: bytes) -> bytes:
+    """
+    Response serializer of the handlers returning responses they serialised themselves (see response_cache).
+    Their serialisation time is then reported by them to Metrics.rpc_serialisation.
+    """
+    return data
+
+
+def _method_name(handler_call_details) -> str:
+    return handler_call_details.method.rsplit("/", 1)[-1]
+
+
+def _code(context, default: grpc.StatusCode) -> grpc.StatusCode:
+    code = context.code() if hasattr(context, "code") else None
+    return code if isinstance(code, grpc.StatusCode) else default
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """ Records the RPCs of a threaded gRPC server in `metrics` """
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = _method_name(handler_call_details)
+        metrics = self.metrics
+
+        def unary_response(behavior):
+            def wrapper(request_or_iterator, context):
+                started = metrics.rpc_started(method)
+                code = grpc.StatusCode.OK
+                try:
+                    return behavior(request_or_iterator, context)
+                except Exception:
+                    code = grpc.StatusCode.UNKNOWN
+                    raise
+                finally:
+                    metrics.rpc_finished(method, _code(context, code), started)
+
+            return wrapper
+
+        def stream_response(behavior):
+            def wrapper(request_or_iterator, context):
+                started = metrics.rpc_started(method)
+                code = grpc.StatusCode.OK
+                try:
+                    yield from behavior(request_or_iterator, context)
+                except GeneratorExit:
+                    code = grpc.StatusCode.CANCELLED
+                    raise
+                except Exception:
+                    code = grpc.StatusCode.UNKNOWN
+                    raise
+                finally:
+                    metrics.rpc_finished(method, _code(context, code), started)
+
+            return wrapper
+
+        return _wrap_handler(handler, metrics, method, unary_response, stream_response)
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """ Records the RPCs of a grpc.aio server in `metrics` """
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = _method_name(handler_call_details)
+        metrics = self.metrics
+
+        def unary_response(behavior):
+            async def wrapper(request_or_iterator, context):
+                started = metrics.rpc_started(method)
+                code = grpc.StatusCode.OK
+                try:
+                    return await behavior(request_or_iterator, context)
+                except Exception:
+                    code = grpc.StatusCode.UNKNOWN
+                    raise
+                finally:
+                    metrics.rpc_finished(method, _code(context, code), started)
+
+            return wrapper
+
+        def stream_response(behavior):
+            async def wrapper(request_or_iterator, context):
+                started = metrics.rpc_started(method)
+                code = grpc.StatusCode.OK
+                try:
+                    async for response in behavior(request_or_iterator, context):
+                        yield response
+                except GeneratorExit:
+                    code = grpc.StatusCode.CANCELLED
+                    raise
+                except Exception:
+                    code = grpc.StatusCode.UNKNOWN
+                    raise
+                finally:
+                    metrics.rpc_finished(method, _code(context, code), started)
+
+            return wrapper
+
+        return _wrap_handler(handler, metrics, method, unary_response, stream_response)
+
+
+def _wrap_handler(handler, metrics: Metrics, method: str, unary_response, stream_response):
+    wrapped = {"response_serializer": metrics.timed_serializer(method, handler.response_serializer)}
+    if handler.unary_unary:
+        wrapped["unary_unary"] = unary_response(handler.unary_unary)
+    elif handler.stream_unary:
+        wrapped["stream_unary"] = unary_response(handler.stream_unary)
+    elif handler.unary_stream:
+        wrapped["unary_stream"] = stream_response(handler.unary_stream)
+    elif handler.stream_stream:
+        wrapped["stream_stream"] = stream_response(handler.stream_stream)
+    return handler._replace(**wrapped)
+
+
+def start_metrics(cfg) -> Optional[Metrics]:
+    """
+    Metrics of the service according to the configuration, None when neither METRICS_PORT nor METRICS_FILE is set.
+    """
+    if not cfg.metrics_port and not cfg.metrics_file:
+        return None
+    metrics = Metrics().install()
+    if cfg.metrics_port:
+        port = metrics.serve_http(cfg.metrics_port, cfg.metrics_host)
+        logger.info(f"Serving metrics on http://{cfg.metrics_host}:{port}/metrics")
+    if cfg.metrics_file:
+        metrics.dump_periodically(cfg.metrics_file, cfg.metrics_file_interval)
+        logger.info(f"Writing metrics to {cfg.metrics_file} every {cfg.metrics_file_interval}s")
+    return metrics
@@ -0,0 +1,224 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Multi-process serving.
+
+With GRPC_PROCESSES other than 1, the service runs several worker processes, each with its own gRPC
+server, database connection pools and caches, all listening on SERVICE_PORT through SO_REUSEPORT: the kernel
+spreads the incoming connections among them, so the servicer CPU work (ORM objects hydration, protobuf
+messages building) is no longer bound to a single core by the GIL.
+
+The workers are started with the `spawn` method, so that neither the gRPC core nor the database engines are
+inherited from the supervisor process. The supervisor restarts the workers that exit or whose heartbeat stops,
+relays SIGUSR1 (response cache flush) and, on SIGTERM / SIGINT, stops the workers gracefully. A worker that
+keeps crashing soon after its start is restarted with an exponential backoff, and the supervisor gives up
+after `max_restarts` such crashes in a row.
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 1
+MAX_RESTART_DELAY = 60
+
+
+def process_count(cfg) -> int:
+    """ Number of worker processes, GRPC_PROCESSES or one per CPU """
+    return cfg.grpc_processes or os.cpu_count() or 1
+
+
+def worker_config(cfg, index: int):
+    """ Adapt the service configuration to the worker `index`: each worker exposes its own metrics """
+    if cfg.metrics_port:
+        cfg.metrics_port += index
+    if cfg.metrics_file:
+        path = Path(cfg.metrics_file)
+        cfg.metrics_file = str(path.with_name(f"{path.stem}.{index}{path.suffix}"))
+    return cfg
+
+
+def beat_periodically(heartbeat, interval: float = HEARTBEAT_INTERVAL) -> threading.Thread:
+    """ Update the worker `heartbeat` shared value every `interval` seconds, from a daemon thread """
+
+    def beat():
+        while True:
+            heartbeat.value = time.time()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=beat, name="heartbeat", daemon=True)
+    thread.start()
+    return thread
+
+
+def run_worker(index: int, heartbeat) -> None:
+    """ Worker process entry point, serves until SIGTERM """
+    # Imported here as the supervisor doesn't need the servicer
+    from ensembl.production.metadata.grpc.config import MetadataConfig
+    from ensembl.production.metadata.grpc.service import serve, serve_async
+
+    # the supervisor alone handles the terminal interrupts, and stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    beat_periodically(heartbeat)
+    if MetadataConfig().grpc_async:
+        import asyncio
+        asyncio.run(serve_async(worker_index=index))
+    else:
+        serve(worker_index=index)
+
+
+class WorkerCrashLoop(Exception):
+    """ Raised by the supervisor when a worker keeps crashing soon after its start """
+
+
+class Worker:
+    def __init__(self, index: int, process, heartbeat):
+        self.index = index
+        self.process = process
+        self.heartbeat = heartbeat
+        # restarts in a row, each after the worker crashed within the restart window
+        self.restarts = 0
+        self.started = time.monotonic()
+        self.exited = None
+
+
+class Supervisor:
+    """
+    Start and watch the worker processes of the service.
+
+    Args:
+        processes: Number of worker processes.
+        shutdown_grace: Seconds given to the workers to finish their RPCs when stopped.
+        heartbeat_timeout: Seconds without heartbeat after which a worker is restarted, 0 to only restart the
+            workers that exit.
+        restart_backoff: Seconds before the second restart of a crashing worker, doubled at each further
+            restart up to MAX_RESTART_DELAY. The first restart is immediate.
+        restart_window: Seconds a worker must run for its restarts count to start over.
+        max_restarts: Restarts in a row of a worker crashing within the restart window after which the
+            supervisor stops, 0 for no limit.
+        target: Worker processes entry point, called with the worker index and heartbeat.
+    """
+
+    def __init__(self, processes: int, shutdown_grace: float = 10, heartbeat_timeout: float = 30,
+                 restart_backoff: float = 1, restart_window: float = 60, max_restarts: int = 5,
+                 target=run_worker):
+        self.processes = processes
+        self.shutdown_grace = shutdown_grace
+        self.heartbeat_timeout = heartbeat_timeout
+        self.restart_backoff = restart_backoff
+        self.restart_window = restart_window
+        self.max_restarts = max_restarts
+        self.target = target
+        self.workers = []
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = threading.Event()
+
+    def _spawn(self, index: int) -> Worker:
+        heartbeat = self._context.Value("d", time.time(), lock=False)
+        process = self._context.Process(
+            target=self.target, args=(index, heartbeat), name=f"grpc-worker-{index}", daemon=False
+        )
+        process.start()
+        logger.info(f"Started gRPC worker {index} (pid {process.pid})")
+        return Worker(index, process, heartbeat)
+
+    def start(self) -> "Supervisor":
+        self.workers = [self._spawn(index) for index in range(self.processes)]
+        return self
+
+    def restart_delay(self, restarts: int) -> float:
+        """ Seconds to wait before restarting a worker already restarted `restarts` times in a row """
+        if not restarts:
+            return 0
+        return min(self.restart_backoff * 2 ** (restarts - 1), MAX_RESTART_DELAY)
+
+    def check(self) -> int:
+        """
+        Restart the workers that exited or whose heartbeat is late, once their backoff delay has elapsed.
+
+        Returns:
+            The number of restarted workers.
+
+        Raises:
+            WorkerCrashLoop: If a worker crashed within the restart window `max_restarts` times in a row.
+        """
+        restarted = 0
+        for i, worker in enumerate(self.workers):
+            if self._stopping.is_set():
+                break
+            if worker.exited is None:
+                if not worker.process.is_alive():
+                    logger.warning(f"gRPC worker {worker.index} (pid {worker.process.pid}) exited with code "
+                                   f"{worker.process.exitcode}")
+                elif self.heartbeat_timeout and time.time() - worker.heartbeat.value > self.heartbeat_timeout:
+                    logger.warning(f"gRPC worker {worker.index} (pid {worker.process.pid}) missed its heartbeat "
+                                   f"for more than {self.heartbeat_timeout}s, killing it")
+                    worker.process.kill()
+                    worker.process.join()
+                else:
+                    continue
+                worker.exited = time.monotonic()
+                if worker.exited - worker.started > self.restart_window:
+                    worker.restarts = 0
+                if self.max_restarts and worker.restarts >= self.max_restarts:
+                    raise WorkerCrashLoop(f"gRPC worker {worker.index} crashed {worker.restarts + 1} times "
+                                          f"in a row within {self.restart_window}s of its start")
+                logger.warning(f"Restarting gRPC worker {worker.index} in "
+                               f"{self.restart_delay(worker.restarts)}s")
+            if time.monotonic() - worker.exited < self.restart_delay(worker.restarts):
+                continue
+            replacement = self._spawn(worker.index)
+            replacement.restarts = worker.restarts + 1
+            self.workers[i] = replacement
+            restarted += 1
+        return restarted
+
+    def signal(self, signum) -> None:
+        """ Send the `signum` signal to the running workers """
+        for worker in self.workers:
+            if worker.process.is_alive():
+                os.kill(worker.process.pid, signum)
+
+    def stop(self) -> None:
+        """ Stop the workers gracefully, killing those still running after the grace period """
+        self._stopping.set()
+        self.signal(signal.SIGTERM)
+        deadline = time.monotonic() + self.shutdown_grace + 5
+        for worker in self.workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                logger.warning(f"gRPC worker {worker.index} (pid {worker.process.pid}) didn't stop, "
+                               f"killing it")
+                worker.process.kill()
+                worker.process.join()
+
+    def run(self, check_interval: float = 1) -> None:
+        """ Start the workers and watch them until SIGTERM / SIGINT, must be called from the main thread """
+        signal.signal(signal.SIGTERM, lambda signum, frame: self._stopping.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self._stopping.set())
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.signal(signal.SIGUSR1))
+        self.start()
+        try:
+            while not self._stopping.wait(check_interval):
+                self.check()
+        except WorkerCrashLoop as e:
+            logger.error(f"{e}, stopping the service")
+            raise
+        finally:
+            logger.info(f"Stopping the {len(self.workers)} gRPC workers...")
+            self.stop()
+            logger.info("gRPC workers have shut down")
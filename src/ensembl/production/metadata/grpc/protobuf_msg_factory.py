@@ -228,7 +228,8 @@ def create_assembly_info(data=None):
         accession=data.Assembly.accession,
         level=data.Assembly.level,
         name=data.Assembly.name,
-        chromosomal=data.AssemblySequence.chromosomal,
+        # BOOLEAN in DuckDB copies
+        chromosomal=int(data.AssemblySequence.chromosomal),
         length=data.AssemblySequence.length,
         sequence_location=data.AssemblySequence.sequence_location,
         md5=data.AssemblySequence.md5,
@@ -602,3 +603,21 @@ def create_genome_counts(data=None):
         total=data["total_genomes"],
         counts=data["counts"]
     )
+
+
+def create_genome_list(data=None):
+    if data is None:
+        return ensembl_metadata_pb2.GenomeList()
+
+    return ensembl_metadata_pb2.GenomeList(
+        genomes=data
+    )
+
+
+def create_brief_genome_details_list(data=None):
+    if data is None:
+        return ensembl_metadata_pb2.BriefGenomeDetailsList()
+
+    return ensembl_metadata_pb2.BriefGenomeDetailsList(
+        genomes=data
+    )
@@ -0,0 +1,257 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Cache of the serialised responses of the unary RPCs.
+
+The responses only change with the release state of the metadata DB (see fetch_release_generation), so they
+are cached under (RPC, request bytes, release generation): a hit skips the database queries, the protobuf
+message building and its serialisation. The whole cache is dropped when the release generation changes, or on
+demand (SIGUSR1 on the server, see service.py), and the entries expire after a maximum age. The release
+generation doesn't follow the unreleased data, so the cache is not used with ALLOW_UNRELEASED.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Set, Tuple
+
+import grpc
+from ensembl.utils.database import DBConnection
+
+from ensembl.production.metadata.api.adaptors.genome import fetch_release_generation
+from ensembl.production.metadata.grpc.metrics import Counter, Gauge, Metrics, serialised_response
+
+__all__ = ["ResponseCache", "ReleaseGeneration", "ResponseCacheInterceptor", "AsyncResponseCacheInterceptor"]
+
+logger = logging.getLogger(__name__)
+
+HITS_COUNTER = ("grpc_response_cache_hits_total", "Responses served from the response cache", ("method",))
+MISSES_COUNTER = ("grpc_response_cache_misses_total", "Responses computed and stored in the response cache",
+                  ("method",))
+BYTES_GAUGE = ("grpc_response_cache_bytes", "Size of the response cache entries in bytes")
+
+
+class ResponseCache:
+    """
+    Thread safe LRU cache of serialised responses, bounded by the total size of its keys and values in bytes.
+
+    Args:
+        max_bytes: Maximum size of the cache, the least recently used entries are evicted first.
+            0 disables the cache.
+        max_age: Seconds an entry is served for, None for no limit. It bounds the staleness of the responses
+            depending on changes the release generation doesn't see, e.g. dataset attributes updated in place.
+    """
+
+    def __init__(self, max_bytes: int, max_age: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.generation = None
+        self._entries: OrderedDict[Tuple[str, bytes, Hashable], Tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _size(key: Tuple[str, bytes, Hashable], value: bytes) -> int:
+        return len(key[0]) + len(key[1]) + len(value)
+
+    def get(self, key: Tuple[str, bytes, Hashable]) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.max_age is not None and time.monotonic() - entry[1] >= self.max_age:
+                del self._entries[key]
+                self.nbytes -= self._size(key, entry[0])
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Tuple[str, bytes, Hashable], value: bytes) -> None:
+        size = self._size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key[2] != self.generation:
+                # stored by a request started before the generation changed
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= self._size(key, previous[0])
+            self._entries[key] = (value, time.monotonic())
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                evicted_key, (evicted, _) = self._entries.popitem(last=False)
+                self.nbytes -= self._size(evicted_key, evicted)
+
+    def validate(self, generation: Hashable) -> None:
+        """ Drop all the entries if the release generation changed """
+        with self._lock:
+            if generation != self.generation:
+                self._clear()
+                self.generation = generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "bytes": self.nbytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+
+class ReleaseGeneration:
+    """
+    Token of the release state of the metadata DB, a counter bumped whenever fetch_release_generation changes.
+
+    The database is checked at most every `refresh_interval` seconds, 0 checks it on each call.
+    """
+
+    def __init__(self, metadata_db: DBConnection, refresh_interval: float = 60):
+        self.metadata_db = metadata_db
+        self.refresh_interval = refresh_interval
+        self.token = 0
+        self._generation = None
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def due(self) -> bool:
+        return self._checked is None or time.monotonic() - self._checked >= self.refresh_interval
+
+    def current(self) -> int:
+        if self.due():
+            with self._lock:
+                # Another thread may have checked while we were waiting for the lock
+                if self.due():
+                    with self.metadata_db.session_scope() as session:
+                        generation = fetch_release_generation(session)
+                    if generation != self._generation:
+                        if self._generation is not None:
+                            logger.info("Release state changed, dropping the cached responses")
+                        self._generation = generation
+                        self.token += 1
+                    self._checked = time.monotonic()
+        return self.token
+
+
+class _ResponseCacheInterceptorBase:
+    def __init__(self, cache: ResponseCache, generation: ReleaseGeneration, rpcs: Optional[Set[str]] = None,
+                 metrics: Metrics = None):
+        self.cache = cache
+        self.generation = generation
+        self.rpcs = rpcs
+        self.serialisation = metrics.rpc_serialisation if metrics else None
+        if metrics:
+            self.hits = metrics.counter(*HITS_COUNTER)
+            self.misses = metrics.counter(*MISSES_COUNTER)
+            self.nbytes = metrics.gauge(*BYTES_GAUGE)
+        else:
+            self.hits = Counter(*HITS_COUNTER)
+            self.misses = Counter(*MISSES_COUNTER)
+            self.nbytes = Gauge(*BYTES_GAUGE)
+
+    def _cached_handler(self, handler, handler_call_details) -> Optional[str]:
+        """ The RPC name when its responses are cached """
+        if handler is None or handler.unary_unary is None or self.cache.max_bytes <= 0:
+            return None
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        if self.rpcs is not None and method not in self.rpcs:
+            return None
+        return method
+
+    def _lookup(self, method: str, request, generation: int) -> Tuple[Tuple, Optional[bytes]]:
+        self.cache.validate(generation)
+        key = (method, request.SerializeToString(deterministic=True), generation)
+        data = self.cache.get(key)
+        (self.hits if data is not None else self.misses).inc(method=method)
+        return key, data
+
+    def _store(self, key: Tuple, data: bytes, context) -> None:
+        code = context.code()
+        if code is None or code == grpc.StatusCode.OK:
+            self.cache.set(key, data)
+            self.nbytes.set(self.cache.nbytes)
+
+    def _serialize(self, method: str, serializer, message) -> bytes:
+        """ Serialise a computed response, its serialisation time is reported to the metrics """
+        start = time.perf_counter()
+        data = serializer(message) if serializer else message
+        if self.serialisation is not None:
+            self.serialisation.observe(time.perf_counter() - start, method=method)
+        return data
+
+
+class ResponseCacheInterceptor(_ResponseCacheInterceptorBase, grpc.ServerInterceptor):
+    """
+    Serves the unary RPCs of a threaded gRPC server from a ResponseCache.
+
+    Args:
+        cache: Cache of the serialised responses.
+        generation: Release generation the cached responses are valid for.
+        rpcs: Names of the RPCs to cache, None for all the unary RPCs.
+        metrics: Metrics registering the cache hits / misses counters.
+    """
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        method = self._cached_handler(handler, handler_call_details)
+        if method is None:
+            return handler
+        behavior, serializer = handler.unary_unary, handler.response_serializer
+
+        def cached(request, context):
+            key, data = self._lookup(method, request, self.generation.current())
+            if data is None:
+                data = self._serialize(method, serializer, behavior(request, context))
+                self._store(key, data, context)
+            return data
+
+        return handler._replace(unary_unary=cached, response_serializer=serialised_response)
+
+
+class AsyncResponseCacheInterceptor(_ResponseCacheInterceptorBase, grpc.aio.ServerInterceptor):
+    """ Serves the unary RPCs of a grpc.aio server from a ResponseCache, see ResponseCacheInterceptor """
+
+    async def _current_generation(self) -> int:
+        if self.generation.due():
+            # the release state is checked with the blocking driver
+            return await asyncio.get_running_loop().run_in_executor(None, self.generation.current)
+        return self.generation.current()
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        method = self._cached_handler(handler, handler_call_details)
+        if method is None:
+            return handler
+        behavior, serializer = handler.unary_unary, handler.response_serializer
+
+        async def cached(request, context):
+            key, data = self._lookup(method, request, await self._current_generation())
+            if data is None:
+                data = self._serialize(method, serializer, await behavior(request, context))
+                self._store(key, data, context)
+            return data
+
+        return handler._replace(unary_unary=cached, response_serializer=serialised_response)
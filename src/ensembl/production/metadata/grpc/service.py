@@ -9,47 +9,180 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import asyncio
 import logging
+import signal
 from concurrent import futures
 
 import grpc
 from grpc_reflection.v1alpha import reflection
 
+from ensembl.production.metadata.api.adaptors.base import PooledDBConnection
 from ensembl.production.metadata.grpc import ensembl_metadata_pb2_grpc, ensembl_metadata_pb2
+from ensembl.production.metadata.grpc.coalescing import AsyncCoalescingInterceptor, CoalescingInterceptor, \
+    parse_rpc_names
 from ensembl.production.metadata.grpc.config import MetadataConfig
+from ensembl.production.metadata.grpc.metrics import AsyncMetricsInterceptor, MetricsInterceptor, \
+    start_metrics
+from ensembl.production.metadata.grpc.prefork import Supervisor, process_count, worker_config
+from ensembl.production.metadata.grpc.response_cache import AsyncResponseCacheInterceptor, \
+    ReleaseGeneration, ResponseCache, ResponseCacheInterceptor
 from ensembl.production.metadata.grpc.servicer import EnsemblMetadataServicer
+from ensembl.production.metadata.grpc.warmup import report_warm_up, warm_up
 
 logger = logging.getLogger(__name__)
 
 
-def serve():
-    cfg = MetadataConfig()
+SERVICE_NAMES = (
+    ensembl_metadata_pb2.DESCRIPTOR.services_by_name['EnsemblMetadata'].full_name,
+    reflection.SERVICE_NAME
+)
+
+
+def setup_logging(cfg):
     log_level = logging.DEBUG if cfg.debug_mode else logging.WARNING
 
     logging.basicConfig(
         level=log_level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(
-        EnsemblMetadataServicer(), server
-    )
-    SERVICE_NAMES = (
-        ensembl_metadata_pb2.DESCRIPTOR.services_by_name['EnsemblMetadata'].full_name,
-        reflection.SERVICE_NAME
+
+
+def server_interceptors(cfg, metrics=None, response_cache=None, aio=False):
+    """ Interceptors of the threaded (or grpc.aio) server, outermost first """
+    interceptors = []
+    if metrics:
+        interceptors.append((AsyncMetricsInterceptor if aio else MetricsInterceptor)(metrics))
+    cached_rpcs = parse_rpc_names(cfg.response_cache_rpcs)
+    if response_cache is not None and cached_rpcs != set():
+        generation = ReleaseGeneration(
+            PooledDBConnection.from_config(cfg.metadata_uri), cfg.response_cache_refresh_interval
+        )
+        interceptors.append((AsyncResponseCacheInterceptor if aio else ResponseCacheInterceptor)(
+            response_cache, generation, cached_rpcs, metrics
+        ))
+    coalesced_rpcs = parse_rpc_names(cfg.coalesce_rpcs)
+    if coalesced_rpcs != set():
+        interceptors.append(
+            (AsyncCoalescingInterceptor if aio else CoalescingInterceptor)(coalesced_rpcs, metrics)
+        )
+    return interceptors
+
+
+def server_options(cfg) -> dict:
+    """
+    Options of the threaded (or grpc.aio) server: the RPCs beyond GRPC_MAX_CONCURRENT_RPCS are rejected with
+    RESOURCE_EXHAUSTED instead of queueing for a worker / database connection, and the worker processes of a
+    multi-process service share the port.
+    """
+    options = {"maximum_concurrent_rpcs": cfg.grpc_max_concurrent_rpcs or None}
+    if process_count(cfg) != 1:
+        options["options"] = [("grpc.so_reuseport", 1)]
+    return options
+
+
+def start_response_cache(cfg):
+    """ Response cache of the service, None when RESPONSE_CACHE_SIZE is 0 or the unreleased data is served """
+    if cfg.response_cache_size <= 0:
+        return None
+    if cfg.allow_unreleased:
+        # the release generation doesn't change with the unreleased genomes / datasets
+        logger.warning("RESPONSE_CACHE_SIZE is ignored with ALLOW_UNRELEASED, the response cache is disabled")
+        return None
+    return ResponseCache(cfg.response_cache_size, cfg.response_cache_max_age)
+
+
+def flush_response_cache(response_cache):
+    logger.warning(f"Flushing the response cache: {response_cache.stats()}")
+    response_cache.clear()
+
+
+def serve(worker_index=None):
+    cfg = MetadataConfig().validate()
+    if worker_index is not None:
+        worker_config(cfg, worker_index)
+    setup_logging(cfg)
+    metrics = start_metrics(cfg)
+    response_cache = start_response_cache(cfg)
+    if response_cache is not None:
+        signal.signal(signal.SIGUSR1, lambda signum, frame: flush_response_cache(response_cache))
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=cfg.grpc_max_workers),
+        interceptors=server_interceptors(cfg, metrics, response_cache),
+        **server_options(cfg)
     )
+    servicer = EnsemblMetadataServicer()
+    ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(servicer, server)
     reflection.enable_server_reflection(SERVICE_NAMES, server)
+    if cfg.warmup:
+        # before the port is opened, the service is only ready once warmed up
+        report_warm_up(warm_up(servicer.genome_adaptor, cfg.warmup_group, cfg.warmup_max_genomes), metrics)
     server.add_insecure_port(f"[::]:{cfg.service_port}")
     server.start()
+    # stop accepting RPCs, and let the running ones finish
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop(grace=cfg.grpc_shutdown_grace))
     try:
-        logger.info(f"Starting GRPC Server on {cfg.service_port} DEBUG: {cfg.debug_mode}")
+        logger.info(f"Starting GRPC Server on {cfg.service_port} DEBUG: {cfg.debug_mode}"
+                    + (f" worker: {worker_index}" if worker_index is not None else ""))
         server.wait_for_termination()
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt caught, stopping the server...")
         server.stop(grace=0)  # Immediately stop the server
         logger.info("gRPC server has shut down gracefully")
+    finally:
+        if metrics:
+            metrics.close()
+
+
+async def serve_async(worker_index=None):
+    # Imported here so the threaded server doesn't require the asyncio database drivers
+    from ensembl.production.metadata.grpc.aio_servicer import AsyncEnsemblMetadataServicer
+
+    cfg = MetadataConfig().validate()
+    if worker_index is not None:
+        worker_config(cfg, worker_index)
+    setup_logging(cfg)
+    metrics = start_metrics(cfg)
+    response_cache = start_response_cache(cfg)
+    if response_cache is not None:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, flush_response_cache, response_cache)
+    server = grpc.aio.server(
+        interceptors=server_interceptors(cfg, metrics, response_cache, aio=True), **server_options(cfg)
+    )
+    servicer = AsyncEnsemblMetadataServicer()
+    ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(servicer, server)
+    reflection.enable_server_reflection(SERVICE_NAMES, server)
+    if cfg.warmup:
+        report = await servicer.genome_adaptor.run_sync(warm_up, cfg.warmup_group, cfg.warmup_max_genomes)
+        report_warm_up(report, metrics)
+    server.add_insecure_port(f"[::]:{cfg.service_port}")
+    await server.start()
+    asyncio.get_running_loop().add_signal_handler(
+        signal.SIGTERM, lambda: asyncio.ensure_future(server.stop(grace=cfg.grpc_shutdown_grace))
+    )
+    try:
+        logger.info(f"Starting asyncio GRPC Server on {cfg.service_port} DEBUG: {cfg.debug_mode}"
+                    + (f" worker: {worker_index}" if worker_index is not None else ""))
+        await server.wait_for_termination()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("Interrupted, stopping the server...")
+        await server.stop(grace=0)
+        logger.info("gRPC server has shut down gracefully")
+    finally:
+        await servicer.close()
+        if metrics:
+            metrics.close()
 
 
 if __name__ == "__main__":
     logger.info(f"gRPC server starting...")
-    serve()
+    main_cfg = MetadataConfig().validate()
+    if process_count(main_cfg) != 1:
+        setup_logging(main_cfg)
+        Supervisor(process_count(main_cfg), main_cfg.grpc_shutdown_grace,
+                   main_cfg.grpc_worker_heartbeat_timeout, main_cfg.grpc_worker_restart_backoff,
+                   main_cfg.grpc_worker_restart_window, main_cfg.grpc_worker_max_restarts).run()
+    elif main_cfg.grpc_async:
+        asyncio.run(serve_async())
+    else:
+        serve()
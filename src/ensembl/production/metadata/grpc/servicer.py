@@ -13,6 +13,7 @@ import logging
 
 import ensembl.production.metadata.grpc.utils as utils
 from ensembl.production.metadata.api.adaptors import GenomeAdaptor
+from ensembl.production.metadata.api.adaptors.snapshot import SnapshotGenomeAdaptor
 from ensembl.production.metadata.api.adaptors.vep import VepAdaptor
 from ensembl.production.metadata.grpc import ensembl_metadata_pb2_grpc
 from ensembl.production.metadata.grpc.config import MetadataConfig
@@ -23,7 +24,7 @@ logger = logging.getLogger(__name__)
 class EnsemblMetadataServicer(ensembl_metadata_pb2_grpc.EnsemblMetadataServicer):
     def __init__(self):
         self.genome_adaptor = utils.connect_to_db(
-            adaptor_class=GenomeAdaptor,
+            adaptor_class=SnapshotGenomeAdaptor if MetadataConfig().snapshot_mode else GenomeAdaptor,
             taxonomy_uri=MetadataConfig().taxon_uri
         )
         self.vep_adaptor = utils.connect_to_db(
@@ -78,6 +79,16 @@ class EnsemblMetadataServicer(ensembl_metadata_pb2_grpc.EnsemblMetadataServicer)
         logger.debug(f"Received RPC for GetBriefGenomeDetailsByUUID with request: {request}")
         return utils.get_brief_genome_details_by_uuid(self.genome_adaptor, request.genome_uuid, request.release_version)
 
+    def GetGenomesByUUIDs(self, request, context):
+        logger.debug(f"Received RPC for GetGenomesByUUIDs with request: {request}")
+        return utils.get_genomes_by_uuids(self.genome_adaptor, list(request.genome_uuid), request.release_version)
+
+    def GetBriefGenomeDetailsByUUIDs(self, request, context):
+        logger.debug(f"Received RPC for GetBriefGenomeDetailsByUUIDs with request: {request}")
+        return utils.get_brief_genome_details_by_uuids(
+            self.genome_adaptor, list(request.genome_uuid), request.release_version
+        )
+
 
     def GetGenomesBySpecificKeyword(self, request, context):
         logger.debug(f"Received RPC for GetGenomesBySpecificKeyword with request: {request}")
@@ -18,7 +18,6 @@ from typing import Type, Any
 import ensembl.production.metadata.grpc.protobuf_msg_factory as msg_factory
 from ensembl.production.metadata.api.adaptors import GenomeAdaptor, BaseAdaptor
 from ensembl.production.metadata.api.adaptors import ReleaseAdaptor
-from ensembl.production.metadata.api.models import Genome
 from ensembl.production.metadata.grpc.config import MetadataConfig
 
 logger = logging.getLogger(__name__)
@@ -83,8 +82,13 @@ def is_valid_uuid(value):
 def get_alternative_names(db_conn, taxon_id):
     """ Get alternative names for a given taxon ID """
     taxon_ifo = db_conn.fetch_taxonomy_names(taxon_id)
-    alternative_names = taxon_ifo[taxon_id].get('synonym')
-    genbank_common_name = taxon_ifo[taxon_id].get('genbank_common_name')
+    return _alternative_names(taxon_ifo[taxon_id])
+
+
+def _alternative_names(taxon_names):
+    """ Alternative names out of the fetch_taxonomy_names entry of a taxon """
+    alternative_names = list(taxon_names.get('synonym'))
+    genbank_common_name = taxon_names.get('genbank_common_name')
 
     if genbank_common_name is not None:
         alternative_names.append(genbank_common_name)
@@ -175,6 +179,16 @@ def create_genome_with_attributes_and_count(db_conn, genome, release_version):
                                                         release_version=release_version)
 
     logger.debug(f"Genome Datasets Retrieved: {attrib_data_results}")
+    # fetch related assemblies count
+    related_assemblies_count = db_conn.fetch_assemblies_count(genome.Organism.species_taxonomy_id)
+
+    alternative_names = get_alternative_names(db_conn, genome.Organism.species_taxonomy_id)
+
+    return _create_genome(genome, attrib_data_results, related_assemblies_count, alternative_names)
+
+
+def _create_genome(genome, attrib_data_results, related_assemblies_count, alternative_names):
+    """ Build the Genome message out of the already fetched datasets, assemblies count and names """
     attribs = []
     datasets = []
     if len(attrib_data_results) > 0:
@@ -185,11 +199,6 @@ def create_genome_with_attributes_and_count(db_conn, genome, release_version):
             for dataset in dataset_group.datasets:
                 attribs.extend(dataset.attributes)
 
-    # fetch related assemblies count
-    related_assemblies_count = db_conn.fetch_assemblies_count(genome.Organism.species_taxonomy_id)
-
-    alternative_names = get_alternative_names(db_conn, genome.Organism.species_taxonomy_id)
-
     return msg_factory.create_genome(
         data=genome,
         attributes=attribs,
@@ -366,6 +375,103 @@ def get_brief_genome_details_by_uuid(db_conn, genome_uuid_or_tag, release_versio
     return msg_factory.create_brief_genome_details(current_genome, latest_genome)
 
 
+def _unique_genome_uuids(genome_uuids):
+    """ Requested genome UUIDs without the empty and duplicated ones, in the requested order """
+    return list(dict.fromkeys(genome_uuid for genome_uuid in genome_uuids if genome_uuid))
+
+
+def get_genomes_by_uuids(db_conn, genome_uuids, release_version):
+    """
+    Batched flavour of get_genome_by_uuid.
+
+    The whole batch is resolved with a fixed number of queries (genomes, datasets, assemblies counts and
+    taxonomy names), whatever the number of requested genomes.
+
+    Returns:
+        A GenomeList with the genomes in the requested order, unknown genome UUIDs are left out.
+    """
+    genome_uuids = _unique_genome_uuids(genome_uuids)
+    if not genome_uuids:
+        logger.warning("Missing or Empty Genome UUID field.")
+        return msg_factory.create_genome_list()
+    genomes = {}
+    for genome in db_conn.fetch_genomes(genome_uuid=genome_uuids, release_version=release_version):
+        genomes.setdefault(genome.Genome.genome_uuid, genome)
+    missing = [genome_uuid for genome_uuid in genome_uuids if genome_uuid not in genomes]
+    if missing:
+        logger.error(f"No Genome/Release found: {missing}/{release_version}")
+    if not genomes:
+        return msg_factory.create_genome_list()
+
+    attrib_data_results = {}
+    for dataset_group in db_conn.fetch_genome_datasets(genome_uuid=list(genomes.keys()),
+                                                       dataset_type_name="all",
+                                                       release_version=release_version):
+        attrib_data_results.setdefault(dataset_group.genome.genome_uuid, []).append(dataset_group)
+    species_taxonomy_ids = list(dict.fromkeys(genome.Organism.species_taxonomy_id for genome in genomes.values()))
+    related_assemblies_counts = db_conn.fetch_assemblies_counts(species_taxonomy_ids)
+    taxonomy_names = db_conn.fetch_taxonomy_names(species_taxonomy_ids)
+
+    return msg_factory.create_genome_list([
+        _create_genome(
+            genome=genomes[genome_uuid],
+            attrib_data_results=attrib_data_results.get(genome_uuid, []),
+            related_assemblies_count=related_assemblies_counts[genomes[genome_uuid].Organism.species_taxonomy_id],
+            alternative_names=_alternative_names(taxonomy_names[genomes[genome_uuid].Organism.species_taxonomy_id])
+        )
+        for genome_uuid in genome_uuids if genome_uuid in genomes
+    ])
+
+
+def get_brief_genome_details_by_uuids(db_conn, genome_uuids, release_version):
+    """
+    Batched flavour of get_brief_genome_details_by_uuid, for genome UUIDs only (no tags).
+
+    The whole batch is resolved with two queries: the requested genomes, then the genomes sharing their assemblies.
+
+    Returns:
+        A BriefGenomeDetailsList with the genomes in the requested order, unknown genome UUIDs are left out.
+    """
+    genome_uuids = _unique_genome_uuids(genome_uuids)
+    if not genome_uuids:
+        logger.warning("Missing or Empty Genome UUID field.")
+        return msg_factory.create_brief_genome_details_list()
+    genome_results = {}
+    for genome in db_conn.fetch_genomes(genome_uuid=genome_uuids, release_version=release_version):
+        genome_results.setdefault(genome.Genome.genome_uuid, []).append(genome)
+
+    current_genomes = {}
+    for genome_uuid in genome_uuids:
+        results = genome_results.get(genome_uuid)
+        if not results:
+            logger.error(f"No Genome/Release found: {genome_uuid}/{release_version}")
+            continue
+        if len(results) > 1:
+            logger.warning(f"Multiple results found for Genome UUID/Release version: {genome_uuid}/{release_version}")
+            # released in both a partial and integrated release, we are interested in the integrated one
+            results = [res for res in results if res.EnsemblRelease.release_type == "integrated"]
+            if not results:
+                logger.error(f"No integrated release found: {genome_uuid}/{release_version}")
+                continue
+        current_genomes[genome_uuid] = results[0]
+    if not current_genomes:
+        return msg_factory.create_brief_genome_details_list()
+
+    # Latest genome of each assembly, first one due to ordering in fetch_genomes
+    assembly_names = list(dict.fromkeys(genome.Assembly.name for genome in current_genomes.values()))
+    latest_genomes = {}
+    for genome in db_conn.fetch_genomes(assembly_name=assembly_names):
+        latest_genomes.setdefault(genome.Assembly.name.lower(), genome)
+
+    brief_genomes = []
+    for genome_uuid, current_genome in current_genomes.items():
+        latest_genome = latest_genomes.get(current_genome.Assembly.name.lower())
+        if latest_genome is not None and latest_genome.Genome.genome_uuid == genome_uuid:
+            latest_genome = None
+        brief_genomes.append(msg_factory.create_brief_genome_details(current_genome, latest_genome))
+    return msg_factory.create_brief_genome_details_list(brief_genomes)
+
+
 def get_attributes_by_genome_uuid(db_conn, genome_uuid, release_version):
     if not genome_uuid:
         logger.warning("Missing or Empty Genome UUID field.")
@@ -559,8 +665,15 @@ def genome_assembly_sequence_region(db_conn, genome_uuid, sequence_region_name):
     return msg_factory.create_genome_assembly_sequence_region()
 
 
+def _release_adaptor(metadata_db):
+    """Reuse the given connection when it is already a ReleaseAdaptor (asyncio servicer)."""
+    if isinstance(metadata_db, ReleaseAdaptor):
+        return metadata_db
+    return ReleaseAdaptor(metadata_uri=MetadataConfig().metadata_uri)
+
+
 def release_iterator(metadata_db, site_name, release_label, current_only):
-    conn = ReleaseAdaptor(metadata_uri=MetadataConfig().metadata_uri)
+    conn = _release_adaptor(metadata_db)
 
     # set release_label and site_name to None if it's an empty list
     release_label = release_label or None
@@ -582,7 +695,7 @@ def release_by_uuid_iterator(metadata_db, genome_uuid):
     if not genome_uuid:
         return
 
-    conn = ReleaseAdaptor(metadata_uri=MetadataConfig().metadata_uri)
+    conn = _release_adaptor(metadata_db)
     release_results = conn.fetch_releases_for_genome(
         genome_uuid=genome_uuid,
     )
@@ -653,27 +766,13 @@ def get_ftp_links(db_conn, genome_uuid, dataset_type, release_version):
     if not release_version:
         release_version = None
 
-    # Find the Genome
-    with db_conn.metadata_db.session_scope() as session:
-        genome = session.query(Genome).filter(Genome.genome_uuid == genome_uuid).first()
-
-        # Return empty links if Genome is not found
-        if genome is None:
-            logger.debug("No Genome found.")
-            return msg_factory.create_paths()
-
-        # Find the links for the given dataset.
-        # Find the links for the given dataset.
-        # Note: release_version filtration is not implemented in the API yet
-        try:
-            links = db_conn.get_public_path(
-                genome_uuid=genome_uuid,
-                dataset_type=dataset_type
-            )
-        except (ValueError, RuntimeError) as error:
-            # log the errors to error log and return empty list of links
-            logger.error(f"Error fetching links: {error}")
-            return msg_factory.create_paths()
+    # Find the links for the given dataset, an unknown genome is reported as a ValueError
+    # Note: release_version filtration is not implemented in the API yet
+    links = db_conn.get_public_paths(genome_uuids=[genome_uuid], dataset_type=dataset_type)[genome_uuid]
+    if isinstance(links, Exception):
+        # log the errors to error log and return empty list of links
+        logger.error(f"Error fetching links: {links}")
+        return msg_factory.create_paths()
 
     if len(links) > 0:
         response_data = msg_factory.create_paths(data=links)
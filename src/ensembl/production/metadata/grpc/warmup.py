@@ -0,0 +1,102 @@
+#  See the NOTICE file distributed with this work for additional information
+#  regarding copyright ownership.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Startup warm-up of the gRPC service.
+
+Before the server port is opened, the hot RPC code paths are run for the genomes of the species of an
+organism group (the species selector `popular` group by default). It loads the database buffers and the
+statement, taxonomy names and assemblies counts caches, so the first requests after a deploy don't pay for
+them.
+"""
+import logging
+import time
+
+import ensembl.production.metadata.grpc.utils as utils
+
+logger = logging.getLogger(__name__)
+
+# utils helpers called for each warmed up genome, as their RPC would
+GENOME_RPCS = (
+    ("GetGenomeByUUID", lambda db_conn, genome_uuid: utils.get_genome_by_uuid(db_conn, genome_uuid, None)),
+    ("GetBriefGenomeDetailsByUUID",
+     lambda db_conn, genome_uuid: utils.get_brief_genome_details_by_uuid(db_conn, genome_uuid, None)),
+    ("GetAttributesByGenomeUUID",
+     lambda db_conn, genome_uuid: utils.get_attributes_by_genome_uuid(db_conn, genome_uuid, None)),
+    ("GetTopLevelStatisticsByUUID", utils.get_top_level_statistics_by_uuid),
+    ("GetDatasetsListByUUID",
+     lambda db_conn, genome_uuid: utils.get_datasets_list_by_uuid(db_conn, genome_uuid, None)),
+    ("GetFTPLinks", lambda db_conn, genome_uuid: utils.get_ftp_links(db_conn, genome_uuid, "all", None)),
+)
+
+
+def _call(name, fn, *args):
+    try:
+        result = fn(*args)
+        # streaming RPCs helpers are generators
+        return list(result) if hasattr(result, "__next__") else result
+    except Exception as e:
+        logger.warning(f"Warm-up {name}{args[1:]} failed: {e}")
+        return None
+
+
+def warm_up(db_conn, group_code: str = "popular", max_genomes: int = 50) -> dict:
+    """
+    Run the hot RPC code paths for (up to `max_genomes`) genomes of the species of the `group_code` organism
+    group, in the group order.
+
+    Failures are logged and skipped, the warm-up never prevents the service from starting.
+
+    Args:
+        db_conn: GenomeAdaptor of the servicer.
+        group_code: Code of the organism group whose species genomes are warmed up.
+        max_genomes: Maximum number of genomes warmed up.
+
+    Returns:
+        dict with the number of warmed up `species`, `genomes`, `calls` and the warm-up time in `seconds`.
+    """
+    start = time.perf_counter()
+    report = {"species": 0, "genomes": 0, "calls": 0}
+    if group_code == "popular":
+        _call("GetOrganismsGroupCount", utils.get_organisms_group_count, db_conn, None)
+        report["calls"] += 1
+    species = _call("fetch_organisms_group_counts", lambda db, code: db.fetch_organisms_group_counts(
+        group_code=code), db_conn, group_code) or []
+    warmed_up = set()
+    for organism in species:
+        if len(warmed_up) >= max_genomes:
+            break
+        report["species"] += 1
+        genomes = _call(
+            "GetGenomesBySpecificKeyword", utils.get_genomes_by_specific_keyword_iterator, db_conn,
+            None, None, None, None, None, None, None, organism.species_taxonomy_id
+        ) or []
+        report["calls"] += 1
+        for genome in genomes:
+            if len(warmed_up) >= max_genomes:
+                break
+            if genome.genome_uuid in warmed_up:
+                continue
+            warmed_up.add(genome.genome_uuid)
+            for name, fn in GENOME_RPCS:
+                _call(name, fn, db_conn, genome.genome_uuid)
+                report["calls"] += 1
+    report["genomes"] = len(warmed_up)
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def report_warm_up(report: dict, metrics=None) -> None:
+    logger.info(f"Warm-up of {report['genomes']} genomes ({report['species']} species, "
+                f"{report['calls']} calls) done in {report['seconds']:.2f}s")
+    if metrics:
+        metrics.gauge("warmup_seconds", "Duration of the startup warm-up").set(report["seconds"])
+        metrics.gauge("warmup_genomes", "Genomes warmed up at startup").set(report["genomes"])
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import time
+
+import duckdb
+
+# This will write denormalised views of the DuckDB dump made by
+# load_meta_duckdb.py as Parquet files, one directory per view, partitioned
+# by release label (<outdir>/<view>/release_label=<label>/*.parquet), so that
+# the consumers can read them without attaching the whole DuckDB file.
+
+# Requirements: Just the Python duckdb package
+
+# Rows per Parquet row group: each row group carries the min / max statistics
+# of its columns, which the readers use to skip it.
+DEFAULT_ROW_GROUP_SIZE = 100000
+
+GENOMES_VIEW = """
+    SELECT er.label AS release_label,
+           er.version AS release_version,
+           er.release_type,
+           gr.is_current,
+           g.genome_uuid,
+           g.production_name,
+           g.url_name,
+           g.genebuild_date,
+           g.annotation_source,
+           g.provider_name,
+           o.organism_uuid,
+           o.taxonomy_id,
+           o.species_taxonomy_id,
+           o.scientific_name,
+           o.common_name,
+           o.strain,
+           o.strain_type,
+           a.assembly_uuid,
+           a.accession AS assembly_accession,
+           a.name AS assembly_name,
+           a.ucsc_name AS assembly_ucsc_name,
+           a.level AS assembly_level,
+           a.is_reference AS assembly_is_reference
+    FROM genome g
+    JOIN genome_release gr ON gr.genome_id = g.genome_id
+    JOIN ensembl_release er ON er.release_id = gr.release_id
+    JOIN organism o ON o.organism_id = g.organism_id
+    JOIN assembly a ON a.assembly_id = g.assembly_id
+"""
+
+# Genome datasets, by the release they were attached to, the views keeping
+# the current ones only.
+GENOME_DATASETS = """
+    FROM genome_dataset gd
+    JOIN genome g ON g.genome_id = gd.genome_id
+    JOIN dataset d ON d.dataset_id = gd.dataset_id
+    JOIN dataset_type dt ON dt.dataset_type_id = d.dataset_type_id
+    LEFT JOIN ensembl_release er ON er.release_id = gd.release_id
+"""
+
+DATASETS_VIEW = f"""
+    SELECT er.label AS release_label,
+           g.genome_uuid,
+           d.dataset_uuid,
+           dt.name AS dataset_type,
+           d.name AS dataset_name,
+           d.label AS dataset_label,
+           d.version AS dataset_version,
+           d.status AS dataset_status
+    {GENOME_DATASETS}
+    WHERE gd.is_current
+"""
+
+DATASET_ATTRIBUTES_VIEW = f"""
+    SELECT er.label AS release_label,
+           g.genome_uuid,
+           d.dataset_uuid,
+           dt.name AS dataset_type,
+           att.name AS attribute_name,
+           att.type AS attribute_type,
+           da.value
+    {GENOME_DATASETS}
+    JOIN dataset_attribute da ON da.dataset_id = d.dataset_id
+    JOIN attribute att ON att.attribute_id = da.attribute_id
+    WHERE gd.is_current
+"""
+
+# Name: (query, sort columns). The rows are sorted within each partition so
+# that the row group statistics of the sort columns are selective.
+VIEWS = {
+    "genomes": (GENOMES_VIEW, "genome_uuid"),
+    "datasets": (DATASETS_VIEW, "genome_uuid, dataset_type"),
+    "dataset_attributes": (DATASET_ATTRIBUTES_VIEW, "genome_uuid, dataset_type, attribute_name"),
+}
+
+
+def export_view(con, name, outdir, compression="zstd", row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                progress=print):
+    # Write the view `name` under <outdir>/<name>, replacing a previous export.
+    # Returns the number of rows written.
+    query, order = VIEWS[name]
+    start_time = time.perf_counter()
+    rows = con.execute(
+        f"""
+        COPY (SELECT * FROM ({query}) ORDER BY release_label, {order})
+        TO '{os.path.join(outdir, name)}'
+        (FORMAT PARQUET, PARTITION_BY (release_label), COMPRESSION {compression},
+         ROW_GROUP_SIZE {row_group_size}, OVERWRITE)
+        """
+    ).fetchone()[0]
+    progress(f"Exported view {name}: {rows} rows in {time.perf_counter() - start_time:.1f}s")
+    return rows
+
+
+def export_views(con, outdir, views=None, compression="zstd", row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                 progress=print):
+    os.makedirs(outdir, exist_ok=True)
+    return {
+        name: export_view(con, name, outdir, compression, row_group_size, progress)
+        for name in (views or VIEWS)
+    }
+
+
+def main():
+    description = "Writes denormalised views of the metadata DuckDB dump as partitioned Parquet files"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--infile", default="duck_meta.db", help='DuckDB dump made by load_meta_duckdb.py')
+    parser.add_argument("--outdir", default="duck_meta_parquet",
+                        help='Output directory, one sub-directory per view')
+    parser.add_argument("--views", nargs="+", choices=list(VIEWS), help='Views to export, all by default')
+    parser.add_argument("--compression", default="zstd", choices=["zstd", "snappy", "gzip", "uncompressed"],
+                        help='Parquet column compression')
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help='Rows per Parquet row group')
+    args = parser.parse_args()
+
+    print(f"Exporting metadata views from {args.infile} to {args.outdir}")
+    con = duckdb.connect(args.infile, read_only=True)
+    export_views(con, args.outdir, args.views, args.compression, args.row_group_size)
+    print("Done")
+
+
+if __name__ == "__main__":
+    main()
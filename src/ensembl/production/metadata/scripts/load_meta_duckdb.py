@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 import os
 import duckdb
@@ -10,6 +13,17 @@ import duckdb
 
 # Requirements: Just the Python duckdb package
 
+# Tables are copied in ranges of this many primary key values, so that only
+# one range per table being copied is held in memory.
+DEFAULT_CHUNK_ROWS = 500000
+
+# Per table high-water marks of the last copy, for the incremental refreshes.
+STATE_TABLE = "load_state"
+
+# Tables whose rows are never updated in place: an incremental refresh only
+# looks for new and removed keys instead of comparing the row contents.
+APPEND_ONLY_TABLES = {"assembly_sequence", "sequence_alias"}
+
 
 def released_genomes_query():
     # A genome is treated as released when it is connected through
@@ -178,6 +192,220 @@ def copy_query(tbl):
     return filtered_copy_queries.get(tbl, f"FROM metadb.{tbl}")
 
 
+def table_key(con, tbl):
+    # Integer primary key of the source table, used to copy it in ranges.
+    # Falls back on the first column when it is an integer `*_id` one, as
+    # all the metadata tables are defined, when the source catalog doesn't
+    # expose the primary keys.
+    constraints = con.execute(
+        """
+        SELECT constraint_column_names
+        FROM duckdb_constraints()
+        WHERE database_name = 'metadb' AND table_name = ? AND constraint_type = 'PRIMARY KEY'
+        """,
+        [tbl],
+    ).fetchall()
+    columns = con.execute(
+        """
+        SELECT column_name, data_type
+        FROM duckdb_columns()
+        WHERE database_name = 'metadb' AND table_name = ?
+        ORDER BY column_index
+        """,
+        [tbl],
+    ).fetchall()
+    types = dict(columns)
+    if constraints and len(constraints[0][0]) == 1:
+        key = constraints[0][0][0]
+    elif columns and columns[0][0].endswith("_id"):
+        key = columns[0][0]
+    else:
+        return None
+    return key if "INT" in types.get(key, "") else None
+
+
+def key_ranges(con, tbl, key, chunk_rows):
+    # Lower bounds of the primary key ranges of `chunk_rows` rows each, from a
+    # single scan of the source keys: the ranges stay balanced whatever the
+    # gaps between the key values.
+    return [
+        row[0]
+        for row in con.execute(
+            f"""
+            SELECT {key}
+            FROM (
+                SELECT {key}, row_number() OVER (ORDER BY {key}) - 1 AS position
+                FROM metadb.{tbl}
+            )
+            WHERE position % {chunk_rows} = 0
+            ORDER BY {key}
+            """
+        ).fetchall()
+    ]
+
+
+def copy_table(con, tbl, chunk_rows=DEFAULT_CHUNK_ROWS, progress=print):
+    # Copy one table in primary key ranges of `chunk_rows` rows: the ranges
+    # are filtered in the source database, so memory use is bounded by the
+    # range size rather than by the table size. Tables without an integer
+    # key are copied in one go.
+    query = copy_query(tbl)
+    start_time = time.perf_counter()
+    con.execute(f"DROP TABLE IF EXISTS duck_meta.{tbl}")
+    key = table_key(con, tbl) if chunk_rows else None
+    if key is None:
+        con.execute(f"CREATE TABLE duck_meta.{tbl} AS {query}")
+    else:
+        con.execute(f"CREATE TABLE duck_meta.{tbl} AS SELECT * FROM ({query}) LIMIT 0")
+        bounds = key_ranges(con, tbl, key, chunk_rows)
+        for i, start in enumerate(bounds):
+            condition = f"q.{key} >= {start}"
+            if i + 1 < len(bounds):
+                condition += f" AND q.{key} < {bounds[i + 1]}"
+            con.execute(
+                f"INSERT INTO duck_meta.{tbl} SELECT * FROM ({query}) q WHERE {condition} ORDER BY q.{key}"
+            )
+            if i + 1 < len(bounds):
+                progress(f"  {tbl}: {100 * (i + 1) / len(bounds):.0f}% "
+                         f"({time.perf_counter() - start_time:.0f}s)")
+    rows = con.execute(f"SELECT count(*) FROM duck_meta.{tbl}").fetchone()[0]
+    progress(f"Imported table {tbl}: {rows} rows in {time.perf_counter() - start_time:.1f}s")
+    return rows
+
+
+def load_state(con):
+    # {table: (key column, max key)} of the last copy, empty on the first run.
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS duck_meta.{STATE_TABLE} (
+            table_name VARCHAR PRIMARY KEY,
+            key_column VARCHAR,
+            max_key BIGINT,
+            row_count BIGINT,
+            loaded_at TIMESTAMP
+        )
+        """
+    )
+    rows = con.execute(f"SELECT table_name, key_column, max_key FROM duck_meta.{STATE_TABLE}").fetchall()
+    return {tbl: (key, max_key) for tbl, key, max_key in rows}
+
+
+def save_state(con, tables):
+    load_state(con)
+    for tbl in tables:
+        key = table_key(con, tbl)
+        max_key, rows = con.execute(
+            f"SELECT {f'max({key})' if key else 'NULL'}, count(*) FROM duck_meta.{tbl}"
+        ).fetchone()
+        con.execute(
+            f"INSERT OR REPLACE INTO duck_meta.{STATE_TABLE} VALUES (?, ?, ?, ?, now()::TIMESTAMP)",
+            [tbl, key, max_key, rows],
+        )
+
+
+def same_columns(con, tbl):
+    # The source query and the copied table have the same columns, i.e. the
+    # table schema didn't change since its last copy.
+    source = con.execute(f"DESCRIBE SELECT * FROM ({copy_query(tbl)})").fetchall()
+    copied = con.execute(f"DESCRIBE duck_meta.{tbl}").fetchall()
+    return [column[:2] for column in source] == [column[:2] for column in copied]
+
+
+def refresh_table(con, tbl, state, chunk_rows=DEFAULT_CHUNK_ROWS, progress=print):
+    # Apply to the copy of `tbl` the changes of the source since the last copy:
+    # the copied rows no longer in the source (e.g. of genomes no longer
+    # released) are deleted, the new and changed ones copied. New rows are
+    # those above the high-water mark, or below it for rows that only now pass
+    # the released filters; changed rows are found by row hash, except for
+    # the append-only tables. Falls back on a full copy when the table has no
+    # state, integer key or rows, when its schema changed, or when the row count
+    # doesn't match the source after the refresh.
+    query = copy_query(tbl)
+    start_time = time.perf_counter()
+    key, max_key = state.get(tbl, (None, None))
+    if key is None or max_key is None or key != table_key(con, tbl) or not same_columns(con, tbl):
+        return copy_table(con, tbl, chunk_rows, progress)
+    con.execute(f"CREATE OR REPLACE TEMP TABLE {tbl}_source AS SELECT {key} FROM ({query})")
+    if tbl in APPEND_ONLY_TABLES:
+        changed_query = f"""
+            SELECT {key} FROM {tbl}_source WHERE {key} <= {max_key}
+            EXCEPT SELECT {key} FROM duck_meta.{tbl}
+        """
+    else:
+        changed_query = f"""
+            SELECT {key} FROM (
+                SELECT q.{key}, hash(q) FROM ({query}) q
+                EXCEPT SELECT t.{key}, hash(t) FROM duck_meta.{tbl} t
+            )
+        """
+    con.execute(f"CREATE OR REPLACE TEMP TABLE {tbl}_changed AS {changed_query}")
+    con.execute("BEGIN TRANSACTION")
+    try:
+        deleted = con.execute(
+            f"DELETE FROM duck_meta.{tbl} WHERE {key} NOT IN (SELECT {key} FROM {tbl}_source)"
+        ).fetchone()[0]
+        con.execute(f"DELETE FROM duck_meta.{tbl} WHERE {key} IN (SELECT {key} FROM {tbl}_changed)")
+        copied = 0
+        low, high = con.execute(f"SELECT min({key}), max({key}) FROM {tbl}_changed").fetchone()
+        if low is not None:
+            # the range bounds the source rows read, the semi-join picks the changed ones
+            copied += con.execute(
+                f"""
+                INSERT INTO duck_meta.{tbl}
+                SELECT * FROM ({query}) q
+                WHERE q.{key} >= {low} AND q.{key} <= {high}
+                  AND q.{key} IN (SELECT {key} FROM {tbl}_changed)
+                ORDER BY q.{key}
+                """
+            ).fetchone()[0]
+        if tbl in APPEND_ONLY_TABLES:
+            copied += con.execute(
+                f"INSERT INTO duck_meta.{tbl} "
+                f"SELECT * FROM ({query}) q WHERE q.{key} > {max_key} ORDER BY q.{key}"
+            ).fetchone()[0]
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.execute(f"DROP TABLE IF EXISTS {tbl}_source")
+        con.execute(f"DROP TABLE IF EXISTS {tbl}_changed")
+    rows = con.execute(f"SELECT count(*) FROM duck_meta.{tbl}").fetchone()[0]
+    expected = con.execute(f"SELECT count(*) FROM ({query})").fetchone()[0]
+    if rows != expected:
+        progress(f"Refreshed table {tbl} has {rows} rows instead of {expected}, copying it again")
+        return copy_table(con, tbl, chunk_rows, progress)
+    progress(f"Refreshed table {tbl}: {copied} rows copied, {deleted} deleted, {rows} rows "
+             f"in {time.perf_counter() - start_time:.1f}s")
+    return rows
+
+
+def copy_tables(con, tables, chunk_rows=DEFAULT_CHUNK_ROWS, jobs=4, progress=print, incremental=False):
+    # The tables are independent from each other: each one is copied by its
+    # own cursor (a connection sharing the attached databases), `jobs` tables
+    # at a time. The high-water marks are recorded once all are copied.
+    lock = threading.Lock()
+    state = load_state(con) if incremental else {}
+
+    def locked_progress(message):
+        with lock:
+            progress(message)
+
+    def copy(tbl):
+        cursor = con.cursor()
+        try:
+            if incremental:
+                return refresh_table(cursor, tbl, state, chunk_rows, locked_progress)
+            return copy_table(cursor, tbl, chunk_rows, locked_progress)
+        finally:
+            cursor.close()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        rows = dict(zip(tables, executor.map(copy, tables)))
+    save_state(con, tables)
+    return rows
+
+
 def main():
     description = "Creates a DuckDB-format file from the metadata DB"
     parser = argparse.ArgumentParser(description=description)
@@ -186,6 +414,14 @@ def main():
     parser.add_argument("--dbuser", help='Metadata database read-only user')
     parser.add_argument("--dbname", help='Metadata database name')
     parser.add_argument("--outfile", help='Name of DuckDB format output file')
+    parser.add_argument("--memory-limit", default="4GB",
+                        help='DuckDB memory limit, data beyond it is spilled to the temp directory')
+    parser.add_argument("--temp-dir", help='DuckDB spill directory, <outfile>.tmp by default')
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help='Rows per copied primary key range, 0 to copy each table in one go')
+    parser.add_argument("--jobs", type=int, default=4, help='Tables copied in parallel')
+    parser.add_argument("--incremental", action="store_true",
+                        help='Only apply the changes since the last copy to an existing output file')
     args = vars(parser.parse_args())
 
     dbhost = args.get("dbhost") or "mysql-ens-production-1"
@@ -211,12 +447,14 @@ def main():
 
     con = duckdb.connect()
 
-    # The mem limit below is not honored for the 'CREATE AS FROM' operation.
-    # For the current metadata DB, this needs a bit more than 12GB to run
-    # We may want to consider to dump from metadata to CSV, then read that
-    # Alternatively, do our own loop with OFFSET + LIMIT (or similar) to copy data
-    con.execute("SET memory_limit = '8GB'")
+    # A single 'CREATE AS FROM' of the largest tables doesn't honor the memory
+    # limit (it needed more than 12GB for the current metadata DB): the tables
+    # are copied in primary key ranges instead, each range query being pushed
+    # down to MySQL.
+    con.execute(f"SET memory_limit = '{args['memory_limit']}'")
+    con.execute(f"SET temp_directory = '{args.get('temp_dir') or outfile + '.tmp'}'")
     con.execute(f"ATTACH 'host={dbhost} user={dbuser} port={dbport} database={dbname}' AS metadb (TYPE mysql)")
+    con.execute("SET mysql_experimental_filter_pushdown = true")
     con.execute(f"ATTACH '{outfile}' as duck_meta")
     con.execute("use metadb")
 
@@ -227,13 +465,10 @@ def main():
     skipped_tables = {"django_migrations"}
 
     results = con.fetchall()
-    for res in results:
-        tbl = res[0]
-        if tbl.startswith("vw_") or tbl in skipped_tables:
-            continue
-        print(f"Importing from table {tbl}")
-        con.execute(f"DROP TABLE IF EXISTS duck_meta.{tbl}")
-        con.execute(f"CREATE TABLE duck_meta.{tbl} AS {copy_query(tbl)}")
+    tables = [res[0] for res in results if not res[0].startswith("vw_") and res[0] not in skipped_tables]
+    action = "Refreshing" if args["incremental"] else "Importing"
+    print(f"{action} {len(tables)} tables, {args['jobs']} at a time")
+    copy_tables(con, tables, args["chunk_rows"], args["jobs"], incremental=args["incremental"])
 
     print("Done")
 
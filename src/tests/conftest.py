@@ -1,13 +1,16 @@
 import os
 import shutil
+import sqlite3
 import tempfile
 from pathlib import Path
 
+import duckdb
 import pytest
 import sqlalchemy as db
 from _pytest.config import Config
 from ensembl.utils.database import DBConnection
 from grpc_reflection.v1alpha import reflection
+from sqlalchemy.engine import make_url
 
 from ensembl.production.metadata.api.adaptors import GenomeAdaptor
 from ensembl.production.metadata.api.adaptors import ReleaseAdaptor
@@ -153,3 +156,42 @@ def grpc_server(_grpc_server, grpc_addr, grpc_add_to_server, grpc_servicer):
     _grpc_server.start()
     yield _grpc_server
     _grpc_server.stop(grace=None)
+
+
+# DuckDB types of the SQLite declared types, as the DuckDB mysql extension maps the MySQL ones
+DUCKDB_TYPES = (("BOOL", "BOOLEAN"), ("INT", "BIGINT"), ("DATETIME", "TIMESTAMP"), ("DATE", "DATE"),
+                ("FLOAT", "DOUBLE"), ("REAL", "DOUBLE"), ("DEC", "DOUBLE"))
+
+
+def duckdb_copy(sqlite_url, path):
+    """DuckDB copy of a SQLite test database, without constraints, as `load_meta_duckdb.py` makes them."""
+    source = sqlite3.connect(make_url(sqlite_url).database)
+    target = duckdb.connect(str(path))
+    try:
+        tables = source.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        for (table,) in tables:
+            columns = source.execute(f"PRAGMA table_info('{table}')").fetchall()
+            definitions = []
+            for column in columns:
+                declared = column[2].upper()
+                column_type = next((duck for sqlite, duck in DUCKDB_TYPES if sqlite in declared), "VARCHAR")
+                definitions.append(f'"{column[1]}" {column_type}')
+            target.execute(f'CREATE TABLE "{table}" ({", ".join(definitions)})')
+            rows = source.execute(f'SELECT * FROM "{table}"').fetchall()
+            if rows:
+                target.executemany(f'INSERT INTO "{table}" VALUES ({", ".join("?" * len(columns))})', rows)
+    finally:
+        source.close()
+        target.close()
+    return f"duckdb:///{path}"
+
+
+@pytest.fixture(scope="module")
+def duckdb_uris(test_dbs, tmp_path_factory):
+    """DuckDB copies of the test databases, by database name."""
+    tmp_path = tmp_path_factory.mktemp("duckdb")
+    return {
+        name: duckdb_copy(test_db.dbc.url, tmp_path / f"{name}.duckdb") for name, test_db in test_dbs.items()
+    }
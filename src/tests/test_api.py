@@ -13,12 +13,225 @@
 Unit tests for api module
 """
 
+import re
 from pathlib import Path
 
 import pytest
 from ensembl.utils.database import UnitTestDB
+from sqlalchemy import case, event, func, select
+from sqlalchemy.engine import Engine
 
 from ensembl.production.metadata.api.adaptors.genome import *
+from ensembl.production.metadata.api.factories.utils import format_accession_path
+
+
+def baseline_public_path(genome_adapter, genome_uuid, dataset_type='all', release=None):
+    """
+    Per genome implementation of GenomeAdaptor.get_public_path before it was derived from get_public_paths,
+    kept as the reference for the bulk implementation.
+    """
+    paths = []
+    scientific_name = None
+    accession = None
+    genebuild_source_name = None
+    last_geneset_update = None
+    if dataset_type == "variation":
+        dataset_type = "short_variants"
+
+    with genome_adapter.metadata_db.session_scope() as session:
+        # === VALIDATION SECTION ===
+        genome_exists = session.execute(
+            select(Genome.genome_uuid).where(Genome.genome_uuid == genome_uuid)
+        ).first()
+        if not genome_exists:
+            raise ValueError(f"Genome with UUID {genome_uuid} not found")
+
+        if release is not None:
+            release_exists = session.execute(
+                select(EnsemblRelease.label).where(EnsemblRelease.label == release)
+            ).first()
+            if not release_exists:
+                raise ValueError(f"Ensembl release with label '{release}' not found")
+
+        # === METADATA RETRIEVAL ===
+        # Get core genome metadata: organism name, assembly accession, and genebuild info
+        query = select(
+            Organism.scientific_name,
+            Assembly.accession,
+            func.max(case(
+                (Attribute.name == 'genebuild.annotation_source', DatasetAttribute.value),
+                else_=None
+            )).label('genebuild_source_name'),
+            func.max(case(
+                (Attribute.name == 'genebuild.last_geneset_update', DatasetAttribute.value),
+                else_=None
+            )).label('last_geneset_update')
+        ).select_from(
+            Genome
+        ).join(Organism).join(Assembly).join(GenomeDataset).join(Dataset).join(DatasetType).join(
+            DatasetAttribute).join(Attribute).where(
+            Genome.genome_uuid == genome_uuid,
+            DatasetType.name == 'genebuild',
+            Attribute.name.in_(['genebuild.annotation_source', 'genebuild.last_geneset_update'])
+        ).group_by(
+            Organism.scientific_name,
+            Assembly.accession
+        )
+
+        result = session.execute(query).first()
+        if result:
+            scientific_name, accession, genebuild_source_name, last_geneset_update = result
+        else:
+            scientific_name = accession = genebuild_source_name = last_geneset_update = None
+
+        # === DATASET TYPE DISCOVERY ===
+        supported_types = ["genebuild", "assembly", "homologies", "short_variants"]
+        unique_dataset_types_query = select(DatasetType.name).distinct().join(
+            Dataset
+        ).join(GenomeDataset).join(Genome).where(
+            Genome.genome_uuid == genome_uuid,
+            DatasetType.name.in_(supported_types),
+            Dataset.status == DatasetStatus.RELEASED
+        )
+        unique_dataset_types = session.execute(unique_dataset_types_query).scalars().all()
+
+        variation_release = None
+        homology_release = None
+
+        # === RELEASE HANDLING ===
+        if release is None:
+            if "short_variants" in unique_dataset_types and dataset_type in ("all", "short_variants"):
+                variation_release = (
+                    session.execute(
+                        select(EnsemblRelease.label)
+                        .join(GenomeDataset)
+                        .join(Dataset)
+                        .join(DatasetType)
+                        .join(Genome)
+                        .where(
+                            Genome.genome_uuid == genome_uuid,
+                            DatasetType.name == "short_variants",
+                            Dataset.status == DatasetStatus.RELEASED,
+                            GenomeDataset.is_current == True,
+                            EnsemblRelease.release_type == "partial",
+                        )
+                        .order_by(EnsemblRelease.release_id.desc())
+                    )
+                    .scalars()
+                    .first()
+                )
+
+            if 'homologies' in unique_dataset_types and dataset_type in ('all', 'homologies'):
+                homology_release = session.execute(
+                    select(EnsemblRelease.label).join(GenomeDataset).join(Dataset).join(DatasetType).join(
+                        Genome).where(
+                        Genome.genome_uuid == genome_uuid,
+                        DatasetType.name == 'homologies',
+                        Dataset.status == DatasetStatus.RELEASED,
+                        GenomeDataset.is_current == True,
+                        EnsemblRelease.release_type == 'partial'
+                    ).order_by(EnsemblRelease.release_id.desc())
+                ).scalars().first()
+        else:
+            if "short_variants" in unique_dataset_types and dataset_type in ("all", "short_variants"):
+                variation_release = (
+                    session.execute(
+                        select(EnsemblRelease.label)
+                        .join(GenomeDataset)
+                        .join(Dataset)
+                        .join(DatasetType)
+                        .join(Genome)
+                        .where(
+                            Genome.genome_uuid == genome_uuid,
+                            DatasetType.name == "short_variants",
+                            Dataset.status == DatasetStatus.RELEASED,
+                            EnsemblRelease.release_type == "partial",
+                            EnsemblRelease.release_id
+                            <= (
+                                select(EnsemblRelease.release_id)
+                                .where(EnsemblRelease.label == release)
+                                .scalar_subquery()
+                            ),
+                        )
+                        .order_by(EnsemblRelease.release_id.desc())
+                    )
+                    .scalars()
+                    .first()
+                )
+
+                if variation_release is None:
+                    unique_dataset_types = [t for t in unique_dataset_types if t != "short_variants"]
+
+            if 'homologies' in unique_dataset_types and dataset_type in ('all', 'homologies'):
+                homology_release = session.execute(
+                    select(EnsemblRelease.label).join(GenomeDataset).join(Dataset).join(DatasetType).join(
+                        Genome).where(
+                        Genome.genome_uuid == genome_uuid,
+                        DatasetType.name == 'homologies',
+                        Dataset.status == DatasetStatus.RELEASED,
+                        EnsemblRelease.release_type == 'partial',
+                        EnsemblRelease.release_id <= (
+                            select(EnsemblRelease.release_id).where(
+                                EnsemblRelease.label == release).scalar_subquery()
+                        )
+                    ).order_by(EnsemblRelease.release_id.desc())
+                ).scalars().first()
+
+                if homology_release is None:
+                    unique_dataset_types = [t for t in unique_dataset_types if t != 'homologies']
+
+    # === DATA VALIDATION ===
+    if 'genebuild' not in unique_dataset_types or 'assembly' not in unique_dataset_types:
+        raise ValueError(
+            f"Missing genebuild or assembly dataset types. Something is seriously wrong with {genome_uuid}")
+
+    if scientific_name is None or accession is None or genebuild_source_name is None or last_geneset_update is None:
+        raise ValueError("Required metadata fields are missing. Please check the database entries.")
+
+    # === PATH CONSTRUCTION ===
+    match = re.match(r'^(\d{4}-\d{2})', last_geneset_update)
+    if not match:
+        raise ValueError(f"Invalid last_geneset_update format: {last_geneset_update}")
+    last_geneset_update = match.group(1).replace('-', '_')
+
+    genebuild_source_name = genebuild_source_name.lower()
+
+    base_path = format_accession_path(accession)
+    common_path = f"{base_path}/{genebuild_source_name}/{last_geneset_update}"
+
+    if 'homologies' in unique_dataset_types and homology_release:
+        homology_release = homology_release.replace('-', '_')
+    if "short_variants" in unique_dataset_types and variation_release:
+        variation_release = variation_release.replace('-', '_')
+
+    path_templates = {
+        "genebuild": f"{common_path}/geneset",
+        "assembly": f"{common_path}/genome",
+        "homologies": f"{common_path}/homology/{homology_release}",
+        "short_variants": f"{common_path}/variation/{variation_release}",
+    }
+
+    # === REQUEST VALIDATION ===
+    if dataset_type not in unique_dataset_types and dataset_type != 'all':
+        raise TypeNotFoundException(f"Dataset Type : {dataset_type} not found in metadata.")
+
+    # === PATH GENERATION ===
+    if dataset_type == 'all':
+        for dataset_type_name in unique_dataset_types:
+            paths.append({
+                "dataset_type": dataset_type_name,
+                "path": path_templates[dataset_type_name]
+            })
+    elif dataset_type in path_templates:
+        paths.append({
+            "dataset_type": dataset_type,
+            "path": path_templates[dataset_type]
+        })
+    else:
+        raise TypeNotFoundException(f"Dataset Type : {dataset_type} has no associated path.")
+
+    return paths
+
 
 
 @pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
@@ -59,3 +272,51 @@ class TestApi:
         assert path[0]['path'] == 'GCA/000/001/405/29/ensembl/2023_03/variation/2023_06_15'
         path = genome_adapter.get_public_path(genome_uuid, dataset_type='homologies')
         assert path[0]['path'] == 'GCA/000/001/405/29/ensembl/2023_03/homology/2023_06_15'
+
+    def test_get_public_paths(self, test_dbs):
+        genome_adapter = GenomeAdaptor(test_dbs['ensembl_genome_metadata'].dbc.url, test_dbs['ncbi_taxonomy'].dbc.url)
+        with genome_adapter.metadata_db.session_scope() as session:
+            genome_uuids = session.execute(db.select(Genome.genome_uuid)).scalars().all()
+            release_labels = session.execute(db.select(EnsemblRelease.label)).scalars().all()
+        genome_uuids.append('not-a-genome')
+        cases = [(dataset_type, None) for dataset_type in
+                 ('all', 'genebuild', 'assembly', 'variation', 'homologies', 'regulatory_features')]
+        cases += [(dataset_type, label) for label in release_labels for dataset_type in ('all', 'homologies')]
+        cases.append(('genebuild', 'not-a-release'))
+        errors = set()
+        for dataset_type, release in cases:
+            paths = genome_adapter.get_public_paths(genome_uuids, dataset_type=dataset_type, release=release)
+            assert list(paths) == genome_uuids
+            for genome_uuid in genome_uuids:
+                try:
+                    expected = baseline_public_path(genome_adapter, genome_uuid, dataset_type, release)
+                except (ValueError, TypeNotFoundException) as e:
+                    assert type(paths[genome_uuid]) is type(e)
+                    assert str(paths[genome_uuid]) == str(e)
+                    errors.add(type(e))
+                else:
+                    # the baseline lists the dataset types in the database order
+                    assert isinstance(paths[genome_uuid], list)
+                    assert sorted(paths[genome_uuid], key=lambda path: path['dataset_type']) == \
+                           sorted(expected, key=lambda path: path['dataset_type'])
+        # both the missing genomes / releases and the missing dataset types are covered
+        assert errors == {ValueError, TypeNotFoundException}
+
+    def test_get_public_paths_statements_count(self, test_dbs):
+        genome_adapter = GenomeAdaptor(test_dbs['ensembl_genome_metadata'].dbc.url, test_dbs['ncbi_taxonomy'].dbc.url)
+        with genome_adapter.metadata_db.session_scope() as session:
+            genome_uuids = session.execute(db.select(Genome.genome_uuid)).scalars().all()
+        statements = []
+
+        def count_statement(*args):
+            statements.append(args[2])
+
+        event.listen(Engine, "before_cursor_execute", count_statement)
+        try:
+            genome_adapter.get_public_paths(genome_uuids[:1])
+            single = len(statements)
+            statements.clear()
+            genome_adapter.get_public_paths(genome_uuids)
+        finally:
+            event.remove(Engine, "before_cursor_execute", count_statement)
+        assert len(statements) == single
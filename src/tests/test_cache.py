@@ -0,0 +1,105 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the adaptors caches
+"""
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from ensembl.utils.database import UnitTestDB
+
+from ensembl.production.metadata.api.adaptors import GenomeAdaptor
+from ensembl.production.metadata.api.adaptors.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestTTLCache:
+    dbc: UnitTestDB = None
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        # "b" is the least recently used
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1}
+
+    def test_expiry(self):
+        clock = Clock()
+        cache = TTLCache(maxsize=10, ttl=60, timer=clock)
+        cache.set("a", 1)
+        clock.now = 59
+        assert cache.get("a") == 1
+        clock.now = 60
+        assert cache.get("a", "expired") == "expired"
+        assert len(cache) == 0
+
+    def test_disabled(self):
+        cache = TTLCache(maxsize=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert cache.misses == 1
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestTaxonomyNamesCache:
+    dbc: UnitTestDB = None
+
+    def test_fetch_taxonomy_names_cached(self, genome_conn):
+        GenomeAdaptor.taxonomy_names_cache.clear()
+        expected = genome_conn.fetch_taxonomy_names([9606, "6239", 1])
+        assert GenomeAdaptor.taxonomy_names_cache.misses == 3
+        assert expected[9606]["scientific_name"] == "Homo sapiens"
+        assert expected[1] == {"scientific_name": None, "genbank_common_name": None, "synonym": []}
+
+        @contextmanager
+        def no_session():
+            raise AssertionError("Unexpected taxonomy database access")
+            yield
+
+        session_scope = genome_conn.taxonomy_db.session_scope
+        genome_conn.taxonomy_db.session_scope = no_session
+        try:
+            names = genome_conn.fetch_taxonomy_names([9606, "6239", 1])
+            assert names == expected
+            assert GenomeAdaptor.taxonomy_names_cache.hits == 3
+            # the cached entries are not shared with the callers
+            names[9606]["synonym"].append("Human")
+            assert genome_conn.fetch_taxonomy_names(9606) == {9606: expected[9606]}
+        finally:
+            genome_conn.taxonomy_db.session_scope = session_scope
+        # other synonym classes are cached separately
+        assert genome_conn.fetch_taxonomy_names(9606, synonyms=["authority"])[9606]["synonym"] == \
+               ["Homo sapiens Linnaeus, 1758"]
+
+    def test_fetch_taxonomy_ids(self, genome_conn):
+        assert genome_conn.fetch_taxonomy_ids(["Homo sapiens", "Caenorhabditis elegans"]) == [9606, 6239]
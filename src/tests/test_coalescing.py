@@ -0,0 +1,247 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the request coalescing
+"""
+import asyncio
+import threading
+import time
+from concurrent import futures
+from pathlib import Path
+
+import grpc
+import pytest
+from ensembl.utils.database import UnitTestDB
+
+from ensembl.production.metadata.grpc import ensembl_metadata_pb2
+from ensembl.production.metadata.grpc.coalescing import AsyncCoalescingInterceptor, AsyncSingleFlight, \
+    CoalescingInterceptor, SingleFlight, SingleFlightTimeout, parse_rpc_names
+from ensembl.production.metadata.grpc.metrics import Metrics, MetricsInterceptor
+
+SERVICE = "ensembl_metadata.EnsemblMetadata"
+
+
+class SlowServicer:
+    """ GetGenomeByUUID and GetGenomeUUID echoing the requested UUID once released """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def handler(self):
+        def get_genome(request, context):
+            self.calls += 1
+            self.release.wait(10)
+            return ensembl_metadata_pb2.Genome(genome_uuid=request.genome_uuid)
+
+        return grpc.method_handlers_generic_handler(SERVICE, {
+            name: grpc.unary_unary_rpc_method_handler(
+                get_genome,
+                request_deserializer=ensembl_metadata_pb2.GenomeUUIDRequest.FromString,
+                response_serializer=ensembl_metadata_pb2.Genome.SerializeToString,
+            ) for name in ("GetGenomeByUUID", "GetGenomeUUID")
+        })
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestCoalescing:
+    dbc: UnitTestDB = None
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("*", None),
+            ("", set()),
+            ("None", set()),
+            ("GetGenomeByUUID, GetTopLevelStatisticsByUUID", {"GetGenomeByUUID", "GetTopLevelStatisticsByUUID"}),
+        ]
+    )
+    def test_parse_rpc_names(self, test_dbs, value, expected):
+        assert parse_rpc_names(value) == expected
+
+    def test_single_flight(self, test_dbs):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(10)
+            return "genome"
+
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(single_flight.do, "key", compute)
+            _wait_for(lambda: calls)
+            followers = [executor.submit(single_flight.do, "key", compute) for _ in range(3)]
+            other = executor.submit(single_flight.do, "other", lambda: "other genome")
+            assert other.result() == ("other genome", False)
+            time.sleep(0.1)
+            release.set()
+            assert leader.result() == ("genome", False)
+            assert [follower.result() for follower in followers] == [("genome", True)] * 3
+        assert len(calls) == 1
+        assert len(single_flight) == 0
+
+    def test_single_flight_error(self, test_dbs):
+        single_flight = SingleFlight()
+        with pytest.raises(ValueError):
+            single_flight.do("key", lambda: int("genome"))
+        assert single_flight.do("key", lambda: 1) == (1, False)
+
+    def test_single_flight_timeout(self, test_dbs):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, "key", lambda: release.wait(10) and "genome")
+            _wait_for(lambda: len(single_flight) == 1)
+            with pytest.raises(SingleFlightTimeout):
+                single_flight.do("key", lambda: "not run", timeout=0.05)
+            release.set()
+            # the shared call goes on
+            assert leader.result() == ("genome", False)
+
+    def test_async_single_flight(self, test_dbs):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "genome"
+
+        async def run():
+            first = asyncio.ensure_future(single_flight.do("key", compute))
+            cancelled = asyncio.ensure_future(single_flight.do("key", compute))
+            others = asyncio.gather(*[single_flight.do("key", compute) for _ in range(3)])
+            await asyncio.sleep(0)
+            # a caller going away does not cancel the shared call
+            cancelled.cancel()
+            return await first, await others
+
+        first, others = asyncio.run(run())
+        assert first == ("genome", False)
+        assert others == [("genome", True)] * 3
+        assert len(calls) == 1
+        assert len(single_flight) == 0
+
+    def test_interceptor(self, test_dbs):
+        servicer = SlowServicer()
+        metrics = Metrics()
+        interceptor = CoalescingInterceptor({"GetGenomeByUUID"}, metrics)
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=8), interceptors=[MetricsInterceptor(metrics), interceptor]
+        )
+        server.add_generic_rpc_handlers((servicer.handler(),))
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                def call(method, genome_uuid):
+                    return channel.unary_unary(
+                        f"/{SERVICE}/{method}",
+                        request_serializer=ensembl_metadata_pb2.GenomeUUIDRequest.SerializeToString,
+                        response_deserializer=ensembl_metadata_pb2.Genome.FromString,
+                    ).future(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=genome_uuid))
+
+                coalesced = [call("GetGenomeByUUID", "a73351f7") for _ in range(4)]
+                other_uuid = call("GetGenomeByUUID", "a7335667")
+                # not in the coalesced RPCs
+                other_rpc = [call("GetGenomeUUID", "a73351f7") for _ in range(2)]
+                _wait_for(lambda: metrics.rpc_in_flight.value(method="GetGenomeByUUID") == 5
+                          and metrics.rpc_in_flight.value(method="GetGenomeUUID") == 2)
+                servicer.release.set()
+                assert [response.result().genome_uuid for response in coalesced] == ["a73351f7"] * 4
+                assert other_uuid.result().genome_uuid == "a7335667"
+                assert [response.result().genome_uuid for response in other_rpc] == ["a73351f7"] * 2
+        finally:
+            server.stop(grace=None)
+        # one call per distinct GetGenomeByUUID request, GetGenomeUUID calls all run
+        assert servicer.calls == 4
+        assert metrics.rpc_requests.value(method="GetGenomeByUUID", code="OK") == 5
+        assert interceptor.coalesced.value(method="GetGenomeByUUID") == 3
+        assert 'ensembl_metadata_grpc_coalesced_requests_total{method="GetGenomeByUUID"} 3' in metrics.render()
+
+    def test_interceptor_deadline(self, test_dbs):
+        servicer = SlowServicer()
+        metrics = Metrics()
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=4),
+                             interceptors=[MetricsInterceptor(metrics), CoalescingInterceptor()])
+        server.add_generic_rpc_handlers((servicer.handler(),))
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                rpc = channel.unary_unary(
+                    f"/{SERVICE}/GetGenomeByUUID",
+                    request_serializer=ensembl_metadata_pb2.GenomeUUIDRequest.SerializeToString,
+                    response_deserializer=ensembl_metadata_pb2.Genome.FromString,
+                )
+                request = ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid="a73351f7")
+                leader = rpc.future(request)
+                _wait_for(lambda: servicer.calls == 1)
+                with pytest.raises(grpc.RpcError) as error:
+                    rpc(request, timeout=0.2)
+                assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+                # the follower gives up at its own deadline on the server too, not when the leader is done
+                _wait_for(lambda: metrics.rpc_in_flight.value(method="GetGenomeByUUID") == 1, timeout=5)
+                servicer.release.set()
+                assert leader.result().genome_uuid == "a73351f7"
+        finally:
+            server.stop(grace=None)
+        assert servicer.calls == 1
+
+    def test_async_interceptor(self, test_dbs):
+        calls = []
+
+        async def get_genome(request, context):
+            calls.append(request.genome_uuid)
+            await asyncio.sleep(0.2)
+            return ensembl_metadata_pb2.Genome(genome_uuid=request.genome_uuid)
+
+        interceptor = AsyncCoalescingInterceptor()
+
+        async def run():
+            server = grpc.aio.server(interceptors=[interceptor])
+            server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE, {
+                "GetGenomeByUUID": grpc.unary_unary_rpc_method_handler(
+                    get_genome,
+                    request_deserializer=ensembl_metadata_pb2.GenomeUUIDRequest.FromString,
+                    response_serializer=ensembl_metadata_pb2.Genome.SerializeToString,
+                )}),))
+            port = server.add_insecure_port("localhost:0")
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                    rpc = channel.unary_unary(
+                        f"/{SERVICE}/GetGenomeByUUID",
+                        request_serializer=ensembl_metadata_pb2.GenomeUUIDRequest.SerializeToString,
+                        response_deserializer=ensembl_metadata_pb2.Genome.FromString,
+                    )
+                    return await asyncio.gather(
+                        *[rpc(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid="a73351f7")) for _ in range(4)]
+                    )
+            finally:
+                await server.stop(grace=None)
+
+        responses = asyncio.run(run())
+        assert [response.genome_uuid for response in responses] == ["a73351f7"] * 4
+        assert calls == ["a73351f7"]
+        assert interceptor.coalesced.value(method="GetGenomeByUUID") == 3
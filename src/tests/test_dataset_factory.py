@@ -372,6 +372,52 @@ class TestDatasetFactory2:
             # Ensure the original status was different for test validity
             assert original_status != new_status, "Test should validate an actual status change."
 
+    @pytest.mark.parametrize("status", [DatasetStatus.SUBMITTED, DatasetStatus.PROCESSING,
+                                        DatasetStatus.PROCESSED, DatasetStatus.RELEASED])
+    def test_update_datasets_status(self, test_dbs, dataset_factory, status):
+        """
+        Test case: Updating the status of many datasets at once.
+        - Ensure the datasets, and their parents and children, end up with the statuses of one
+          update_dataset_status call per dataset.
+        - Verify that the datasets update_dataset_status refuses are reported, and left unchanged.
+        """
+        metadata_db = DBConnection(test_dbs['ensembl_genome_metadata'].dbc.url)
+
+        def snapshot(session):
+            return dict(session.query(Dataset.dataset_uuid, Dataset.status).all())
+
+        with metadata_db.test_session_scope() as session:
+            dataset_uuids = list(dict.fromkeys(
+                dataset_uuid for dataset_uuid, in session.query(Dataset.dataset_uuid).join(GenomeDataset)
+                .filter(GenomeDataset.genome_id.in_([86, 1, 4, 201]))
+                .order_by(Dataset.name, Dataset.dataset_uuid)
+            ))
+            # each refused update is rolled back to its savepoint: pysqlite only begins the transaction on
+            # the first write, and releasing a SAVEPOINT outside a transaction would commit it
+            session.query(Dataset).filter(Dataset.dataset_id == -1).update({Dataset.name: "none"})
+            expected = {}
+            for dataset_uuid in dataset_uuids:
+                try:
+                    with session.begin_nested():
+                        expected[dataset_uuid] = dataset_factory.update_dataset_status(
+                            dataset_uuid, status, session=session)[1]
+                except Exception as exc:
+                    expected[dataset_uuid] = type(exc)
+            expected_statuses = snapshot(session)
+
+        with metadata_db.test_session_scope() as session:
+            before = snapshot(session)
+
+            results = dataset_factory.update_datasets_status(dataset_uuids + dataset_uuids[:3], status.value,
+                                                             session=session)
+            assert list(results) == dataset_uuids
+            assert {dataset_uuid: type(result) if isinstance(result, Exception) else result
+                    for dataset_uuid, result in results.items()} == expected
+            assert snapshot(session) == expected_statuses
+        # for test validity: the datasets changed, or were refused
+        assert expected_statuses != before or \
+            any(isinstance(result, Exception) for result in results.values())
+
 
 @pytest.mark.parametrize("test_dbs", [[{'src': Path(__file__).parent / "databases/ensembl_genome_metadata"},
                                        {'src': Path(__file__).parent / "databases/ncbi_taxonomy"},
@@ -0,0 +1,84 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for serving the gRPC API from a DuckDB copy of the metadata database
+"""
+from pathlib import Path
+
+import pytest
+import sqlalchemy as db
+from ensembl.utils.database import UnitTestDB
+
+import ensembl.production.metadata.grpc.utils as utils
+from ensembl.production.metadata.api.adaptors import GenomeAdaptor, ReleaseAdaptor
+from ensembl.production.metadata.api.adaptors.base import PooledDBConnection, pool_options
+from ensembl.production.metadata.api.adaptors.genome import fetch_release_generation
+
+GENOME_UUID = "a73351f7-93e7-11ec-a39d-005056b38ce3"
+ASSEMBLY_UUID = "532aa68f-6500-404e-a470-8afb718a770a"
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestDuckDB:
+    dbc: UnitTestDB = None
+
+    def test_pool_options(self, test_dbs, tmp_path):
+        assert pool_options("duckdb:///:memory:") == {}
+        options = pool_options(f"duckdb:///{tmp_path}/meta.duckdb")
+        assert options["connect_args"] == {"read_only": True}
+        assert "connect_args" not in pool_options(f"sqlite:///{tmp_path}/meta.db")
+
+    def test_rpcs(self, test_dbs, genome_conn, duckdb_uris):
+        duck_conn = GenomeAdaptor(metadata_uri=duckdb_uris["ensembl_genome_metadata"],
+                                  taxonomy_uri=duckdb_uris["ncbi_taxonomy"])
+        rpcs = {
+            "GetGenomeByUUID": lambda conn: utils.get_genome_by_uuid(conn, GENOME_UUID, None),
+            "GetBriefGenomeDetailsByUUID": lambda conn: utils.get_brief_genome_details_by_uuid(
+                conn, GENOME_UUID, None),
+            "GetAttributesByGenomeUUID": lambda conn: utils.get_attributes_by_genome_uuid(
+                conn, GENOME_UUID, None),
+            "GetTopLevelStatisticsByUUID": lambda conn: utils.get_top_level_statistics_by_uuid(
+                conn, GENOME_UUID),
+            "GetDatasetsListByUUID": lambda conn: utils.get_datasets_list_by_uuid(conn, GENOME_UUID, None),
+            "GetFTPLinks": lambda conn: utils.get_ftp_links(conn, GENOME_UUID, "all", None),
+            "GetSpeciesInformation": lambda conn: utils.get_species_information(conn, GENOME_UUID),
+            "GetAssemblyInformation": lambda conn: utils.get_assembly_information(conn, ASSEMBLY_UUID),
+            "GetOrganismsGroupCount": lambda conn: utils.get_organisms_group_count(conn, None),
+            "GetGenomesBySpecificKeyword": lambda conn: list(utils.get_genomes_by_specific_keyword_iterator(
+                conn, None, None, None, None, None, None, None, 9606)),
+            "GetGenomeSequence": lambda conn: list(utils.genome_sequence_iterator(conn, GENOME_UUID, True)),
+            "GetAssemblyRegion": lambda conn: list(utils.assembly_region_iterator(conn, GENOME_UUID, False)),
+        }
+        for name, rpc in rpcs.items():
+            expected = rpc(genome_conn)
+            assert expected, name
+            assert rpc(duck_conn) == expected, name
+
+    def test_releases(self, test_dbs, release_conn, duckdb_uris):
+        duck_conn = ReleaseAdaptor(metadata_uri=duckdb_uris["ensembl_genome_metadata"])
+        for fetch in (lambda conn: conn.fetch_releases(),
+                      lambda conn: conn.fetch_releases_for_genome(GENOME_UUID)):
+            expected = [release.EnsemblRelease.label for release in fetch(release_conn)]
+            assert expected
+            assert [release.EnsemblRelease.label for release in fetch(duck_conn)] == expected
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            expected = fetch_release_generation(session)
+        with duck_conn.metadata_db.session_scope() as session:
+            assert fetch_release_generation(session) == expected
+
+    def test_read_only(self, test_dbs, duckdb_uris):
+        duck_db = PooledDBConnection.from_config(duckdb_uris["ensembl_genome_metadata"])
+        with pytest.raises(db.exc.DBAPIError, match="read-only"):
+            with duck_db.session_scope() as session:
+                session.execute(db.text("DELETE FROM ensembl_site"))
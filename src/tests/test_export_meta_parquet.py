@@ -0,0 +1,74 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the Parquet export of the metadata DuckDB dump
+"""
+from pathlib import Path
+
+import duckdb
+import pytest
+from ensembl.utils.database import UnitTestDB
+from sqlalchemy.engine import make_url
+
+from ensembl.production.metadata.scripts.export_meta_parquet import VIEWS, export_views
+
+GENOME_UUID = "a73351f7-93e7-11ec-a39d-005056b38ce3"
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestExportMetaParquet:
+    dbc: UnitTestDB = None
+
+    def test_export_views(self, test_dbs, duckdb_uris, tmp_path):
+        con = duckdb.connect(make_url(duckdb_uris["ensembl_genome_metadata"]).database, read_only=True)
+        messages = []
+        rows = export_views(con, tmp_path, progress=messages.append)
+        assert len(messages) == len(VIEWS)
+        labels = {label for label, in con.execute("SELECT label FROM ensembl_release").fetchall()}
+        for name, (query, order) in VIEWS.items():
+            files = f"{tmp_path / name}/*/*.parquet"
+            expected = con.execute(f"SELECT * FROM ({query}) ORDER BY release_label, {order}").fetchall()
+            assert rows[name] == len(expected) > 0, name
+            # one directory per release label
+            partitions = {path.name.split("=", 1)[1] for path in (tmp_path / name).iterdir()}
+            assert partitions <= labels | {"__HIVE_DEFAULT_PARTITION__"}
+            columns = [column[0] for column in con.execute(f"DESCRIBE {query}").fetchall()]
+            exported = con.execute(
+                f"SELECT {', '.join(columns)} FROM read_parquet('{files}', hive_partitioning = true) "
+                f"ORDER BY release_label, {order}"
+            ).fetchall()
+            assert [row[1:] for row in exported] == [row[1:] for row in expected], name
+            # compressed, with row group statistics
+            metadata = con.execute(
+                f"SELECT compression, stats_min_value, stats_max_value "
+                f"FROM parquet_metadata('{files}') WHERE path_in_schema = 'genome_uuid'"
+            ).fetchall()
+            assert metadata
+            assert all(compression == "ZSTD" and low <= high for compression, low, high in metadata), name
+
+        # pruned by the partitions and the statistics
+        genome = con.execute(
+            f"SELECT production_name "
+            f"FROM read_parquet('{tmp_path}/genomes/*/*.parquet', hive_partitioning = true) "
+            f"WHERE release_label = '2020-10-18' AND genome_uuid = '{GENOME_UUID}'"
+        ).fetchall()
+        assert genome == con.execute(
+            f"SELECT g.production_name FROM genome g JOIN genome_release gr USING (genome_id) "
+            f"JOIN ensembl_release er USING (release_id) "
+            f"WHERE er.label = '2020-10-18' AND g.genome_uuid = '{GENOME_UUID}'"
+        ).fetchall()
+
+        # a new export replaces the previous one
+        assert export_views(con, tmp_path, ["genomes"], progress=lambda message: None) == \
+            {"genomes": rows["genomes"]}
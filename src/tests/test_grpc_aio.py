@@ -0,0 +1,165 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the asyncio adaptors and gRPC servicer
+"""
+import asyncio
+import logging
+from pathlib import Path
+
+import grpc
+import pytest
+from ensembl.utils.database import UnitTestDB
+
+import ensembl.production.metadata.grpc.utils as utils
+from ensembl.production.metadata.api.adaptors.aio import AsyncGenomeAdaptor, AsyncReleaseAdaptor, to_async_url
+from ensembl.production.metadata.grpc import ensembl_metadata_pb2, ensembl_metadata_pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestAsyncAdaptors:
+    dbc: UnitTestDB = None
+
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("mysql://ensembl@localhost:3306/metadata", "mysql+aiomysql://ensembl@localhost:3306/metadata"),
+            ("mysql+pymysql://ensembl@localhost:3306/metadata", "mysql+aiomysql://ensembl@localhost:3306/metadata"),
+            ("sqlite:////tmp/metadata.db", "sqlite+aiosqlite:////tmp/metadata.db"),
+            ("sqlite+aiosqlite:////tmp/metadata.db", "sqlite+aiosqlite:////tmp/metadata.db"),
+        ]
+    )
+    def test_to_async_url(self, url, expected):
+        assert to_async_url(url).render_as_string(hide_password=False) == expected
+
+    def test_to_async_url_unsupported(self):
+        with pytest.raises(ValueError):
+            to_async_url("oracle://ensembl@localhost/metadata")
+
+    def test_fetch_genomes(self, test_dbs, genome_conn):
+        async def fetch():
+            adaptor = AsyncGenomeAdaptor(
+                metadata_uri=test_dbs["ensembl_genome_metadata"].dbc.url,
+                taxonomy_uri=test_dbs["ncbi_taxonomy"].dbc.url,
+            )
+            try:
+                return await adaptor.fetch_genomes(genome_uuid="a73351f7-93e7-11ec-a39d-005056b38ce3")
+            finally:
+                await adaptor.dispose()
+
+        genomes = asyncio.run(fetch())
+        expected = genome_conn.fetch_genomes(genome_uuid="a73351f7-93e7-11ec-a39d-005056b38ce3")
+        assert len(genomes) == len(expected) > 0
+        assert [g.Genome.genome_uuid for g in genomes] == [g.Genome.genome_uuid for g in expected]
+        assert genomes[0].Assembly.accession == expected[0].Assembly.accession
+
+    def test_fetch_taxonomy_names(self, test_dbs, genome_conn):
+        async def fetch():
+            adaptor = AsyncGenomeAdaptor(
+                metadata_uri=test_dbs["ensembl_genome_metadata"].dbc.url,
+                taxonomy_uri=test_dbs["ncbi_taxonomy"].dbc.url,
+            )
+            try:
+                return await adaptor.fetch_taxonomy_names(taxonomy_ids=[6239, 9606])
+            finally:
+                await adaptor.dispose()
+
+        assert asyncio.run(fetch()) == genome_conn.fetch_taxonomy_names(taxonomy_ids=[6239, 9606])
+
+    def test_stream_sync(self, test_dbs, genome_conn):
+        built, first_page = [], []
+
+        def sequences(conn, genome_uuid):
+            for sequence in utils.genome_sequence_iterator(conn, genome_uuid, False):
+                built.append(sequence)
+                yield sequence
+
+        async def stream():
+            adaptor = AsyncGenomeAdaptor(
+                metadata_uri=test_dbs["ensembl_genome_metadata"].dbc.url,
+                taxonomy_uri=test_dbs["ncbi_taxonomy"].dbc.url,
+            )
+            received = []
+            try:
+                async for sequence in adaptor.stream_sync(
+                        sequences, "a73357ab-93e7-11ec-a39d-005056b38ce3", page_size=3):
+                    # built one page at a time, ahead of the stream
+                    assert len(built) - len(received) <= 3
+                    received.append(sequence)
+                    if len(received) == 1:
+                        first_page.append(len(built))
+                return received
+            finally:
+                await adaptor.dispose()
+
+        received = asyncio.run(stream())
+        expected = list(utils.genome_sequence_iterator(genome_conn, "a73357ab-93e7-11ec-a39d-005056b38ce3", False))
+        assert len(expected) > 3
+        assert received == expected
+        # the first sequence is sent before the next pages are built
+        assert first_page == [3]
+
+    def test_fetch_releases(self, test_dbs, release_conn):
+        async def fetch():
+            adaptor = AsyncReleaseAdaptor(metadata_uri=test_dbs["ensembl_genome_metadata"].dbc.url)
+            try:
+                return await adaptor.fetch_releases()
+            finally:
+                await adaptor.dispose()
+
+        releases = asyncio.run(fetch())
+        expected = release_conn.fetch_releases()
+        assert [r.EnsemblRelease.label for r in releases] == [r.EnsemblRelease.label for r in expected]
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestAsyncServicer:
+    dbc: UnitTestDB = None
+
+    def test_unary_and_streaming_rpcs(self, test_dbs, grpc_servicer):
+        from ensembl.production.metadata.grpc.aio_servicer import AsyncEnsemblMetadataServicer
+
+        genome_request = ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid="a73351f7-93e7-11ec-a39d-005056b38ce3")
+        sequence_request = ensembl_metadata_pb2.GenomeSequenceRequest(
+            genome_uuid="a73351f7-93e7-11ec-a39d-005056b38ce3", chromosomal_only=False
+        )
+        release_request = ensembl_metadata_pb2.ReleaseRequest()
+
+        async def call():
+            server = grpc.aio.server()
+            servicer = AsyncEnsemblMetadataServicer()
+            ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(servicer, server)
+            port = server.add_insecure_port("localhost:0")
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                    stub = ensembl_metadata_pb2_grpc.EnsemblMetadataStub(channel)
+                    genome = await stub.GetGenomeByUUID(genome_request)
+                    sequences = [s async for s in stub.GetGenomeSequence(sequence_request)]
+                    releases = [r async for r in stub.GetRelease(release_request)]
+                    return genome, sequences, releases
+            finally:
+                await server.stop(grace=None)
+                await servicer.close()
+
+        genome, sequences, releases = asyncio.run(call())
+        assert genome == grpc_servicer.GetGenomeByUUID(genome_request, None)
+        assert genome.assembly.accession == "GCA_000005845.2"
+        assert sequences == list(grpc_servicer.GetGenomeSequence(sequence_request, None))
+        assert len(sequences) > 0
+        assert releases == list(grpc_servicer.GetRelease(release_request, None))
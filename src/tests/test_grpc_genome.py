@@ -18,6 +18,12 @@ from pathlib import Path
 
 import pytest
 from ensembl.utils.database import UnitTestDB
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ensembl.production.metadata.api.adaptors.genome import AssembliesCounts, fetch_genomes_select
+from ensembl.production.metadata.api.models import EnsemblRelease, Genome, ReleaseStatus
+from ensembl.production.metadata.api.search.search import ReleaseSelector
 
 logger = logging.getLogger(__name__)
 
@@ -343,6 +349,32 @@ class TestGRPCGenomeAdaptor:
             for dataset in result.datasets
         )
 
+    @pytest.mark.parametrize(
+        "genome_uuid",
+        [
+            "a7335667-93e7-11ec-a39d-005056b38ce3",
+            ["a7335667-93e7-11ec-a39d-005056b38ce3", "a73357ab-93e7-11ec-a39d-005056b38ce3"],
+            None,  # all genomes
+        ]
+    )
+    def test_fetch_genome_datasets_statements_count(self, genome_conn, genome_uuid):
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        # DBConnection creates a new engine for each session, listen on all of them
+        event.listen(Engine, "before_cursor_execute", count_statement)
+        try:
+            genome_datasets = genome_conn.fetch_genome_datasets(genome_uuid=genome_uuid, dataset_type_name="all")
+        finally:
+            event.remove(Engine, "before_cursor_execute", count_statement)
+        assert len(genome_datasets) > 0
+        assert sum(len(genome.datasets) for genome in genome_datasets) >= len(genome_datasets)
+        # genomes, genome_datasets, releases, datasets, types, sources, dataset_attributes, attributes
+        # plus the SQLite connection setup
+        assert len(statements) <= 10, statements
+
     @pytest.mark.parametrize(
         "status, organism_uuid, expected_count",
         [
@@ -388,6 +420,32 @@ class TestGRPCGenomeAdaptor:
         assert len(genomes) == 1
         assert genomes[0].Genome.genome_uuid == expected_output
 
+    def test_fetch_genomes_current_matches_release_selector(self, test_dbs, genome_conn):
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            expected = {}
+            for genome in session.query(Genome).all():
+                release = ReleaseSelector.select_release_for_genome(genome)
+                if release is not None:
+                    expected[genome.genome_uuid] = release.release_id
+        genomes = genome_conn.fetch_genomes(status="Current")
+        # a single current release per genome
+        assert len(genomes) == len(expected) > 0
+        assert {genome.Genome.genome_uuid: genome.EnsemblRelease.release_id for genome in genomes} == expected
+
+    def test_fetch_genomes_statement_cache(self, genome_conn):
+        fetch_genomes_select.cache_clear()
+        genomes = {}
+        for genome in genome_conn.fetch_genomes(status="Released"):
+            genomes.setdefault(genome.Genome.genome_uuid, genome.Genome.production_name)
+        for genome_uuid, production_name in genomes.items():
+            fetched = genome_conn.fetch_genomes(genome_uuid=genome_uuid, status="Released")
+            assert {genome.Genome.genome_uuid for genome in fetched} == {genome_uuid}
+            fetched = genome_conn.fetch_genomes(production_name=production_name, status="Released")
+            assert genome_uuid in {genome.Genome.genome_uuid for genome in fetched}
+        # one statement per set of filters, whatever the filter values
+        assert fetch_genomes_select.cache_info().currsize == 3
+        assert fetch_genomes_select.cache_info().hits == 2 * len(genomes) - 2
+
     @pytest.mark.parametrize(
         "production_name, assembly_name, use_default_assembly, status",
         [
@@ -431,6 +489,47 @@ class TestGRPCGenomeAdaptor:
         # We should have three assemblies associated with Human (Two for grch37.38 organism + one t2t)
         assert genomes == expected_assemblies_count
 
+    def test_fetch_assemblies_counts(self, test_dbs, genome_conn):
+        assert genome_conn.fetch_assemblies_counts([9606, 562, 1], status="All") == {9606: 11, 562: 1, 1: 0}
+        released = genome_conn.fetch_assemblies_count(9606)
+        # read from the materialised counts
+        metadata_db = genome_conn.metadata_db
+        genome_conn.metadata_db = None
+        try:
+            assert genome_conn.fetch_assemblies_counts(9606) == {9606: released}
+        finally:
+            genome_conn.metadata_db = metadata_db
+        assert not genome_conn.assemblies_counts.refresh(genome_conn.metadata_db)
+        # publishing a release drops the counts
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            release = session.query(EnsemblRelease).filter(EnsemblRelease.version == 110.2).one()
+            release.status = ReleaseStatus.RELEASED
+        try:
+            assert genome_conn.assemblies_counts.refresh(genome_conn.metadata_db)
+            assert genome_conn.fetch_assemblies_count(9606) > released
+        finally:
+            with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+                release = session.query(EnsemblRelease).filter(EnsemblRelease.version == 110.2).one()
+                release.status = ReleaseStatus.PREPARED
+
+    def test_assemblies_counts_maps(self, test_dbs):
+        metadata_db = test_dbs["ensembl_genome_metadata"].dbc
+        assemblies_counts = AssembliesCounts(refresh_interval=0, max_maps=2)
+        built = []
+
+        def build():
+            # the database is queried without holding the lock
+            assert not assemblies_counts._lock.locked()
+            built.append(1)
+            return {9606: len(built)}
+
+        for release_version in (108.0, 109.0, 110.0, 111.0, 110.0):
+            assemblies_counts.get(metadata_db, release_version, "Released", build)
+        # the least recently used maps are evicted
+        assert len(assemblies_counts._counts) == 2
+        assert len(built) == 4
+        assert assemblies_counts.get(metadata_db, 111.0, "Released", build) == {9606: 4}
+
     @pytest.mark.parametrize(
         "status, group, version, output_count",
         [
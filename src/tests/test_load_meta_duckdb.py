@@ -0,0 +1,126 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the DuckDB dump of the metadata database, with a DuckDB copy of the test database as source
+"""
+import shutil
+from pathlib import Path
+
+import duckdb
+import pytest
+from ensembl.utils.database import UnitTestDB
+from sqlalchemy.engine import make_url
+
+from ensembl.production.metadata.scripts.load_meta_duckdb import STATE_TABLE, copy_query, \
+    copy_table, copy_tables, key_ranges, table_key
+
+TABLES = ("attribute", "dataset", "dataset_attribute", "ensembl_release", "genome", "genome_dataset",
+          "genome_release", "organism", "assembly_sequence", "ensembl_site")
+
+
+def connect(source, outfile):
+    con = duckdb.connect()
+    con.execute(f"ATTACH '{make_url(source).database}' AS metadb (READ_ONLY)")
+    con.execute(f"ATTACH '{outfile}' AS duck_meta")
+    return con
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestLoadMetaDuckDB:
+    dbc: UnitTestDB = None
+
+    def test_table_key(self, test_dbs, duckdb_uris, tmp_path):
+        con = connect(duckdb_uris["ensembl_genome_metadata"], tmp_path / "out.db")
+        assert table_key(con, "genome") == "genome_id"
+        assert table_key(con, "ensembl_release") == "release_id"
+        # sparse keys: as many ranges as needed for the rows, not for the key values
+        rows, low, high = con.execute(
+            "SELECT count(*), min(assembly_sequence_id), max(assembly_sequence_id) "
+            "FROM metadb.assembly_sequence"
+        ).fetchone()
+        bounds = key_ranges(con, "assembly_sequence", "assembly_sequence_id", 10)
+        assert bounds[0] == low
+        assert len(bounds) == -(-rows // 10) < (high - low) // 10
+        con.execute("DETACH metadb")
+        con.execute(f"ATTACH '{tmp_path / 'no_key.db'}' AS metadb")
+        con.execute("CREATE TABLE metadb.no_key (name VARCHAR)")
+        assert table_key(con, "no_key") is None
+
+    def test_copy_tables(self, test_dbs, duckdb_uris, tmp_path):
+        con = connect(duckdb_uris["ensembl_genome_metadata"], tmp_path / "chunked.db")
+        messages = []
+        rows = copy_tables(con, TABLES, chunk_rows=7, jobs=3, progress=messages.append)
+        assert any("%" in message for message in messages)
+        assert len([message for message in messages if message.startswith("Imported table")]) == len(TABLES)
+
+        # same content, and in primary key order, as a copy in one go
+        con.execute(f"ATTACH '{tmp_path / 'whole.db'}' AS whole")
+        for tbl in TABLES:
+            con.execute(f"CREATE TABLE whole.{tbl} AS {copy_query(tbl)}")
+            key = table_key(con, tbl)
+            expected = con.execute(f"SELECT * FROM whole.{tbl} ORDER BY {key}").fetchall()
+            assert rows[tbl] == len(expected) > 0, tbl
+            assert con.execute(f"SELECT * FROM duck_meta.{tbl}").fetchall() == expected, tbl
+        # released genomes only
+        assert rows["genome"] < con.execute("SELECT count(*) FROM metadb.genome").fetchone()[0]
+
+    def test_copy_table_whole(self, test_dbs, duckdb_uris, tmp_path):
+        con = connect(duckdb_uris["ensembl_genome_metadata"], tmp_path / "out.db")
+        copy_table(con, "genome", chunk_rows=0, progress=lambda message: None)
+        # the copy replaces the table
+        assert copy_table(con, "genome", chunk_rows=5, progress=lambda message: None) == \
+            con.execute("SELECT count(*) FROM duck_meta.genome").fetchone()[0]
+
+    def test_incremental_refresh(self, test_dbs, duckdb_uris, tmp_path):
+        source = tmp_path / "source.db"
+        shutil.copy(make_url(duckdb_uris["ensembl_genome_metadata"]).database, source)
+        con = connect(f"duckdb:///{source}", tmp_path / "out.db")
+        con.execute("DETACH metadb")
+        con.execute(f"ATTACH '{source}' AS metadb")
+        copy_tables(con, TABLES, chunk_rows=50, jobs=2, progress=lambda message: None)
+        state = dict(con.execute(f"SELECT table_name, max_key FROM duck_meta.{STATE_TABLE}").fetchall())
+        assert state["genome"] == con.execute("SELECT max(genome_id) FROM duck_meta.genome").fetchone()[0]
+
+        # a release withdrawn, a dataset status and an attribute changed, sequences added and removed
+        release_id = con.execute("SELECT max(release_id) FROM metadb.ensembl_release "
+                                 "WHERE status = 'Released'").fetchone()[0]
+        con.execute(f"UPDATE metadb.ensembl_release SET status = 'Planned' WHERE release_id = {release_id}")
+        con.execute("UPDATE metadb.dataset SET status = 'Faulty' WHERE dataset_id = "
+                    "(SELECT min(dataset_id) FROM duck_meta.dataset)")
+        con.execute("UPDATE metadb.dataset_attribute SET value = 'changed' WHERE dataset_attribute_id = "
+                    "(SELECT max(dataset_attribute_id) FROM duck_meta.dataset_attribute)")
+        con.execute("DELETE FROM metadb.assembly_sequence WHERE assembly_sequence_id = "
+                    "(SELECT min(assembly_sequence_id) FROM duck_meta.assembly_sequence)")
+        con.execute("INSERT INTO metadb.assembly_sequence SELECT * REPLACE "
+                    "(assembly_sequence_id + 10000000 AS assembly_sequence_id, name || '_new' AS name) "
+                    "FROM duck_meta.assembly_sequence LIMIT 3")
+
+        messages = []
+        rows = copy_tables(con, TABLES, chunk_rows=50, jobs=2, progress=messages.append, incremental=True)
+        assert len([message for message in messages if message.startswith("Refreshed table")]) == len(TABLES)
+        assert "Refreshed table assembly_sequence: 3 rows copied, 1 deleted" in " ".join(messages)
+        con.execute(f"ATTACH '{tmp_path / 'whole.db'}' AS whole")
+        for tbl in TABLES:
+            con.execute(f"CREATE TABLE whole.{tbl} AS {copy_query(tbl)}")
+            key = table_key(con, tbl)
+            expected = con.execute(f"SELECT * FROM whole.{tbl} ORDER BY {key}").fetchall()
+            assert rows[tbl] == len(expected), tbl
+            assert con.execute(f"SELECT * FROM duck_meta.{tbl} ORDER BY {key}").fetchall() == expected, tbl
+        assert con.execute(f"SELECT count(*) FROM duck_meta.ensembl_release "
+                           f"WHERE release_id = {release_id}").fetchone()[0] == 0
+
+        # nothing to do without changes
+        messages = []
+        copy_tables(con, TABLES, chunk_rows=50, jobs=2, progress=messages.append, incremental=True)
+        assert all(" 0 rows copied, 0 deleted" in message for message in messages)
@@ -0,0 +1,148 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the gRPC service metrics
+"""
+import asyncio
+import urllib.request
+from concurrent import futures
+from pathlib import Path
+
+import grpc
+import pytest
+from ensembl.utils.database import UnitTestDB
+
+from ensembl.production.metadata.grpc import ensembl_metadata_pb2, ensembl_metadata_pb2_grpc
+from ensembl.production.metadata.grpc.metrics import AsyncMetricsInterceptor, Counter, Histogram, Metrics, \
+    MetricsInterceptor
+
+GENOME_UUID = "a73351f7-93e7-11ec-a39d-005056b38ce3"
+
+
+def _fail(request, context):
+    raise RuntimeError("boom")
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestMetrics:
+    dbc: UnitTestDB = None
+
+    def test_exposition_format(self, test_dbs):
+        counter = Counter("requests_total", "Requests", ("method",))
+        counter.inc(method='Get"Genome')
+        counter.inc(2, method='Get"Genome')
+        assert counter.render() == (
+            '# HELP requests_total Requests\n'
+            '# TYPE requests_total counter\n'
+            'requests_total{method="Get\\"Genome"} 3\n'
+        )
+        histogram = Histogram("duration_seconds", "Duration", buckets=(0.1, 1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+        assert histogram.render().splitlines()[2:] == [
+            'duration_seconds_bucket{le="0.1"} 1',
+            'duration_seconds_bucket{le="1.0"} 2',
+            'duration_seconds_bucket{le="+Inf"} 3',
+            'duration_seconds_sum 5.55',
+            'duration_seconds_count 3',
+        ]
+        with pytest.raises(ValueError):
+            counter.inc(site="ensembl")
+
+    def test_interceptor(self, test_dbs, grpc_servicer):
+        metrics = Metrics().install()
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), interceptors=[MetricsInterceptor(metrics)])
+        ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(grpc_servicer, server)
+        server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(
+            "test.Failing", {"Fail": grpc.unary_unary_rpc_method_handler(_fail)}),))
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                stub = ensembl_metadata_pb2_grpc.EnsemblMetadataStub(channel)
+                genome = stub.GetGenomeByUUID(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=GENOME_UUID))
+                sequences = list(stub.GetGenomeSequence(
+                    ensembl_metadata_pb2.GenomeSequenceRequest(genome_uuid=GENOME_UUID)))
+                with pytest.raises(grpc.RpcError):
+                    channel.unary_unary("/test.Failing/Fail")(b"")
+        finally:
+            server.stop(grace=None)
+            metrics.close()
+
+        assert genome.genome_uuid == GENOME_UUID
+        assert metrics.rpc_requests.value(method="GetGenomeByUUID", code="OK") == 1
+        assert metrics.rpc_requests.value(method="GetGenomeSequence", code="OK") == 1
+        assert metrics.rpc_requests.value(method="Fail", code="UNKNOWN") == 1
+        assert metrics.rpc_in_flight.value(method="GetGenomeByUUID") == 0
+        assert metrics.rpc_latency.count(method="GetGenomeByUUID") == 1
+        assert metrics.rpc_responses.value(method="GetGenomeByUUID") == 1
+        assert metrics.rpc_responses.value(method="GetGenomeSequence") == len(sequences) > 0
+        assert metrics.rpc_response_bytes.value(method="GetGenomeByUUID") == genome.ByteSize()
+        assert metrics.rpc_serialisation.count(method="GetGenomeSequence") == len(sequences)
+        # the SQL statements are attributed to the RPC they are run for
+        assert metrics.rpc_sql_statements.sum(method="GetGenomeByUUID") > 0
+        assert metrics.rpc_sql_statements.sum(method="Fail") == 0
+        assert metrics.rpc_sql_duration.sum(method="GetGenomeByUUID") > 0
+        assert metrics.sql_statements.value() >= metrics.rpc_sql_statements.sum(method="GetGenomeByUUID")
+        assert metrics.db_checkout_wait.count() > 0
+        assert metrics.db_connections_in_use.value() == 0
+        assert 'ensembl_metadata_grpc_requests_total{method="GetGenomeByUUID",code="OK"} 1' in metrics.render()
+
+    def test_async_interceptor(self, test_dbs, grpc_servicer):
+        from ensembl.production.metadata.grpc.aio_servicer import AsyncEnsemblMetadataServicer
+
+        metrics = Metrics().install()
+
+        async def call():
+            server = grpc.aio.server(interceptors=[AsyncMetricsInterceptor(metrics)])
+            servicer = AsyncEnsemblMetadataServicer()
+            ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(servicer, server)
+            port = server.add_insecure_port("localhost:0")
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                    stub = ensembl_metadata_pb2_grpc.EnsemblMetadataStub(channel)
+                    await stub.GetGenomeByUUID(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=GENOME_UUID))
+                    return [s async for s in stub.GetGenomeSequence(
+                        ensembl_metadata_pb2.GenomeSequenceRequest(genome_uuid=GENOME_UUID))]
+            finally:
+                await server.stop(grace=None)
+                await servicer.close()
+
+        try:
+            sequences = asyncio.run(call())
+        finally:
+            metrics.close()
+        assert metrics.rpc_requests.value(method="GetGenomeByUUID", code="OK") == 1
+        assert metrics.rpc_responses.value(method="GetGenomeSequence") == len(sequences) > 0
+        assert metrics.rpc_sql_statements.sum(method="GetGenomeByUUID") > 0
+        assert metrics.rpc_in_flight.value(method="GetGenomeSequence") == 0
+
+    def test_exposition(self, test_dbs, tmp_path):
+        metrics = Metrics()
+        metrics.rpc_requests.inc(method="GetGenomeByUUID", code="OK")
+        port = metrics.serve_http(0)
+        metrics.dump_periodically(str(tmp_path / "metrics.prom"), interval=3600)
+        try:
+            # local only by default
+            assert metrics._http_server.server_address[0] == "127.0.0.1"
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                body = response.read().decode()
+        finally:
+            metrics.close()
+        assert body == metrics.render()
+        # written when closed
+        assert (tmp_path / "metrics.prom").read_text() == body
@@ -0,0 +1,162 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the multi-process serving
+"""
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+import grpc
+import pytest
+from ensembl.utils.database import UnitTestDB
+
+from ensembl.production.metadata.grpc import ensembl_metadata_pb2, ensembl_metadata_pb2_grpc
+from ensembl.production.metadata.grpc.config import MetadataConfig
+from ensembl.production.metadata.grpc.prefork import MAX_RESTART_DELAY, Supervisor, WorkerCrashLoop, \
+    beat_periodically, process_count, worker_config
+from ensembl.production.metadata.grpc.service import server_options
+
+GENOME_UUID = "a73351f7-93e7-11ec-a39d-005056b38ce3"
+
+
+def exiting_worker(index, heartbeat):
+    sys.exit(3)
+
+
+def stalled_worker(index, heartbeat):
+    time.sleep(60)
+
+
+def beating_worker(index, heartbeat):
+    beat_periodically(heartbeat, 0.1)
+    time.sleep(60)
+
+
+def wait_for(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestPrefork:
+    dbc: UnitTestDB = None
+
+    def test_worker_config(self, test_dbs, monkeypatch):
+        monkeypatch.setenv("METRICS_PORT", "9100")
+        monkeypatch.setenv("METRICS_FILE", "/tmp/metrics.prom")
+        monkeypatch.setenv("GRPC_PROCESSES", "0")
+        config = worker_config(MetadataConfig(), 2)
+        assert config.metrics_port == 9102
+        assert config.metrics_file == "/tmp/metrics.2.prom"
+        assert process_count(config) == os.cpu_count()
+        monkeypatch.setenv("GRPC_PROCESSES", "4")
+        assert server_options(MetadataConfig())["options"] == [("grpc.so_reuseport", 1)]
+        monkeypatch.setenv("GRPC_PROCESSES", "1")
+        assert "options" not in server_options(MetadataConfig())
+        monkeypatch.setenv("GRPC_PROCESSES", "-1")
+        with pytest.raises(ValueError, match="GRPC_PROCESSES"):
+            MetadataConfig().validate()
+        monkeypatch.setenv("GRPC_PROCESSES", "2")
+        monkeypatch.setenv("GRPC_WORKER_MAX_RESTARTS", "-1")
+        with pytest.raises(ValueError, match="GRPC_WORKER_MAX_RESTARTS"):
+            MetadataConfig().validate()
+
+    def test_restart_exited_worker(self, test_dbs):
+        supervisor = Supervisor(1, shutdown_grace=0, target=exiting_worker).start()
+        try:
+            first = supervisor.workers[0].process
+            assert wait_for(lambda: not first.is_alive())
+            assert first.exitcode == 3
+            assert supervisor.check() == 1
+            assert supervisor.workers[0].process is not first
+            assert supervisor.workers[0].restarts == 1
+        finally:
+            supervisor.stop()
+
+    def test_restart_backoff(self, test_dbs):
+        supervisor = Supervisor(1, shutdown_grace=0, restart_backoff=0.5, max_restarts=3,
+                                target=exiting_worker).start()
+        assert [supervisor.restart_delay(restarts) for restarts in range(4)] == [0, 0.5, 1, 2]
+        assert supervisor.restart_delay(20) == MAX_RESTART_DELAY
+        try:
+            for restarts in range(3):
+                worker = supervisor.workers[0]
+                assert wait_for(lambda: not worker.process.is_alive())
+                assert worker.restarts == restarts
+                if restarts:
+                    # not restarted before its backoff delay
+                    assert supervisor.check() == 0
+                    assert supervisor.workers[0] is worker
+                assert wait_for(lambda: supervisor.check() or supervisor.workers[0] is not worker)
+                assert time.monotonic() - worker.exited >= supervisor.restart_delay(restarts)
+            worker = supervisor.workers[0]
+            assert wait_for(lambda: not worker.process.is_alive())
+            with pytest.raises(WorkerCrashLoop, match="crashed 4 times"):
+                supervisor.check()
+        finally:
+            supervisor.stop()
+
+    def test_restart_window(self, test_dbs):
+        supervisor = Supervisor(1, shutdown_grace=0, restart_window=0, max_restarts=1,
+                                target=exiting_worker).start()
+        try:
+            supervisor.workers[0].restarts = 4
+            assert wait_for(lambda: not supervisor.workers[0].process.is_alive())
+            # ran longer than the restart window, restarted at once and counted from 0
+            assert supervisor.check() == 1
+            assert supervisor.workers[0].restarts == 1
+        finally:
+            supervisor.stop()
+
+    def test_restart_stalled_worker(self, test_dbs):
+        supervisor = Supervisor(1, shutdown_grace=0, heartbeat_timeout=1, target=stalled_worker).start()
+        started = time.time()
+        supervisor.workers.append(Supervisor(1, target=beating_worker).start().workers[0])
+        try:
+            stalled, beating = supervisor.workers
+            assert wait_for(lambda: beating.heartbeat.value > started + 0.5)
+            time.sleep(1.2)
+            # only the worker without heartbeat is restarted
+            assert supervisor.check() == 1
+            assert not stalled.process.is_alive()
+            assert supervisor.workers[1] is beating
+        finally:
+            supervisor.stop()
+        assert all(not worker.process.is_alive() for worker in supervisor.workers)
+
+    def test_serve(self, test_dbs, monkeypatch):
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            port = sock.getsockname()[1]
+        monkeypatch.setenv("METADATA_URI", str(test_dbs["ensembl_genome_metadata"].dbc.url))
+        monkeypatch.setenv("TAXONOMY_URI", str(test_dbs["ncbi_taxonomy"].dbc.url))
+        monkeypatch.setenv("SERVICE_PORT", str(port))
+        monkeypatch.setenv("GRPC_PROCESSES", "2")
+        supervisor = Supervisor(2, shutdown_grace=1).start()
+        try:
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                grpc.channel_ready_future(channel).result(timeout=60)
+                stub = ensembl_metadata_pb2_grpc.EnsemblMetadataStub(channel)
+                genome = stub.GetGenomeByUUID(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=GENOME_UUID))
+            assert genome.genome_uuid == GENOME_UUID
+            assert supervisor.check() == 0
+        finally:
+            supervisor.stop()
+        # stopped gracefully, on SIGTERM
+        assert [worker.process.exitcode for worker in supervisor.workers] == [0, 0]
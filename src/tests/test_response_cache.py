@@ -0,0 +1,217 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the serialised responses cache
+"""
+import asyncio
+import time
+from concurrent import futures
+from pathlib import Path
+
+import grpc
+import pytest
+import sqlalchemy as db
+from ensembl.utils.database import UnitTestDB
+
+from ensembl.production.metadata.api.models import EnsemblRelease
+from ensembl.production.metadata.grpc import ensembl_metadata_pb2, ensembl_metadata_pb2_grpc
+from ensembl.production.metadata.grpc.metrics import Metrics, MetricsInterceptor
+from ensembl.production.metadata.grpc.response_cache import AsyncResponseCacheInterceptor, ReleaseGeneration, \
+    ResponseCache, ResponseCacheInterceptor
+
+GENOME_UUID = "a73351f7-93e7-11ec-a39d-005056b38ce3"
+SERVICE = "ensembl_metadata.EnsemblMetadata"
+
+
+def _toggle_first_release(dbc):
+    with dbc.session_scope() as session:
+        release = session.execute(db.select(EnsemblRelease).order_by(EnsemblRelease.release_id)).scalars().first()
+        release.is_current = 0 if release.is_current else 1
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestResponseCache:
+    dbc: UnitTestDB = None
+
+    def test_lru_by_bytes(self, test_dbs):
+        cache = ResponseCache(max_bytes=30)
+        cache.validate(1)
+        cache.set(("A", b"1", 1), b"x" * 10)
+        cache.set(("B", b"2", 1), b"y" * 10)
+        assert cache.nbytes == 24
+        assert cache.get(("A", b"1", 1)) == b"x" * 10
+        # evicts the least recently used entry
+        cache.set(("C", b"3", 1), b"z" * 10)
+        assert cache.get(("B", b"2", 1)) is None
+        assert cache.get(("A", b"1", 1)) == b"x" * 10
+        assert cache.nbytes == 24
+        # larger than the whole cache
+        cache.set(("D", b"4", 1), b"z" * 30)
+        assert len(cache) == 2
+        # stored for a previous release generation
+        cache.validate(2)
+        assert len(cache) == 0 and cache.nbytes == 0
+        cache.set(("A", b"1", 1), b"x")
+        assert len(cache) == 0
+        assert cache.stats() == {"size": 0, "bytes": 0, "max_bytes": 30, "hits": 2, "misses": 1}
+
+    def test_max_age(self, test_dbs):
+        cache = ResponseCache(max_bytes=1024, max_age=0.05)
+        cache.validate(1)
+        cache.set(("A", b"1", 1), b"x" * 10)
+        assert cache.get(("A", b"1", 1)) == b"x" * 10
+        time.sleep(0.06)
+        assert cache.get(("A", b"1", 1)) is None
+        assert len(cache) == 0 and cache.nbytes == 0
+
+    def test_release_generation(self, test_dbs):
+        dbc = test_dbs["ensembl_genome_metadata"].dbc
+        generation = ReleaseGeneration(dbc, refresh_interval=0)
+        token = generation.current()
+        assert generation.current() == token
+        _toggle_first_release(dbc)
+        try:
+            assert generation.current() == token + 1
+        finally:
+            _toggle_first_release(dbc)
+        assert generation.current() == token + 2
+        # checked at most every refresh_interval seconds
+        generation.refresh_interval = 3600
+        _toggle_first_release(dbc)
+        try:
+            assert generation.current() == token + 2
+        finally:
+            _toggle_first_release(dbc)
+
+    def test_interceptor(self, test_dbs, grpc_servicer):
+        dbc = test_dbs["ensembl_genome_metadata"].dbc
+        metrics = Metrics()
+        interceptor = ResponseCacheInterceptor(
+            ResponseCache(1024 * 1024), ReleaseGeneration(dbc, refresh_interval=0), {"GetGenomeByUUID"}, metrics
+        )
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=2), interceptors=[MetricsInterceptor(metrics), interceptor]
+        )
+        ensembl_metadata_pb2_grpc.add_EnsemblMetadataServicer_to_server(grpc_servicer, server)
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                stub = ensembl_metadata_pb2_grpc.EnsemblMetadataStub(channel)
+                request = ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=GENOME_UUID)
+                genomes = [stub.GetGenomeByUUID(request) for _ in range(3)]
+                assert interceptor.hits.value(method="GetGenomeByUUID") == 2
+                assert interceptor.misses.value(method="GetGenomeByUUID") == 1
+                # streaming and non cached RPCs go through
+                assert list(stub.GetGenomeSequence(ensembl_metadata_pb2.GenomeSequenceRequest(
+                    genome_uuid=GENOME_UUID)))
+                stub.GetSpeciesInformation(request)
+                assert len(interceptor.cache) == 1
+                # a release change invalidates the cached responses
+                _toggle_first_release(dbc)
+                try:
+                    assert stub.GetGenomeByUUID(request) == genomes[0]
+                finally:
+                    _toggle_first_release(dbc)
+                assert interceptor.misses.value(method="GetGenomeByUUID") == 2
+        finally:
+            server.stop(grace=None)
+        assert genomes[0].genome_uuid == GENOME_UUID
+        assert genomes[1] == genomes[2] == genomes[0]
+        assert metrics.rpc_requests.value(method="GetGenomeByUUID", code="OK") == 4
+        assert metrics.rpc_response_bytes.value(method="GetGenomeByUUID") == 4 * genomes[0].ByteSize()
+        # only the computed responses are serialised
+        assert metrics.rpc_serialisation.count(method="GetGenomeByUUID") == 2
+        assert interceptor.nbytes.value() == interceptor.cache.nbytes > genomes[0].ByteSize()
+
+    def test_async_interceptor(self, test_dbs):
+        calls = []
+
+        async def get_genome(request, context):
+            calls.append(request.genome_uuid)
+            if request.genome_uuid == "missing":
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+            return ensembl_metadata_pb2.Genome(genome_uuid=request.genome_uuid)
+
+        interceptor = AsyncResponseCacheInterceptor(
+            ResponseCache(1024 * 1024), ReleaseGeneration(test_dbs["ensembl_genome_metadata"].dbc)
+        )
+
+        async def run():
+            server = grpc.aio.server(interceptors=[interceptor])
+            server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE, {
+                "GetGenomeByUUID": grpc.unary_unary_rpc_method_handler(
+                    get_genome,
+                    request_deserializer=ensembl_metadata_pb2.GenomeUUIDRequest.FromString,
+                    response_serializer=ensembl_metadata_pb2.Genome.SerializeToString,
+                )}),))
+            port = server.add_insecure_port("localhost:0")
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                    rpc = channel.unary_unary(
+                        f"/{SERVICE}/GetGenomeByUUID",
+                        request_serializer=ensembl_metadata_pb2.GenomeUUIDRequest.SerializeToString,
+                        response_deserializer=ensembl_metadata_pb2.Genome.FromString,
+                    )
+                    responses = [await rpc(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid="a73351f7"))
+                                 for _ in range(3)]
+                    for _ in range(2):
+                        with pytest.raises(grpc.aio.AioRpcError):
+                            await rpc(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid="missing"))
+                    return responses
+            finally:
+                await server.stop(grace=None)
+
+        responses = asyncio.run(run())
+        assert [response.genome_uuid for response in responses] == ["a73351f7"] * 3
+        # the error responses are not cached
+        assert calls == ["a73351f7", "missing", "missing"]
+        assert interceptor.hits.value(method="GetGenomeByUUID") == 2
+
+    def test_serialisation_metrics(self, test_dbs):
+        def slow_serializer(message):
+            time.sleep(0.05)
+            return message.SerializeToString()
+
+        metrics = Metrics()
+        interceptor = ResponseCacheInterceptor(
+            ResponseCache(1024 * 1024), ReleaseGeneration(test_dbs["ensembl_genome_metadata"].dbc), None, metrics
+        )
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=2), interceptors=[MetricsInterceptor(metrics), interceptor]
+        )
+        server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE, {
+            "GetGenomeByUUID": grpc.unary_unary_rpc_method_handler(
+                lambda request, context: ensembl_metadata_pb2.Genome(genome_uuid=request.genome_uuid),
+                request_deserializer=ensembl_metadata_pb2.GenomeUUIDRequest.FromString,
+                response_serializer=slow_serializer,
+            )}),))
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                rpc = channel.unary_unary(
+                    f"/{SERVICE}/GetGenomeByUUID",
+                    request_serializer=ensembl_metadata_pb2.GenomeUUIDRequest.SerializeToString,
+                    response_deserializer=ensembl_metadata_pb2.Genome.FromString,
+                )
+                for genome_uuid in ("a73351f7", "a73351f7", "b1234567"):
+                    rpc(ensembl_metadata_pb2.GenomeUUIDRequest(genome_uuid=genome_uuid))
+        finally:
+            server.stop(grace=None)
+        # the serialisation of the two cache misses, timed inside the cache interceptor
+        assert metrics.rpc_serialisation.count(method="GetGenomeByUUID") == 2
+        assert metrics.rpc_serialisation.sum(method="GetGenomeByUUID") >= 0.1
+        assert metrics.rpc_responses.value(method="GetGenomeByUUID") == 3
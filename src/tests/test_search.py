@@ -10,7 +10,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import io
 import json
+import shutil
 from pathlib import Path
 from unittest.mock import Mock
 
@@ -36,11 +39,13 @@ from ensembl.production.metadata.api.search.search import (
     IndexingErrorCollection,
     GenomeSearchDocument,
     DatasetFieldExtractor,
+    PrefetchedDatasetFieldExtractor,
     ReleaseSelector,
     GenomeSearchIndexer,
     SearchIndex,
     set_url_name,
     update_rank,
+    write_search_index,
 )
 
 db_directory = Path(__file__).parent / "databases"
@@ -1267,6 +1272,27 @@ class TestGenomeSearchIndexer:
             assert lineage["lineage_common_name"] == []
             assert lineage["lineage_scientific_name"] == []
 
+    def test_taxonomy_lineage_cache(self, test_dbs):
+        """Test the lineage cache resolves each taxonomy node once, and preloads give the same lineages."""
+        metadata_uri = test_dbs["ensembl_genome_metadata"].dbc.url
+        taxonomy_uri = test_dbs["ncbi_taxonomy"].dbc.url
+        taxonomy_ids = [3702, 562, 9606, 999999999]
+
+        with test_dbs["ncbi_taxonomy"].dbc.session_scope() as taxonomy_session:
+            indexer = GenomeSearchIndexer(metadata_uri, taxonomy_uri)
+            expected = [indexer._get_taxonomy_lineage(taxonomy_session, tid) for tid in taxonomy_ids]
+            queries = indexer.lineage_cache.stats["queries"]
+            assert [indexer._get_taxonomy_lineage(taxonomy_session, tid) for tid in taxonomy_ids] == expected
+            assert indexer.lineage_cache.stats["queries"] == queries
+            assert indexer.lineage_cache.stats["lookups"] == 2 * len(taxonomy_ids)
+
+            indexer = GenomeSearchIndexer(metadata_uri, taxonomy_uri)
+            indexer.lineage_cache.preload(taxonomy_session, taxonomy_ids)
+            assert indexer.lineage_cache.stats["queries"] == 2
+            assert [indexer._get_taxonomy_lineage(taxonomy_session, tid) for tid in taxonomy_ids] == expected
+            assert indexer.lineage_cache.stats["queries"] == 2
+            assert indexer.lineage_cache.stats["resolved_taxa"] == len(taxonomy_ids)
+
     def test_create_search_document_success(self, test_dbs):
         """Test create_search_document successfully creates a document."""
         metadata_uri = test_dbs["ensembl_genome_metadata"].dbc.url
@@ -1464,6 +1490,28 @@ class TestGenomeSearchIndexer:
         assert isinstance(errors, IndexingErrorCollection)
         # Errors may or may not exist depending on test data quality
 
+    @pytest.mark.parametrize("pretty_print", [True, False])
+    def test_stream_to_json_matches_export_to_json(self, test_dbs, tmp_path, pretty_print):
+        """Test the two pass stream_to_json writes the same file as export_to_json."""
+        metadata_uri = test_dbs["ensembl_genome_metadata"].dbc.url
+        taxonomy_uri = test_dbs["ncbi_taxonomy"].dbc.url
+        indexer = GenomeSearchIndexer(metadata_uri, taxonomy_uri, batch_size=2)
+
+        count = indexer.export_to_json(str(tmp_path / "export.json"), pretty_print=pretty_print)
+        streamed, errors = indexer.stream_to_json(str(tmp_path / "stream.json"), pretty_print=pretty_print)
+
+        assert streamed == count > 0
+        assert (tmp_path / "stream.json").read_bytes() == (tmp_path / "export.json").read_bytes()
+
+    @pytest.mark.parametrize("pretty_print", [True, False])
+    def test_write_search_index_without_entries(self, test_dbs, pretty_print):
+        """Test write_search_index writes an empty index as json.dump would."""
+        output = io.StringIO()
+        write_search_index(output, "2025-07", 0, [], pretty_print=pretty_print)
+
+        search_index = SearchIndex(release="2025-07", entry_count=0, entries=[])
+        assert output.getvalue() == json.dumps(search_index.model_dump(), indent=2 if pretty_print else None)
+
     def test_export_to_json_auto_uses_regular_mode(self, test_dbs, tmp_path):
         """Test export_to_json_auto uses regular mode for small datasets."""
         metadata_uri = test_dbs["ensembl_genome_metadata"].dbc.url
@@ -1510,6 +1558,144 @@ class TestGenomeSearchIndexer:
                 # Should process all or fewer genomes (some may not have valid releases)
                 assert total_processed <= total_count
 
+    def test_parallel_search_index_matches_serial(self, test_dbs):
+        """Test that the worker processes build the same index as a serial run."""
+        metadata_uri = test_dbs["ensembl_genome_metadata"].dbc.url
+        taxonomy_uri = test_dbs["ncbi_taxonomy"].dbc.url
+
+        serial = GenomeSearchIndexer(metadata_uri, taxonomy_uri, batch_size=2).get_search_index()
+        parallel = GenomeSearchIndexer(metadata_uri, taxonomy_uri, batch_size=2, workers=2).get_search_index()
+
+        assert parallel.entry_count > 0
+        assert json.dumps(parallel.model_dump()) == json.dumps(serial.model_dump())
+
+    @staticmethod
+    def _previous_index(tmp_path):
+        """An indexer on a copy of the test databases, and a search index of their latest release."""
+        for name in ("ensembl_genome_metadata", "ncbi_taxonomy"):
+            shutil.copy(db_directory / f"{name}.db", tmp_path / f"{name}.db")
+        indexer = GenomeSearchIndexer(
+            f"sqlite:///{tmp_path}/ensembl_genome_metadata.db", f"sqlite:///{tmp_path}/ncbi_taxonomy.db"
+        )
+        with indexer.metadata_db.session_scope() as session:
+            # The index release as the latest release
+            session.query(EnsemblRelease).filter(EnsemblRelease.label == "2023-06-15").update(
+                {EnsemblRelease.release_date: datetime.date(2025, 8, 1)}
+            )
+        previous_index = tmp_path / "previous.json"
+        count = indexer.export_to_json(str(previous_index))
+        assert count == 5
+
+        def reusable_genome_uuids():
+            with indexer.metadata_db.session_scope() as session:
+                genome_ids = indexer._get_genome_ids_to_process(session)
+                search_index = SearchIndex.model_validate_json(previous_index.read_text())
+                reusable = indexer._get_reusable_documents(session, genome_ids, search_index)
+                return {doc.genome_uuid for doc in reusable.values()}
+
+        assert len(reusable_genome_uuids()) == count
+        return indexer, previous_index, count, reusable_genome_uuids
+
+    @staticmethod
+    def _assert_incremental_matches_full(indexer, previous_index, count, tmp_path):
+        incremental_index = tmp_path / "incremental.json"
+        assert indexer.export_to_json_incremental(str(previous_index), str(incremental_index)) == count
+        indexer.export_to_json(str(tmp_path / "full.json"))
+        assert incremental_index.read_bytes() == (tmp_path / "full.json").read_bytes()
+        return incremental_index.read_text()
+
+    def test_export_to_json_incremental(self, test_dbs, tmp_path):
+        """Test the incremental rebuild only creates the changed documents, and matches a full rebuild."""
+        indexer, previous_index, count, reusable_genome_uuids = self._previous_index(tmp_path)
+
+        with indexer.metadata_db.session_scope() as session:
+            session.query(Organism).filter(Organism.common_name == "Roundworm").update(
+                {Organism.common_name: "Nematode"}
+            )
+            release = EnsemblRelease(
+                version=116.0, release_date=datetime.date(2025, 9, 1), label="2025-09-01", is_current=0,
+                site_id=1, release_type="partial", status=ReleaseStatus.RELEASED,
+            )
+            session.add(release)
+            genome_uuid = "2020e8d5-4d87-47af-be78-0b15e48970a7"
+            genome = session.query(Genome).filter(Genome.genome_uuid == genome_uuid).one()
+            session.add(GenomeRelease(genome_id=genome.genome_id, ensembl_release=release, is_current=0))
+
+        assert reusable_genome_uuids() == {
+            "a7335667-93e7-11ec-a39d-005056b38ce3",
+            "9caa2cae-d1c8-4cfc-9ffd-2e13bc3e95b1",
+            "65d4f21f-695a-4ed0-be67-5732a551fea4",
+        }
+        assert "Nematode" in self._assert_incremental_matches_full(indexer, previous_index, count, tmp_path)
+
+    def test_export_to_json_incremental_attribute_update(self, test_dbs, tmp_path):
+        """Test the documents of the genomes whose dataset attributes were updated in place are created again."""
+        indexer, previous_index, count, reusable_genome_uuids = self._previous_index(tmp_path)
+        genome_uuid = "a7335667-93e7-11ec-a39d-005056b38ce3"
+        with indexer.metadata_db.session_scope() as session:
+            dataset_attributes = (
+                session.query(DatasetAttribute)
+                .join(Attribute, Attribute.attribute_id == DatasetAttribute.attribute_id)
+                .join(GenomeDataset, GenomeDataset.dataset_id == DatasetAttribute.dataset_id)
+                .join(Genome, Genome.genome_id == GenomeDataset.genome_id)
+                .filter(Genome.genome_uuid == genome_uuid, Attribute.name == "genebuild.method_display")
+                .all()
+            )
+            assert dataset_attributes
+            for dataset_attribute in dataset_attributes:
+                dataset_attribute.value = "Edited annotation method"
+
+        assert genome_uuid not in reusable_genome_uuids()
+        assert len(reusable_genome_uuids()) == count - 1
+        index = self._assert_incremental_matches_full(indexer, previous_index, count, tmp_path)
+        assert "Edited annotation method" in index
+
+    def test_export_to_json_incremental_same_day_release(self, test_dbs, tmp_path):
+        """Test a release published on the day of the previous index release counts as a newer release."""
+        indexer, previous_index, count, reusable_genome_uuids = self._previous_index(tmp_path)
+        genome_uuid = "2020e8d5-4d87-47af-be78-0b15e48970a7"
+        with indexer.metadata_db.session_scope() as session:
+            release = EnsemblRelease(
+                version=115.5, release_date=datetime.date(2025, 8, 1), label="2025-08-01", is_current=0,
+                site_id=1, release_type="integrated", status=ReleaseStatus.RELEASED,
+            )
+            session.add(release)
+            genome = session.query(Genome).filter(Genome.genome_uuid == genome_uuid).one()
+            session.add(GenomeRelease(genome_id=genome.genome_id, ensembl_release=release, is_current=0))
+
+        assert genome_uuid not in reusable_genome_uuids()
+        self._assert_incremental_matches_full(indexer, previous_index, count, tmp_path)
+
+    def test_prefetched_dataset_fields_match(self, test_dbs):
+        """Test the dataset fields computed from the batch attribute values are those of the loaded datasets."""
+        indexer = GenomeSearchIndexer(
+            test_dbs["ensembl_genome_metadata"].dbc.url, test_dbs["ncbi_taxonomy"].dbc.url
+        )
+
+        def dataset_fields(session, genome, release, dataset_extractor=None):
+            try:
+                return indexer._extract_dataset_fields(session, genome, release, dataset_extractor)
+            except (MissingDatasetFieldError, ValueError) as e:
+                return repr(e)
+
+        with indexer.metadata_db.session_scope() as session:
+            genome_ids = indexer._get_genome_ids_to_process(session)
+            expected = {
+                genome.genome_id: dataset_fields(session, genome, release)
+                for genome, release in indexer._get_genome_release_pairs(session, genome_ids)
+            }
+            session.expunge_all()
+            dataset_values = indexer._get_dataset_values(session, genome_ids)
+            pairs = indexer._get_genome_release_pairs(session, genome_ids, datasets=False)
+            assert len(pairs) == len(expected) > 0
+            for genome, release in pairs:
+                extractor = PrefetchedDatasetFieldExtractor(
+                    session, genome, release, *dataset_values[genome.genome_id]
+                )
+                assert dataset_fields(session, genome, release, extractor) == expected[genome.genome_id]
+                # the datasets were not loaded
+                assert "genome_datasets" not in genome.__dict__
+
     def test_document_structure_matches_schema(self, test_dbs):
         """Test that generated documents match GenomeSearchDocument schema."""
         metadata_uri = test_dbs["ensembl_genome_metadata"].dbc.url
@@ -0,0 +1,129 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the gRPC server workers, connection pool and concurrent RPCs limit settings
+"""
+import threading
+import time
+from concurrent import futures
+from pathlib import Path
+
+import grpc
+import pytest
+import sqlalchemy as db
+from ensembl.utils.database import UnitTestDB
+
+from ensembl.production.metadata.api.adaptors.base import PooledDBConnection, pool_options
+from ensembl.production.metadata.grpc.config import MetadataConfig
+from ensembl.production.metadata.grpc.service import server_options, start_response_cache
+
+SERVICE = "ensembl_metadata.EnsemblMetadata"
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestServerSettings:
+    dbc: UnitTestDB = None
+
+    def test_config(self, test_dbs, monkeypatch):
+        monkeypatch.setenv("POOL_SIZE", "5")
+        monkeypatch.setenv("MAX_OVERFLOW", "2")
+        monkeypatch.setenv("POOL_TIMEOUT", "1.5")
+        monkeypatch.setenv("GRPC_MAX_WORKERS", "6")
+        monkeypatch.delenv("GRPC_MAX_CONCURRENT_RPCS", raising=False)
+        config = MetadataConfig().validate()
+        assert (config.pool_size, config.max_overflow, config.pool_timeout) == (5, 2, 1.5)
+        assert config.grpc_max_workers == 6
+        assert config.grpc_max_concurrent_rpcs == 12
+        assert server_options(config) == {"maximum_concurrent_rpcs": 12}
+        monkeypatch.setenv("GRPC_MAX_CONCURRENT_RPCS", "0")
+        assert server_options(MetadataConfig()) == {"maximum_concurrent_rpcs": None}
+
+    @pytest.mark.parametrize(
+        "name, value",
+        [("GRPC_MAX_WORKERS", "0"), ("GRPC_MAX_CONCURRENT_RPCS", "-1"), ("POOL_SIZE", "0"),
+         ("MAX_OVERFLOW", "-1"), ("POOL_TIMEOUT", "0"), ("RESPONSE_CACHE_MAX_AGE", "0")]
+    )
+    def test_config_invalid(self, test_dbs, monkeypatch, name, value):
+        monkeypatch.setenv(name, value)
+        with pytest.raises(ValueError, match=name):
+            MetadataConfig().validate()
+
+    def test_config_warnings(self, test_dbs, monkeypatch):
+        monkeypatch.setenv("POOL_SIZE", "2")
+        monkeypatch.setenv("MAX_OVERFLOW", "0")
+        monkeypatch.setenv("GRPC_MAX_WORKERS", "4")
+        monkeypatch.setenv("GRPC_MAX_CONCURRENT_RPCS", "3")
+        with pytest.warns(UserWarning) as record:
+            MetadataConfig().validate()
+        messages = [str(warning.message) for warning in record]
+        assert any("some workers will never be used" in message for message in messages)
+        assert any("POOL_SIZE + MAX_OVERFLOW = 2" in message for message in messages)
+
+    def test_response_cache_config(self, test_dbs, monkeypatch):
+        monkeypatch.delenv("RESPONSE_CACHE_SIZE", raising=False)
+        monkeypatch.delenv("ALLOW_UNRELEASED", raising=False)
+        # opt-in
+        assert start_response_cache(MetadataConfig()) is None
+        monkeypatch.setenv("RESPONSE_CACHE_SIZE", "1024")
+        monkeypatch.setenv("RESPONSE_CACHE_MAX_AGE", "30")
+        cache = start_response_cache(MetadataConfig())
+        assert (cache.max_bytes, cache.max_age) == (1024, 30)
+        # the release generation doesn't follow the unreleased data
+        monkeypatch.setenv("ALLOW_UNRELEASED", "true")
+        assert start_response_cache(MetadataConfig()) is None
+
+    def test_pooled_connection(self, test_dbs, tmp_path):
+        assert pool_options("sqlite://") == {}
+        assert set(pool_options(f"sqlite:///{tmp_path}/test.db")) == {
+            "pool_size", "max_overflow", "pool_timeout", "pool_recycle"
+        }
+        dbc = PooledDBConnection.from_config(test_dbs["ensembl_genome_metadata"].dbc.url)
+        with dbc.session_scope() as session:
+            first = session.get_bind()
+            assert session.execute(db.text("SELECT 1")).scalar() == 1
+        with dbc.session_scope() as session:
+            # the sessions share the engine, and its connections pool
+            assert session.get_bind() is first is dbc._engine
+        assert dbc._engine.pool.size() == pool_options(dbc.url)["pool_size"]
+
+    def test_max_concurrent_rpcs(self, test_dbs):
+        release = threading.Event()
+
+        def slow(request, context):
+            release.wait(5)
+            return request
+
+        config = MetadataConfig()
+        config.grpc_max_concurrent_rpcs = 2
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=4), **server_options(config))
+        server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE, {
+            "Slow": grpc.unary_unary_rpc_method_handler(slow)
+        }),))
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                rpc = channel.unary_unary(f"/{SERVICE}/Slow")
+                calls = [rpc.future(b"x") for _ in range(4)]
+                # the RPCs beyond the limit are rejected straight away, while the others wait
+                deadline = time.monotonic() + 5
+                while sum(call.done() for call in calls) < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                rejected = [call.code() for call in calls if call.done()]
+                release.set()
+                codes = [call.code() for call in calls]
+        finally:
+            server.stop(grace=None)
+        assert rejected == [grpc.StatusCode.RESOURCE_EXHAUSTED] * 2
+        assert sorted(code.name for code in codes) == ["OK", "OK", "RESOURCE_EXHAUSTED", "RESOURCE_EXHAUSTED"]
@@ -0,0 +1,139 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the in-memory genome snapshot read model
+"""
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+import sqlalchemy as db
+from ensembl.utils.database import UnitTestDB
+
+import ensembl.production.metadata.grpc.utils as utils
+from ensembl.production.metadata.api.adaptors.snapshot import SnapshotGenomeAdaptor
+from ensembl.production.metadata.api.models import Genome, EnsemblRelease
+
+logger = logging.getLogger(__name__)
+
+
+class NoDatabase:
+    """Fails any attempt to open a database session"""
+
+    @contextmanager
+    def session_scope(self):
+        raise AssertionError("Unexpected database access")
+        yield
+
+
+def assert_same_outcome(rpc, snapshot_conn, genome_conn, *args):
+    """Asserts the snapshot returns what the database returns, or raises what the database raises"""
+    try:
+        expected = rpc(genome_conn, *args)
+    except Exception as e:
+        # e.g. get_brief_genome_details_by_uuid fails on genomes with several partial releases, both ways
+        with pytest.raises(type(e)):
+            rpc(snapshot_conn, *args)
+    else:
+        assert rpc(snapshot_conn, *args) == expected
+
+
+def row_keys(rows):
+    return [(row.Genome.genome_uuid, row.GenomeRelease.genome_release_id) for row in rows]
+
+
+@pytest.fixture(scope="class")
+def snapshot_conn(test_dbs):
+    yield SnapshotGenomeAdaptor(
+        metadata_uri=test_dbs["ensembl_genome_metadata"].dbc.url,
+        taxonomy_uri=test_dbs["ncbi_taxonomy"].dbc.url,
+        refresh_interval=0,
+    )
+
+
+@pytest.fixture(scope="class")
+def genome_uuids(test_dbs):
+    with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+        return session.execute(db.select(Genome.genome_uuid).order_by(Genome.genome_uuid)).scalars().all()
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestSnapshotGenomeAdaptor:
+    dbc: UnitTestDB = None
+
+    @pytest.mark.parametrize("release_version", [None, 0, 108.0, 110.1, 111.0])
+    def test_rpcs_match_database(self, genome_conn, snapshot_conn, genome_uuids, release_version):
+        for genome_uuid in genome_uuids:
+            for rpc in (utils.get_genome_by_uuid, utils.get_brief_genome_details_by_uuid,
+                        utils.get_attributes_by_genome_uuid, utils.get_datasets_list_by_uuid):
+                assert_same_outcome(rpc, snapshot_conn, genome_conn, genome_uuid, release_version)
+            assert utils.get_species_information(snapshot_conn, genome_uuid) == \
+                   utils.get_species_information(genome_conn, genome_uuid)
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"genome_tag": "grch37"},
+            {"genome_tag": ["grch38", "wbcel235"]},
+            {"assembly_name": "GRCh38.p14"},
+            {"assembly_name": "grch38", "use_default_assembly": True},
+            {"biosample_id": "SAMN12121739"},
+            {"genome_uuid": "a73351f7-93e7-11ec-a39d-005056b38ce3", "status": "Released"},
+            {"genome_uuid": ["a73351f7-93e7-11ec-a39d-005056b38ce3", "a7335667-93e7-11ec-a39d-005056b38ce3"]},
+            {"release_type": "partial", "release_version": 110.1},
+        ]
+    )
+    def test_fetch_genomes(self, genome_conn, snapshot_conn, params):
+        assert row_keys(snapshot_conn.fetch_genomes(**params)) == row_keys(genome_conn.fetch_genomes(**params))
+
+    def test_fetch_assemblies_count(self, genome_conn, snapshot_conn):
+        for row in genome_conn.fetch_genomes():
+            species_taxonomy_id = row.Organism.species_taxonomy_id
+            for release_version in (None, 110.1):
+                assert snapshot_conn.fetch_assemblies_count(species_taxonomy_id, release_version) == \
+                       genome_conn.fetch_assemblies_count(species_taxonomy_id, release_version)
+
+    def test_fetch_assemblies_counts(self, genome_conn, snapshot_conn):
+        species_taxonomy_ids = list({row.Organism.species_taxonomy_id for row in genome_conn.fetch_genomes()})
+        for release_version in (None, 110.1):
+            counts = genome_conn.fetch_assemblies_counts(species_taxonomy_ids + [1], release_version)
+            assert counts == snapshot_conn.fetch_assemblies_counts(species_taxonomy_ids + [1], release_version)
+            assert counts == {
+                species_taxonomy_id: genome_conn.fetch_assemblies_count(species_taxonomy_id, release_version)
+                for species_taxonomy_id in species_taxonomy_ids + [1]
+            }
+
+    def test_no_database_access(self, snapshot_conn, genome_uuids):
+        metadata_db, taxonomy_db = snapshot_conn.metadata_db, snapshot_conn.taxonomy_db
+        snapshot_conn.metadata_db = snapshot_conn.taxonomy_db = NoDatabase()
+        try:
+            for genome_uuid in genome_uuids:
+                for rpc in (utils.get_genome_by_uuid, utils.get_brief_genome_details_by_uuid,
+                            utils.get_attributes_by_genome_uuid, utils.get_datasets_list_by_uuid):
+                    # a database access raises AssertionError, any other error propagates too
+                    assert rpc(snapshot_conn, genome_uuid, 0) is not None
+        finally:
+            snapshot_conn.metadata_db, snapshot_conn.taxonomy_db = metadata_db, taxonomy_db
+
+    def test_refresh(self, test_dbs, snapshot_conn):
+        assert not snapshot_conn.refresh()
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            release = session.execute(db.select(EnsemblRelease).order_by(EnsemblRelease.release_id)).scalars().first()
+            release.is_current = 0 if release.is_current else 1
+        assert snapshot_conn.refresh()
+        assert not snapshot_conn.refresh()
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            release = session.execute(db.select(EnsemblRelease).order_by(EnsemblRelease.release_id)).scalars().first()
+            release.is_current = 0 if release.is_current else 1
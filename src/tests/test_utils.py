@@ -23,7 +23,10 @@ from typing import List
 import pytest
 from ensembl.utils.database import UnitTestDB, DBConnection
 from google.protobuf import json_format
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
+from ensembl.production.metadata.api.adaptors import AssembliesCounts, GenomeAdaptor
 from ensembl.production.metadata.api.models import (
     Dataset,
     EnsemblRelease,
@@ -980,3 +983,61 @@ class TestUtils:
         )
         print(output)
         assert json.loads(output) == expected_output
+
+    @pytest.mark.parametrize("release_version", [0, 108.0, 110.1])
+    def test_get_genomes_by_uuids(self, test_dbs, genome_conn, release_version):
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            genome_uuids = session.query(Genome.genome_uuid).order_by(Genome.genome_uuid.desc()).all()
+        genome_uuids = [genome_uuid for genome_uuid, in genome_uuids]
+        expected = [utils.get_genome_by_uuid(genome_conn, genome_uuid, release_version) for genome_uuid in genome_uuids]
+        expected = [genome for genome in expected if genome != ensembl_metadata_pb2.Genome()]
+        assert len(expected) > 1
+        # unknown, empty and duplicated genome uuids are left out
+        output = utils.get_genomes_by_uuids(
+            genome_conn, ["some-invalid-genome-uuid-000000000000", ""] + genome_uuids + genome_uuids[:1],
+            release_version
+        )
+        assert list(output.genomes) == expected
+
+    @pytest.mark.parametrize("release_version", [0, 108.0, 110.1])
+    def test_get_brief_genome_details_by_uuids(self, test_dbs, genome_conn, release_version):
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            genome_uuids = session.query(Genome.genome_uuid).order_by(Genome.genome_uuid.desc()).all()
+        genome_uuids = [genome_uuid for genome_uuid, in genome_uuids]
+        expected = []
+        for genome_uuid in genome_uuids:
+            try:
+                genome = utils.get_brief_genome_details_by_uuid(genome_conn, genome_uuid, release_version)
+            except IndexError:
+                # released in partial releases only, left out of the batch
+                continue
+            if genome != ensembl_metadata_pb2.BriefGenomeDetails():
+                expected.append(genome)
+        assert len(expected) > 1
+        output = utils.get_brief_genome_details_by_uuids(
+            genome_conn, genome_uuids + ["some-invalid-genome-uuid-000000000000"], release_version
+        )
+        assert list(output.genomes) == expected
+
+    def test_get_genomes_by_uuids_statements_count(self, test_dbs, genome_conn):
+        with test_dbs["ensembl_genome_metadata"].dbc.session_scope() as session:
+            genome_uuids = [genome_uuid for genome_uuid, in session.query(Genome.genome_uuid).all()]
+
+        def statements_count(rpc, batch):
+            GenomeAdaptor.taxonomy_names_cache.clear()
+            genome_conn.assemblies_counts = AssembliesCounts()
+            statements = []
+
+            def count_statement(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            # DBConnection creates a new engine for each session, listen on all of them
+            event.listen(Engine, "before_cursor_execute", count_statement)
+            try:
+                assert len(rpc(genome_conn, batch, 0).genomes) > 0
+            finally:
+                event.remove(Engine, "before_cursor_execute", count_statement)
+            return len(statements)
+
+        for rpc in (utils.get_genomes_by_uuids, utils.get_brief_genome_details_by_uuids):
+            assert statements_count(rpc, genome_uuids) == statements_count(rpc, genome_uuids[:2])
@@ -0,0 +1,68 @@
+# See the NOTICE file distributed with this work for additional information
+#   regarding copyright ownership.
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#       http://www.apache.org/licenses/LICENSE-2.0
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Unit tests for the gRPC service startup warm-up
+"""
+import asyncio
+from pathlib import Path
+
+import pytest
+from ensembl.utils.database import UnitTestDB
+
+from ensembl.production.metadata.api.adaptors import GenomeAdaptor
+from ensembl.production.metadata.grpc.metrics import Metrics
+from ensembl.production.metadata.grpc.warmup import report_warm_up, warm_up
+
+
+@pytest.mark.parametrize("test_dbs", [[{"src": Path(__file__).parent / "databases/ensembl_genome_metadata"},
+                                        {"src": Path(__file__).parent / "databases/ncbi_taxonomy"}]],
+                         indirect=True)
+class TestWarmUp:
+    dbc: UnitTestDB = None
+
+    def test_warm_up(self, test_dbs, genome_conn):
+        GenomeAdaptor.taxonomy_names_cache.clear()
+        popular = genome_conn.fetch_organisms_group_counts(group_code="popular")
+        report = warm_up(genome_conn)
+        assert report["species"] == len(popular) > 0
+        assert report["genomes"] >= report["species"]
+        assert report["calls"] == 1 + report["species"] + 6 * report["genomes"]
+        assert report["seconds"] > 0
+        # the taxonomy names of the warmed up genomes are cached
+        assert len(GenomeAdaptor.taxonomy_names_cache) > 0
+
+        metrics = Metrics()
+        report_warm_up(report, metrics)
+        assert f"ensembl_metadata_warmup_genomes {report['genomes']}" in metrics.render()
+
+    def test_warm_up_max_genomes(self, test_dbs, genome_conn):
+        report = warm_up(genome_conn, max_genomes=2)
+        assert report["genomes"] == 2
+        assert report["species"] <= 2
+        assert warm_up(genome_conn, group_code="unknown")["genomes"] == 0
+
+    def test_warm_up_failure(self, test_dbs, genome_conn):
+        # the warm-up never prevents the service from starting
+        genome_conn.metadata_db = None
+        assert warm_up(genome_conn)["genomes"] == 0
+
+    def test_async_warm_up(self, test_dbs):
+        from ensembl.production.metadata.grpc.aio_servicer import AsyncEnsemblMetadataServicer
+
+        async def run():
+            servicer = AsyncEnsemblMetadataServicer()
+            try:
+                return await servicer.genome_adaptor.run_sync(warm_up, "popular", 3)
+            finally:
+                await servicer.close()
+
+        assert asyncio.run(run())["genomes"] == 3